@@ -69,3 +69,24 @@ resource "aws_cloudwatch_event_rule" "update_expired_download_limits" {
   schedule_expression = var.update_expired_download_limits_schedule_expression
 }
 
+resource "aws_cloudwatch_event_target" "purge_geocoding_results" {
+  target_id = "eventTarget${local.short}PurgeGeocodingResults"
+  rule      = aws_cloudwatch_event_rule.purge_geocoding_results.name
+  arn       = aws_sfn_state_machine.app_cli.id
+  role_arn  = aws_iam_role.cloudwatch_events_service_role.arn
+
+  input = <<EOF
+{
+  "commands": [
+    "purge_geocoding_results"
+  ]
+}
+EOF
+
+}
+
+resource "aws_cloudwatch_event_rule" "purge_geocoding_results" {
+  name                = "eventRule${local.short}PurgeGeocodingResults"
+  description         = "Run purge_geocoding_results management command at a scheduled time (${var.purge_geocoding_results_schedule_expression})"
+  schedule_expression = var.purge_geocoding_results_schedule_expression
+}
@@ -26,6 +26,9 @@ target "kafka" {
 target "django" {
   context    = "src/django"
   dockerfile = "Dockerfile"
+  contexts = {
+    "logstash-src" = "src/logstash"
+  }
   tags       = ["${ECR_REGISTRY}/${IMAGE_NAME}-${ENV_SLUG}:${GIT_COMMIT}"]
 }
 
@@ -11,6 +11,31 @@ class Settings(BaseSettings):
     consumer_group_id: str
     consumer_client_id: str
     topic_dedupe_basic_name: str
+    # Share the topic between replicas through the stable `consumer_group_id`
+    # group, committing offsets once a message has been matched
+    consumer_group_mode: bool = False
+    # Partitions matched at the same time in consumer group mode
+    consumer_max_concurrency: int = 2
+    # Redeliveries of a failed message before it is skipped
+    consumer_max_retries: int = 3
+    # Postgres channel notified with the id of each matched list item
+    match_notification_channel: str = "facility_list_item_matched"
+    # Rows per multi-row INSERT when writing match results
+    writer_batch_size: int = 1000
+    # Distinct (country, name, address) keys per exact match query
+    exact_match_batch_size: int = 1000
+    # Candidate facility IDs per gazetteer existence check query
+    facility_exists_batch_size: int = 10000
+    # Directory for the gazetteer model and index snapshot. Empty disables it.
+    # It must be on a volume that outlives the container, or every start
+    # still retrains the gazetteer
+    gazetteer_snapshot_dir: str = ""
+    # Minimum seconds between snapshots written after incremental updates
+    gazetteer_snapshot_interval_seconds: int = 600
+    # Worker processes for gazetteer matching. 0 uses every core
+    gazetteer_match_processes: int = 0
+    # Maximum messy items of one country per gazetteer matching shard
+    gazetteer_match_shard_size: int = 500
     # Environment
     env: str
     instance_source: str = "os_hub"
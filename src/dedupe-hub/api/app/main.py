@@ -15,8 +15,10 @@ from kafka import TopicPartition
 
 from app.utils.rollbar import init_rollbar
 from app.matching.matcher.gazeteer.gazetteer_cache import GazetteerCache
+from app.matching.matcher.gazeteer.gazetteer_executor import gazetteer_match_executor
 
 from app.config import settings
+from app.partitioned_consumer import PartitionedConsumer
 
 from app.matching.facilities_matcher import matcher
 # Import to register origin_source listeners (triggers SQLAlchemy events)
@@ -28,6 +30,7 @@ app = FastAPI()
 # global variables
 consumer_task = None
 consumer = None
+partitioned_consumer = None
 
 logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s',
                     level=logging.INFO)
@@ -47,8 +50,13 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     log.info('Shutting down API')
+    gazetteer_match_executor.shutdown()
     consumer_task.cancel()
-    await consumer.stop()
+    # The consumer task stops the consumer once its handlers are done.
+    try:
+        await consumer_task
+    except asyncio.CancelledError:
+        pass
 
 
 @app.get("/")
@@ -78,6 +86,30 @@ async def trigger(source_id):
 async def initialize():
     loop = asyncio.get_event_loop()
     global consumer
+    global partitioned_consumer
+    if settings.consumer_group_mode:
+        log.debug(f'Initializing KafkaConsumer for topic {settings.topic_dedupe_basic_name}, '
+                  f'group_id {settings.consumer_group_id} and using bootstrap servers '
+                  f'{settings.bootstrap_servers}')
+        consumer = AIOKafkaConsumer(loop=loop,
+                                    bootstrap_servers=settings.bootstrap_servers,
+                                    group_id=settings.consumer_group_id,
+                                    client_id=settings.consumer_client_id,
+                                    enable_auto_commit=False)
+        partitioned_consumer = PartitionedConsumer(
+            consumer,
+            handle,
+            max_concurrency=settings.consumer_max_concurrency,
+            max_retries=settings.consumer_max_retries
+        )
+        # subscribe with a listener that waits for the tasks of revoked
+        # partitions before they are handed over
+        partitioned_consumer.subscribe([settings.topic_dedupe_basic_name])
+        # get cluster layout and join group, resuming from the committed
+        # offsets of the group
+        await consumer.start()
+        return True
+
     group_id = f'{settings.consumer_group_id}-{randint(0, 10000)}'
     log.debug(f'Initializing KafkaConsumer for topic {settings.topic_dedupe_basic_name}, group_id {group_id}'
               f' and using bootstrap servers {settings.bootstrap_servers}')
@@ -115,6 +147,9 @@ async def initialize():
 
 async def consume():
     global consumer_task
+    if settings.consumer_group_mode:
+        consumer_task = asyncio.create_task(partitioned_consumer.run())
+        return
     consumer_task = asyncio.create_task(send_consumer_message(consumer))
 
 async def send_consumer_message(consumer):
@@ -132,15 +167,19 @@ async def send_consumer_message(consumer):
         await consumer.stop()
 
 async def handle(value):
-    value = json.loads(value.decode("utf-8"))
-    log.info(f'[Matching] Source Id: {value}')
     try:
+        value = json.loads(value.decode("utf-8"))
+        log.info(f'[Matching] Source Id: {value}')
         log.info(f'[Matching] Start processing!')
-        result = matcher(value)
+        # Matching is CPU bound, so it runs off the event loop to keep the
+        # consumer heartbeats and the API responsive.
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, matcher, value)
         log.info(f'[Matching] Result: {result}')
     except Exception as error:
         log.error(f'[Matching] Error: {error}')
-    return
+        return False
+    return True
 
 async def build_gazetteer():
     try:
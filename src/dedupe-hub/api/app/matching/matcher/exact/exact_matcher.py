@@ -1,7 +1,10 @@
 import logging
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+from sqlalchemy import tuple_
+
+from app.config import settings
 from app.database.models.facility_list_item import FacilityListItem
 from app.matching.DTOs.match_dto import MatchDTO
 from app.matching.DTOs.facility_list_item_dto import FacilityListItemDict
@@ -13,6 +16,9 @@ logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s',
                     level=logging.INFO)
 log = logging.getLogger(__name__)
 
+# (country code, clean name, clean address)
+MatchKey = Tuple[str, str, str]
+
 
 class ExactMatcher(BaseMatcher):
     automatic_threshold: float
@@ -32,8 +38,11 @@ class ExactMatcher(BaseMatcher):
         log.info('[Matching] Exact match processing started!')
         log.info(f'[Matching] Messy data: {messy}')
 
+        matched_items = self.get_matched_items(messy)
         matches = {
-            messy_id: self.identify_exact_matches(item)
+            messy_id: self.get_exact_matches(
+                matched_items.get(self.get_match_key(item), [])
+            )
             for messy_id, item in messy.items()
         }
         self.set_finish()
@@ -43,20 +52,9 @@ class ExactMatcher(BaseMatcher):
 
         return matches
 
-    def identify_exact_matches(
-        self, facility_list_item
-    ) -> List[MatchDTO or None]:
-
-        exact_matches = self.get_exact_matches(facility_list_item)
-
-        if len(exact_matches) > 0:
-            return exact_matches
-
-        return []
-
-    def get_exact_matches(self, facility_list_item) -> List[MatchDTO]:
+    def get_exact_matches(self, matched_items) -> List[MatchDTO]:
         result_list: List[MatchDTO] = []
-        for item in self.get_matched_items(facility_list_item):
+        for item in matched_items:
             exact_match_dto: MatchDTO = {
                 'id': item.id,
                 'facility_id': item.facility_id,
@@ -67,19 +65,54 @@ class ExactMatcher(BaseMatcher):
         return result_list
 
     @staticmethod
-    def get_matched_items(facility_list_item):
+    def get_match_key(facility_list_item) -> MatchKey:
+        return (
+            facility_list_item.get('country', '').upper(),
+            facility_list_item.get('name', ''),
+            facility_list_item.get('address', ''),
+        )
+
+    @classmethod
+    def get_matched_items(
+        cls, messy: FacilityListItemDict
+    ) -> Dict[MatchKey, List[Any]]:
+        """
+        Looks up the matched list items of every distinct (country, clean
+        name, clean address) key of the messy data with one query per
+        `exact_match_batch_size` keys, served by the composite index on
+        those columns.
+        """
+        keys = list({cls.get_match_key(item) for item in messy.values()})
+        matched_items: Dict[MatchKey, List[Any]] = {}
+        batch_size = settings.exact_match_batch_size
+
         with get_session() as session:
-            return (session.query(FacilityListItem). \
+            for start in range(0, len(keys), batch_size):
+                rows = session.query(
+                    FacilityListItem.id,
+                    FacilityListItem.facility_id,
+                    FacilityListItem.country_code,
+                    FacilityListItem.clean_name,
+                    FacilityListItem.clean_address,
+                ). \
                 filter(
                     FacilityListItem.status.in_([FacilityListItem.MATCHED, FacilityListItem.CONFIRMED_MATCH]),
                     FacilityListItem.facility_id != None,
-                    FacilityListItem.clean_name == facility_list_item.get('name', ''),
-                    FacilityListItem.clean_address == facility_list_item.get('address', ''),
-                    FacilityListItem.country_code == facility_list_item.get('country', '').upper()
+                    tuple_(
+                        FacilityListItem.country_code,
+                        FacilityListItem.clean_name,
+                        FacilityListItem.clean_address,
+                    ).in_(keys[start:start + batch_size])
                 ). \
+                order_by(FacilityListItem.id). \
                 all()
-            )
-        
+
+                for row in rows:
+                    key = (row.country_code, row.clean_name, row.clean_address)
+                    matched_items.setdefault(key, []).append(row)
+
+        return matched_items
+
     def get_started(self):
         return self.started
     
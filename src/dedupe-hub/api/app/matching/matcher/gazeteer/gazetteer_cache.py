@@ -1,8 +1,11 @@
 import logging
+import threading
+import time
 from typing import Dict, List, Tuple, Union
 from dedupe import Gazetteer, StaticGazetteer
 from sqlalchemy.sql import func
 
+from app.config import settings
 from app.utils.rollbar import try_reporting_error_to_rollbar
 from app.database.sqlalchemy import get_session
 from app.exceptions import NoCanonicalRecordsError
@@ -19,6 +22,10 @@ from app.matching.matcher.gazeteer.gazetteer_data_fetcher import (
     get_canonical_items,
     get_messy_items_for_training,
 )
+from app.matching.matcher.gazeteer.gazetteer_snapshot import (
+    load_gazetteer_snapshot,
+    save_gazetteer_snapshot,
+)
 from app.matching.matcher.gazeteer.gazetteer_train import gazetteer_train
 
 logger = logging.getLogger(__name__)
@@ -38,22 +45,38 @@ class GazetteerCache:
     removed since the previous call to the `get_latest` class method.
 
     Note that the first time `get_latest` is called it will be slow, as it
-    needs to train a model and index it with all the `Facility` items.
+    needs to train a model and index it with all the `Facility` items, unless
+    a snapshot saved by a previous process can be loaded from disk. In that
+    case only the history recorded after the snapshot is replayed.
     """
     _gazetter: Union[Gazetteer, StaticGazetteer, None] = None
     _facility_version: Union[int, None] = None
     _match_version: Union[int, None] = None
+    _snapshot_saved_at: Union[float, None] = None
+    # Held while the gazetteer is updated or matched against, as lists of
+    # several partitions are matched in concurrent threads.
+    lock = threading.RLock()
+
+    @classmethod
+    def get_version(cls) -> Tuple[Union[int, None], Union[int, None]]:
+        """
+        Returns the facility and match history_id watermarks of the in-memory
+        gazetteer, which change whenever `get_latest` indexes new records.
+        """
+        return cls._facility_version, cls._match_version
+
+    @classmethod
+    def _get_versions(cls, session) -> Tuple[Union[int, None], Union[int, None]]:
+        return (
+            session.query(func.max(HistoricalFacility.history_id)).scalar(),
+            session.query(func.max(HistoricalFacilityMatch.history_id)).scalar(),
+        )
 
     @classmethod
     def _rebuild_gazetteer(cls) -> Union[Gazetteer, StaticGazetteer, None]:
         logger.info('Rebuilding gazetteer')
         with get_session() as session:
-            db_facility_version = (
-                session.query(func.max(HistoricalFacility.history_id).label("max_id")).limit(1)
-            )
-            db_match_version = (
-                session.query(func.max(HistoricalFacilityMatch.history_id).label("max_id")).limit(1)
-            )
+            db_facility_version, db_match_version = cls._get_versions(session)
 
             # We expect `get_canonical_items` to return a list rather than a
             # QuerySet so that we can close the transaction as quickly as
@@ -68,16 +91,40 @@ class GazetteerCache:
             cls._gazetter = gazetteer_train(messy, canonical, should_index=True)
             cls._facility_version = db_facility_version
             cls._match_version = db_match_version
+            cls._save_snapshot()
             return cls._gazetter
 
+    @classmethod
+    def _load_snapshot(cls) -> bool:
+        snapshot = load_gazetteer_snapshot()
+        if snapshot is None:
+            return False
+        cls._gazetter, cls._facility_version, cls._match_version = snapshot
+        cls._snapshot_saved_at = time.monotonic()
+        return True
+
+    @classmethod
+    def _save_snapshot(cls) -> None:
+        if save_gazetteer_snapshot(
+            cls._gazetter, cls._facility_version, cls._match_version
+        ):
+            cls._snapshot_saved_at = time.monotonic()
+
+    @classmethod
+    def _is_snapshot_due(cls) -> bool:
+        if cls._snapshot_saved_at is None:
+            return True
+        elapsed = time.monotonic() - cls._snapshot_saved_at
+        return elapsed >= settings.gazetteer_snapshot_interval_seconds
+
     @classmethod
     def _get_new_facility_history(cls) -> FacilityHistory:
         facility_changes = []
         latest_facility_dedupe_records = {}
         with get_session() as session:
-            db_facility_version = (
-                session.query(func.max(HistoricalFacility.history_id).label("max_id")).limit(1)
-            )
+            db_facility_version = session.query(
+                func.max(HistoricalFacility.history_id)
+            ).scalar()
 
             if db_facility_version != cls._facility_version:
                 if cls._facility_version is None:
@@ -86,19 +133,21 @@ class GazetteerCache:
                     last_facility_version_id = cls._facility_version
                 # We call `list` so that we can get all the data and exit
                 # the transaction as soon as possible
-                historical_facility_q = session.query(
-                    HistoricalFacility.id, 
-                    HistoricalFacility.country_code, 
-                    HistoricalFacility.name, 
-                    HistoricalFacility.address, 
-                    HistoricalFacility.history_type, 
-                    HistoricalFacility.history_id
-                ). \
-                filter(
-                    HistoricalFacility.history_id == last_facility_version_id
-                ). \
-                order_by(
-                    HistoricalFacility.history_id.desc()
+                historical_facility_q = list(
+                    session.query(
+                        HistoricalFacility.id,
+                        HistoricalFacility.country_code,
+                        HistoricalFacility.name,
+                        HistoricalFacility.address,
+                        HistoricalFacility.history_type,
+                        HistoricalFacility.history_id
+                    ).
+                    filter(
+                        HistoricalFacility.history_id > last_facility_version_id
+                    ).
+                    order_by(
+                        HistoricalFacility.history_id.asc()
+                    )
                 )
                 facility_changes: List[Dict[str, str or int]] = []
                 for item in historical_facility_q:
@@ -112,7 +161,9 @@ class GazetteerCache:
                     }
                     facility_changes.append(dict_item)
 
-                changed_facility_ids_qs = [item.id for item in historical_facility_q]
+                changed_facility_ids_qs = {
+                    item.id for item in historical_facility_q
+                }
                 # We use an dictionary comprehension so that we can load
                 # all the data and exit the transaction as soon as possible
                 latest_facility_dedupe_records = {
@@ -130,7 +181,9 @@ class GazetteerCache:
         latest_match_records = {}
         latest_matched_facility_dedupe_records = {}
         with get_session() as session:
-            db_match_version = session.query(func.max(HistoricalFacility.history_id).label("max_id")).limit(1)
+            db_match_version = session.query(
+                func.max(HistoricalFacilityMatch.history_id)
+            ).scalar()
 
             if db_match_version != cls._match_version:
                 if cls._match_version is None:
@@ -142,37 +195,37 @@ class GazetteerCache:
                 # the transaction as soon as possible
                 match_changes = list(
                     session.query(
-                    HistoricalFacilityMatch.id, 
-                    HistoricalFacilityMatch.facility_id, 
-                    HistoricalFacilityMatch.history_type, 
+                    HistoricalFacilityMatch.id,
+                    HistoricalFacilityMatch.facility_id,
+                    HistoricalFacilityMatch.history_type,
                     HistoricalFacilityMatch.history_id
                     ). \
                     filter(
-                        HistoricalFacilityMatch.history_id==last_match_version_id
+                        HistoricalFacilityMatch.history_id > last_match_version_id
                     ). \
-                    order_by(HistoricalFacilityMatch.history_id.desc())
+                    order_by(HistoricalFacilityMatch.history_id.asc())
                 )
 
                 # We use an dictionary comprehension so that we can load
                 # all the data and exit the transaction as soon as possible
-                history_id_list = [item.history_id for item in match_changes]
+                match_id_list = {item.id for item in match_changes}
                 latest_match_records = {
-                    m['id']: {
-                        'facility': m['facility_id'],
-                        'status': m['status'],
-                        'is_active': m['is_active'],
-                    } for m in session.query(FacilityMatch.id, 
-                                             FacilityMatch.facility_id, 
-                                             FacilityMatch.status, 
+                    m.id: {
+                        'facility': m.facility_id,
+                        'status': m.status,
+                        'is_active': m.is_active,
+                    } for m in session.query(FacilityMatch.id,
+                                             FacilityMatch.facility_id,
+                                             FacilityMatch.status,
                                              FacilityMatch.is_active). \
                         filter(
-                            FacilityMatch.id.in_(history_id_list)
+                            FacilityMatch.id.in_(match_id_list)
                         )
                 }
 
                 # We use an dictionary comprehension so that we can load
                 # all the data and exit the transaction as soon as possible
-                facility_id_list = [item.facility_id for item in match_changes]
+                facility_id_list = {item.facility_id for item in match_changes}
                 latest_matched_facility_dedupe_records = {
                     f['id']: facility_values_to_dedupe_record(f) for f in
                     transform_to_dict(session.query(Facility).filter(Facility.id.in_(facility_id_list)))
@@ -184,7 +237,7 @@ class GazetteerCache:
     @classmethod
     def get_latest(cls) -> Gazetteer or StaticGazetteer or None:
         try:
-            if cls._gazetter is None:
+            if cls._gazetter is None and not cls._load_snapshot():
                 return cls._rebuild_gazetteer()
 
             facility_changes, latest_facility_dedupe_records = \
@@ -267,7 +320,10 @@ class GazetteerCache:
                             record = dedupe_record_for_match_item(item)
                             logger.debug(f'Indexing match {record}')
                             cls._gazetter.index(record)
-                    cls._match_version = item['history_id']
+                cls._match_version = item['history_id']
+
+            if (facility_changes or match_changes) and cls._is_snapshot_due():
+                cls._save_snapshot()
 
         except Exception as e:
             logger.error(f'[Matching] Get latest Gazetteer Error: {e}')
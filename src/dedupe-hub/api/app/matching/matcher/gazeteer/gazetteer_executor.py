@@ -0,0 +1,159 @@
+import logging
+import multiprocessing
+import os
+import threading
+from itertools import islice
+from typing import Dict, Hashable, Iterator, List, Tuple, Union
+
+from dedupe import Gazetteer, StaticGazetteer
+
+from app.config import settings
+from app.matching.DTOs.facility_list_item_dto import FacilityListItemDict
+
+logger = logging.getLogger(__name__)
+
+GazetteerMatch = List[Tuple[Tuple[str, str], float]]
+
+# The message of the ValueError dedupe raises for a shard without candidates.
+NO_RECORDS_TO_MATCH = 'No records to match'
+
+# The gazetteer the pool workers match against. It is set before the pool is
+# forked, so the workers share the indexed gazetteer of the parent process
+# instead of each receiving a pickled copy.
+_worker_gazetteer: Union[Gazetteer, StaticGazetteer, None] = None
+
+
+def _init_worker() -> None:
+    # Daemonic pool workers cannot start dedupe's own scoring pool.
+    _worker_gazetteer.num_cores = 1
+
+
+def _match_shard(args: Tuple[FacilityListItemDict, float]) -> List[GazetteerMatch]:
+    shard, threshold = args
+    return match_gazetteer(_worker_gazetteer, shard, threshold)
+
+
+def match_gazetteer(
+    gazetteer: Union[Gazetteer, StaticGazetteer],
+    messy: FacilityListItemDict,
+    threshold: float
+) -> List[GazetteerMatch]:
+    try:
+        matches = gazetteer.match(
+            messy,
+            threshold=threshold,
+            n_matches=None,
+            generator=True
+        )
+        # Plain tuples instead of numpy records, so the results are cheap to
+        # send back from a worker.
+        return [
+            [((messy_id, canon_id), float(score))
+             for (messy_id, canon_id), score in match]
+            for match in matches
+        ]
+    except ValueError as error:
+        # Raised by dedupe's scoreGazette when none of the records share a
+        # block with the index, which is expected for a single shard.
+        if str(error) != NO_RECORDS_TO_MATCH:
+            raise
+        logger.debug(f'[Matching] No gazetteer candidates for shard: {error}')
+        return []
+
+
+def shard_by_country(
+    messy: FacilityListItemDict, shard_size: int
+) -> List[FacilityListItemDict]:
+    """
+    Split the messy records into shards of at most `shard_size` records of a
+    single country. A messy record is compared with the whole index on its
+    own, so the shards match exactly as the full dict would, and keeping a
+    country together lets a shard reuse the same blocks.
+    """
+    by_country: Dict[Hashable, Dict[str, Dict[str, str]]] = {}
+    for item_id, record in messy.items():
+        by_country.setdefault(record.get('country'), {})[item_id] = record
+
+    shards = []
+    for records in by_country.values():
+        items = iter(records.items())
+        while True:
+            shard = dict(islice(items, shard_size))
+            if not shard:
+                break
+            shards.append(shard)
+    return shards
+
+
+class GazetteerMatchExecutor:
+    """
+    Matches messy records against the gazetteer in a pool of worker
+    processes, one country shard at a time. The pool is forked from the
+    current gazetteer and is recreated whenever `GazetteerCache` indexes new
+    records, as the workers only see the gazetteer as it was when forked.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_version = None
+
+    @staticmethod
+    def get_processes() -> int:
+        return settings.gazetteer_match_processes or os.cpu_count() or 1
+
+    def match(
+        self,
+        gazetteer: Union[Gazetteer, StaticGazetteer],
+        version: Hashable,
+        messy: FacilityListItemDict,
+        threshold: float
+    ) -> Iterator[GazetteerMatch]:
+        shards = shard_by_country(messy, settings.gazetteer_match_shard_size)
+        if len(shards) < 2 or self.get_processes() < 2:
+            yield from match_gazetteer(gazetteer, messy, threshold)
+            return
+
+        logger.info(
+            f'[Matching] Matching {len(messy)} items in {len(shards)} shards'
+        )
+        with self._lock:
+            pool = self._get_pool(gazetteer, version)
+            for shard_matches in pool.imap_unordered(
+                _match_shard, [(shard, threshold) for shard in shards]
+            ):
+                yield from shard_matches
+
+    def _get_pool(
+        self,
+        gazetteer: Union[Gazetteer, StaticGazetteer],
+        version: Hashable
+    ):
+        global _worker_gazetteer
+
+        version = (id(gazetteer), version)
+        if self._pool is not None and self._pool_version == version:
+            return self._pool
+
+        self._terminate_pool()
+        _worker_gazetteer = gazetteer
+        self._pool = multiprocessing.get_context('fork').Pool(
+            processes=self.get_processes(),
+            initializer=_init_worker
+        )
+        self._pool_version = version
+        return self._pool
+
+    def _terminate_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._pool_version = None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._terminate_pool()
+
+
+gazetteer_match_executor = GazetteerMatchExecutor()
@@ -1,6 +1,6 @@
 import logging
 
-from typing import List, Tuple, Dict
+from typing import List, Set, Tuple, Dict
 from typing_extensions import DefaultDict
 
 from dedupe import core, Gazetteer, StaticGazetteer
@@ -17,6 +17,7 @@ from app.matching.DTOs.facility_list_item_dto import FacilityListItemDict
 from app.matching.DTOs.results_dto import ResultsDTO
 from app.matching.matcher.base_matcher import BaseMatcher
 from app.matching.matcher.gazeteer.gazetteer_cache import GazetteerCache
+from app.matching.matcher.gazeteer.gazetteer_executor import gazetteer_match_executor
 from app.matching.matcher.gazeteer.gazetteer_item_match import GazetteerItemMatch
 from app.matching.matcher.gazeteer.gazetteer_match_defaults import GazetteerMatchDefaults
 from app.matching.matcher.gazeteer.gazetteer_helper import normalize_extended_facility_id
@@ -74,13 +75,14 @@ class GazetteerMatcher(BaseMatcher):
         self.no_geocoded_items = False
         try:
             self.no_gazetteer_matches = False
-            gazetteer = self.get_gazetteer(messy)
-            return gazetteer.match(
-                messy,
-                threshold=self.gazetteer_threshold,
-                n_matches=None,
-                generator=True
-            )
+            with GazetteerCache.lock:
+                gazetteer = self.get_gazetteer(messy)
+                return list(gazetteer_match_executor.match(
+                    gazetteer,
+                    GazetteerCache.get_version(),
+                    messy,
+                    threshold=self.gazetteer_threshold
+                ))
         except NoCanonicalRecordsError:
             log.error('[Matching] Error: No canonical records')
             self.no_gazetteer_matches = True
@@ -102,14 +104,22 @@ class GazetteerMatcher(BaseMatcher):
         """
         item_matches = DefaultDict(list)
 
-        for matches in results:
-            for (messy_id, canon_id), score in matches:
-                if self.facility_exists(canon_id):
-                    item_matches[messy_id].append({
-                        'id': messy_id,
-                        'facility_id': canon_id, 
-                        'score': float(score)
-                        })
+        pairs = [
+            (messy_id, canon_id, score)
+            for matches in results
+            for (messy_id, canon_id), score in matches
+        ]
+        existing_ids = self.get_existing_facility_ids(
+            {canon_id for _, canon_id, _ in pairs}
+        )
+
+        for messy_id, canon_id, score in pairs:
+            if canon_id in existing_ids:
+                item_matches[messy_id].append({
+                    'id': messy_id,
+                    'facility_id': canon_id, 
+                    'score': float(score)
+                    })
 
         log.info('[Matching] Gazetteer match processing finished!')
         log.info(f'[Matching] Gazetteer matches result: {item_matches}')
@@ -123,8 +133,35 @@ class GazetteerMatcher(BaseMatcher):
         return gazetteer
 
     def facility_exists(self, canon_id: str) -> bool:
+        return canon_id in self.get_existing_facility_ids({canon_id})
+
+    def get_existing_facility_ids(self, canon_ids: Set[str]) -> Set[str]:
+        """
+        Returns the candidate IDs, extended or not, whose facility still
+        exists. The normalized IDs are checked with one query per
+        `facility_exists_batch_size` IDs.
+        """
+        canon_ids_by_facility_id = DefaultDict(set)
+        for canon_id in canon_ids:
+            facility_id = normalize_extended_facility_id(canon_id)
+            canon_ids_by_facility_id[facility_id].add(canon_id)
+
+        facility_ids = list(canon_ids_by_facility_id.keys())
+        if not facility_ids:
+            return set()
+
+        batch_size = settings.facility_exists_batch_size
+        existing_ids = set()
+
         with get_session() as session:
-            return session.query(exists().where(Facility.id==normalize_extended_facility_id(canon_id))).scalar()
+            for start in range(0, len(facility_ids), batch_size):
+                rows = session.query(Facility.id). \
+                    filter(Facility.id.in_(facility_ids[start:start + batch_size])). \
+                    all()
+                for row in rows:
+                    existing_ids.update(canon_ids_by_facility_id[row.id])
+
+        return existing_ids
 
     def get_results(self) -> ResultsDTO:
         return {
@@ -0,0 +1,117 @@
+import logging
+import os
+import pickle
+import tempfile
+from typing import Dict, Tuple, Union
+
+from dedupe import Gazetteer, StaticGazetteer
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE_NAME = 'gazetteer.snapshot'
+# Bump when the snapshot layout changes so that older files are ignored.
+SNAPSHOT_FORMAT = 1
+
+Snapshot = Tuple[StaticGazetteer, Union[int, None], Union[int, None]]
+
+
+def get_snapshot_path() -> str:
+    return os.path.join(settings.gazetteer_snapshot_dir, SNAPSHOT_FILE_NAME)
+
+
+def get_snapshot_metadata(
+    facility_version: Union[int, None],
+    match_version: Union[int, None]
+) -> Dict[str, Union[int, str, None]]:
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'dedupe_hub_version': settings.dedupe_hub_version,
+        'facility_version': facility_version,
+        'match_version': match_version,
+    }
+
+
+def save_gazetteer_snapshot(
+    gazetteer: Union[Gazetteer, StaticGazetteer],
+    facility_version: Union[int, None],
+    match_version: Union[int, None]
+) -> bool:
+    """
+    Write the trained model settings and the built index of the gazetteer to
+    local disk, tagged with the `HistoricalFacility` and
+    `HistoricalFacilityMatch` history_id watermarks it includes. The file is
+    written next to the previous snapshot and then renamed over it, so a
+    reader never sees a partial snapshot.
+    """
+    if not settings.gazetteer_snapshot_dir:
+        return False
+
+    try:
+        os.makedirs(settings.gazetteer_snapshot_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=settings.gazetteer_snapshot_dir,
+            prefix=f'{SNAPSHOT_FILE_NAME}.'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as snapshot_file:
+                pickle.dump(
+                    get_snapshot_metadata(facility_version, match_version),
+                    snapshot_file
+                )
+                gazetteer.writeSettings(snapshot_file, index=True)
+            os.replace(temp_path, get_snapshot_path())
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except Exception as e:
+        logger.error(f'[Matching] Gazetteer snapshot save error: {e}')
+        return False
+
+    logger.info(
+        f'Saved gazetteer snapshot at facility version {facility_version} '
+        f'and match version {match_version}'
+    )
+    return True
+
+
+def load_gazetteer_snapshot() -> Union[Snapshot, None]:
+    """
+    Load the gazetteer saved by `save_gazetteer_snapshot` together with its
+    history_id watermarks. Returns None if there is no usable snapshot for
+    this dedupe hub version.
+    """
+    if not settings.gazetteer_snapshot_dir:
+        return None
+
+    path = get_snapshot_path()
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as snapshot_file:
+            metadata = pickle.load(snapshot_file)
+            expected = get_snapshot_metadata(None, None)
+            if (
+                metadata.get('format') != expected['format']
+                or metadata.get('dedupe_hub_version')
+                != expected['dedupe_hub_version']
+            ):
+                logger.info('Ignoring gazetteer snapshot of another version')
+                return None
+            gazetteer = StaticGazetteer(snapshot_file)
+    except Exception as e:
+        logger.error(f'[Matching] Gazetteer snapshot load error: {e}')
+        return None
+
+    logger.info(
+        'Loaded gazetteer snapshot at facility version '
+        f'{metadata["facility_version"]} and match version '
+        f'{metadata["match_version"]}'
+    )
+    return (
+        gazetteer,
+        metadata['facility_version'],
+        metadata['match_version'],
+    )
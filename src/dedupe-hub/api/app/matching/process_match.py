@@ -21,7 +21,7 @@ class ProcessMatch:
         log.info(f'[Matching] Upcoming Data that will processing: {data}')
         processed_data = self._process_data(data)
         log.info(f'[Matching] Processed data: {processed_data}')
-        return self._write_data(processed_data)
+        return self._write_data(processed_data, data)
 
     def _read_data(self) -> FacilityListItemDict:
         return self.reader()
@@ -29,8 +29,9 @@ class ProcessMatch:
     def _process_data(self, data: FacilityListItemDict) -> List[FacilityMatchDTO]:
         return self.processor(data)
 
-    def _write_data(self, processed_data: List[FacilityMatchDTO]) -> List[FacilityMatchDTO]:
+    def _write_data(self, processed_data: List[FacilityMatchDTO], data: FacilityListItemDict) -> List[FacilityMatchDTO]:
         if self.writer:
-            return self.writer(processed_data)
+            # The writer also wakes the waiters of the items without matches.
+            return self.writer(processed_data, list(data))
         return []
 
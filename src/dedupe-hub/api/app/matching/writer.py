@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import Iterable, List, Set
 from sqlalchemy import text
 from app.database.models.source import Source
 from app.database.models.facility_list_item import FacilityListItem
@@ -15,53 +15,109 @@ class Writer:
         pass
 
     def write(
-        self, processed_data: List[FacilityMatchDTO]
+        self,
+        processed_data: List[FacilityMatchDTO],
+        item_ids: Iterable[int] = ()
     ) -> List[FacilityMatchDTO]:
         with get_session() as session:
-            matches = []
-            for match in processed_data:
-                facility_match = FacilityMatchTemp()
-                facility_match.facility_id = match['facility_id']
-                facility_match.confidence = float(match['confidence'])
-                facility_match.facility_list_item_id = match['facility_list_item_id']
-                facility_match.status = match['status']
-                facility_match.results = match['results']
-                facility_match.version = settings.dedupe_hub_version
-                facility_match.created_at = datetime.now()
-                facility_match.updated_at = datetime.now()
+            now = datetime.now()
+            temp_rows = [
+                {
+                    'facility_id': match['facility_id'],
+                    'confidence': float(match['confidence']),
+                    'facility_list_item_id': match['facility_list_item_id'],
+                    'status': match['status'],
+                    'results': match['results'],
+                    'is_active': True,
+                    'version': settings.dedupe_hub_version,
+                    'created_at': now,
+                    'updated_at': now,
+                }
+                for match in processed_data
+            ]
+            self._insert(session, FacilityMatchTemp, temp_rows)
 
-                session.add(facility_match)
-                session.commit()
-
-                if session.query(Source.create). \
-                join(
-                    FacilityListItem,
-                    FacilityListItem.id == match["facility_list_item_id"]
-                ). \
-                filter(Source.id==FacilityListItem.source_id).scalar():
-                    if settings.dedupe_hub_live:
-                        origin_facility_match = FacilityMatch()
-                        origin_facility_match.facility_id = match['facility_id']
-                        origin_facility_match.confidence = float(match['confidence'])
-                        origin_facility_match.facility_list_item_id = match['facility_list_item_id']
-                        origin_facility_match.status = match['status']
-                        origin_facility_match.results = match['results']
-                        origin_facility_match.created_at = datetime.now()
-                        origin_facility_match.updated_at = datetime.now()
+            if settings.dedupe_hub_live:
+                create_item_ids = self._get_create_item_ids(
+                    session, processed_data
+                )
+                origin_rows = [
+                    {
+                        'facility_id': match['facility_id'],
+                        'confidence': float(match['confidence']),
+                        'facility_list_item_id': match['facility_list_item_id'],
+                        'status': match['status'],
+                        'results': match['results'],
+                        'is_active': True,
+                        'origin_source': settings.instance_source,
+                        'created_at': now,
+                        'updated_at': now,
+                    }
+                    for match in processed_data
+                    if match['facility_list_item_id'] in create_item_ids
+                ]
+                self._insert(session, FacilityMatch, origin_rows)
 
-                        session.add(origin_facility_match)
-                        session.commit()
+            session.commit()
 
-                matches.append(facility_match)
-            
-            if len(matches) > 0 and settings.dedupe_hub_live:
-                ids = [f_m.facility_id for f_m in matches]
-                ids_set = { elem for elem in ids }
+            if len(processed_data) > 0 and settings.dedupe_hub_live:
+                ids_set = {match['facility_id'] for match in processed_data}
                 params = {'data': list(ids_set)}
                 sql = text('call index_facilities_by(:data);')
                 session.execute(sql, params)
                 session.commit()
-            
+
+            self._notify_matched(session, processed_data, item_ids)
+
             session.close()
 
             return processed_data
+
+    def _get_create_item_ids(
+        self, session, processed_data: List[FacilityMatchDTO]
+    ) -> Set[int]:
+        # Resolves Source.create for every list item of the batch at once.
+        item_ids = {match['facility_list_item_id'] for match in processed_data}
+        if not item_ids:
+            return set()
+        rows = session.query(FacilityListItem.id). \
+            join(Source, Source.id == FacilityListItem.source_id). \
+            filter(
+                FacilityListItem.id.in_(item_ids),
+                Source.create.is_(True),
+            ). \
+            all()
+        return {row.id for row in rows}
+
+    def _insert(self, session, model, rows: List[dict]):
+        # Multi-row INSERTs, so a list costs a few statements instead of a
+        # round trip and a commit per match.
+        batch_size = settings.writer_batch_size
+        for start in range(0, len(rows), batch_size):
+            session.execute(
+                model.__table__.insert().values(rows[start:start + batch_size])
+            )
+
+    def _notify_matched(
+        self,
+        session,
+        processed_data: List[FacilityMatchDTO],
+        item_ids: Iterable[int]
+    ):
+        # Wakes the Django requests waiting for the processed list items,
+        # with or without matches. Postgres delivers the notifications when
+        # the transaction commits, so only after everything above has been
+        # written.
+        notified_ids = set(item_ids) | {
+            match['facility_list_item_id'] for match in processed_data
+        }
+        if not notified_ids:
+            return
+        sql = text(
+            'SELECT pg_notify(:channel, id::text) FROM unnest(:ids) AS id;'
+        )
+        session.execute(sql, {
+            'channel': settings.match_notification_channel,
+            'ids': sorted(notified_ids),
+        })
+        session.commit()
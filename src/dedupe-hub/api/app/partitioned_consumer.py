@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from aiokafka.abc import ConsumerRebalanceListener
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[[bytes], Awaitable[bool]]
+
+
+class PartitionedConsumer:
+    """
+    Consumes every partition assigned to a consumer of a stable consumer
+    group, so that several dedupe hub replicas share the topic.
+
+    The messages of a partition are handled in order, and its offset is
+    committed after each message has been handled. Up to `max_concurrency`
+    partitions are handled at the same time. A partition is paused while its
+    messages are handled, so the consumer keeps polling, and with it stays in
+    the group, however long matching takes. A message whose handler fails is
+    redelivered up to `max_retries` times before it is skipped, whether the
+    handler returns False or raises.
+
+    A rebalance resumes the partitions that stay assigned and fetches them
+    again from the last committed offset. Such a batch is dropped while the
+    partition's task still runs, and the partition continues from where the
+    task stopped once it is done. The task of a revoked partition stops after
+    the message it is handling and is waited for before the partition is
+    given up. The handler runs matching in a thread that cannot be cancelled,
+    so giving up the partition earlier would let another replica match the
+    same uncommitted message again.
+    """
+
+    def __init__(
+        self,
+        consumer,
+        handler: Handler,
+        max_concurrency: int,
+        max_retries: int,
+        poll_timeout_ms: int = 1000
+    ):
+        self.consumer = consumer
+        self.handler = handler
+        self.max_retries = max_retries
+        self.poll_timeout_ms = poll_timeout_ms
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.tasks: Dict[Any, asyncio.Task] = {}
+        self.failures: Dict[Tuple[Any, int], int] = {}
+        # Partitions whose fetched batch was dropped while their task ran.
+        self.refetched = set()
+        # Partitions whose task stops after the message it is handling.
+        self.stopping = set()
+
+    def subscribe(self, topics: Iterable[str]):
+        self.consumer.subscribe(
+            topics=list(topics),
+            listener=PartitionRebalanceListener(self)
+        )
+
+    async def run(self):
+        try:
+            while True:
+                await self.poll()
+        finally:
+            await self.stop_tasks(list(self.tasks))
+            log.warning('Stopping consumer')
+            await self.consumer.stop()
+
+    async def poll(self):
+        batches = await self.consumer.getmany(timeout_ms=self.poll_timeout_ms)
+        for tp, messages in batches.items():
+            self.consumer.pause(tp)
+            if tp in self.tasks:
+                # A rebalance kept the partition assigned and resumed it.
+                log.info(
+                    f'[Consumer] Dropping batch of {tp}, which is still '
+                    f'being handled'
+                )
+                self.refetched.add(tp)
+                continue
+            self.tasks[tp] = asyncio.create_task(
+                self.handle_partition(tp, messages)
+            )
+
+        for tp, task in list(self.tasks.items()):
+            if task.done():
+                self.finish_task(tp, task, resume=True)
+
+    async def revoke(self, revoked: Iterable[Any]):
+        await self.stop_tasks(revoked)
+
+    async def stop_tasks(self, partitions: Iterable[Any]):
+        tasks = {tp: self.tasks[tp] for tp in partitions if tp in self.tasks}
+        if not tasks:
+            return
+
+        log.info(
+            f'[Consumer] Waiting for the tasks of partitions {list(tasks)} '
+            f'to finish their current message'
+        )
+        self.stopping.update(tasks)
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for tp, task in tasks.items():
+            self.stopping.discard(tp)
+            self.finish_task(tp, task, resume=False)
+
+    def finish_task(self, tp, task: asyncio.Task, resume: bool):
+        del self.tasks[tp]
+        refetched = tp in self.refetched
+        self.refetched.discard(tp)
+
+        next_offset = None
+        if task.cancelled():
+            log.warning(f'[Consumer] Cancelled the task of partition {tp}')
+        elif task.exception() is not None:
+            log.error(f'[Consumer] Partition {tp} failed: {task.exception()}')
+        else:
+            next_offset = task.result()
+
+        if not resume or tp not in self.consumer.assignment():
+            return
+        if refetched and next_offset is not None:
+            # Continue after the messages the task handled instead of from
+            # the batch dropped while it ran.
+            self.consumer.seek(tp, next_offset)
+        self.consumer.resume(tp)
+
+    async def handle_partition(self, tp, messages) -> Optional[int]:
+        """
+        Handle the messages in order and return the offset of the next
+        message to handle.
+        """
+        async with self.semaphore:
+            for message in messages:
+                if tp in self.stopping:
+                    return message.offset
+                if not await self.handle_message(tp, message):
+                    # Fetch the failed message again once the partition is
+                    # resumed.
+                    self.consumer.seek(tp, message.offset)
+                    return message.offset
+                await self.commit(tp, message.offset + 1)
+            return messages[-1].offset + 1 if messages else None
+
+    async def handle_message(self, tp, message) -> bool:
+        log.info(f'Consumed msg: {message}')
+        try:
+            handled = await self.handler(message.value)
+        except Exception as error:
+            # Counted as a failure, so the message is fetched again instead
+            # of being skipped with the rest of its batch.
+            log.error(
+                f'[Consumer] Handling msg at offset {message.offset} of '
+                f'{tp} failed: {error}'
+            )
+            handled = False
+
+        if handled:
+            self.failures.pop((tp, message.offset), None)
+            return True
+
+        attempts = self.failures.get((tp, message.offset), 0) + 1
+        if attempts > self.max_retries:
+            log.error(
+                f'[Consumer] Skipping msg at offset {message.offset} of '
+                f'{tp} after {attempts} attempts'
+            )
+            self.failures.pop((tp, message.offset), None)
+            return True
+
+        self.failures[(tp, message.offset)] = attempts
+        return False
+
+    async def commit(self, tp, offset: int):
+        try:
+            await self.consumer.commit({tp: offset})
+        except Exception as error:
+            # The partition was most likely reassigned to another replica,
+            # which continues from the last committed offset.
+            log.warning(f'[Consumer] Commit of {tp} failed: {error}')
+
+
+class PartitionRebalanceListener(ConsumerRebalanceListener):
+    def __init__(self, partitioned_consumer: PartitionedConsumer):
+        self.partitioned_consumer = partitioned_consumer
+
+    async def on_partitions_revoked(self, revoked):
+        await self.partitioned_consumer.revoke(revoked)
+
+    async def on_partitions_assigned(self, assigned):
+        pass
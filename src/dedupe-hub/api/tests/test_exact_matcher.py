@@ -0,0 +1,78 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.matching.matcher.exact.exact_matcher import ExactMatcher
+
+
+class TestExactMatcher(unittest.TestCase):
+    def setUp(self):
+        self.messy = {
+            "1": {"name": "test 1", "address": "address 1", "country": "cn"},
+            "2": {"name": "test 2", "address": "address 2", "country": "cn"},
+            "3": {"name": "test 1", "address": "address 1", "country": "CN"},
+        }
+        self.matched_rows = [
+            SimpleNamespace(
+                id=10,
+                facility_id="CN20241096SFEBA",
+                country_code="CN",
+                clean_name="test 1",
+                clean_address="address 1",
+            ),
+            SimpleNamespace(
+                id=11,
+                facility_id="CN20241096SFEBB",
+                country_code="CN",
+                clean_name="test 1",
+                clean_address="address 1",
+            ),
+        ]
+
+        self.session_patcher = patch(
+            'app.matching.matcher.exact.exact_matcher.get_session'
+        )
+        self.mock_get_session = self.session_patcher.start()
+        self.mock_session = MagicMock()
+        self.mock_get_session.return_value.__enter__.return_value = (
+            self.mock_session
+        )
+        self.mock_all = (
+            self.mock_session.query.return_value.filter.return_value
+            .order_by.return_value.all
+        )
+        self.mock_all.return_value = self.matched_rows
+
+        self.settings_patcher = patch(
+            'app.matching.matcher.exact.exact_matcher.settings'
+        )
+        self.mock_settings = self.settings_patcher.start()
+        self.mock_settings.exact_match_batch_size = 1000
+
+    def tearDown(self):
+        self.session_patcher.stop()
+        self.settings_patcher.stop()
+
+    def test_process_resolves_all_items_with_one_query(self):
+        result = ExactMatcher().process(self.messy)
+
+        self.assertEqual(self.mock_all.call_count, 1)
+        expected = [
+            {'id': 10, 'facility_id': "CN20241096SFEBA", 'score': '1'},
+            {'id': 11, 'facility_id': "CN20241096SFEBB", 'score': '1'},
+        ]
+        self.assertEqual(result["1"], expected)
+        self.assertEqual(result["3"], expected)
+        self.assertEqual(result["2"], [])
+
+    def test_process_queries_distinct_keys_in_batches(self):
+        self.mock_settings.exact_match_batch_size = 1
+
+        ExactMatcher().process(self.messy)
+
+        self.assertEqual(self.mock_all.call_count, 2)
+
+    def test_process_empty_messy_does_not_query(self):
+        result = ExactMatcher().process({})
+
+        self.assertEqual(result, {})
+        self.mock_all.assert_not_called()
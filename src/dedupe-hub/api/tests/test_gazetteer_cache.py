@@ -0,0 +1,164 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from app.matching.matcher.gazeteer.gazetteer_cache import GazetteerCache
+from app.matching.matcher.gazeteer.gazetteer_snapshot import (
+    load_gazetteer_snapshot,
+    save_gazetteer_snapshot,
+)
+
+
+class FakeGazetteer:
+    def __init__(self, data=b'model-and-index'):
+        self.data = data
+
+    def writeSettings(self, file_obj, index=False):
+        pickle.dump((self.data, index), file_obj)
+
+
+def fake_static_gazetteer(file_obj):
+    data, _ = pickle.load(file_obj)
+    return FakeGazetteer(data)
+
+
+class TestGazetteerSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+
+        self.settings_patcher = patch(
+            'app.matching.matcher.gazeteer.gazetteer_snapshot.settings'
+        )
+        self.mock_settings = self.settings_patcher.start()
+        self.mock_settings.gazetteer_snapshot_dir = self.snapshot_dir.name
+        self.mock_settings.dedupe_hub_version = '1'
+
+        self.static_patcher = patch(
+            'app.matching.matcher.gazeteer.gazetteer_snapshot.StaticGazetteer',
+            side_effect=fake_static_gazetteer
+        )
+        self.static_patcher.start()
+
+    def tearDown(self):
+        self.settings_patcher.stop()
+        self.static_patcher.stop()
+        self.snapshot_dir.cleanup()
+
+    def test_loads_saved_gazetteer_with_watermarks(self):
+        self.assertTrue(save_gazetteer_snapshot(FakeGazetteer(), 10, 20))
+
+        gazetteer, facility_version, match_version = load_gazetteer_snapshot()
+
+        self.assertEqual(gazetteer.data, b'model-and-index')
+        self.assertEqual(facility_version, 10)
+        self.assertEqual(match_version, 20)
+        self.assertEqual(os.listdir(self.snapshot_dir.name),
+                         ['gazetteer.snapshot'])
+
+    def test_ignores_snapshot_of_another_version(self):
+        save_gazetteer_snapshot(FakeGazetteer(), 10, 20)
+        self.mock_settings.dedupe_hub_version = '2'
+
+        self.assertIsNone(load_gazetteer_snapshot())
+
+    def test_ignores_missing_snapshot(self):
+        self.assertIsNone(load_gazetteer_snapshot())
+
+    def test_keeps_previous_snapshot_when_save_fails(self):
+        save_gazetteer_snapshot(FakeGazetteer(b'previous'), 10, 20)
+        broken = FakeGazetteer()
+        broken.writeSettings = MagicMock(side_effect=IOError('disk full'))
+
+        self.assertFalse(save_gazetteer_snapshot(broken, 11, 21))
+
+        gazetteer, facility_version, _ = load_gazetteer_snapshot()
+        self.assertEqual(gazetteer.data, b'previous')
+        self.assertEqual(facility_version, 10)
+        self.assertEqual(os.listdir(self.snapshot_dir.name),
+                         ['gazetteer.snapshot'])
+
+    def test_disabled_without_snapshot_dir(self):
+        self.mock_settings.gazetteer_snapshot_dir = ''
+
+        self.assertFalse(save_gazetteer_snapshot(FakeGazetteer(), 10, 20))
+        self.assertIsNone(load_gazetteer_snapshot())
+
+
+class TestGazetteerCache(unittest.TestCase):
+    def setUp(self):
+        GazetteerCache._gazetter = None
+        GazetteerCache._facility_version = None
+        GazetteerCache._match_version = None
+        GazetteerCache._snapshot_saved_at = None
+
+        module = 'app.matching.matcher.gazeteer.gazetteer_cache'
+        self.load_patcher = patch(f'{module}.load_gazetteer_snapshot')
+        self.mock_load = self.load_patcher.start()
+        self.save_patcher = patch(f'{module}.save_gazetteer_snapshot')
+        self.mock_save = self.save_patcher.start()
+        self.mock_save.return_value = True
+        self.rebuild_patcher = patch.object(
+            GazetteerCache, '_rebuild_gazetteer'
+        )
+        self.mock_rebuild = self.rebuild_patcher.start()
+        self.facility_history_patcher = patch.object(
+            GazetteerCache, '_get_new_facility_history',
+            return_value=([], {})
+        )
+        self.mock_facility_history = self.facility_history_patcher.start()
+        self.match_history_patcher = patch.object(
+            GazetteerCache, '_get_new_match_history',
+            return_value=([], {}, {})
+        )
+        self.match_history_patcher.start()
+        self.settings_patcher = patch(f'{module}.settings')
+        self.mock_settings = self.settings_patcher.start()
+        self.mock_settings.gazetteer_snapshot_interval_seconds = 600
+
+    def tearDown(self):
+        self.load_patcher.stop()
+        self.save_patcher.stop()
+        self.rebuild_patcher.stop()
+        self.facility_history_patcher.stop()
+        self.match_history_patcher.stop()
+        self.settings_patcher.stop()
+        GazetteerCache._gazetter = None
+
+    def test_rebuilds_without_snapshot(self):
+        self.mock_load.return_value = None
+
+        GazetteerCache.get_latest()
+
+        self.mock_rebuild.assert_called_once()
+
+    def test_replays_history_after_snapshot(self):
+        gazetteer = MagicMock()
+        self.mock_load.return_value = (gazetteer, 10, 20)
+        record = {11: {'country': 'cn', 'name': 'a', 'address': 'b'}}
+        self.mock_facility_history.return_value = (
+            [{'id': 11, 'history_type': '~', 'history_id': 12}],
+            {11: record},
+        )
+
+        result = GazetteerCache.get_latest()
+
+        self.assertIs(result, gazetteer)
+        self.mock_rebuild.assert_not_called()
+        gazetteer.index.assert_called_once_with(record)
+        self.assertEqual(GazetteerCache._facility_version, 12)
+        self.assertEqual(GazetteerCache._match_version, 20)
+
+    def test_throttles_snapshots_after_replay(self):
+        gazetteer = MagicMock()
+        self.mock_load.return_value = (gazetteer, 10, 20)
+        self.mock_facility_history.return_value = (
+            [{'id': 11, 'history_type': '-', 'history_id': 12}], {}
+        )
+
+        GazetteerCache.get_latest()
+        self.mock_save.assert_not_called()
+
+        self.mock_settings.gazetteer_snapshot_interval_seconds = 0
+        GazetteerCache.get_latest()
+        self.mock_save.assert_called_once_with(gazetteer, 12, 20)
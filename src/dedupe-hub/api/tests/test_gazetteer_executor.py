@@ -0,0 +1,120 @@
+import os
+import unittest
+from unittest.mock import patch
+from app.matching.matcher.gazeteer.gazetteer_executor import (
+    GazetteerMatchExecutor,
+    match_gazetteer,
+    shard_by_country,
+)
+
+
+class FakeGazetteer:
+    """Matches every messy record with a canonical ID of the same country."""
+
+    num_cores = 4
+
+    def match(self, messy, threshold=0.5, n_matches=1, generator=False):
+        if not messy:
+            raise ValueError('No records to match')
+        return (
+            [((item_id, f"{record['country']}-{os.getpid()}"), 0.9)]
+            for item_id, record in messy.items()
+        )
+
+
+class TestShardByCountry(unittest.TestCase):
+    def test_shards_hold_a_single_country(self):
+        messy = {
+            '1': {'country': 'cn', 'name': 'a', 'address': 'a'},
+            '2': {'country': 'us', 'name': 'b', 'address': 'b'},
+            '3': {'country': 'cn', 'name': 'c', 'address': 'c'},
+        }
+
+        shards = shard_by_country(messy, 500)
+
+        self.assertEqual(
+            sorted(sorted(shard.keys()) for shard in shards),
+            [['1', '3'], ['2']]
+        )
+
+    def test_splits_large_countries(self):
+        messy = {
+            str(i): {'country': 'cn', 'name': 'a', 'address': 'a'}
+            for i in range(5)
+        }
+
+        shards = shard_by_country(messy, 2)
+
+        self.assertEqual([len(shard) for shard in shards], [2, 2, 1])
+
+
+class TestMatchGazetteer(unittest.TestCase):
+    def test_returns_no_matches_when_nothing_shares_a_block(self):
+        self.assertEqual(match_gazetteer(FakeGazetteer(), {}, 0.5), [])
+
+    def test_raises_other_errors(self):
+        class BrokenGazetteer(FakeGazetteer):
+            def match(self, *args, **kwargs):
+                raise ValueError('Bad record')
+
+        messy = {'1': {'country': 'cn', 'name': 'a', 'address': 'a'}}
+
+        with self.assertRaises(ValueError):
+            match_gazetteer(BrokenGazetteer(), messy, 0.5)
+
+
+class TestGazetteerMatchExecutor(unittest.TestCase):
+    def setUp(self):
+        self.settings_patcher = patch(
+            'app.matching.matcher.gazeteer.gazetteer_executor.settings'
+        )
+        self.mock_settings = self.settings_patcher.start()
+        self.mock_settings.gazetteer_match_processes = 2
+        self.mock_settings.gazetteer_match_shard_size = 2
+        self.executor = GazetteerMatchExecutor()
+        self.messy = {
+            str(i): {'country': country, 'name': 'a', 'address': 'a'}
+            for i, country in enumerate(['cn', 'cn', 'cn', 'us', 'in'])
+        }
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.settings_patcher.stop()
+
+    def test_matches_shards_in_worker_processes(self):
+        matches = list(
+            self.executor.match(FakeGazetteer(), (1, 1), self.messy, 0.5)
+        )
+
+        self.assertEqual(
+            sorted(match[0][0][0] for match in matches),
+            ['0', '1', '2', '3', '4']
+        )
+        for match in matches:
+            (messy_id, canon_id), score = match[0]
+            self.assertTrue(
+                canon_id.startswith(self.messy[messy_id]['country'])
+            )
+            self.assertNotEqual(canon_id.split('-')[1], str(os.getpid()))
+            self.assertEqual(score, 0.9)
+
+    def test_reuses_pool_until_gazetteer_changes(self):
+        gazetteer = FakeGazetteer()
+
+        list(self.executor.match(gazetteer, (1, 1), self.messy, 0.5))
+        pool = self.executor._pool
+        list(self.executor.match(gazetteer, (1, 1), self.messy, 0.5))
+        self.assertIs(self.executor._pool, pool)
+
+        list(self.executor.match(gazetteer, (2, 1), self.messy, 0.5))
+        self.assertIsNot(self.executor._pool, pool)
+
+    def test_matches_single_shard_in_process(self):
+        messy = {'1': {'country': 'cn', 'name': 'a', 'address': 'a'}}
+
+        matches = list(
+            self.executor.match(FakeGazetteer(), (1, 1), messy, 0.5)
+        )
+
+        self.assertEqual(matches, [[(('1', f'cn-{os.getpid()}'), 0.9)]])
+        self.assertIsNone(self.executor._pool)
@@ -0,0 +1,80 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.matching.matcher.gazeteer.gazetteer_matcher import GazetteerMatcher
+
+
+class TestGazetteerMatcher(unittest.TestCase):
+    def setUp(self):
+        self.results = iter([
+            [
+                (("1", "CN20241096SFEBA"), 0.9),
+                (("1", "CN20241096SFEBB_MATCH-12"), 0.8),
+            ],
+            [
+                (("2", "CN20241096SFEBC"), 0.7),
+                (("2", "CN20241096SFEBA_MATCH-13"), 0.6),
+            ],
+        ])
+
+        self.session_patcher = patch(
+            'app.matching.matcher.gazeteer.gazetteer_matcher.get_session'
+        )
+        self.mock_get_session = self.session_patcher.start()
+        self.mock_session = MagicMock()
+        self.mock_get_session.return_value.__enter__.return_value = (
+            self.mock_session
+        )
+        self.mock_all = (
+            self.mock_session.query.return_value.filter.return_value.all
+        )
+        # CN20241096SFEBB was merged away after the gazetteer was built.
+        self.mock_all.return_value = [
+            SimpleNamespace(id="CN20241096SFEBA"),
+            SimpleNamespace(id="CN20241096SFEBC"),
+        ]
+
+        self.settings_patcher = patch(
+            'app.matching.matcher.gazeteer.gazetteer_matcher.settings'
+        )
+        self.mock_settings = self.settings_patcher.start()
+        self.mock_settings.facility_exists_batch_size = 10000
+
+    def tearDown(self):
+        self.session_patcher.stop()
+        self.settings_patcher.stop()
+
+    def test_filter_matches_checks_all_candidates_with_one_query(self):
+        item_matches = GazetteerMatcher().filter_matches(self.results)
+
+        self.assertEqual(self.mock_all.call_count, 1)
+        self.assertEqual(item_matches["1"], [
+            {'id': "1", 'facility_id': "CN20241096SFEBA", 'score': 0.9},
+        ])
+        self.assertEqual(item_matches["2"], [
+            {'id': "2", 'facility_id': "CN20241096SFEBC", 'score': 0.7},
+            {
+                'id': "2",
+                'facility_id': "CN20241096SFEBA_MATCH-13",
+                'score': 0.6,
+            },
+        ])
+
+    def test_filter_matches_queries_in_batches(self):
+        self.mock_settings.facility_exists_batch_size = 2
+
+        GazetteerMatcher().filter_matches(self.results)
+
+        self.assertEqual(self.mock_all.call_count, 2)
+
+    def test_filter_matches_without_candidates_does_not_query(self):
+        item_matches = GazetteerMatcher().filter_matches(iter([]))
+
+        self.assertEqual(item_matches, {})
+        self.mock_all.assert_not_called()
+
+    def test_facility_exists(self):
+        self.assertTrue(
+            GazetteerMatcher().facility_exists("CN20241096SFEBA_MATCH-13")
+        )
+        self.assertFalse(GazetteerMatcher().facility_exists("CN20241096SFEBB"))
@@ -0,0 +1,220 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from app.partitioned_consumer import PartitionedConsumer
+
+
+class FakeConsumer:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.paused = set()
+        self.committed = {}
+        self.seeks = []
+
+    async def getmany(self, timeout_ms=0):
+        await asyncio.sleep(0)
+        if not self.batches:
+            return {}
+        # Paused partitions are only fetched once they are resumed.
+        batch = {
+            tp: messages for tp, messages in self.batches[0].items()
+            if tp not in self.paused
+        }
+        for tp in batch:
+            del self.batches[0][tp]
+        if not self.batches[0]:
+            self.batches.pop(0)
+        return batch
+
+    def assignment(self):
+        return {'p0', 'p1'}
+
+    def pause(self, tp):
+        self.paused.add(tp)
+
+    def resume(self, tp):
+        self.paused.discard(tp)
+
+    def seek(self, tp, offset):
+        self.seeks.append((tp, offset))
+
+    async def commit(self, offsets):
+        self.committed.update(offsets)
+
+
+def message(offset, value):
+    return SimpleNamespace(offset=offset, value=value)
+
+
+class TestPartitionedConsumer(unittest.TestCase):
+    def run_polls(self, partitioned_consumer, polls):
+        async def run():
+            for _ in range(polls):
+                await partitioned_consumer.poll()
+                await asyncio.sleep(0)
+        asyncio.run(run())
+
+    def test_commits_each_partition_after_handling(self):
+        handled = []
+
+        async def handler(value):
+            handled.append(value)
+            return True
+
+        consumer = FakeConsumer([{
+            'p0': [message(0, b'1'), message(1, b'2')],
+            'p1': [message(7, b'3')],
+        }])
+        partitioned_consumer = PartitionedConsumer(
+            consumer, handler, max_concurrency=2, max_retries=3
+        )
+
+        self.run_polls(partitioned_consumer, 3)
+
+        self.assertEqual(sorted(handled), [b'1', b'2', b'3'])
+        self.assertEqual(consumer.committed, {'p0': 2, 'p1': 8})
+        self.assertEqual(consumer.paused, set())
+
+    def test_keeps_partition_paused_while_handling(self):
+        consumer = FakeConsumer([{'p0': [message(0, b'1')]}])
+
+        async def run():
+            done = asyncio.Event()
+
+            async def handler(value):
+                await done.wait()
+                return True
+
+            partitioned_consumer = PartitionedConsumer(
+                consumer, handler, max_concurrency=1, max_retries=3
+            )
+            await partitioned_consumer.poll()
+            await partitioned_consumer.poll()
+            self.assertEqual(consumer.paused, {'p0'})
+            self.assertEqual(consumer.committed, {})
+
+            done.set()
+            await asyncio.sleep(0)
+            await partitioned_consumer.poll()
+
+        asyncio.run(run())
+
+        self.assertEqual(consumer.paused, set())
+        self.assertEqual(consumer.committed, {'p0': 1})
+
+    def test_redelivers_failed_message_then_skips_it(self):
+        async def handler(value):
+            return value != b'bad'
+
+        consumer = FakeConsumer([
+            {'p0': [message(0, b'1'), message(1, b'bad')]},
+            {'p0': [message(1, b'bad'), message(2, b'2')]},
+        ])
+        partitioned_consumer = PartitionedConsumer(
+            consumer, handler, max_concurrency=1, max_retries=1
+        )
+
+        self.run_polls(partitioned_consumer, 3)
+
+        self.assertEqual(consumer.seeks, [('p0', 1)])
+        self.assertEqual(consumer.committed, {'p0': 3})
+
+    def test_redelivers_message_whose_handler_raises(self):
+        attempts = []
+
+        async def handler(value):
+            attempts.append(value)
+            if value == b'bad' and len(attempts) < 3:
+                raise RuntimeError('Matching failed')
+            return True
+
+        consumer = FakeConsumer([
+            {'p0': [message(0, b'bad'), message(1, b'2')]},
+            {'p0': [message(0, b'bad'), message(1, b'2')]},
+            {'p0': [message(0, b'bad'), message(1, b'2')]},
+        ])
+        partitioned_consumer = PartitionedConsumer(
+            consumer, handler, max_concurrency=1, max_retries=3
+        )
+
+        self.run_polls(partitioned_consumer, 6)
+
+        self.assertEqual(consumer.seeks, [('p0', 0), ('p0', 0)])
+        self.assertEqual(attempts, [b'bad', b'bad', b'bad', b'2'])
+        self.assertEqual(consumer.committed, {'p0': 2})
+        self.assertEqual(consumer.paused, set())
+
+    def test_drops_batch_refetched_while_partition_is_handled(self):
+        handled = []
+        consumer = FakeConsumer([
+            {'p0': [message(0, b'1'), message(1, b'2')]},
+            # A rebalance kept p0 and fetched it from the committed offset.
+            {'p0': [message(1, b'2')]},
+        ])
+
+        async def run():
+            done = asyncio.Event()
+
+            async def handler(value):
+                if value == b'2':
+                    await done.wait()
+                handled.append(value)
+                return True
+
+            partitioned_consumer = PartitionedConsumer(
+                consumer, handler, max_concurrency=1, max_retries=3
+            )
+            await partitioned_consumer.poll()
+            await asyncio.sleep(0)
+            consumer.paused.clear()
+            await partitioned_consumer.poll()
+            self.assertEqual(consumer.paused, {'p0'})
+            self.assertEqual(len(partitioned_consumer.tasks), 1)
+
+            done.set()
+            await asyncio.sleep(0)
+            await partitioned_consumer.poll()
+
+        asyncio.run(run())
+
+        self.assertEqual(handled, [b'1', b'2'])
+        self.assertEqual(consumer.seeks, [('p0', 2)])
+        self.assertEqual(consumer.committed, {'p0': 2})
+        self.assertEqual(consumer.paused, set())
+
+    def test_waits_for_current_message_of_revoked_partitions(self):
+        handled = []
+        consumer = FakeConsumer([{
+            'p0': [message(0, b'1'), message(1, b'2')],
+            'p1': [message(0, b'3')],
+        }])
+
+        async def run():
+            started = asyncio.Event()
+            done = asyncio.Event()
+
+            async def handler(value):
+                if value == b'1':
+                    started.set()
+                    await done.wait()
+                handled.append(value)
+                return True
+
+            partitioned_consumer = PartitionedConsumer(
+                consumer, handler, max_concurrency=2, max_retries=3
+            )
+            await partitioned_consumer.poll()
+            await started.wait()
+            revoke = asyncio.create_task(partitioned_consumer.revoke(['p0']))
+            await asyncio.sleep(0)
+            self.assertFalse(revoke.done())
+
+            done.set()
+            await revoke
+            self.assertNotIn('p0', partitioned_consumer.tasks)
+
+        asyncio.run(run())
+
+        # p0 stops after the message it was handling when it was revoked.
+        self.assertNotIn(b'2', handled)
+        self.assertEqual(consumer.committed['p0'], 1)
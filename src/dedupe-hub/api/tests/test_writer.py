@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from app.matching.writer import Writer
+
+
+class TestWriter(unittest.TestCase):
+    def setUp(self):
+        self.processed_data = [
+            {
+                "facility_id": "CN20241096SFEBA",
+                "confidence": 1.0,
+                "facility_list_item_id": 1,
+                "status": "AUTOMATIC",
+                "results": {}
+            },
+            {
+                "facility_id": "CN20241096SFEBB",
+                "confidence": 0.6,
+                "facility_list_item_id": 2,
+                "status": "PENDING",
+                "results": {}
+            },
+            {
+                "facility_id": "CN20241096SFEBC",
+                "confidence": 0.6,
+                "facility_list_item_id": 2,
+                "status": "PENDING",
+                "results": {}
+            },
+        ]
+
+        self.session_patcher = patch('app.matching.writer.get_session')
+        self.mock_get_session = self.session_patcher.start()
+        self.mock_session = MagicMock()
+        self.mock_get_session.return_value.__enter__.return_value = (
+            self.mock_session
+        )
+
+        self.settings_patcher = patch('app.matching.writer.settings')
+        self.mock_settings = self.settings_patcher.start()
+        self.mock_settings.dedupe_hub_live = False
+        self.mock_settings.match_notification_channel = 'matched'
+        self.mock_settings.writer_batch_size = 1000
+        self.mock_settings.dedupe_hub_version = '1.0.0'
+        self.mock_settings.instance_source = 'os_hub'
+
+        # Only list item 1 belongs to a source that creates facilities.
+        create_item = MagicMock()
+        create_item.id = 1
+        self.mock_session.query.return_value.join.return_value. \
+            filter.return_value.all.return_value = [create_item]
+
+    def tearDown(self):
+        self.session_patcher.stop()
+        self.settings_patcher.stop()
+
+    def get_inserts(self, table_name):
+        return [
+            call.args[0]
+            for call in self.mock_session.execute.call_args_list
+            if getattr(call.args[0], 'table', None) is not None
+            and call.args[0].table.name == table_name
+        ]
+
+    def get_inserted_item_ids(self, table_name):
+        return [
+            row['facility_list_item_id']
+            for insert in self.get_inserts(table_name)
+            for row in insert._multi_values[0]
+        ]
+
+    def get_procedure_calls(self):
+        return [
+            call
+            for call in self.mock_session.execute.call_args_list
+            if 'index_facilities_by' in str(call.args[0])
+        ]
+
+    def get_notify_calls(self):
+        return [
+            call
+            for call in self.mock_session.execute.call_args_list
+            if 'pg_notify' in str(call.args[0])
+        ]
+
+    def get_notified_payloads(self):
+        return [
+            item_id
+            for call in self.get_notify_calls()
+            for item_id in call.args[1]['ids']
+        ]
+
+    def test_notifies_each_list_item_once_in_one_statement(self):
+        result = Writer().write(self.processed_data)
+
+        self.assertEqual(result, self.processed_data)
+        self.assertEqual(len(self.get_notify_calls()), 1)
+        self.assertEqual(self.get_notified_payloads(), [1, 2])
+
+    def test_notifies_list_items_without_matches(self):
+        Writer().write(self.processed_data, [1, 2, 3])
+
+        self.assertEqual(self.get_notified_payloads(), [1, 2, 3])
+
+    def test_inserts_temp_matches_in_one_statement(self):
+        Writer().write(self.processed_data)
+
+        self.assertEqual(len(self.get_inserts('api_facilitymatchtemp')), 1)
+        self.assertEqual(
+            self.get_inserted_item_ids('api_facilitymatchtemp'), [1, 2, 2]
+        )
+        self.assertEqual(self.get_inserts('api_facilitymatch'), [])
+        self.assertEqual(self.get_procedure_calls(), [])
+
+    def test_splits_inserts_into_batches(self):
+        self.mock_settings.writer_batch_size = 2
+
+        Writer().write(self.processed_data)
+
+        self.assertEqual(len(self.get_inserts('api_facilitymatchtemp')), 2)
+
+    def test_live_writes_origin_matches_for_create_sources_only(self):
+        self.mock_settings.dedupe_hub_live = True
+
+        Writer().write(self.processed_data)
+
+        self.assertEqual(
+            self.get_inserted_item_ids('api_facilitymatch'), [1]
+        )
+        self.mock_session.query.assert_called_once()
+        procedure_calls = self.get_procedure_calls()
+        self.assertEqual(len(procedure_calls), 1)
+        self.assertEqual(
+            sorted(procedure_calls[0].args[1]['data']),
+            ['CN20241096SFEBA', 'CN20241096SFEBB', 'CN20241096SFEBC'],
+        )
+
+    def test_does_not_notify_without_list_items(self):
+        Writer().write([])
+
+        self.assertEqual(self.get_notified_payloads(), [])
@@ -244,6 +244,17 @@ class PaginationConfig:
     MAX_PAGE_SIZE = 250
 
 
+class FacilitiesDownloadExportConfig:
+    # Rows fetched per round trip of the server-side cursor and written per
+    # chunk of the streamed response.
+    CHUNK_SIZE = 2000
+    CSV = 'csv'
+    XLSX = 'xlsx'
+    FILE_FORMATS = (CSV, XLSX)
+    FILE_NAME = 'facilities'
+    XLSX_SHEET_NAME = 'facilities'
+
+
 # API v1
 class APIV1CommonErrorMessages:
     COMMON_REQ_BODY_ERROR = 'The request body is invalid.'
@@ -326,6 +337,18 @@ PARTNER_FIELD_LIST_CACHE_TTL_SECONDS = 60
 MASKED_CONTRIBUTOR_IDS_CACHE_KEY = 'masked_contributor_ids'
 MASKED_CONTRIBUTOR_IDS_CACHE_TTL_SECONDS = 60
 
+# Cache key (formatted with the contributor ID) + TTL (seconds) for the embed
+# settings of a contributor. See api/services/embed_context.py.
+EMBED_CONTEXT_CACHE_KEY = 'embed_context_{contributor_id}'
+EMBED_CONTEXT_CACHE_TTL_SECONDS = 60 * 10
+
+# Cache key (formatted with a hash of the token) + TTLs (seconds) for the
+# user, contributor and API block of an API token, shared by every process
+# and kept in each process. See api/token_meter.py.
+TOKEN_METER_CACHE_KEY = 'token_meter_{token_hash}'
+TOKEN_METER_CACHE_TTL_SECONDS = 60
+TOKEN_METER_LOCAL_TTL_SECONDS = 5
+
 # Label shown in place of a masked contributor's name in paid products. The
 # real contributor type (e.g. Union) is replaced by this neutral label in the
 # response only; the stored `Contributor.contrib_type` is never changed.
@@ -145,7 +145,9 @@ def all_values_empty(value):
     return False
 
 
-def create_extendedfield(field, field_value, item, contributor):
+def build_extendedfield(field, field_value, item, contributor):
+    """Return the unsaved ExtendedField for a raw field value, or None if
+    the value is empty."""
     if field_value is not None and field_value != "" \
             and not all_values_empty(field_value):
         if field == ExtendedField.NUMBER_OF_WORKERS:
@@ -177,16 +179,24 @@ def create_extendedfield(field, field_value, item, contributor):
         elif field == ExtendedField.ISIC_4:
             normalized_isic = get_isic_4_extendedfield_value(field_value)
             if not normalized_isic.get('raw_value'):
-                return
+                return None
             field_value = normalized_isic
 
-        ExtendedField.objects.create(
+        return ExtendedField(
             contributor=contributor,
             facility_list_item=item,
             field_name=field,
             value=field_value
         )
 
+    return None
+
+
+def create_extendedfield(field, field_value, item, contributor):
+    extended_field = build_extendedfield(field, field_value, item, contributor)
+    if extended_field is not None:
+        extended_field.save()
+
 
 OBJECT_FIELD_TYPE = "object"
 
@@ -245,6 +255,21 @@ def create_extendedfields_for_single_item(
         create_extendedfield(field, field_value, item, contributor)
 
 
+def build_extendedfields_for_single_item(item, raw_data):
+    """Return the unsaved ExtendedFields of a list item that may not be
+    saved yet, for callers inserting them in bulk."""
+    contributor = item.source.contributor
+
+    return [
+        extended_field
+        for extended_field in (
+            build_extendedfield(field, raw_data.get(field), item, contributor)
+            for field in RAW_DATA_FIELDS
+        )
+        if extended_field is not None
+    ]
+
+
 def create_partner_extendedfields_for_single_item(
     item,
     raw_data
@@ -1,4 +1,6 @@
+from django.http import FileResponse, StreamingHttpResponse
 from rest_framework import viewsets, mixins
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from waffle import switch_is_active
 
@@ -9,8 +11,10 @@ from api.serializers.facility.facility_download_serializer_embed_mode import \
     FacilityDownloadSerializerEmbedMode
 from api.serializers.utils import get_embed_contributor_id_from_query_params
 from api.services.facilities_download_service import FacilitiesDownloadService
+from api.services.facilities_download_export_service import \
+    FacilitiesDownloadExportService
 from api.serializers.facility.utils import is_same_contributor_from_url_param
-from api.constants import PaginationConfig
+from api.constants import FacilitiesDownloadExportConfig, PaginationConfig
 from api.services.contributor_masking_policy import ContributorMaskingPolicy
 
 
@@ -76,14 +80,8 @@ class FacilitiesDownloadViewSet(
         limit = None
         is_same_contributor = is_same_contributor_from_url_param(request)
 
-        if (
-            is_first_page or is_last_page
-        ) and (
-            not switch_is_active('private_instance')
-            and not self.__is_embed_mode()
-            and not is_same_contributor
-        ):
-            limit = FacilitiesDownloadService.get_download_limit(request)
+        if is_first_page or is_last_page:
+            limit = self.__get_download_limit(request, is_same_contributor)
 
         list_serializer = self.get_serializer(items)
         rows = [facility_data['row'] for facility_data in list_serializer.data]
@@ -118,22 +116,93 @@ class FacilitiesDownloadViewSet(
             and not is_same_contributor
         ):
             # Charge for the full result set, not just the last page size
-            returned_count = base_qs.count()
-
-            prev_free_amount = getattr(limit, 'free_download_records', 0)
-            prev_paid_amount = getattr(limit, 'paid_download_records', 0)
-
-            FacilitiesDownloadService.register_download_if_needed(
+            self.__register_download(
+                request,
                 limit,
-                returned_count,
+                base_qs.count(),
                 is_same_contributor
             )
-            if returned_count:
-                FacilitiesDownloadService.send_email_if_needed(
-                    request,
-                    limit,
-                    prev_free_amount,
-                    prev_paid_amount
-                )
 
         return Response(payload)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Return the whole download as a single CSV (streamed) or XLSX file,
+        chosen by the `file_format` query param, instead of page by page.
+        """
+        FacilitiesDownloadService.check_if_downloads_are_blocked()
+        FacilitiesDownloadService.validate_query_params(request)
+        file_format = FacilitiesDownloadExportService.get_file_format(request)
+        FacilitiesDownloadService.log_request(request)
+
+        base_qs = FacilitiesDownloadService.get_filtered_queryset(request)
+        is_same_contributor = is_same_contributor_from_url_param(request)
+        limit = self.__get_download_limit(request, is_same_contributor)
+
+        count = base_qs.count()
+        FacilitiesDownloadService.enforce_limits(count, limit)
+        # Charged before the file is written, as a streamed response can be
+        # consumed without ever reaching its last row.
+        self.__register_download(request, limit, count, is_same_contributor)
+
+        serializer = self.get_serializer([]).child
+        headers = serializer.get_headers()
+        rows = FacilitiesDownloadExportService.iter_rows(serializer, base_qs)
+        file_name = FacilitiesDownloadExportConfig.FILE_NAME
+
+        if file_format == FacilitiesDownloadExportConfig.XLSX:
+            xlsx_file = \
+                FacilitiesDownloadExportService.write_xlsx(headers, rows)
+            return FileResponse(
+                xlsx_file,
+                as_attachment=True,
+                filename=f'{file_name}.xlsx',
+                content_type=(
+                    'application/vnd.openxmlformats-officedocument'
+                    '.spreadsheetml.sheet'
+                ),
+            )
+
+        response = StreamingHttpResponse(
+            FacilitiesDownloadExportService.stream_csv(headers, rows),
+            content_type='text/csv; charset=utf-8',
+        )
+        response['Content-Disposition'] = \
+            f'attachment; filename="{file_name}.csv"'
+        return response
+
+    def __get_download_limit(self, request, is_same_contributor):
+        if (
+            switch_is_active('private_instance')
+            or self.__is_embed_mode()
+            or is_same_contributor
+        ):
+            return None
+        return FacilitiesDownloadService.get_download_limit(request)
+
+    @staticmethod
+    def __register_download(
+        request,
+        limit,
+        returned_count,
+        is_same_contributor
+    ):
+        if not limit or is_same_contributor:
+            return
+
+        prev_free_amount = getattr(limit, 'free_download_records', 0)
+        prev_paid_amount = getattr(limit, 'paid_download_records', 0)
+
+        FacilitiesDownloadService.register_download_if_needed(
+            limit,
+            returned_count,
+            is_same_contributor
+        )
+        if returned_count:
+            FacilitiesDownloadService.send_email_if_needed(
+                request,
+                limit,
+                prev_free_amount,
+                prev_paid_amount
+            )
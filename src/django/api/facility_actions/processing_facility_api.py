@@ -6,7 +6,7 @@ from typing import Any, Dict, List, Union
 from api.constants import APIErrorMessages, ProcessingAction
 from api.extended_fields import create_extendedfields_for_single_item
 from api.facility_actions.processing_facility import ProcessingFacility
-from api.geocoding import geocode_address
+from api.geocoding import geocode_address_with_cache_hit
 from api.kafka_producer import produce_message_match_process
 from api.models.contributor.contributor import Contributor
 from api.models.facility.facility_list_item import FacilityListItem
@@ -110,10 +110,12 @@ class ProcessingFacilityAPI(ProcessingFacility):
             f'Country Code: {row.country_code}'
         )
         try:
-            geocode_result = geocode_address(row.address, row.country_code)
+            geocode_result, cache_hit = geocode_address_with_cache_hit(
+                row.address, row.country_code
+            )
 
             self.__handle_geocode_result(
-                geocode_result, item, result, geocode_started
+                geocode_result, cache_hit, item, result, geocode_started
             )
 
         except Exception as exc:
@@ -222,6 +224,7 @@ class ProcessingFacilityAPI(ProcessingFacility):
     @staticmethod
     def __handle_geocode_result(
         geocode_result: dict,
+        cache_hit: bool,
         item: FacilityListItem,
         result: dict,
         geocode_started: str,
@@ -253,6 +256,7 @@ class ProcessingFacilityAPI(ProcessingFacility):
                 'started_at': geocode_started,
                 'error': False,
                 'skipped_geocoder': False,
+                'cache_hit': cache_hit,
                 'data': geocode_result['full_response'],
                 'finished_at': str(timezone.now()),
             }
@@ -2,12 +2,15 @@ import logging
 import traceback
 from typing import Any, Dict, Optional, Set, List, Union
 
+from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.utils import timezone
+from simple_history.utils import bulk_create_with_history
 
 from api.constants import FileHeaderField, ProcessingAction
-from api.extended_fields import create_extendedfields_for_single_item
+from api.extended_fields import build_extendedfields_for_single_item
 from api.facility_actions.processing_facility import ProcessingFacility
+from api.models.extended_field import ExtendedField
 from api.models.facility.facility_list import FacilityList
 from api.models.facility.facility_list_item import FacilityListItem
 from api.models.source import Source
@@ -24,8 +27,12 @@ log = logging.getLogger(__name__)
 class ProcessingFacilityList(ProcessingFacility):
     '''
     Class to process a facility list.
+    The list items and their extended fields are built in memory and inserted
+    in batches of BATCH_SIZE rows.
     '''
 
+    BATCH_SIZE = 1000
+
     def __init__(self, processing_input: Dict[str, Any]) -> None:
         self.__facility_list: FacilityList = processing_input['facility_list']
         # It can be None if there are CC internal errors.
@@ -58,43 +65,73 @@ class ProcessingFacilityList(ProcessingFacility):
 
         is_geocoded: bool = False
         parsed_items: Set[str] = set()
-
-        for idx, row in enumerate(rows):
-            # Created a partially filled FacilityListItem to save valid data
-            # and to provide an item for saving any errors that may exist
-            # below.
-            item = self._create_facility_list_item(
-                self.__facility_list.source, row, idx, header_str
-            )
-            log.info(f'[List Upload] FacilityListItem created. Id {item.id}!')
-
-            self.__handle_row_errors(item, row)
-
-            if item.status != FacilityListItem.ERROR_PARSING:
-                item.sector = row.sector
-                item.country_code = row.country_code
-                item.name = row.name
-                item.clean_name = row.clean_name
-                item.address = row.address
-                item.clean_address = row.clean_address
-                try:
-                    self.__process_valid_item(item, row)
-                except Exception as e:
-                    self.__handle_processing_exception(item, e)
-
-            self.__finalize_item_processing(item, is_geocoded, parsed_items)
+        source = self.__facility_list.source
+
+        for batch_start in range(0, len(rows), self.BATCH_SIZE):
+            items: List[FacilityListItem] = []
+            extended_fields: List[ExtendedField] = []
+
+            for idx, row in enumerate(
+                rows[batch_start:batch_start + self.BATCH_SIZE],
+                start=batch_start,
+            ):
+                # Build a partially filled FacilityListItem to hold valid data
+                # and any errors that may exist below.
+                item = self._build_facility_list_item(
+                    source, row, idx, header_str
+                )
+
+                self.__handle_row_errors(item, row)
+
+                if item.status != FacilityListItem.ERROR_PARSING:
+                    item.sector = row.sector
+                    item.country_code = row.country_code
+                    item.name = row.name
+                    item.clean_name = row.clean_name
+                    item.address = row.address
+                    item.clean_address = row.clean_address
+                    try:
+                        extended_fields.extend(
+                            self.__process_valid_item(item, row)
+                        )
+                    except Exception as e:
+                        self.__handle_processing_exception(item, e)
+
+                self.__finalize_item_processing(
+                    item, is_geocoded, parsed_items
+                )
+                items.append(item)
+
+            self.__save_batch(items, extended_fields)
 
     @staticmethod
-    def _create_facility_list_item(
+    def _build_facility_list_item(
         source: Source, row: RowDTO, idx: int, header_str: str
     ) -> FacilityListItem:
-        return FacilityListItem.objects.create(
+        return FacilityListItem(
             row_index=idx,
             raw_data=','.join(f'"{value}"' for value in row.raw_json.values()),
             raw_json=row.raw_json,
             raw_header=header_str,
             sector=[],
             source=source,
+            # Set by a post_save signal for single inserts, which bulk
+            # inserts don't send.
+            origin_source=settings.INSTANCE_SOURCE,
+        )
+
+    @staticmethod
+    def __save_batch(
+        items: List[FacilityListItem],
+        extended_fields: List[ExtendedField],
+    ) -> None:
+        FacilityListItem.objects.bulk_create(items)
+        for extended_field in extended_fields:
+            extended_field.origin_source = settings.INSTANCE_SOURCE
+        bulk_create_with_history(extended_fields, ExtendedField)
+        log.info(
+            f'[List Upload] {len(items)} FacilityListItems created. '
+            f'Ids {items[0].id}-{items[-1].id}!'
         )
 
     def __handle_cc_internal_errors(self) -> None:
@@ -123,7 +160,7 @@ class ProcessingFacilityList(ProcessingFacility):
                 f'[List Upload] CC Parsing Error: '
                 f'{stringified_cc_err_messages}'
             )
-            log.info(f'[List Upload] FacilityListItem Id: {item.id}')
+            log.info(f'[List Upload] Row index: {item.row_index}')
             item.status = FacilityListItem.ERROR_PARSING
             item.processing_results.append(
                 {
@@ -138,7 +175,7 @@ class ProcessingFacilityList(ProcessingFacility):
 
     def __process_valid_item(
         self, item: FacilityListItem, row: RowDTO
-    ) -> None:
+    ) -> List[ExtendedField]:
         lat: Optional[float] = row.fields.get(FileHeaderField.LAT)
         lng: Optional[float] = row.fields.get(FileHeaderField.LNG)
 
@@ -146,7 +183,7 @@ class ProcessingFacilityList(ProcessingFacility):
             item.geocoded_point = Point(lng, lat)
             self.is_geocoded = True
 
-        create_extendedfields_for_single_item(item, row.fields)
+        return build_extendedfields_for_single_item(item, row.fields)
 
     def __handle_processing_exception(
         self, item: FacilityListItem, exception: Exception
@@ -159,7 +196,7 @@ class ProcessingFacilityList(ProcessingFacility):
             message=error_message,
             extra_data={'affected_list': str(self.__facility_list)}
         )
-        log.info(f'[List Upload] FacilityListItem Id: {item.id}')
+        log.info(f'[List Upload] Row index: {item.row_index}')
 
         item.status = FacilityListItem.ERROR_PARSING
         item.processing_results.append(
@@ -195,4 +232,3 @@ class ProcessingFacilityList(ProcessingFacility):
                 item.status = FacilityListItem.DUPLICATE
             else:
                 parsed_items.add(core_fields)
-        item.save()
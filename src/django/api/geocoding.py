@@ -1,7 +1,16 @@
+import hashlib
+import re
+import threading
+import time
+from datetime import timedelta
+
 from django.conf import settings
+from django.utils import timezone
 
 import requests
 
+from api.models.geocoding_result import GeocodingResult
+
 
 ZERO_RESULTS = "ZERO_RESULTS"
 GEOCODING_URL = "https://maps.googleapis.com/maps/api/geocode/json"
@@ -11,6 +20,47 @@ GEOCODING_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 # request here would block that contributor's other submissions instead of
 # just this one.
 GEOCODING_REQUEST_TIMEOUT_SECONDS = 10
+# Expired geocoding responses are deleted by the purge_geocoding_results
+# command in batches of this size, each in its own transaction.
+GEOCODING_CACHE_PURGE_BATCH_SIZE = 5000
+
+
+class TokenBucket:
+    """
+    Limit the rate of requests made by all threads of the process. The bucket
+    holds up to a second's worth of requests. A caller takes a token even if
+    none is left, then sleeps outside the lock until the time it is due, so
+    waiting callers are spaced out in the order they arrived.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tokens = None
+        self.updated_at = None
+
+    def acquire(self, rate):
+        if rate <= 0:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            capacity = max(rate, 1)
+            if self.updated_at is None:
+                tokens = capacity
+            else:
+                tokens = min(
+                    capacity,
+                    self.tokens + (now - self.updated_at) * rate,
+                )
+            self.tokens = tokens - 1
+            self.updated_at = now
+            wait = -self.tokens / rate if self.tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+geocoding_rate_limiter = TokenBucket()
 
 
 def create_geocoding_params(address, country_code):
@@ -81,8 +131,102 @@ def find_valid_country_code(data, country_code):
     raise ValueError(error)
 
 
-def geocode_address(address, country_code, validate_country=True):
+def normalize_geocoding_address(address):
+    """
+    Return the form of the address used as the geocoding cache key.
+    Only case and spacing are normalised, as Google ignores them, while
+    punctuation such as the dash of a street number range can change the
+    result.
+    """
+    address = re.sub(r'\s+', ' ', address or '')
+    address = re.sub(r' ?, ?', ', ', address)
+    return address.strip(' ,').lower()
+
+
+def get_geocoding_cache_key(address, country_code):
+    value = '{}|{}'.format(address, country_code)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def get_cached_geocoding_response(key):
+    if settings.GEOCODING_CACHE_TTL_DAYS <= 0:
+        return None
+
+    cached = GeocodingResult.objects.filter(key=key).first()
+    if cached is None:
+        return None
+
+    ttl_days = (
+        settings.GEOCODING_CACHE_NEGATIVE_TTL_DAYS
+        if cached.response.get('status') == ZERO_RESULTS
+        else settings.GEOCODING_CACHE_TTL_DAYS
+    )
+    if cached.geocoded_at < timezone.now() - timedelta(days=ttl_days):
+        return None
+
+    return cached.response
+
+
+def cache_geocoding_response(key, address, country_code, data):
+    if settings.GEOCODING_CACHE_TTL_DAYS <= 0:
+        return
+    # Errors such as OVER_QUERY_LIMIT or REQUEST_DENIED are not a property
+    # of the address, so only successful and empty responses are kept.
+    if data.get('status') not in ('OK', ZERO_RESULTS):
+        return
+    if len(country_code) != 2:
+        return
+
+    # An upsert rather than update_or_create, so that two lists geocoding
+    # the same address at once can not fail each other's transaction.
+    GeocodingResult.objects.bulk_create(
+        [
+            GeocodingResult(
+                key=key,
+                address=address,
+                country_code=country_code,
+                response=data,
+                geocoded_at=timezone.now(),
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=['key'],
+        update_fields=['response', 'geocoded_at'],
+    )
+
+
+def purge_expired_geocoding_responses():
+    """
+    Delete a batch of the responses older than `GEOCODING_CACHE_TTL_DAYS`,
+    or of any responses if the cache is disabled, so that Google responses
+    are not kept for longer than they may be reused. Return the number of
+    responses deleted.
+    """
+    expires_at = timezone.now() - timedelta(
+        days=max(settings.GEOCODING_CACHE_TTL_DAYS, 0)
+    )
+    expired = GeocodingResult.objects.filter(geocoded_at__lt=expires_at)
+    deleted, _ = GeocodingResult.objects.filter(
+        pk__in=expired.values('pk')[:GEOCODING_CACHE_PURGE_BATCH_SIZE]
+    ).delete()
+    return deleted
+
+
+def get_geocoding_response(address, country_code):
+    """
+    Return the Google Geocoding API response for the address and whether it
+    was served from the `GeocodingResult` cache.
+    """
+    normalized_address = normalize_geocoding_address(address)
+    normalized_country_code = (country_code or '').upper()
+    key = get_geocoding_cache_key(normalized_address, normalized_country_code)
+
+    data = get_cached_geocoding_response(key)
+    if data is not None:
+        return data, True
+
     params = create_geocoding_params(address, country_code)
+    geocoding_rate_limiter.acquire(settings.GEOCODING_REQUESTS_PER_SECOND)
     r = requests.get(
         GEOCODING_URL, params=params, timeout=GEOCODING_REQUEST_TIMEOUT_SECONDS
     )
@@ -92,12 +236,35 @@ def geocode_address(address, country_code, validate_country=True):
                          .format(r.status_code))
 
     data = r.json()
+    cache_geocoding_response(
+        key, normalized_address, normalized_country_code, data
+    )
+    return data, False
 
-    if data["status"] == ZERO_RESULTS or len(data["results"]) == 0:
-        return format_no_geocode_results(data)
 
-    if validate_country:
+def geocode_address(address, country_code, validate_country=True):
+    result, _ = geocode_address_with_cache_hit(
+        address, country_code, validate_country
+    )
+    return result
+
+
+def geocode_address_with_cache_hit(
+    address, country_code, validate_country=True
+):
+    """
+    Return the result of `geocode_address` and whether its response was
+    served from the `GeocodingResult` cache. The flag is kept out of the
+    result, which the geocoding endpoints return to clients as it is.
+    """
+    data, cache_hit = get_geocoding_response(address, country_code)
+
+    if data["status"] == ZERO_RESULTS or len(data["results"]) == 0:
+        result = format_no_geocode_results(data)
+    elif validate_country:
         valid_result = find_valid_country_code(data, country_code)
-        return format_geocoded_address_data(data, valid_result)
+        result = format_geocoded_address_data(data, valid_result)
+    else:
+        result = format_geocoded_address_data(data)
 
-    return format_geocoded_address_data(data)
+    return result, cache_hit
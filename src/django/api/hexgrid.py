@@ -0,0 +1,138 @@
+"""Arithmetic hexagon binning for the `facilitygrid` vector tile layer.
+
+The cells are the global lattice drawn by the `generate_hexgrid` database
+function: pointy-top hexagons in Web Mercator (EPSG:3857) with their bottom
+vertices snapped to multiples of the cell width and of the row pair height.
+The cell centres form two offset rectangular lattices, so the cell holding a
+point is whichever of the nearest centres of the two lattices is closer.
+That assigns a facility to its cell with a few arithmetic operations instead
+of an `ST_Contains` test against every hexagon.
+
+A cell is addressed by an integer column and row. Even rows belong to the
+first lattice and odd rows to the second, shifted right by half a cell. The
+`facility_hex_cell` database function (sqls/0227_facility_hex_cell.sql)
+implements the same arithmetic for the `api_facilityhexcount` trigger.
+"""
+
+import math
+from typing import Tuple
+
+# Width of the Web Mercator world in metres.
+WEB_MERCATOR_WORLD_WIDTH = 2 * 20037508.342789244
+# A tile is 2 ** GRID_ZOOM_FACTOR hexagons wide.
+GRID_ZOOM_FACTOR = 3
+
+
+class HexGrid:
+    def __init__(self, width: float):
+        self.width = width
+        self.half_width = width / 2
+        # The hexagon rises by `a` along each slanted side and by `2 * a`
+        # along each vertical side, so it is `4 * a` high and rows of cells
+        # are `3 * a` apart.
+        self.a = math.tan(math.radians(30)) * self.half_width
+        self.radius = 2 * self.a
+        self.row_height = 3 * self.a
+
+    @classmethod
+    def for_zoom(cls, z: int) -> 'HexGrid':
+        return cls(WEB_MERCATOR_WORLD_WIDTH / 2 ** (z + GRID_ZOOM_FACTOR))
+
+    def get_center(self, col: int, row: int) -> Tuple[float, float]:
+        return (
+            col * self.width + (row & 1) * self.half_width,
+            2 * self.a + row * self.row_height,
+        )
+
+    def get_cell(self, x: float, y: float) -> Tuple[int, int]:
+        """Return the column and row of the cell holding the point."""
+        pair_height = 2 * self.row_height
+        even_cell = (
+            math.floor(x / self.width + 0.5),
+            2 * math.floor((y - 2 * self.a) / pair_height + 0.5),
+        )
+        odd_cell = (
+            math.floor((x - self.half_width) / self.width + 0.5),
+            2 * math.floor((y - 5 * self.a) / pair_height + 0.5) + 1,
+        )
+
+        def distance(cell):
+            center_x, center_y = self.get_center(*cell)
+            return (x - center_x) ** 2 + (y - center_y) ** 2
+
+        if distance(even_cell) <= distance(odd_cell):
+            return even_cell
+        return odd_cell
+
+    def get_cell_range(
+        self,
+        xmin: float,
+        ymin: float,
+        xmax: float,
+        ymax: float,
+    ) -> Tuple[int, int, int, int]:
+        """Return the column and row bounds of cells whose centres can fall
+        inside the box."""
+        return (
+            math.floor(xmin / self.width) - 1,
+            math.floor((ymin - 2 * self.a) / self.row_height) - 1,
+            math.ceil(xmax / self.width) + 1,
+            math.ceil((ymax - 2 * self.a) / self.row_height) + 1,
+        )
+
+    def get_cell_query(self, points_query: str) -> str:
+        """
+        Return SQL selecting the `hex_col` and `hex_row` of the cell holding
+        each point of a query with `px` and `py` Web Mercator columns.
+
+        The query must not contain literal percent signs, as it is executed
+        with the filter params of `FacilityIndex.objects
+        .filter_by_query_params`.
+        """
+        pair_height = 2 * self.row_height
+        return f"""
+            SELECT
+                CASE WHEN even_distance <= odd_distance
+                    THEN even_col ELSE odd_col
+                END AS hex_col,
+                CASE WHEN even_distance <= odd_distance
+                    THEN even_row ELSE odd_row
+                END AS hex_row
+            FROM (
+                SELECT
+                    even_col,
+                    even_row,
+                    odd_col,
+                    odd_row,
+                    (px - even_col * {self.width}) ^ 2
+                    + (py - ({2 * self.a} + even_row * {self.row_height})) ^ 2
+                        AS even_distance,
+                    (px - (odd_col * {self.width} + {self.half_width})) ^ 2
+                    + (py - ({2 * self.a} + odd_row * {self.row_height})) ^ 2
+                        AS odd_distance
+                FROM (
+                    SELECT
+                        px,
+                        py,
+                        FLOOR(px / {self.width} + 0.5)::bigint AS even_col,
+                        2 * FLOOR(
+                            (py - {2 * self.a}) / {pair_height} + 0.5
+                        )::bigint AS even_row,
+                        FLOOR(
+                            (px - {self.half_width}) / {self.width} + 0.5
+                        )::bigint AS odd_col,
+                        2 * FLOOR(
+                            (py - {5 * self.a}) / {pair_height} + 0.5
+                        )::bigint + 1 AS odd_row
+                    FROM ({points_query}) AS points
+                ) AS candidates
+            ) AS distances
+        """
+
+    def get_center_sql(self) -> Tuple[str, str]:
+        """Return SQL expressions for the centre of the `hex_col`,
+        `hex_row` cell."""
+        return (
+            f'(hex_col * {self.width} + (hex_row & 1) * {self.half_width})',
+            f'({2 * self.a} + hex_row * {self.row_height})',
+        )
@@ -1,10 +1,14 @@
-from django.db.models import F
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.conf import settings
 from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
-from django.contrib.postgres.aggregates.general import ArrayAgg
+from django.utils import timezone
 
 from api.models import (Contributor, RequestLog, ContributorNotifications,
-                        ApiLimit, ApiBlock)
+                        ApiLimit, ApiBlock, RequestLogDailyCount)
 from api.mail import (send_api_notice, send_admin_api_notice, send_api_warning,
                       send_admin_api_warning)
 
@@ -68,16 +72,112 @@ def block_free_api_contributor(contributor,
                              is_active=True)
 
 
+def get_day_start(day):
+    return datetime.combine(day, datetime.min.time(), tzinfo=dt_timezone.utc)
+
+
+def get_successful_request_logs():
+    return RequestLog.objects.filter(
+        response_code__gte=200,
+        response_code__lte=299,
+    )
+
+
+def rollup_request_log_daily_counts(now):
+    """
+    Count the successful requests of every user on each day after the last
+    day rolled up and before the last `REQUEST_LOG_ROLLUP_GRACE_DAYS` days
+    and the current one (UTC). The first rollup counts every day logged so
+    far. Returns the start of the first day that is not rolled up, from
+    which the requests are counted from the request log.
+    """
+    today = now.astimezone(dt_timezone.utc).date()
+    rollup_end = get_day_start(
+        today - timedelta(days=settings.REQUEST_LOG_ROLLUP_GRACE_DAYS)
+    )
+    last_day = RequestLogDailyCount.objects.aggregate(
+        last_day=Max('day')
+    )['last_day']
+
+    logs = get_successful_request_logs().filter(created_at__lt=rollup_end)
+    if last_day is not None:
+        logs = logs.filter(
+            created_at__gte=get_day_start(last_day + timedelta(days=1))
+        )
+
+    daily_counts = (
+        logs
+        .annotate(day=TruncDate('created_at', tzinfo=dt_timezone.utc))
+        .values('user_id', 'day')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    RequestLogDailyCount.objects.bulk_create(
+        [RequestLogDailyCount(**daily_count) for daily_count in daily_counts],
+        batch_size=1000,
+        # A concurrent rollup counted the same days.
+        ignore_conflicts=True,
+    )
+
+    return rollup_end
+
+
+def get_contributor_request_logs(contributor):
+    return get_successful_request_logs().filter(
+        user__contributor=contributor
+    )
+
+
+def get_first_request_at(contributor, rollup_end):
+    first_day = RequestLogDailyCount.objects.filter(
+        user__contributor=contributor
+    ).aggregate(first_day=Min('day'))['first_day']
+
+    logs = get_contributor_request_logs(contributor)
+    if first_day is not None:
+        logs = logs.filter(
+            created_at__gte=get_day_start(first_day),
+            created_at__lt=get_day_start(first_day + timedelta(days=1)),
+        )
+    else:
+        logs = logs.filter(created_at__gte=rollup_end)
+
+    return logs.aggregate(first=Min('created_at'))['first']
+
+
+def get_request_count(contributor, start_date, rollup_end):
+    """
+    Count the successful requests of a contributor since start_date. Whole
+    days that were rolled up are read from the daily counts, the day
+    start_date falls on and the days from rollup_end on from the request
+    log.
+    """
+    start_day = start_date.astimezone(dt_timezone.utc).date()
+    start_day_end = get_day_start(start_day + timedelta(days=1))
+
+    rolled_up_count = RequestLogDailyCount.objects.filter(
+        user__contributor=contributor,
+        day__gt=start_day,
+        day__lt=rollup_end.date(),
+    ).aggregate(count=Sum('count'))['count'] or 0
+
+    logged_count = get_contributor_request_logs(contributor).filter(
+        Q(created_at__lt=start_day_end) | Q(created_at__gte=rollup_end),
+        created_at__gte=start_date,
+    ).count()
+
+    return rolled_up_count + logged_count
+
+
 @transaction.atomic
-def check_contributor_api_limit(at_datetime, c):
+def check_contributor_api_limit(at_datetime, contributor_id, rollup_end):
     try:
-        contributor = Contributor.objects.get(id=c.get('contributor'))
+        contributor = Contributor.objects.get(id=contributor_id)
     except Contributor.DoesNotExist:
         # API Limits and Blocks are linked to contributors.
         # Users without contributors are blocked from the system
         # in middleware and don't need to be handled here.
         return
-    log_dates = c.get('log_dates')
     notification, created = ContributorNotifications \
         .objects \
         .get_or_create(contributor=contributor)
@@ -89,7 +189,9 @@ def check_contributor_api_limit(at_datetime, c):
     except ObjectDoesNotExist:
         limit = None
         renewal_period = ''
-        date = min(log_dates)
+        date = get_first_request_at(contributor, rollup_end)
+        if date is None:
+            return
 
     context = DateLimitationContext()
 
@@ -104,8 +206,7 @@ def check_contributor_api_limit(at_datetime, c):
     start_date = date_limitation.get_start_date()
     until = date_limitation.get_api_block_until()
 
-    logs_for_period = [x for x in log_dates if x >= start_date]
-    request_count = len(logs_for_period)
+    request_count = get_request_count(contributor, start_date, rollup_end)
 
     if (limit is None or
             renewal_period == ''):
@@ -175,12 +276,19 @@ def check_contributor_api_limit(at_datetime, c):
 
 
 def check_api_limits(at_datetime):
-    contributor_logs = RequestLog.objects.filter(
-            response_code__gte=200,
-            response_code__lte=299).annotate(
-                contributor=F('user__contributor__id')
-            ).values('contributor').annotate(
-                log_dates=ArrayAgg('created_at')
-            )
-    for c in contributor_logs:
-        check_contributor_api_limit(at_datetime, c)
+    rollup_end = rollup_request_log_daily_counts(timezone.now())
+
+    contributor_ids = set(
+        RequestLogDailyCount.objects
+        .values_list('user__contributor', flat=True)
+        .distinct()
+    ) | set(
+        get_successful_request_logs()
+        .filter(created_at__gte=rollup_end)
+        .values_list('user__contributor', flat=True)
+        .distinct()
+    )
+    contributor_ids.discard(None)
+
+    for contributor_id in contributor_ids:
+        check_contributor_api_limit(at_datetime, contributor_id, rollup_end)
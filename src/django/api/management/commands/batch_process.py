@@ -2,9 +2,13 @@ import os
 import sys
 import logging
 import asyncio
+import queue
+import threading
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 
 from api.constants import ProcessingAction
 from api.models import (
@@ -27,9 +31,95 @@ LIST_ACTIONS = set([
 
 VALID_ACTIONS = list(LINE_ITEM_ACTIONS.keys()) + list(LIST_ACTIONS)
 
+GEOCODED_FIELDS = [
+    'status',
+    'geocoded_point',
+    'geocoded_address',
+    'processing_results',
+    'updated_at',
+]
+
 logger = logging.getLogger(__name__)
 
 
+def geocode_items_concurrently(items, process, concurrency, batch_size):
+    """
+    Geocode the items in `concurrency` threads and yield (item, error) pairs
+    for all of them. The geocoded items are saved `batch_size` at a time,
+    each batch in one transaction, and yielded once they are saved. Items
+    `process` raised an error for are not saved.
+    """
+    pending = queue.Queue()
+    processed = queue.Queue()
+
+    def work():
+        try:
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                try:
+                    process(item)
+                    processed.put((item, None))
+                except Exception as error:
+                    processed.put((item, error))
+        finally:
+            # Geocoding reads and writes the geocoding cache with the
+            # connection of the thread.
+            connection.close()
+
+    for item in items:
+        pending.put(item)
+    threads = []
+    for _ in range(min(concurrency, len(items))):
+        pending.put(None)
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    batch = []
+    try:
+        for _ in range(len(items)):
+            item, error = processed.get()
+            if error is None:
+                batch.append(item)
+            elif isinstance(error, (ValueError, ItemRemovedException)):
+                yield item, error
+            else:
+                raise error
+
+            if len(batch) >= batch_size:
+                save_geocoded_items(batch)
+                yield from ((item, None) for item in batch)
+                batch = []
+
+        save_geocoded_items(batch)
+        yield from ((item, None) for item in batch)
+    finally:
+        # Let the threads finish early if an error stopped the loop.
+        while True:
+            try:
+                pending.get_nowait()
+            except queue.Empty:
+                break
+        for thread in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+
+
+def save_geocoded_items(items):
+    if not items:
+        return
+    now = timezone.now()
+    for item in items:
+        item.updated_at = now
+    with transaction.atomic():
+        FacilityListItem.objects.bulk_update(items, GEOCODED_FIELDS)
+        # [A/B Test] OSHUB-507
+        FacilityListItemTemp.copy_all(items)
+
+
 class Command(BaseCommand):
     help = 'Run an action on all items in a facility list. If ' \
            'AWS_BATCH_JOB_ARRAY_INDEX environment variable is set, will ' \
@@ -47,6 +137,11 @@ class Command(BaseCommand):
         group.add_argument('-l', '--list-id',
                            required=True,
                            help='The id of the facility list to process.')
+        parser.add_argument('-c', '--concurrency',
+                            type=int,
+                            default=settings.GEOCODING_CONCURRENCY,
+                            help='The number of items to geocode at once. '
+                                 'Defaults to GEOCODING_CONCURRENCY.')
 
     def handle(self, *args, **options):
         action = options['action']
@@ -71,7 +166,9 @@ class Command(BaseCommand):
             sys.exit(1)
 
         if action in LINE_ITEM_ACTIONS.keys():
-            self.process_items(facility_list, action, process)
+            self.process_items(
+                facility_list, action, process, options['concurrency']
+            )
         elif action == ProcessingAction.PARSE:
             parse_production_location_list(facility_list)
         elif action == ProcessingAction.MATCH:
@@ -89,7 +186,7 @@ class Command(BaseCommand):
             logger.info(f'[List Upload] FacilityList Id: {list_id}')
             notify_facility_list_complete(list_id)
 
-    def process_items(self, facility_list, action, process):
+    def process_items(self, facility_list, action, process, concurrency=1):
         row_index = os.environ.get('AWS_BATCH_JOB_ARRAY_INDEX')
         if row_index:
             items = FacilityListItem.objects.filter(
@@ -105,29 +202,36 @@ class Command(BaseCommand):
             'failure': 0,
         }
 
-        for item in items:
-            try:
-                with transaction.atomic():
-                    if action == ProcessingAction.GEOCODE:
-                        logger.info('[List Upload] Started Geocode process!')
-                        logger.info(
-                            f'[List Upload] FacilityListItem Id: {item.id}'
-                        )
-                        process(item)
-                        item.save()
-                        # [A/B Test] OSHUB-507
-                        FacilityListItemTemp.copy(item)
-
-                if item.status in FacilityListItem.ERROR_STATUSES:
-                    result['failure'] += 1
-                else:
-                    result['success'] += 1
-            except ValueError as e:
-                self.stderr.write('Value Error: {}'.format(e))
-                result['failure'] += 1
-            except ItemRemovedException:
+        if action == ProcessingAction.GEOCODE and concurrency > 1:
+            items = list(items)
+            logger.info('[List Upload] Started Geocode process!')
+            logger.info(
+                f'[List Upload] Geocoding {len(items)} FacilityListItems '
+                f'in {concurrency} threads'
+            )
+            processed_items = geocode_items_concurrently(
+                items,
+                process,
+                concurrency,
+                settings.GEOCODING_WRITE_BATCH_SIZE,
+            )
+        else:
+            processed_items = (
+                (item, self.process_item(item, action, process))
+                for item in items
+            )
+
+        for item, error in processed_items:
+            if isinstance(error, ItemRemovedException):
                 self.stderr.write(self.style.WARNING('Skipping removed item'))
                 result['warning'] += 1
+            elif error is not None:
+                self.stderr.write('Value Error: {}'.format(error))
+                result['failure'] += 1
+            elif item.status in FacilityListItem.ERROR_STATUSES:
+                result['failure'] += 1
+            else:
+                result['success'] += 1
 
         # Print successes
         if result['success'] > 0:
@@ -149,3 +253,20 @@ class Command(BaseCommand):
                 self.style.ERROR(
                     '{}: {} failures'.format(
                         action, result['failure'])))
+
+    def process_item(self, item, action, process):
+        try:
+            with transaction.atomic():
+                if action == ProcessingAction.GEOCODE:
+                    logger.info('[List Upload] Started Geocode process!')
+                    logger.info(
+                        f'[List Upload] FacilityListItem Id: {item.id}'
+                    )
+                    process(item)
+                    item.save()
+                    # [A/B Test] OSHUB-507
+                    FacilityListItemTemp.copy(item)
+        except (ValueError, ItemRemovedException) as error:
+            return error
+
+        return None
@@ -0,0 +1,136 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.http import QueryDict
+
+from api.constants import FacilitiesQueryParams
+from api.helpers.helpers import format_custom_text
+from api.models.facility.facility_index import FacilityIndex
+
+DEFAULT_QUERIES = [
+    'textile',
+    'garment',
+    'apparel',
+    'fashion',
+    'knit',
+    'ozen',
+    'özen',
+    'co',
+]
+
+
+def get_indexed_queryset(query, contributor):
+    params = QueryDict(mutable=True)
+    params[FacilitiesQueryParams.Q] = query
+    if contributor is not None:
+        params[FacilitiesQueryParams.EMBED] = '1'
+        params[FacilitiesQueryParams.CONTRIBUTORS] = contributor
+    return FacilityIndex.objects.filter_by_query_params(params)
+
+
+def get_unaccent_queryset(query, contributor):
+    """
+    The `q` filter of FacilityIndexNewManager as it was before the trigram
+    indexes, using the `unaccent` lookups of django.contrib.postgres.
+    """
+    query_filter = Q(name__unaccent__icontains=query) | Q(id=query)
+    if contributor is not None:
+        query_filter |= Q(
+            custom_text_search__unaccent__contains=format_custom_text(
+                contributor, query
+            )
+        )
+        return FacilityIndex.objects.filter(
+            query_filter, contributors_id__overlap=[contributor]
+        )
+    return FacilityIndex.objects.filter(query_filter)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the time taken to count the facilities matching `q` '
+        'searches with the trigram-indexed `immutable_unaccent` lookups of '
+        'FacilityIndexNewManager and with the `unaccent` lookups they '
+        'replaced. Prints the median and p95 time of each and whether their '
+        'results differ.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-q',
+            '--query',
+            action='append',
+            help='Search text to benchmark. Can be repeated.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='Times to run each search (default: 10).'
+        )
+        parser.add_argument(
+            '--contributor',
+            help=(
+                'Search in embed mode for this contributor id, which also '
+                'matches the custom text of the facilities.'
+            )
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Print the query plan of each search.'
+        )
+
+    def handle(self, *args, **options):
+        queries = options['query'] or DEFAULT_QUERIES
+        repeat = options['repeat']
+        contributor = options['contributor']
+        if repeat < 1:
+            raise CommandError('--repeat must be at least 1.')
+
+        paths = (
+            ('indexed', get_indexed_queryset),
+            ('unaccent', get_unaccent_queryset),
+        )
+        totals = {name: [] for name, _ in paths}
+
+        for query in queries:
+            counts = {}
+            for name, get_queryset in paths:
+                queryset = get_queryset(query, contributor)
+                if options['explain']:
+                    self.stdout.write(f'{name} "{query}":')
+                    self.stdout.write(queryset.explain(analyze=True))
+
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    counts[name] = queryset.all().count()
+                    timings.append(time.perf_counter() - started)
+                totals[name].extend(timings)
+
+                self.stdout.write(
+                    f'{name:>8} "{query}": {counts[name]} facilities, '
+                    f'{self.format_timings(timings)}'
+                )
+
+            if len(set(counts.values())) > 1:
+                self.stdout.write(self.style.WARNING(
+                    f'Results differ for "{query}": {counts}'
+                ))
+
+        for name, timings in totals.items():
+            self.stdout.write(self.style.SUCCESS(
+                f'{name:>8} overall: {self.format_timings(timings)}'
+            ))
+
+    @staticmethod
+    def format_timings(timings):
+        ordered = sorted(timings)
+        p95 = ordered[max(0, round(len(ordered) * 0.95) - 1)]
+        return (
+            f'median {statistics.median(ordered) * 1000:.1f} ms, '
+            f'p95 {p95 * 1000:.1f} ms'
+        )
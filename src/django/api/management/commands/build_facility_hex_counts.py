@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.hexgrid import HexGrid
+from api.models.facility.facility_hex_count import (
+    MAX_ZOOM_VERSION_NAME,
+    FacilityHexCount,
+)
+from api.models.version import Version
+
+# The frontend draws the facilitygrid layer up to this zoom level
+# (`maxVectorTileFacilitiesGridZoom`).
+MAX_GRID_ZOOM = 11
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the precomputed facility counts per facilitygrid hexagon '
+        'used to render unfiltered grid tiles. Once built, the counts are '
+        'kept up to date by database triggers, so this only needs to run '
+        'once, or to change the highest zoom level with counts. Facility '
+        'index writes wait until the rebuild is done.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-zoom',
+            type=int,
+            default=MAX_GRID_ZOOM,
+            help=(
+                'Highest zoom level to build counts for '
+                f'(default: {MAX_GRID_ZOOM}).'
+            )
+        )
+
+    def handle(self, *args, **options):
+        max_zoom = options['max_zoom']
+        if max_zoom < 0 or max_zoom > MAX_GRID_ZOOM:
+            raise CommandError(
+                f'--max-zoom must be between 0 and {MAX_GRID_ZOOM}.'
+            )
+
+        # The counts are rebuilt in one transaction holding off facility
+        # index writes, so that no change is missed before the triggers start
+        # maintaining the new zoom levels and tiles keep reading the previous
+        # counts until the rebuild is committed.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('LOCK TABLE api_facilityindex IN SHARE MODE')
+            FacilityHexCount.objects.all().delete()
+            for z in range(max_zoom + 1):
+                cells = self.build_zoom(z)
+                self.stdout.write(
+                    f'Built {cells} hexagons for zoom level {z}.'
+                )
+            Version.objects.update_or_create(
+                name=MAX_ZOOM_VERSION_NAME,
+                defaults={'version': max_zoom},
+            )
+        FacilityHexCount.forget_max_zoom()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Successfully built facility hexagon counts for zoom '
+                f'levels 0-{max_zoom}.'
+            )
+        )
+
+    @staticmethod
+    def build_zoom(z):
+        points_query = """
+            SELECT ST_X(mercator) AS px, ST_Y(mercator) AS py
+            FROM (
+                SELECT ST_Transform(location, 3857) AS mercator
+                FROM api_facilityindex
+                WHERE location IS NOT NULL
+            ) AS facilities
+        """
+        query = """
+            INSERT INTO api_facilityhexcount (zoom, hex_col, hex_row, count)
+            SELECT %s, hex_col, hex_row, COUNT(*)
+            FROM ({cell_query}) AS cells
+            GROUP BY hex_col, hex_row
+        """.format(
+            cell_query=HexGrid.for_zoom(z).get_cell_query(points_query)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(query, [z])
+            return cursor.rowcount
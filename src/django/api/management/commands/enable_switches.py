@@ -14,3 +14,4 @@ class Command(BaseCommand):
         call_command('waffle_switch', 'extended_profile', 'on')
         call_command('waffle_switch', 'disable_list_uploading', 'off')
         call_command('waffle_switch', 'private_instance', 'off')
+        call_command('waffle_switch', 'production_location_indexer', 'on')
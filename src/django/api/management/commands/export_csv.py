@@ -1,14 +1,32 @@
 import csv
+import hashlib
 import logging
+import multiprocessing
 import os
 import base64
 import json
-from datetime import datetime
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.db.models import Count, Max
+from django.db.models.functions import Collate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from api.serializers.facility.facility_download_serializer import (
     FacilityDownloadSerializer,
 )
 from api.models.facility.facility_index import FacilityIndex
+from api.models.partner_field import PartnerField
+from api.models.us_county_tigerline import USCountyTigerline
+from api.models.wage_indicator_country_data import WageIndicatorCountryData
+from api.models.wage_indicator_link_text_config import (
+    WageIndicatorLinkTextConfig,
+)
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
@@ -16,6 +34,26 @@ from googleapiclient.http import MediaFileUpload
 serializer = FacilityDownloadSerializer()
 logger = logging.getLogger(__name__)
 
+# Facilities are exported in bytewise ("C" collation) ID order, which is the
+# order Python compares the IDs in, so that a delta export can merge the
+# facilities with the rows of the previous export. The api_facidx_id_c index
+# covers this order.
+SORT_ID = Collate("id", "C")
+# Where the last export and its manifest are kept for delta exports.
+BASELINE_DIRECTORY = "export_csv"
+# `updated_at` is set to the start of the transaction that wrote the
+# facility, which can be before the previous export started even though it
+# was committed after the export read the facility. Facilities updated up to
+# this long before the previous export started are serialized again.
+DELTA_SAFETY_MARGIN = timedelta(hours=1)
+# Reference data rows are serialized from, whose changes do not update the
+# facility index.
+REFERENCE_DATA_MODELS = (
+    USCountyTigerline,
+    WageIndicatorCountryData,
+    WageIndicatorLinkTextConfig,
+)
+
 
 def upload_file_to_google_drive(filename):
     """
@@ -112,7 +150,7 @@ def write_facilities(writer, facilities):
         writer.writerow(row)
 
 
-def get_facilities(limit=50000, id=None):
+def get_facilities(limit=50000, id=None, to_id=None):
     """
     Retrieve a list of facilities from the FacilityIndex.
     Args:
@@ -121,16 +159,312 @@ def get_facilities(limit=50000, id=None):
             will be included. Defaults to None.
         limit (int, optional): The maximum number of facilities to retrieve.
             Defaults to 50000.
+        to_id (str, optional): The last ID to include. Defaults to None.
     Returns:
         QuerySet: A Django QuerySet containing the filtered
             and ordered facilities.
     """
-    facility_objects = FacilityIndex.objects
+    facility_objects = FacilityIndex.objects.annotate(sort_id=SORT_ID)
 
     if id is not None:
-        facility_objects = facility_objects.filter(id__gt=id)
+        facility_objects = facility_objects.filter(sort_id__gt=id)
+
+    if to_id is not None:
+        facility_objects = facility_objects.filter(sort_id__lte=to_id)
+
+    return facility_objects.order_by("sort_id")[:limit]
+
+
+def write_facility_range(writer, limit=50000, id=None, to_id=None):
+    """
+    Write the facilities after `id` up to and including `to_id`, fetched in
+    batches of `limit`.
+    Returns:
+        int: The number of facilities written.
+    """
+    last_id = id
+    total_facilities = 0
+
+    while True:
+        logger.info(f"New loop iteration, ID: {last_id}")
+        facilities = get_facilities(limit=limit, id=last_id, to_id=to_id)
+
+        if len(facilities) == 0:
+            logger.info("No more facilities, breaking the loop!")
+            break
+
+        write_facilities(writer=writer, facilities=facilities)
+        total_facilities += len(facilities)
+
+        last_id = facilities[len(facilities) - 1].id
+        logger.info(f"Facilities processed: {len(facilities)}")
+        logger.info(f"End of iteration, ID: {last_id}")
+
+    return total_facilities
+
+
+def get_shard_bounds(shards):
+    """
+    Split the facility IDs into ranges holding a similar number of
+    facilities.
+    Args:
+        shards (int): The number of ranges.
+    Returns:
+        list: (after_id, to_id) pairs, where after_id is None for the first
+            range.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT MAX(sort_id) FROM (
+                SELECT
+                    id COLLATE "C" AS sort_id,
+                    NTILE(%s) OVER (ORDER BY id COLLATE "C") AS shard
+                FROM api_facilityindex
+            ) AS shards
+            GROUP BY shard
+            ORDER BY shard
+            """,
+            [shards],
+        )
+        upper_ids = [row[0] for row in cursor.fetchall()]
+
+    bounds = []
+    after_id = None
+    for to_id in upper_ids:
+        bounds.append((after_id, to_id))
+        after_id = to_id
+
+    return bounds
+
+
+def export_shard(after_id, to_id, filename, limit):
+    """
+    Write the facilities of one ID range, without headers, to a part file.
+    Runs in a worker process of `export_in_parallel`.
+    """
+    with open(filename, "w+") as file:
+        count = write_facility_range(
+            writer=csv.writer(file),
+            limit=limit,
+            id=after_id,
+            to_id=to_id,
+        )
+    # Each worker opened its own connection after the fork.
+    connections.close_all()
+    return count
+
+
+def export_in_parallel(file, workers, limit):
+    """
+    Split the facilities into one ID range per worker, export the ranges to
+    part files in worker processes, and append the parts to the file in ID
+    order.
+    Returns:
+        int: The number of facilities written.
+    """
+    bounds = get_shard_bounds(workers)
+    logger.info(f"Exporting {len(bounds)} shards with {workers} workers")
+
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = [
+            (after_id, to_id, os.path.join(directory, f"part-{i}.csv"), limit)
+            for i, (after_id, to_id) in enumerate(bounds)
+        ]
+
+        # Forked workers must not share the connection of this process.
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            counts = pool.starmap(export_shard, jobs)
+
+        file.flush()
+        for _, _, part_filename, _ in jobs:
+            with open(part_filename, "r") as part:
+                shutil.copyfileobj(part, file)
+
+    return sum(counts)
+
+
+def get_changed_rows(facility_ids):
+    """
+    Serialize the given facilities.
+    Returns:
+        dict: The row of every facility that still exists, by ID.
+    """
+    return {
+        facility.id: serializer.get_row(facility)
+        for facility in FacilityIndex.objects.filter(id__in=facility_ids)
+    }
+
+
+def write_delta(writer, previous_file, since, limit=50000):
+    """
+    Write every facility, copying the row of the previous export for the
+    facilities that have not been updated since `DELTA_SAFETY_MARGIN` before
+    it started, and serializing only the new and updated ones. Facilities
+    that no longer exist are dropped.
+    Args:
+        writer (csv.writer): The writer of the new export.
+        previous_file (file object): The previous export, positioned after
+            its headers.
+        since (datetime): When the previous export started.
+        limit (int): The number of facilities serialized per query.
+    Returns:
+        tuple: The number of facilities written and of facilities
+            serialized.
+    """
+    changed_since = since - DELTA_SAFETY_MARGIN
+    previous_rows = csv.reader(previous_file)
+    previous_row = next(previous_rows, None)
+    # Rows to write, in order: either a copied row or the ID of a facility
+    # to serialize, which are fetched together once `limit` are pending.
+    buffer = []
+    pending_ids = []
+    total_facilities = 0
+    serialized_facilities = 0
+
+    def flush():
+        changed_rows = get_changed_rows(pending_ids)
+        for item in buffer:
+            if isinstance(item, list):
+                writer.writerow(item)
+            elif item in changed_rows:
+                writer.writerow(changed_rows[item])
+        buffer.clear()
+        pending_ids.clear()
+
+    current_facilities = (
+        FacilityIndex.objects.annotate(sort_id=SORT_ID)
+        .order_by("sort_id")
+        .values_list("id", "updated_at")
+        .iterator(chunk_size=limit)
+    )
+
+    for facility_id, updated_at in current_facilities:
+        while previous_row is not None and previous_row[0] < facility_id:
+            previous_row = next(previous_rows, None)
+
+        is_unchanged = (
+            previous_row is not None
+            and previous_row[0] == facility_id
+            and updated_at < changed_since
+        )
+        if is_unchanged:
+            buffer.append(previous_row)
+        else:
+            buffer.append(facility_id)
+            pending_ids.append(facility_id)
+            serialized_facilities += 1
+        total_facilities += 1
+
+        if len(pending_ids) >= limit or len(buffer) >= limit * 10:
+            flush()
+
+    flush()
 
-    return facility_objects.order_by("id")[:limit]
+    return total_facilities, serialized_facilities
+
+
+def get_reference_data_fingerprint():
+    """
+    Fingerprint the data that rows are serialized from besides the facility
+    index: the partner fields with their schemas and the wage reference
+    data. A delta export copies rows only while it is unchanged.
+    Returns:
+        str: A hash of the partner fields and of the number and last update
+            of the reference data rows.
+    """
+    partner_fields = list(
+        PartnerField.objects.get_all_including_inactive()
+        .order_by("name")
+        .values()
+    )
+    reference_data = {
+        model._meta.db_table: model.objects.aggregate(
+            count=Count("pk"), updated_at=Max("updated_at")
+        )
+        for model in REFERENCE_DATA_MODELS
+    }
+    fingerprint = json.dumps(
+        [partner_fields, reference_data], sort_keys=True, default=str
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def get_baseline_paths():
+    environment_name = os.getenv('DJANGO_ENV', 'Local').lower()
+    directory = f"{BASELINE_DIRECTORY}/{environment_name}"
+    return (
+        f"{directory}/manifest.json",
+        f"{directory}/locations-data.csv",
+    )
+
+
+def load_baseline(headers, reference_data):
+    """
+    Download the previous export for a delta export.
+    Args:
+        headers (list): The headers of the new export.
+        reference_data (str): The reference data fingerprint of the new
+            export.
+    Returns:
+        tuple: The manifest and the local path of the previous export, or
+            (None, None) if there is no usable previous export.
+    """
+    manifest_path, export_path = get_baseline_paths()
+
+    if not default_storage.exists(manifest_path):
+        logger.info("No export manifest found, exporting everything")
+        return None, None
+
+    with default_storage.open(manifest_path, "r") as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if manifest.get("headers") != headers:
+        logger.info("The headers changed, exporting everything")
+        return None, None
+
+    if manifest.get("reference_data") != reference_data:
+        logger.info("The reference data changed, exporting everything")
+        return None, None
+
+    if not default_storage.exists(export_path):
+        logger.info("No previous export found, exporting everything")
+        return None, None
+
+    fd, previous_filename = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "wb") as previous_file:
+        with default_storage.open(export_path, "rb") as stored_file:
+            shutil.copyfileobj(stored_file, previous_file)
+
+    return manifest, previous_filename
+
+
+def save_baseline(
+    filename, headers, reference_data, started_at, total_facilities
+):
+    """
+    Keep the export and a manifest recording when it started, for the next
+    delta export.
+    """
+    manifest_path, export_path = get_baseline_paths()
+
+    with open(filename, "rb") as file:
+        default_storage.delete(export_path)
+        default_storage.save(export_path, File(file))
+
+    manifest = {
+        "started_at": started_at.isoformat(),
+        "headers": headers,
+        "reference_data": reference_data,
+        "rows": total_facilities,
+        "file": os.path.basename(filename),
+    }
+    default_storage.delete(manifest_path)
+    default_storage.save(
+        manifest_path,
+        ContentFile(json.dumps(manifest).encode("utf-8")),
+    )
 
 
 class Command(BaseCommand):
@@ -159,6 +493,13 @@ class Command(BaseCommand):
         Arguments:
             --limit (int): Optional; The maximum number of facilities
                 to fetch in each iteration. Default is 50000.
+            --workers (int): Optional; The number of processes exporting
+                ranges of facilities in parallel. Default is 1. Ignored,
+                with a warning, by a delta export that reuses the previous
+                export.
+            --delta (bool): Optional; Only serialize the facilities
+                updated since the previous export, copying the other rows
+                from it.
         """
         parser.add_argument(
             "--limit",
@@ -166,6 +507,20 @@ class Command(BaseCommand):
             default=50000,
             help="Limit the number of facilities to fetch in each iteration",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes exporting facilities in parallel",
+        )
+        parser.add_argument(
+            "--delta",
+            action="store_true",
+            help=(
+                "Only serialize the facilities updated since the previous "
+                "export"
+            ),
+        )
 
     def handle(self, *args, **options):
         """
@@ -176,10 +531,14 @@ class Command(BaseCommand):
             **options: Arbitrary keyword arguments. Expected to contain:
                 - "limit" (int): The maximum number of facilities
                     to fetch in each iteration.
+                - "workers" (int): The number of export processes.
+                - "delta" (bool): Whether to reuse the previous export.
         """
         logger.info("Starting the export process!")
 
         limit = options["limit"]
+        workers = options["workers"]
+        delta = options["delta"]
         logger.info(f"Limit set to: {limit}")
 
         environment_name = os.getenv('DJANGO_ENV', 'Local').lower()
@@ -188,34 +547,64 @@ class Command(BaseCommand):
 
         filename = f"./locations-data-{environment_name}-{now}.csv"
 
+        # Facilities updated while the export runs are re-serialized by the
+        # next delta export.
+        started_at = timezone.now()
+        headers = serializer.get_headers()
+        reference_data = get_reference_data_fingerprint() if delta else None
+        manifest, previous_filename = (
+            load_baseline(headers, reference_data) if delta else (None, None)
+        )
+
         with open(filename, "w+") as file:
             logger.info(f"Opened file for writing: {filename}")
 
             writer = create_csv_writer(file=file)
-            last_id = None
-            facilities = None
-            total_facilities = 0
 
-            while True:
-                logger.info(f"New loop iteration, ID: {last_id}")
-                facilities = get_facilities(
+            if manifest is not None:
+                if workers > 1:
+                    # Only the new and updated facilities are serialized,
+                    # which is quick enough in this process.
+                    logger.warning(
+                        f"Ignoring --workers {workers}: a delta export "
+                        "serializes facilities in one process"
+                    )
+                since = parse_datetime(manifest["started_at"])
+                logger.info(f"Exporting facilities updated since {since}")
+                with open(previous_filename, "r") as previous_file:
+                    next(csv.reader(previous_file), None)
+                    total_facilities, serialized_facilities = write_delta(
+                        writer=writer,
+                        previous_file=previous_file,
+                        since=since,
+                        limit=limit,
+                    )
+                os.remove(previous_filename)
+                logger.info(
+                    f"Serialized {serialized_facilities} new or updated "
+                    "facilities"
+                )
+            elif workers > 1:
+                total_facilities = export_in_parallel(
+                    file=file,
+                    workers=workers,
                     limit=limit,
-                    id=last_id,
                 )
-                total_facilities += len(facilities)
-
-                if len(facilities) == 0:
-                    logger.info("No more facilities, breaking the loop!")
-                    break
-
-                write_facilities(
+            else:
+                total_facilities = write_facility_range(
                     writer=writer,
-                    facilities=facilities,
+                    limit=limit,
                 )
 
-                last_id = facilities[len(facilities) - 1].id
-                logger.info(f"Facilities processed: {len(facilities)}")
-                logger.info(f"End of iteration, ID: {last_id}")
+        if delta:
+            logger.info("Saving the export for the next delta export")
+            save_baseline(
+                filename=filename,
+                headers=headers,
+                reference_data=reference_data,
+                started_at=started_at,
+                total_facilities=total_facilities,
+            )
 
         logger.info("Starting to upload the file to Google Drive!")
         file_id = upload_file_to_google_drive(filename=filename)
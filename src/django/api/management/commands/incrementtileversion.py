@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.db.models import F
 
 from api.models import Version
+from api.tile_store import VectorTileStore
 
 
 class Command(BaseCommand):
@@ -12,3 +13,4 @@ class Command(BaseCommand):
         Version.objects \
                .filter(name='tile_version') \
                .update(version=F('version') + 1)
+        VectorTileStore().forget_tile_version()
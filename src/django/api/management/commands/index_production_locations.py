@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from waffle import switch_is_active
+
+from api.services.opensearch.opensearch import OpenSearchServiceConnection
+from api.services.opensearch.production_location_indexer import (
+    ProductionLocationIndexer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Reindexes the production locations recorded as changed in '
+        'api_productionlocationchange into the production-locations '
+        'OpenSearch index, waiting for new changes until stopped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help=(
+                'Exit once the recorded changes are indexed instead of '
+                'waiting for new ones.'
+            )
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help=(
+                'Number of changes to index per batch (default: '
+                'PRODUCTION_LOCATION_INDEXER_BATCH_SIZE).'
+            )
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options.get('batch_size')
+        if batch_size is not None and batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
+        if not switch_is_active('production_location_indexer'):
+            self.stderr.write(self.style.WARNING(
+                'The production_location_indexer switch is off, so no '
+                'changes are recorded for this command to index.'
+            ))
+
+        indexer = ProductionLocationIndexer(
+            OpenSearchServiceConnection().client,
+            batch_size=batch_size,
+        )
+        indexer.run(once=options['once'])
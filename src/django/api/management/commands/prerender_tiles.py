@@ -0,0 +1,115 @@
+import mercantile
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from api.models.facility.facility import Facility
+from api.models.facility.facility_index import FacilityIndex
+from api.tile_store import TILE_STORE_LAYERS, VectorTileStore
+from api.tiler import (
+    get_facilities_vector_tile,
+    get_facility_grid_vector_tile,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the unfiltered vector tile pyramid into the tile store so '
+        'low and mid zoom map views are served without querying PostGIS. '
+        'Tiles with no facilities within their render buffer are skipped '
+        'together with all of their children. Run it again after '
+        'incrementtileversion.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--layer',
+            choices=TILE_STORE_LAYERS,
+            action='append',
+            help=(
+                'Layer to render. Can be repeated '
+                '(default: facilitygrid).'
+            )
+        )
+        parser.add_argument(
+            '--min-zoom',
+            type=int,
+            default=0,
+            help='Lowest zoom level to render (default: 0).'
+        )
+        parser.add_argument(
+            '--max-zoom',
+            type=int,
+            default=settings.TILE_STORE_MAX_ZOOM,
+            help=(
+                'Highest zoom level to render (default: '
+                'TILE_STORE_MAX_ZOOM).'
+            )
+        )
+
+    def handle(self, *args, **options):
+        layers = options['layer'] or ['facilitygrid']
+        min_zoom = options['min_zoom']
+        max_zoom = options['max_zoom']
+        if min_zoom < 0 or min_zoom > max_zoom:
+            raise CommandError(
+                '--min-zoom must be between 0 and --max-zoom.'
+            )
+        if max_zoom > settings.TILE_STORE_MAX_ZOOM:
+            raise CommandError(
+                '--max-zoom must not exceed TILE_STORE_MAX_ZOOM '
+                f'({settings.TILE_STORE_MAX_ZOOM}).'
+            )
+
+        tile_store = VectorTileStore()
+        tile_version = Facility.current_tile_version()
+        params = QueryDict()
+        get_vector_tile = {
+            'facilities': get_facilities_vector_tile,
+            'facilitygrid': get_facility_grid_vector_tile,
+        }
+
+        self.stdout.write(
+            f'Rendering {", ".join(layers)} tiles for zoom levels '
+            f'{min_zoom}-{max_zoom} at tile version {tile_version}...'
+        )
+
+        rendered = 0
+        pending = [mercantile.Tile(x=0, y=0, z=0)]
+        while pending:
+            tile = pending.pop()
+            has_facilities = FacilityIndex.objects.filter(
+                location__within=VectorTileStore.get_buffered_polygon(tile)
+            ).exists()
+            if not has_facilities:
+                continue
+
+            if tile.z >= min_zoom:
+                for layer in layers:
+                    generation = tile_store.get_generation()
+                    try:
+                        vector_tile = get_vector_tile[layer](
+                            params, layer, tile.z, tile.x, tile.y
+                        )
+                    except EmptyResultSet:
+                        continue
+                    if vector_tile is None:
+                        continue
+                    tile_store.set_if_unchanged(
+                        generation,
+                        tile_version,
+                        layer,
+                        tile.z,
+                        tile.x,
+                        tile.y,
+                        vector_tile.tobytes(),
+                    )
+                    rendered += 1
+
+            if tile.z < max_zoom:
+                pending.extend(mercantile.children(tile))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rendered {rendered} tiles.')
+        )
@@ -4,7 +4,10 @@ from django.core.management.base import BaseCommand
 
 from api.models.partner_data_file_upload import PartnerDataFileUpload
 from api.partner_data_file_upload.constants import (
+    ROW_PROCESSING_CONCURRENCY,
     SHEETS_ROW_PROCESSING_DELAY_SECONDS,
+    SHEETS_WRITE_BATCH_SIZE,
+    SHEETS_WRITE_FLUSH_INTERVAL_SECONDS,
 )
 from api.partner_data_file_upload.processing.processor import (
     PartnerDataFileUploadProcessor,
@@ -22,6 +25,28 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("--queue_entry_uuid", type=str, required=False)
+        parser.add_argument(
+            "--write_batch_size",
+            type=int,
+            default=SHEETS_WRITE_BATCH_SIZE,
+            help=(
+                "Number of row outcomes written back to the sheet with one "
+                "request. With 1 and a concurrency of 1, the rows are "
+                "processed one at a time."
+            ),
+        )
+        parser.add_argument(
+            "--flush_interval_seconds",
+            type=float,
+            default=SHEETS_WRITE_FLUSH_INTERVAL_SECONDS,
+            help="Longest time a row outcome waits to be written back.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=ROW_PROCESSING_CONCURRENCY,
+            help="Number of rows whose moderation events are created at once.",
+        )
 
     def handle(self, *args, **options):
         queue_entry_uuid = options.get("queue_entry_uuid")
@@ -58,6 +83,9 @@ class Command(BaseCommand):
         processor = PartnerDataFileUploadProcessor(
             GoogleSheetClient.from_env(),
             row_processing_delay_seconds=SHEETS_ROW_PROCESSING_DELAY_SECONDS,
+            write_batch_size=options["write_batch_size"],
+            flush_interval_seconds=options["flush_interval_seconds"],
+            concurrency=options["concurrency"],
         )
         uploads_succeeded = 0
         uploads_failed = 0
@@ -0,0 +1,27 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from api.geocoding import (
+    GEOCODING_CACHE_PURGE_BATCH_SIZE,
+    purge_expired_geocoding_responses,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete the cached geocoding responses older than '
+        'GEOCODING_CACHE_TTL_DAYS, in batches that are each committed on '
+        'their own.'
+    )
+
+    def handle(self, *args, **kwargs):
+        purged = 0
+        while True:
+            deleted = purge_expired_geocoding_responses()
+            purged += deleted
+            if deleted < GEOCODING_CACHE_PURGE_BATCH_SIZE:
+                break
+        logger.info(f"Purged {purged} expired geocoding responses.")
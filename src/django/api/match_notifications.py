@@ -0,0 +1,122 @@
+"""Wake requests waiting for dedupe-hub to match a list item.
+
+Dedupe-hub sends a Postgres notification with the list item id on the
+`MATCH_NOTIFICATION_CHANNEL` channel once `Writer.write` has committed the
+matches of a list item. Each process keeps a single listener thread with its
+own database connection, started on first use, that hands the notifications
+to every waiter registered for that item.
+"""
+
+import logging
+import select
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Set
+
+import psycopg2
+from django.conf import settings
+from django.db import connections
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+log = logging.getLogger(__name__)
+
+# Seconds to wait for the connection to become readable before checking
+# whether it is still alive.
+LISTEN_POLL_SECONDS = 30
+# Seconds to wait before reconnecting after the listener connection failed.
+RECONNECT_DELAY_SECONDS = 5
+
+
+class MatchNotificationListener:
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.lock = threading.Lock()
+        self.waiters: Dict[str, Set[threading.Event]] = {}
+        self.thread = None
+        self.stopped = threading.Event()
+
+    @contextmanager
+    def subscribe(self, item_id) -> Iterator[threading.Event]:
+        """Yield an event that is set whenever the item is matched."""
+        key = str(item_id)
+        event = threading.Event()
+        with self.lock:
+            self.waiters.setdefault(key, set()).add(event)
+            self.start()
+        try:
+            yield event
+        finally:
+            with self.lock:
+                events = self.waiters.get(key)
+                if events is not None:
+                    events.discard(event)
+                    if not events:
+                        del self.waiters[key]
+
+    def start(self) -> None:
+        """Start the listener thread unless it is running. Must be called
+        with the lock held."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            target=self.run,
+            name='match-notification-listener',
+            daemon=True,
+        )
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def notify(self, payload: str) -> None:
+        with self.lock:
+            events = list(self.waiters.get(payload, ()))
+        for event in events:
+            event.set()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.listen()
+            except Exception as exc:
+                log.warning(
+                    f'[Match Notifications] Listener failed: {exc}'
+                )
+                self.stopped.wait(RECONNECT_DELAY_SECONDS)
+
+    def listen(self) -> None:
+        conn = psycopg2.connect(
+            **connections['default'].get_connection_params()
+        )
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}";')
+            # Waiters check the item after subscribing, so a notification
+            # sent before LISTEN took effect is never waited for. Wake
+            # everyone after reconnecting to recheck anyway.
+            with self.lock:
+                events = [e for es in self.waiters.values() for e in es]
+            for event in events:
+                event.set()
+
+            while not self.stopped.is_set():
+                readable, _, _ = select.select(
+                    [conn], [], [], LISTEN_POLL_SECONDS
+                )
+                if not readable:
+                    # Raises if the connection was dropped.
+                    with conn.cursor() as cursor:
+                        cursor.execute('SELECT 1;')
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.notify(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+
+match_notification_listener = MatchNotificationListener(
+    settings.MATCH_NOTIFICATION_CHANNEL
+)
@@ -6,17 +6,15 @@ from concurrent.futures import ThreadPoolExecutor
 import requests
 
 from django.utils import timezone
-from django.core.exceptions import ObjectDoesNotExist
 
 from django.conf import settings
 
 from rest_framework.authentication import get_authorization_header
-from rest_framework.authtoken.models import Token
 
 from django.http import HttpResponse
 
-from api.models import RequestLog
-from api.limits import get_api_block
+from api.request_log_writer import request_log_writer
+from api.token_meter import resolve_token_meter
 from api.middlewares.utils import is_health_check_request
 from oar.rollbar import report_error_to_rollbar
 
@@ -34,8 +32,8 @@ class RequestLogMiddleware:
                 auth = get_authorization_header(request)
                 if auth and auth.split()[0].lower() == 'token'.encode():
                     token = auth.split()[1].decode()
-                    RequestLog.objects.create(
-                        user=request.user,
+                    request_log_writer.write(
+                        user_id=request.user.pk,
                         token=token,
                         method=request.method,
                         path=request.get_full_path(),
@@ -54,46 +52,20 @@ class RequestLogMiddleware:
         return response
 
 
-def get_token(request):
-    auth_header = get_authorization_header(request).decode()
-    if auth_header and auth_header.split()[0].lower() == 'token':
-        try:
-            return Token.objects.get(key=auth_header.split()[1])
-        except Token.DoesNotExist:
-            # This function is designed to be called as part middleware and may
-            # execute before Django REST Framework has processed the token
-            # auth. A non-existent (invalid) token will be handled by that
-            # process, so at this point we just want to quietly return None
-            # rather than raise.
-            return None
-    else:
-        return None
-
-
 def has_active_block(request):
-    try:
-        token = get_token(request)
-        if token is None:
-            return False
-
-        contributor = token.user.contributor
-        apiBlock = get_api_block(contributor)
-        at_datetime = datetime.datetime.now(tz=timezone.get_default_timezone())
-        return (apiBlock is not None and
-                apiBlock.until > at_datetime and apiBlock.active)
-    except ObjectDoesNotExist:
+    token_meter = resolve_token_meter(request)
+    if token_meter is None or token_meter.block_until is None:
         return False
-    return False
+
+    at_datetime = datetime.datetime.now(tz=timezone.get_default_timezone())
+    return token_meter.block_until > at_datetime
 
 
 def token_has_contributor(request):
-    try:
-        token = get_token(request)
-        if token is None:
-            return True
-        return token.user.contributor is not None
-    except ObjectDoesNotExist:
-        return False
+    token_meter = resolve_token_meter(request)
+    if token_meter is None:
+        return True
+    return token_meter.contributor_id is not None
 
 
 class RequestMeterMiddleware:
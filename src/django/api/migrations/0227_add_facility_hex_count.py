@@ -0,0 +1,62 @@
+from django.db import connection, migrations, models
+from api.migrations._migration_helper import MigrationHelper
+
+helper = MigrationHelper(connection)
+
+
+def create_hex_count_functions_and_triggers(apps, schema_editor):
+    '''
+    Create the facility_hex_cell function, which assigns a point to its
+    facilitygrid hexagon, and the triggers that keep api_facilityhexcount
+    in step with api_facilityindex.
+    '''
+    helper.run_sql_files([
+        '0227_facility_hex_cell.sql',
+        '0227_create_facility_hex_count_triggers.sql',
+    ])
+
+
+def drop_hex_count_functions_and_triggers(apps, schema_editor):
+    helper.run_sql_files(['0227_drop_facility_hex_count_triggers.sql'])
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to add a table of precomputed facility counts per
+    facilitygrid hexagon and zoom level, used to render unfiltered grid
+    tiles without aggregating api_facilityindex. The table stays empty and
+    unused until the build_facility_hex_counts command is run.
+    """
+
+    dependencies = [
+        ('api', '0226_add_slc_submission_quality_check_switch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacilityHexCount',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID')),
+                ('zoom', models.PositiveSmallIntegerField(
+                    help_text='The tile zoom level of the hexagon grid.')),
+                ('hex_col', models.BigIntegerField(
+                    help_text='The global column of the hexagon.')),
+                ('hex_row', models.BigIntegerField(
+                    help_text='The global row of the hexagon.')),
+                ('count', models.IntegerField(
+                    default=0,
+                    help_text='The number of facilities in the hexagon.')),
+            ],
+            options={
+                'unique_together': {('zoom', 'hex_col', 'hex_row')},
+            },
+        ),
+        migrations.RunPython(
+            create_hex_count_functions_and_triggers,
+            drop_hex_count_functions_and_triggers,
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to add a table caching Google geocoding responses per
+    normalised address and country code, reused by api.geocoding until they
+    expire.
+    """
+
+    dependencies = [
+        ('api', '0227_add_facility_hex_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodingResult',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID')),
+                ('key', models.CharField(
+                    help_text=(
+                        'The SHA-256 hash of the normalised address and '
+                        'country.'
+                    ),
+                    max_length=64,
+                    unique=True)),
+                ('address', models.TextField(
+                    help_text='The normalised address that was geocoded.')),
+                ('country_code', models.CharField(
+                    help_text=(
+                        'The country code the geocoding request was limited '
+                        'to.'
+                    ),
+                    max_length=2)),
+                ('response', models.JSONField(
+                    help_text='The response of the Google Geocoding API.')),
+                ('geocoded_at', models.DateTimeField(
+                    db_index=True,
+                    help_text='When the address was last geocoded.')),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to add a table counting the successful API requests of each
+    user per day, rolled up from api_requestlog by check_api_limits.
+    """
+
+    dependencies = [
+        ('api', '0228_add_geocoding_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestLogDailyCount',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID')),
+                ('day', models.DateField(
+                    db_index=True,
+                    help_text='The day (UTC) the requests were made')),
+                ('count', models.PositiveIntegerField(
+                    help_text=(
+                        'The number of requests with a 2xx response code'
+                    ))),
+                ('user', models.ForeignKey(
+                    help_text='The User account that made the requests',
+                    on_delete=django.db.models.deletion.CASCADE,
+                    to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'day')},
+            },
+        ),
+    ]
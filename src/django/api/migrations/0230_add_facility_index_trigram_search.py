@@ -0,0 +1,60 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+from django.db.models.functions import Upper
+
+from api.models.facility.immutable_unaccent import ImmutableUnaccent
+
+
+CREATE_IMMUTABLE_UNACCENT = """
+    CREATE OR REPLACE FUNCTION immutable_unaccent(text)
+    RETURNS text AS $$
+        SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+"""
+
+DROP_IMMUTABLE_UNACCENT = """
+    DROP FUNCTION IF EXISTS immutable_unaccent(text);
+"""
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to add trigram indexes for the accent-insensitive `q` and `name`
+    searches of api_facilityindex, built on an IMMUTABLE wrapper of
+    unaccent(). The indexes are built concurrently so api_facilityindex stays
+    writable meanwhile, which requires a non-atomic migration.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0229_add_request_log_daily_count'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_IMMUTABLE_UNACCENT,
+            DROP_IMMUTABLE_UNACCENT,
+        ),
+        AddIndexConcurrently(
+            model_name='facilityindex',
+            index=GinIndex(
+                OpClass(
+                    Upper(ImmutableUnaccent('name')),
+                    name='gin_trgm_ops',
+                ),
+                name='api_facidx_name_trgm',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='facilityindex',
+            index=GinIndex(
+                OpClass(
+                    ImmutableUnaccent('custom_text_search'),
+                    name='gin_trgm_ops',
+                ),
+                name='api_facidx_custom_text_trgm',
+            ),
+        ),
+    ]
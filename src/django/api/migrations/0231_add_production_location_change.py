@@ -0,0 +1,75 @@
+from django.db import connection, migrations, models
+from api.migrations._migration_helper import MigrationHelper
+
+helper = MigrationHelper(connection)
+
+SWITCH_NAME = 'production_location_indexer'
+
+
+def create_switch(apps, schema_editor):
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.get_or_create(
+        name=SWITCH_NAME,
+        defaults={'active': False},
+    )
+
+
+def delete_switch(apps, schema_editor):
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name=SWITCH_NAME).delete()
+
+
+def create_production_location_change_triggers(apps, schema_editor):
+    '''
+    Create the record_production_location_changes function and the triggers
+    that record the locations changed by a statement on the tables the
+    production-locations OpenSearch documents are built from, while the
+    production_location_indexer switch is on.
+    '''
+    helper.run_sql_files([
+        '0231_create_production_location_change_triggers.sql',
+    ])
+
+
+def drop_production_location_change_triggers(apps, schema_editor):
+    helper.run_sql_files([
+        '0231_drop_production_location_change_triggers.sql',
+    ])
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to add an outbox of changed production locations, filled by
+    triggers in the transaction of the change and consumed by the
+    index_production_locations command to keep the production-locations
+    OpenSearch index in step. The triggers only record changes while the
+    production_location_indexer switch, created inactive, is on.
+    """
+
+    dependencies = [
+        ('api', '0230_add_facility_index_trigram_search'),
+        ('waffle', '0003_update_strings_for_i18n'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductionLocationChange',
+            fields=[
+                ('id', models.BigAutoField(
+                    primary_key=True,
+                    serialize=False)),
+                ('os_id', models.CharField(
+                    db_index=True,
+                    help_text='The OS ID of the changed production location.',
+                    max_length=32)),
+                ('created_at', models.DateTimeField(
+                    auto_now_add=True,
+                    help_text='When the change was recorded.')),
+            ],
+        ),
+        migrations.RunPython(create_switch, delete_switch),
+        migrations.RunPython(
+            create_production_location_change_triggers,
+            drop_production_location_change_triggers,
+        ),
+    ]
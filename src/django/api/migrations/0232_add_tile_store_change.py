@@ -0,0 +1,57 @@
+import django.contrib.gis.db.models.fields
+from django.db import connection, migrations, models
+from api.migrations._migration_helper import MigrationHelper
+
+helper = MigrationHelper(connection)
+
+
+def create_tile_store_change_triggers(apps, schema_editor):
+    '''
+    Create the record_tile_store_changes function and the triggers that
+    record the locations of the facilities changed by a statement on the
+    tables the vector tiles are rendered from.
+    '''
+    helper.run_sql_files([
+        '0232_create_tile_store_change_triggers.sql',
+    ])
+
+
+def drop_tile_store_change_triggers(apps, schema_editor):
+    helper.run_sql_files([
+        '0232_drop_tile_store_change_triggers.sql',
+    ])
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to add an outbox of changed facility locations, filled by
+    triggers in the transaction of the change and consumed by the tile store
+    to invalidate the stored vector tiles covering them.
+    """
+
+    dependencies = [
+        ('api', '0231_add_production_location_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TileStoreChange',
+            fields=[
+                ('id', models.BigAutoField(
+                    primary_key=True,
+                    serialize=False)),
+                ('location', django.contrib.gis.db.models.fields.PointField(
+                    help_text=(
+                        'The old or new location of the changed facility.'
+                    ),
+                    srid=4326)),
+                ('created_at', models.DateTimeField(
+                    auto_now_add=True,
+                    help_text='When the change was recorded.')),
+            ],
+        ),
+        migrations.RunPython(
+            create_tile_store_change_triggers,
+            drop_tile_store_change_triggers,
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to count the failed indexing attempts of the production
+    location changes, so that the index_production_locations command parks
+    the changes OpenSearch keeps rejecting instead of retrying them first
+    forever.
+    """
+
+    dependencies = [
+        ('api', '0232_add_tile_store_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productionlocationchange',
+            name='attempts',
+            field=models.PositiveIntegerField(
+                default=0,
+                db_default=0,
+                help_text=(
+                    'The number of times indexing the change failed. Changes '
+                    'that failed PRODUCTION_LOCATION_INDEXER_MAX_ATTEMPTS '
+                    'times are no longer retried.'
+                ),
+            ),
+        ),
+        migrations.AddField(
+            model_name='productionlocationchange',
+            name='last_error',
+            field=models.TextField(
+                blank=True,
+                null=True,
+                help_text='The error of the last failed attempt.',
+            ),
+        ),
+    ]
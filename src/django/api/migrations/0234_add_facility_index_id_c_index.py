@@ -0,0 +1,28 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.models.functions import Collate
+
+
+class Migration(migrations.Migration):
+    """
+    Migration to index the IDs of api_facilityindex in the "C" collation,
+    the order export_csv pages through the facilities in. The index is built
+    concurrently so api_facilityindex stays writable meanwhile, which
+    requires a non-atomic migration.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('api', '0233_add_production_location_change_attempts'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='facilityindex',
+            index=models.Index(
+                Collate('id', 'C'),
+                name='api_facidx_id_c',
+            ),
+        ),
+    ]
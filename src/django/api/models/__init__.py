@@ -43,6 +43,7 @@ from .facility.facility_claim_review_note import (
 from .facility.facility_claim_attachments import (
     FacilityClaimAttachments
 )
+from .facility.facility_hex_count import FacilityHexCount
 from .facility.facility_list import FacilityList
 from .facility.facility_list_item import FacilityListItem
 from .facility.facility_list_item_temp import FacilityListItemTemp
@@ -60,6 +61,7 @@ from .download_log import DownloadLog
 from .embed_config import EmbedConfig
 from .embed_field import EmbedField
 from .event import Event
+from .geocoding_result import GeocodingResult
 from .extended_field import (
   ExtendedField,
   HistoricalExtendedField
@@ -70,9 +72,12 @@ from .partner_data_file_upload import PartnerDataFileUpload
 from .partner_field_group import PartnerFieldGroup
 from .product_type import ProductType
 from .production_type import ProductionType
+from .production_location_change import ProductionLocationChange
 from .request_log import RequestLog
+from .request_log_daily_count import RequestLogDailyCount
 from .sector import Sector
 from .source import Source
+from .tile_store_change import TileStoreChange
 from .user import (
   EmailAsUsernameUserManager,
   get_default_burst_rate,
@@ -161,6 +161,7 @@ class Contributor(models.Model):
 
     def save(self, *args, **kwargs):
         should_invalidate = False
+        embed_changed = False
         if self._state.adding:
             # A new contributor whose flag is on immediately affects the
             # cached masked set, so invalidate before the first request hits.
@@ -168,8 +169,13 @@ class Contributor(models.Model):
         else:
             try:
                 previous = Contributor.objects.values(
-                    'anonymise_in_paid_products', 'admin_id', 'name'
+                    'anonymise_in_paid_products', 'admin_id', 'name',
+                    'embed_level', 'embed_config_id'
                 ).get(pk=self.pk)
+                embed_changed = (
+                    previous['embed_level'] != self.embed_level
+                    or previous['embed_config_id'] != self.embed_config_id
+                )
                 was_masked = previous['anonymise_in_paid_products']
                 is_masked = self.anonymise_in_paid_products
                 if was_masked != is_masked:
@@ -183,9 +189,18 @@ class Contributor(models.Model):
                     )
             except Contributor.DoesNotExist:
                 should_invalidate = True
+                embed_changed = True
 
         super().save(*args, **kwargs)
 
+        if embed_changed:
+            # Drop the embed settings cached for embedded map requests once
+            # the change is committed.
+            # Imported lazily to avoid a circular import: the service imports
+            # this model.
+            from api.services.embed_context import EmbedContext
+            EmbedContext.invalidate(self.pk)
+
         if should_invalidate:
             # Drop only the masked-contributor set (not the whole view_cache)
             # so an admin toggle takes effect on the next list API / download
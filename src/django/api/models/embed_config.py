@@ -1,3 +1,4 @@
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 
 
@@ -55,6 +56,23 @@ class EmbedConfig(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # Drop the embed settings cached for embedded map requests once the
+        # fields saved with the config are committed too. A new config has
+        # no contributor yet; it is dropped when the contributor is saved
+        # with it.
+        try:
+            contributor_id = self.contributor.id
+        except ObjectDoesNotExist:
+            return
+
+        # Imported lazily to avoid a circular import: the service imports
+        # Contributor.
+        from api.services.embed_context import EmbedContext
+        EmbedContext.invalidate(contributor_id)
+
     def __str__(self):
         return ('EmbedConfig {id}, '
                 'Size: {width} x {height} '
@@ -296,22 +296,26 @@ class Facility(models.Model):
         )
 
     @staticmethod
-    def current_tile_cache_key():
-        latest = Facility.objects.order_by('-updated_at').first()
-        if latest is None:
-            timestamp = '0'
-        else:
-            timestamp = int(latest.updated_at.timestamp())
+    def current_tile_version():
         from ..version import Version
         try:
-            tile_version = (
+            return (
                 Version
                 .objects
                 .get(name='tile_version')
                 .version
             )
         except Version.DoesNotExist:
-            tile_version = 0
+            return 0
+
+    @staticmethod
+    def current_tile_cache_key():
+        latest = Facility.objects.order_by('-updated_at').first()
+        if latest is None:
+            timestamp = '0'
+        else:
+            timestamp = int(latest.updated_at.timestamp())
+        tile_version = Facility.current_tile_version()
 
         return f'{timestamp}-{tile_version}'
 
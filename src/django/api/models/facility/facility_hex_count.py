@@ -0,0 +1,76 @@
+from django.core.cache import caches
+from django.db import models
+
+MAX_ZOOM_VERSION_NAME = 'facility_hex_count_max_zoom'
+# The highest zoom level with counts is kept in the tile store cache for this
+# long, so that grid tiles do not look it up. `build_facility_hex_counts`
+# drops it once it has changed.
+MAX_ZOOM_CACHE_KEY = 'facility_hex_count_max_zoom'
+MAX_ZOOM_CACHE_TIMEOUT = 60
+
+
+class FacilityHexCount(models.Model):
+    """
+    Stores the number of indexed facilities in each hexagon of the unfiltered
+    `facilitygrid` tile layer, per zoom level.
+
+    Rows are built by the `build_facility_hex_counts` command and kept up to
+    date by the `update_facility_hex_counts` trigger on `api_facilityindex`
+    for every zoom up to the `facility_hex_count_max_zoom` version row.
+    Cells are addressed as in `api.hexgrid.HexGrid`.
+    """
+    class Meta:
+        unique_together = ('zoom', 'hex_col', 'hex_row')
+
+    zoom = models.PositiveSmallIntegerField(
+        null=False,
+        help_text='The tile zoom level of the hexagon grid.')
+    hex_col = models.BigIntegerField(
+        null=False,
+        help_text='The global column of the hexagon.')
+    hex_row = models.BigIntegerField(
+        null=False,
+        help_text='The global row of the hexagon.')
+    count = models.IntegerField(
+        null=False,
+        default=0,
+        help_text='The number of facilities in the hexagon.')
+
+    @staticmethod
+    def current_max_zoom():
+        """Return the highest zoom level with counts, or -1 if the counts
+        have not been built."""
+        from ..version import Version
+        try:
+            return (
+                Version
+                .objects
+                .get(name=MAX_ZOOM_VERSION_NAME)
+                .version
+            )
+        except Version.DoesNotExist:
+            return -1
+
+    @staticmethod
+    def cached_max_zoom():
+        """Return `current_max_zoom()`, kept in the tile store cache for
+        MAX_ZOOM_CACHE_TIMEOUT seconds."""
+        cache = caches['tile_store']
+        try:
+            max_zoom = cache.get(MAX_ZOOM_CACHE_KEY)
+        except Exception:
+            max_zoom = None
+        if max_zoom is None:
+            max_zoom = FacilityHexCount.current_max_zoom()
+            try:
+                cache.set(MAX_ZOOM_CACHE_KEY, max_zoom, MAX_ZOOM_CACHE_TIMEOUT)
+            except Exception:
+                pass
+        return max_zoom
+
+    @staticmethod
+    def forget_max_zoom():
+        try:
+            caches['tile_store'].delete(MAX_ZOOM_CACHE_KEY)
+        except Exception:
+            pass
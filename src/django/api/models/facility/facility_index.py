@@ -1,12 +1,14 @@
 import uuid
 from django.contrib.gis.db import models as gis_models
 from django.contrib.postgres import fields as postgres
-from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Collate, Upper
 
 from countries.lib.countries import COUNTRY_CHOICES
 from ..contributor.contributor import Contributor
 from .facility_manager_index_new import FacilityIndexNewManager
+from .immutable_unaccent import ImmutableUnaccent
 from api.constants import OriginSource
 
 
@@ -226,6 +228,33 @@ class FacilityIndex(models.Model):
     objects = FacilityIndexNewManager()
 
     class Meta:
-        indexes = [GinIndex(
-            fields=['contrib_types', 'contributors_id', 'lists']
-        )]
+        indexes = [
+            GinIndex(
+                fields=['contrib_types', 'contributors_id', 'lists']
+            ),
+            # Trigram indexes for the `q` and `name` filters of
+            # FacilityIndexNewManager, which match the name with
+            # `immutable_unaccent__icontains` and, in embed mode, the custom
+            # text with `immutable_unaccent__contains`.
+            GinIndex(
+                OpClass(
+                    Upper(ImmutableUnaccent('name')),
+                    name='gin_trgm_ops',
+                ),
+                name='api_facidx_name_trgm',
+            ),
+            GinIndex(
+                OpClass(
+                    ImmutableUnaccent('custom_text_search'),
+                    name='gin_trgm_ops',
+                ),
+                name='api_facidx_custom_text_trgm',
+            ),
+            # The bytewise ID order export_csv pages through facilities in,
+            # which the primary key index in the database collation does not
+            # cover.
+            models.Index(
+                Collate('id', 'C'),
+                name='api_facidx_id_c',
+            ),
+        ]
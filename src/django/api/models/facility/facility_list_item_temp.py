@@ -198,7 +198,17 @@ class FacilityListItemTemp(models.Model):
 
     @staticmethod
     def copy(item):
-        FacilityListItemTemp.objects.create(
+        FacilityListItemTemp.from_item(item).save(force_insert=True)
+
+    @staticmethod
+    def copy_all(items):
+        FacilityListItemTemp.objects.bulk_create(
+            [FacilityListItemTemp.from_item(item) for item in items]
+        )
+
+    @staticmethod
+    def from_item(item):
+        return FacilityListItemTemp(
             id=item.id,
             source=item.source,
             facility_id=item.facility_id,
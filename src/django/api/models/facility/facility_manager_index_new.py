@@ -91,7 +91,11 @@ class FacilityIndexNewManager(models.Manager):
             facilities_qs = facilities_qs.filter(id=id)
 
         if free_text_query is not None:
-            name_filter = Q(name__unaccent__icontains=free_text_query)
+            # `immutable_unaccent` rather than `unaccent`, so the trigram
+            # indexes of FacilityIndex are used.
+            name_filter = Q(
+                name__immutable_unaccent__icontains=free_text_query
+            )
             if embed is not None:
                 custom_text = (
                     format_custom_text(contributors[0], free_text_query)
@@ -99,7 +103,9 @@ class FacilityIndexNewManager(models.Manager):
                     else free_text_query
                 )
                 custom_text_search_filter = Q(
-                    custom_text_search__unaccent__contains=custom_text
+                    custom_text_search__immutable_unaccent__contains=(
+                        custom_text
+                    )
                 )
 
                 facilities_qs = facilities_qs \
@@ -114,7 +120,7 @@ class FacilityIndexNewManager(models.Manager):
         # `name` is deprecated in favor of `q`. We keep `name` available for
         # backward compatibility.
         if name is not None:
-            name_filter = Q(name__unaccent__icontains=name)
+            name_filter = Q(name__immutable_unaccent__icontains=name)
             facilities_qs = facilities_qs.filter(name_filter | Q(id=name))
 
         if countries is not None and len(countries):
@@ -0,0 +1,22 @@
+from django.db.models import CharField, TextField, Transform
+
+
+class ImmutableUnaccent(Transform):
+    """
+    Remove accents like the `unaccent` lookup of django.contrib.postgres,
+    but with the `immutable_unaccent` SQL function created in migration 0230.
+
+    `unaccent` is only STABLE because its dictionary can change, so Postgres
+    won't index an expression that uses it. `immutable_unaccent` names the
+    dictionary and is declared IMMUTABLE, so the trigram indexes of
+    `FacilityIndex` can be built on it. Lookups written as
+    `name__immutable_unaccent__icontains` match those indexes.
+    """
+    bilateral = True
+    lookup_name = 'immutable_unaccent'
+    function = 'immutable_unaccent'
+    output_field = TextField()
+
+
+CharField.register_lookup(ImmutableUnaccent)
+TextField.register_lookup(ImmutableUnaccent)
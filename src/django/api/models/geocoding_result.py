@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class GeocodingResult(models.Model):
+    """
+    Caches the Google Geocoding API response for an address and country so
+    that the same location is not geocoded again for every list it appears
+    in. Rows are looked up by `key`, a hash of the normalised address and
+    country code, and are reused until they are older than the TTL of
+    `api.geocoding.get_geocoding_response`. The hourly
+    `purge_geocoding_results` command deletes the rows older than
+    `GEOCODING_CACHE_TTL_DAYS`.
+    """
+    key = models.CharField(
+        max_length=64,
+        null=False,
+        blank=False,
+        unique=True,
+        help_text='The SHA-256 hash of the normalised address and country.')
+    address = models.TextField(
+        null=False,
+        blank=False,
+        help_text='The normalised address that was geocoded.')
+    country_code = models.CharField(
+        max_length=2,
+        null=False,
+        blank=False,
+        help_text='The country code the geocoding request was limited to.')
+    response = models.JSONField(
+        null=False,
+        help_text='The response of the Google Geocoding API.')
+    geocoded_at = models.DateTimeField(
+        null=False,
+        db_index=True,
+        help_text='When the address was last geocoded.')
+
+    def __str__(self):
+        return f'{self.address} ({self.country_code})'
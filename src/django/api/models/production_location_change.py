@@ -0,0 +1,42 @@
+from django.db import models
+
+
+class ProductionLocationChange(models.Model):
+    """
+    An outbox entry recording that the production location with the OS ID
+    may have changed and its document in the production-locations OpenSearch
+    index has to be rebuilt.
+
+    Rows are inserted by the `record_production_location_changes` triggers
+    on the tables the document is built from, in the same transaction as
+    the change, and are consumed and deleted by the
+    `index_production_locations` command. The triggers only record changes
+    while the `production_location_indexer` switch is on, which should be
+    the case only where that command runs.
+    """
+    id = models.BigAutoField(primary_key=True)
+    os_id = models.CharField(
+        max_length=32,
+        null=False,
+        db_index=True,
+        help_text='The OS ID of the changed production location.')
+    created_at = models.DateTimeField(
+        null=False,
+        auto_now_add=True,
+        help_text='When the change was recorded.')
+    attempts = models.PositiveIntegerField(
+        null=False,
+        default=0,
+        db_default=0,
+        help_text=(
+            'The number of times indexing the change failed. Changes that '
+            'failed PRODUCTION_LOCATION_INDEXER_MAX_ATTEMPTS times are no '
+            'longer retried.'
+        ))
+    last_error = models.TextField(
+        null=True,
+        blank=True,
+        help_text='The error of the last failed attempt.')
+
+    def __str__(self):
+        return f'{self.os_id} ({self.created_at})'
@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class RequestLogDailyCount(models.Model):
+    """
+    The number of successful API requests a User made on a day (UTC), rolled
+    up from the RequestLog by `api.limits.rollup_request_log_daily_counts`
+    once the day is over, so that API limits are checked against a few rows
+    per contributor rather than every request ever logged.
+    """
+    class Meta:
+        unique_together = ('user', 'day')
+
+    user = models.ForeignKey(
+        'User',
+        null=False,
+        on_delete=models.CASCADE,
+        help_text='The User account that made the requests'
+    )
+    day = models.DateField(
+        null=False,
+        db_index=True,
+        help_text='The day (UTC) the requests were made'
+    )
+    count = models.PositiveIntegerField(
+        null=False,
+        help_text='The number of requests with a 2xx response code'
+    )
+
+    def __str__(self):
+        return f'{self.day} - {self.user_id}: {self.count}'
@@ -0,0 +1,25 @@
+from django.contrib.gis.db import models as gis_models
+from django.db import models
+
+
+class TileStoreChange(models.Model):
+    """
+    An outbox entry recording that the stored vector tiles covering the
+    location may be out of date.
+
+    Rows are inserted by the `record_tile_store_changes` triggers on
+    `api_facility` and `api_facilityindex`, in the same transaction as the
+    change, whichever code made it, and are consumed and deleted by
+    `VectorTileStore.invalidate_changes`.
+    """
+    id = models.BigAutoField(primary_key=True)
+    location = gis_models.PointField(
+        null=False,
+        help_text='The old or new location of the changed facility.')
+    created_at = models.DateTimeField(
+        null=False,
+        auto_now_add=True,
+        help_text='When the change was recorded.')
+
+    def __str__(self):
+        return f'{self.location} ({self.created_at})'
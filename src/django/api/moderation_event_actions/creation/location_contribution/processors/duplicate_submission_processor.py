@@ -3,7 +3,10 @@ import re
 from datetime import timedelta
 from difflib import SequenceMatcher
 
+from django.contrib.postgres.search import TrigramSimilarity
 from django.db import connection
+from django.db.models import F
+from django.db.models.fields.json import KeyTextTransform
 from django.utils import timezone
 from rest_framework import status
 
@@ -19,7 +22,9 @@ from api.constants import APIV1LocationContributionErrorMessages
 # becomes visible via the pre-submission search: up to 15 minutes for the
 # auto-approval automation to pick up the pending moderation event, plus up
 # to another 15 minutes for the Logstash pipeline to reindex the approved
-# facility into the production-locations OpenSearch index.
+# facility into the production-locations OpenSearch index. The
+# index_production_locations command reindexes it within seconds instead, but
+# the window stays sized for environments still relying on Logstash.
 DUPLICATE_CHECK_WINDOW_MINUTES = 30
 
 # Both name and address must be at least this similar (SequenceMatcher ratio,
@@ -30,6 +35,19 @@ DUPLICATE_CHECK_WINDOW_MINUTES = 30
 NAME_SIMILARITY_THRESHOLD = 0.9
 ADDRESS_SIMILARITY_THRESHOLD = 0.9
 
+# Recent submissions whose cleaned name or address is less similar than this
+# to the new one (pg_trgm trigram similarity, 0-1) are filtered out in the
+# database, before the SequenceMatcher ratios above are computed. This is a
+# heuristic, not a lower bound of the SequenceMatcher ratio: trigram
+# similarity drops much faster than the ratio when a few characters of a
+# short value change. One or two typos in realistic names have been seen
+# with a ratio of 0.9 and a trigram similarity as low as 0.33, but contrived
+# values (e.g. a repeated short pattern shifted by one character) can score a
+# ratio of 0.9 or more with a trigram similarity below 0.3, and are dropped.
+# A blank new value is never prefiltered, since pg_trgm scores it 0 while
+# SequenceMatcher scores it 1.0 against another blank value.
+CANDIDATE_TRIGRAM_SIMILARITY_THRESHOLD = 0.3
+
 # Matches any numeric token in a cleaned name or address, e.g. "990" and
 # "19123" in "990 spring garden st. philadelphia pa 19123", or "2" in "blue
 # horizon facility unit 2". A distinguishing number (street number, suite/
@@ -145,51 +163,77 @@ class DuplicateSubmissionProcessor(ContributionProcessor):
         cutoff = timezone.now() - timedelta(
             minutes=DUPLICATE_CHECK_WINDOW_MINUTES
         )
-        recent_events = ModerationEvent.objects.filter(
+        new_country = event_dto.cleaned_data.get('country_code')
+        new_name = event_dto.cleaned_data.get('clean_name') or ''
+        new_address = event_dto.cleaned_data.get('clean_address') or ''
+
+        candidates = ModerationEvent.objects.filter(
             contributor=event_dto.contributor,
             source=ModerationEvent.Source.SLC.value,
             request_type=ModerationEvent.RequestType.CREATE.value,
             created_at__gte=cutoff,
-        ).exclude(status=ModerationEvent.Status.REJECTED.value)
-
-        new_country = event_dto.cleaned_data.get('country_code')
-        new_name = event_dto.cleaned_data.get('clean_name', '')
-        new_address = event_dto.cleaned_data.get('clean_address', '')
-
-        for candidate in recent_events:
-            if candidate.cleaned_data.get('country_code') != new_country:
-                continue
+            cleaned_data__country_code=new_country,
+        ).exclude(
+            status=ModerationEvent.Status.REJECTED.value
+        ).annotate(
+            name_similarity=TrigramSimilarity(
+                KeyTextTransform('clean_name', 'cleaned_data'),
+                new_name,
+            ),
+            address_similarity=TrigramSimilarity(
+                KeyTextTransform('clean_address', 'cleaned_data'),
+                new_address,
+            ),
+        )
+        if new_name:
+            candidates = candidates.filter(
+                name_similarity__gte=CANDIDATE_TRIGRAM_SIMILARITY_THRESHOLD
+            )
+        if new_address:
+            candidates = candidates.filter(
+                address_similarity__gte=CANDIDATE_TRIGRAM_SIMILARITY_THRESHOLD
+            )
+        candidates = candidates.order_by(
+            F('name_similarity').desc(nulls_last=True),
+            F('address_similarity').desc(nulls_last=True),
+        ).only('uuid', 'created_at', 'cleaned_data')
 
-            candidate_name = candidate.cleaned_data.get('clean_name', '')
-            if DuplicateSubmissionProcessor.__numbers_differ(
-                new_name, candidate_name
+        for candidate in candidates:
+            if not DuplicateSubmissionProcessor.__is_similar(
+                new_name,
+                candidate.cleaned_data.get('clean_name') or '',
+                NAME_SIMILARITY_THRESHOLD,
             ):
                 continue
 
-            name_similarity = SequenceMatcher(
-                None, new_name, candidate_name
-            ).ratio()
-            if name_similarity < NAME_SIMILARITY_THRESHOLD:
-                continue
-
-            candidate_address = candidate.cleaned_data.get(
-                'clean_address', ''
-            )
-            if DuplicateSubmissionProcessor.__numbers_differ(
-                new_address, candidate_address
+            if not DuplicateSubmissionProcessor.__is_similar(
+                new_address,
+                candidate.cleaned_data.get('clean_address') or '',
+                ADDRESS_SIMILARITY_THRESHOLD,
             ):
                 continue
 
-            address_similarity = SequenceMatcher(
-                None, new_address, candidate_address
-            ).ratio()
-            if address_similarity < ADDRESS_SIMILARITY_THRESHOLD:
-                continue
-
             return candidate
 
         return None
 
+    @staticmethod
+    def __is_similar(value: str, other_value: str, threshold: float) -> bool:
+        '''
+        real_quick_ratio and quick_ratio are cheap upper bounds of the
+        SequenceMatcher ratio, so most pairs below the threshold are
+        rejected without computing the ratio itself.
+        '''
+        if DuplicateSubmissionProcessor.__numbers_differ(value, other_value):
+            return False
+
+        matcher = SequenceMatcher(None, value, other_value)
+        return (
+            matcher.real_quick_ratio() >= threshold
+            and matcher.quick_ratio() >= threshold
+            and matcher.ratio() >= threshold
+        )
+
     @staticmethod
     def __numbers_differ(value: str, other_value: str) -> bool:
         '''
@@ -1,4 +1,6 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from threading import BoundedSemaphore
 
 from rest_framework import status
 from waffle import switch_is_active
@@ -9,7 +11,10 @@ from api.moderation_event_actions.creation.dtos.create_moderation_event_dto \
     import CreateModerationEventDTO
 from api.models.moderation_event import ModerationEvent
 from api.constants import APIV1LocationContributionErrorMessages
-from api.services.submission_quality_service import SubmissionQualityService
+from api.services.submission_quality_service import (
+    INVOKE_TIMEOUT_SECONDS,
+    SubmissionQualityService,
+)
 from countries.lib.countries import COUNTRY_NAMES
 
 logger = logging.getLogger(__name__)
@@ -33,6 +38,16 @@ _WARNING_TITLES = {
     'multiple_locations': 'Submission May Describe Multiple Locations',
 }
 
+# Longest time to wait for the verdicts once the rest of the chain is done:
+# the connect and read timeouts of the model call. A check that takes
+# longer fails open, like any other failed check.
+QUALITY_CHECK_WAIT_SECONDS = 2 * INVOKE_TIMEOUT_SECONDS
+
+# Most checks a process runs at once. A submission arriving while this many
+# are in flight fails open right away instead of queueing a model call that
+# would only run, and be billed, after the submission stopped waiting for it.
+MAX_CONCURRENT_QUALITY_CHECKS = 10
+
 
 class SubmissionQualityProcessor(ContributionProcessor):
     '''
@@ -48,8 +63,21 @@ class SubmissionQualityProcessor(ContributionProcessor):
     dismissed the warnings. The whole check sits behind the
     slc_submission_quality_check waffle switch (on by default), so it
     can be turned off in the Django admin without a deploy.
+
+    The model call is made in a background thread while the rest of the
+    chain (geocoding) runs, rather than before it, so a submission waits
+    for the slower of the two external calls instead of both. Warnings
+    take precedence over any error from the rest of the chain, as they
+    did when the check ran first.
     '''
 
+    # Shared by all requests of the process. The model call only waits on
+    # the network and doesn't touch the database. A slot is taken for every
+    # submitted check and given back once it is done or cancelled, so that
+    # checks never queue behind the workers.
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUALITY_CHECKS)
+    check_slots = BoundedSemaphore(MAX_CONCURRENT_QUALITY_CHECKS)
+
     def __init__(self, quality_service: SubmissionQualityService = None):
         self._quality_service = quality_service or SubmissionQualityService()
 
@@ -75,7 +103,27 @@ class SubmissionQualityProcessor(ContributionProcessor):
             )
             return super().process(event_dto)
 
-        warnings = self.__collect_warnings(event_dto)
+        if not self.check_slots.acquire(blocking=False):
+            logger.warning(
+                'Too many submission quality checks in flight; skipping '
+                '(fail open): contributor=%s',
+                event_dto.contributor.id,
+            )
+            return super().process(event_dto)
+
+        try:
+            pending_warnings = self.executor.submit(
+                self.__collect_warnings, event_dto
+            )
+        except Exception:
+            self.check_slots.release()
+            raise
+        pending_warnings.add_done_callback(
+            lambda _: self.check_slots.release()
+        )
+        event_dto = super().process(event_dto)
+
+        warnings = self.__wait_for_warnings(pending_warnings, event_dto)
         if warnings:
             logger.info(
                 'Submission quality warnings raised: contributor=%s '
@@ -93,9 +141,28 @@ class SubmissionQualityProcessor(ContributionProcessor):
             }
             event_dto.status_code = status.HTTP_409_CONFLICT
 
-            return event_dto
+        return event_dto
 
-        return super().process(event_dto)
+    @staticmethod
+    def __wait_for_warnings(
+            pending_warnings, event_dto: CreateModerationEventDTO) -> list:
+        try:
+            return pending_warnings.result(
+                timeout=QUALITY_CHECK_WAIT_SECONDS
+            )
+        except TimeoutError:
+            # Drops the model call if it hasn't started yet.
+            pending_warnings.cancel()
+            logger.warning(
+                'Submission quality check timed out; skipping (fail open): '
+                'contributor=%s',
+                event_dto.contributor.id,
+            )
+        except Exception:
+            logger.exception(
+                'Submission quality check failed; skipping (fail open).'
+            )
+        return []
 
     def __collect_warnings(
             self, event_dto: CreateModerationEventDTO) -> list:
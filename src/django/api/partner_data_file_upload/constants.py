@@ -40,6 +40,12 @@ SHEET_TRACKING_COLUMNS = ("error", "moderation_id")
 
 # Stay under Google Sheets write quota (60 requests/min per user).
 SHEETS_ROW_PROCESSING_DELAY_SECONDS = 1.1
+# Row outcomes are written back with one request per this many rows, or
+# after this many seconds, whichever comes first.
+SHEETS_WRITE_BATCH_SIZE = 50
+SHEETS_WRITE_FLUSH_INTERVAL_SECONDS = 10
+# Number of rows whose moderation events are created at the same time.
+ROW_PROCESSING_CONCURRENCY = 4
 
 SNAKE_CASE_COLUMN_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
 RESERVED_COLUMNS = frozenset({"os_id", "error", "moderation_id"})
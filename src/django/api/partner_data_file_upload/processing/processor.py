@@ -1,7 +1,10 @@
 import logging
 import time
-from typing import Dict, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
 
+from django.db import connection
 from django.utils import timezone
 
 from api.models.partner_data_file_upload import PartnerDataFileUpload
@@ -11,13 +14,22 @@ from api.moderation_event_actions.creation.location_contribution.location_contri
 from api.moderation_event_actions.creation.moderation_event_creator import (
     ModerationEventCreator,
 )
+from api.partner_data_file_upload.constants import (
+    SHEETS_WRITE_FLUSH_INTERVAL_SECONDS,
+)
 from api.partner_data_file_upload.errors import format_upload_processing_error
 from api.partner_data_file_upload.parsing.parser import PartnerFieldSheetParser
-from api.partner_data_file_upload.parsing.types import SheetProcessingContext
+from api.partner_data_file_upload.parsing.types import (
+    ColumnMapping,
+    SheetProcessingContext,
+)
 from api.partner_data_file_upload.processing.event_creator import (
     PartnerPatchModerationEventCreator,
 )
 from api.partner_data_file_upload.sheets.client import GoogleSheetClient
+from api.partner_data_file_upload.sheets.row_outcome_writer import (
+    RowOutcomeWriter,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +40,15 @@ class PartnerDataFileUploadProcessor:
         sheets_client: GoogleSheetClient,
         me_creator: Optional[ModerationEventCreator] = None,
         row_processing_delay_seconds: float = 0,
+        write_batch_size: int = 1,
+        flush_interval_seconds: float = SHEETS_WRITE_FLUSH_INTERVAL_SECONDS,
+        concurrency: int = 1,
     ):
         self.sheets_client = sheets_client
         self.row_processing_delay_seconds = row_processing_delay_seconds
+        self.write_batch_size = write_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.concurrency = max(concurrency, 1)
         self.event_creator = PartnerPatchModerationEventCreator(
             me_creator or ModerationEventCreator(LocationContribution())
         )
@@ -113,8 +131,6 @@ class PartnerDataFileUploadProcessor:
         queue_row: PartnerDataFileUpload,
         context: SheetProcessingContext,
     ) -> Dict[str, int]:
-        error_col = context.tracking_columns["error"]
-        moderation_id_col = context.tracking_columns["moderation_id"]
         row_stats = {
             "rows_succeeded": 0,
             "rows_failed": 0,
@@ -128,6 +144,40 @@ class PartnerDataFileUploadProcessor:
             len(context.workbook.rows),
         )
 
+        pending_rows = self._iter_pending_rows(queue_row, context, row_stats)
+        if self.write_batch_size > 1 or self.concurrency > 1:
+            self._process_rows_pipelined(
+                queue_row,
+                context,
+                pending_rows,
+                row_stats,
+            )
+        else:
+            self._process_rows_sequentially(
+                queue_row,
+                context,
+                pending_rows,
+                row_stats,
+            )
+
+        logger.info(
+            "Finished sheet row processing for upload uuid=%s. "
+            "rows_succeeded=%s rows_failed=%s rows_skipped_empty=%s "
+            "rows_skipped_existing=%s",
+            queue_row.uuid,
+            row_stats["rows_succeeded"],
+            row_stats["rows_failed"],
+            row_stats["rows_skipped_empty"],
+            row_stats["rows_skipped_existing"],
+        )
+        return row_stats
+
+    @staticmethod
+    def _iter_pending_rows(
+        queue_row: PartnerDataFileUpload,
+        context: SheetProcessingContext,
+        row_stats: Dict[str, int],
+    ) -> Iterator[Tuple[int, Dict[str, object]]]:
         for row_idx, row_values in enumerate(context.workbook.rows, start=2):
             record = PartnerFieldSheetParser.build_record_from_row(
                 row_values,
@@ -148,6 +198,19 @@ class PartnerDataFileUploadProcessor:
                 )
                 continue
 
+            yield row_idx, record
+
+    def _process_rows_sequentially(
+        self,
+        queue_row: PartnerDataFileUpload,
+        context: SheetProcessingContext,
+        pending_rows: Iterator[Tuple[int, Dict[str, object]]],
+        row_stats: Dict[str, int],
+    ) -> None:
+        error_col = context.tracking_columns["error"]
+        moderation_id_col = context.tracking_columns["moderation_id"]
+
+        for row_idx, record in pending_rows:
             row_started_at = time.monotonic()
             try:
                 moderation_id = self.event_creator.create(
@@ -164,14 +227,12 @@ class PartnerDataFileUploadProcessor:
                     "",
                     moderation_id,
                 )
-                row_stats["rows_succeeded"] += 1
-                logger.info(
-                    "Row %s processed successfully for upload uuid=%s. "
-                    "os_id=%s moderation_id=%s",
+                self._count_row_succeeded(
+                    queue_row,
                     row_idx,
-                    queue_row.uuid,
-                    record.get("os_id"),
+                    record,
                     moderation_id,
+                    row_stats,
                 )
             except Exception as error:
                 self.sheets_client.mark_row(
@@ -183,28 +244,187 @@ class PartnerDataFileUploadProcessor:
                     str(error),
                     "",
                 )
-                row_stats["rows_failed"] += 1
-                logger.error(
-                    "Row %s failed for upload uuid=%s. os_id=%s error=%s",
+                self._count_row_failed(
+                    queue_row,
                     row_idx,
-                    queue_row.uuid,
-                    record.get("os_id"),
-                    str(error),
+                    record,
+                    error,
+                    row_stats,
                 )
 
             self._wait_before_next_row(row_started_at)
 
+    def _process_rows_pipelined(
+        self,
+        queue_row: PartnerDataFileUpload,
+        context: SheetProcessingContext,
+        pending_rows: Iterator[Tuple[int, Dict[str, object]]],
+        row_stats: Dict[str, int],
+    ) -> None:
+        """
+        Create the moderation events of `concurrency` rows at a time and
+        write the row outcomes back in batches. Outcomes are collected in
+        row order, so a failed write never leaves a later row marked while
+        an earlier one is not. `row_processing_delay_seconds` is waited
+        between writes instead of between rows. If processing fails part
+        way, the outcomes of the rows already submitted are still written,
+        so that a rerun does not create their moderation events again.
+        """
+        writer = RowOutcomeWriter(
+            self.sheets_client,
+            context,
+            batch_size=self.write_batch_size,
+            flush_interval_seconds=self.flush_interval_seconds,
+            write_delay_seconds=self.row_processing_delay_seconds,
+        )
+        # Queue a few rows per worker so that the workers are kept busy
+        # while the oldest row is waited for.
+        max_rows_in_flight = self.concurrency * 2
+        rows_in_flight = deque()
+
+        completed = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for row_idx, record in pending_rows:
+                    if len(rows_in_flight) >= max_rows_in_flight:
+                        self._collect_row_outcome(
+                            queue_row,
+                            writer,
+                            row_stats,
+                            *rows_in_flight.popleft(),
+                        )
+                    future = executor.submit(
+                        self._create_event_in_worker,
+                        queue_row.contributor,
+                        record,
+                        context.column_mappings,
+                    )
+                    rows_in_flight.append((row_idx, record, future))
+
+                while rows_in_flight:
+                    self._collect_row_outcome(
+                        queue_row,
+                        writer,
+                        row_stats,
+                        *rows_in_flight.popleft(),
+                    )
+            completed = True
+        finally:
+            if not completed:
+                # The executor has waited for the submitted rows by now.
+                self._write_outcomes_after_failure(
+                    queue_row,
+                    writer,
+                    row_stats,
+                    rows_in_flight,
+                )
+
+        writer.flush()
+
+    def _write_outcomes_after_failure(
+        self,
+        queue_row: PartnerDataFileUpload,
+        writer: RowOutcomeWriter,
+        row_stats: Dict[str, int],
+        rows_in_flight: deque,
+    ) -> None:
+        try:
+            while rows_in_flight:
+                self._collect_row_outcome(
+                    queue_row,
+                    writer,
+                    row_stats,
+                    *rows_in_flight.popleft(),
+                )
+            writer.flush()
+        except Exception:
+            logger.exception(
+                "Failed writing row outcomes of partner data file upload "
+                "uuid=%s after processing failed",
+                queue_row.uuid,
+            )
+
+    def _create_event_in_worker(
+        self,
+        contributor,
+        record: Dict[str, object],
+        column_mappings: Dict[str, ColumnMapping],
+    ) -> str:
+        try:
+            return self.event_creator.create(
+                contributor,
+                record,
+                column_mappings,
+            )
+        finally:
+            # Each worker thread opens its own database connection.
+            connection.close()
+
+    def _collect_row_outcome(
+        self,
+        queue_row: PartnerDataFileUpload,
+        writer: RowOutcomeWriter,
+        row_stats: Dict[str, int],
+        row_idx: int,
+        record: Dict[str, object],
+        future: Future,
+    ) -> None:
+        try:
+            moderation_id = future.result()
+        except Exception as error:
+            self._count_row_failed(
+                queue_row,
+                row_idx,
+                record,
+                error,
+                row_stats,
+            )
+            writer.add(row_idx, str(error), "")
+            return
+
+        self._count_row_succeeded(
+            queue_row,
+            row_idx,
+            record,
+            moderation_id,
+            row_stats,
+        )
+        writer.add(row_idx, "", moderation_id)
+
+    @staticmethod
+    def _count_row_succeeded(
+        queue_row: PartnerDataFileUpload,
+        row_idx: int,
+        record: Dict[str, object],
+        moderation_id: str,
+        row_stats: Dict[str, int],
+    ) -> None:
+        row_stats["rows_succeeded"] += 1
         logger.info(
-            "Finished sheet row processing for upload uuid=%s. "
-            "rows_succeeded=%s rows_failed=%s rows_skipped_empty=%s "
-            "rows_skipped_existing=%s",
+            "Row %s processed successfully for upload uuid=%s. "
+            "os_id=%s moderation_id=%s",
+            row_idx,
             queue_row.uuid,
-            row_stats["rows_succeeded"],
-            row_stats["rows_failed"],
-            row_stats["rows_skipped_empty"],
-            row_stats["rows_skipped_existing"],
+            record.get("os_id"),
+            moderation_id,
+        )
+
+    @staticmethod
+    def _count_row_failed(
+        queue_row: PartnerDataFileUpload,
+        row_idx: int,
+        record: Dict[str, object],
+        error: Exception,
+        row_stats: Dict[str, int],
+    ) -> None:
+        row_stats["rows_failed"] += 1
+        logger.error(
+            "Row %s failed for upload uuid=%s. os_id=%s error=%s",
+            row_idx,
+            queue_row.uuid,
+            record.get("os_id"),
+            str(error),
         )
-        return row_stats
 
     def _wait_before_next_row(self, row_started_at: float) -> None:
         if self.row_processing_delay_seconds <= 0:
@@ -179,13 +179,64 @@ class GoogleSheetClient:
         error_message: str,
         moderation_id: str,
     ) -> None:
+        self.mark_rows(
+            workbook,
+            [(row_index, error_message, moderation_id)],
+            cols_count,
+            error_col,
+            moderation_id_col,
+        )
+
+    def mark_rows(
+        self,
+        workbook: SheetWorkbook,
+        outcomes: List[Tuple[int, str, str]],
+        cols_count: int,
+        error_col: int,
+        moderation_id_col: int,
+    ) -> None:
+        """
+        Write the (row_index, error_message, moderation_id) outcomes of
+        several rows with a single batchUpdate request.
+        """
+        if not outcomes:
+            return
+
+        requests = []
+        for row_index, error_message, moderation_id in outcomes:
+            requests.extend(
+                self._row_outcome_requests(
+                    workbook,
+                    row_index,
+                    cols_count,
+                    error_col,
+                    moderation_id_col,
+                    error_message,
+                    moderation_id,
+                )
+            )
+        self.service.spreadsheets().batchUpdate(
+            spreadsheetId=workbook.spreadsheet_id,
+            body={"requests": requests},
+        ).execute()
+
+    @staticmethod
+    def _row_outcome_requests(
+        workbook: SheetWorkbook,
+        row_index: int,
+        cols_count: int,
+        error_col: int,
+        moderation_id_col: int,
+        error_message: str,
+        moderation_id: str,
+    ) -> List[dict]:
         has_error = bool(error_message)
         bg_color = (
             {"red": 1.0, "green": 0.8, "blue": 0.8}
             if has_error
             else None
         )
-        requests = [
+        return [
             {
                 "repeatCell": {
                     "range": {
@@ -228,10 +279,6 @@ class GoogleSheetClient:
                 }
             },
         ]
-        self.service.spreadsheets().batchUpdate(
-            spreadsheetId=workbook.spreadsheet_id,
-            body={"requests": requests},
-        ).execute()
 
     @staticmethod
     def _resolve_sheet(metadata, tab_gid) -> Tuple[str, int, int]:
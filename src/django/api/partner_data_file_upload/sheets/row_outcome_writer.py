@@ -0,0 +1,74 @@
+import time
+from typing import List, Optional, Tuple
+
+from api.partner_data_file_upload.parsing.types import SheetProcessingContext
+from api.partner_data_file_upload.sheets.client import GoogleSheetClient
+
+
+class RowOutcomeWriter:
+    """
+    Collects the outcomes of processed rows and writes them back to the
+    sheet with one batchUpdate request per `batch_size` rows, or once the
+    oldest collected outcome is `flush_interval_seconds` old. Writes are at
+    least `write_delay_seconds` apart, to stay under the Sheets write quota.
+    """
+
+    def __init__(
+        self,
+        sheets_client: GoogleSheetClient,
+        context: SheetProcessingContext,
+        batch_size: int,
+        flush_interval_seconds: float,
+        write_delay_seconds: float = 0,
+    ):
+        self.sheets_client = sheets_client
+        self.context = context
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.write_delay_seconds = write_delay_seconds
+        self.outcomes: List[Tuple[int, str, str]] = []
+        self.first_outcome_at: Optional[float] = None
+        self.last_write_at: Optional[float] = None
+
+    def add(
+        self,
+        row_index: int,
+        error_message: str,
+        moderation_id: str,
+    ) -> None:
+        if not self.outcomes:
+            self.first_outcome_at = time.monotonic()
+        self.outcomes.append((row_index, error_message, moderation_id))
+
+        is_full = len(self.outcomes) >= self.batch_size
+        is_due = (
+            time.monotonic() - self.first_outcome_at
+            >= self.flush_interval_seconds
+        )
+        if is_full or is_due:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.outcomes:
+            return
+
+        self._wait_before_next_write()
+        self.sheets_client.mark_rows(
+            self.context.workbook,
+            self.outcomes,
+            self.context.cols_count,
+            self.context.tracking_columns["error"],
+            self.context.tracking_columns["moderation_id"],
+        )
+        self.last_write_at = time.monotonic()
+        self.outcomes = []
+        self.first_outcome_at = None
+
+    def _wait_before_next_write(self) -> None:
+        if self.write_delay_seconds <= 0 or self.last_write_at is None:
+            return
+
+        elapsed = time.monotonic() - self.last_write_at
+        remaining = self.write_delay_seconds - elapsed
+        if remaining > 0:
+            time.sleep(remaining)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
 import logging
 
 from api.models import Contributor
@@ -49,6 +49,38 @@ class SystemPartnerFieldProvider(ABC):
             contributor_info=contributor_info,
         )
 
+    def fetch_data_for_locations(
+        self,
+        production_locations: Iterable[Facility],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Batch variant of `fetch_data`. Returns the formatted data of each
+        of the given production locations by ID, fetching the raw data of
+        all of them at once and looking the contributor up once. Locations
+        without data are left out.
+        """
+        raw_data_by_id = self._fetch_raw_data_for_locations(
+            list(production_locations)
+        )
+        if not raw_data_by_id:
+            return {}
+
+        contributor_info = self.__get_contributor_info()
+        if contributor_info is None:
+            logger.warning(
+                f"No contributor found for '{self._get_field_name()}' "
+                "partner field."
+            )
+            return {}
+
+        return {
+            production_location_id: self._format_data(
+                raw_data=raw_data,
+                contributor_info=contributor_info,
+            )
+            for production_location_id, raw_data in raw_data_by_id.items()
+        }
+
     def fetch_only_raw_values(
         self,
         production_location: Facility,
@@ -93,6 +125,22 @@ class SystemPartnerFieldProvider(ABC):
         """Fetch raw data from the data source."""
         pass
 
+    def _fetch_raw_data_for_locations(
+        self,
+        production_locations: List[Facility],
+    ) -> Dict[str, Any]:
+        """
+        Fetch the raw data of each of the given production locations by ID,
+        leaving out those without data. Providers override it to fetch the
+        data of all of them with one query.
+        """
+        raw_data_by_id = {}
+        for production_location in production_locations:
+            raw_data = self._fetch_raw_data(production_location)
+            if raw_data is not None:
+                raw_data_by_id[production_location.id] = raw_data
+        return raw_data_by_id
+
     @abstractmethod
     def _format_data(
         self,
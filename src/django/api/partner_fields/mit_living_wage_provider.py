@@ -1,7 +1,8 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from django.contrib.gis.geos import Point
 from api.constants import MIT_LIVING_WAGE_COUNTRY_CODES
+from api.models.facility.facility import Facility
 from api.models.us_county_tigerline import USCountyTigerline
 from api.partner_fields.base_provider import SystemPartnerFieldProvider
 
@@ -9,6 +10,29 @@ from api.partner_fields.base_provider import SystemPartnerFieldProvider
 logger = logging.getLogger(__name__)
 
 
+# The county containing each of the given facility locations (EPSG:4326),
+# the first by geoid where several do, as with `_fetch_raw_data`.
+COUNTIES_BY_LOCATION_SQL = '''
+    SELECT DISTINCT ON (locations.facility_id)
+        locations.facility_id,
+        county.geoid,
+        county.name,
+        county.created_at,
+        county.updated_at
+    FROM unnest(%s::varchar[], %s::float8[], %s::float8[])
+        AS locations (facility_id, lng, lat)
+    JOIN {county_table} county
+        ON ST_Contains(
+            county.geometry,
+            ST_Transform(
+                ST_SetSRID(ST_MakePoint(locations.lng, locations.lat), 4326),
+                5070
+            )
+        )
+    ORDER BY locations.facility_id, county.geoid
+'''
+
+
 class MITLivingWageProvider(SystemPartnerFieldProvider):
     '''
     Provides mit living wage data based on facility location (geoid).
@@ -54,6 +78,43 @@ class MITLivingWageProvider(SystemPartnerFieldProvider):
             )
             return None
 
+    def _fetch_raw_data_for_locations(
+        self,
+        facilities: List[Facility],
+    ) -> Dict[str, USCountyTigerline]:
+        '''
+        Fetch the counties of all the given facilities with one spatial
+        join. Facilities outside the US territories or without a location
+        are left out.
+        '''
+        located_facilities = [
+            facility for facility in facilities
+            if facility.country_code in MIT_LIVING_WAGE_COUNTRY_CODES
+            and facility.location
+        ]
+        if not located_facilities:
+            return {}
+
+        sql = COUNTIES_BY_LOCATION_SQL.format(
+            county_table=USCountyTigerline._meta.db_table
+        )
+        params = [
+            [facility.id for facility in located_facilities],
+            [facility.location.x for facility in located_facilities],
+            [facility.location.y for facility in located_facilities],
+        ]
+        try:
+            return {
+                county.facility_id: county
+                for county in USCountyTigerline.objects.raw(sql, params)
+            }
+        except Exception as e:
+            logger.warning(
+                f'Error fetching geoids for {len(located_facilities)} '
+                f'facilities: {e}',
+            )
+            return {}
+
     def _format_data(
         self,
         raw_data: USCountyTigerline,
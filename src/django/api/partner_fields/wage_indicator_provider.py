@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from api.models.wage_indicator_country_data import WageIndicatorCountryData
 from api.partner_fields.base_provider import SystemPartnerFieldProvider
@@ -40,6 +40,32 @@ class WageIndicatorProvider(SystemPartnerFieldProvider):
 
         return None
 
+    def _fetch_raw_data_for_locations(
+        self,
+        production_locations: List[Facility],
+    ) -> Dict[str, WageIndicatorCountryData]:
+        """
+        Fetch the wage indicator data of the countries of all the given
+        production locations with one query.
+        """
+        data_by_country_code = WageIndicatorCountryData.objects.in_bulk(
+            {location.country_code for location in production_locations}
+        )
+
+        raw_data_by_id = {}
+        for production_location in production_locations:
+            country_code = production_location.country_code
+            if country_code not in data_by_country_code:
+                logger.warning(
+                    f"WageIndicator not found for `{country_code}` country "
+                    f"code. Production location `{production_location.id}` "
+                    "ID."
+                )
+                continue
+            raw_data_by_id[production_location.id] = \
+                data_by_country_code[country_code]
+        return raw_data_by_id
+
     def _format_data(
         self,
         raw_data: WageIndicatorCountryData,
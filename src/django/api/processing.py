@@ -2,13 +2,15 @@ import time
 import traceback
 import logging
 
+from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.urls import reverse
 from django.utils import timezone
 from django.db import transaction
 
 from api.constants import ProcessingAction
-from api.geocoding import geocode_address
+from api.geocoding import geocode_address_with_cache_hit
+from api.match_notifications import match_notification_listener
 from api.models.facility.facility import Facility
 from api.models.facility.facility_list_item import FacilityListItem
 from api.models.facility.facility_list_item_temp import FacilityListItemTemp
@@ -86,7 +88,9 @@ def geocode_facility_list_item(item):
         raise ValueError('Items to be geocoded must be in the PARSED status')
     try:
         if item.geocoded_point is None:
-            data = geocode_address(item.address, item.country_code)
+            data, cache_hit = geocode_address_with_cache_hit(
+                item.address, item.country_code
+            )
             if data['result_count'] > 0:
                 item.status = FacilityListItem.GEOCODED
                 item.geocoded_point = Point(
@@ -101,6 +105,7 @@ def geocode_facility_list_item(item):
                 'started_at': started,
                 'error': False,
                 'skipped_geocoder': False,
+                'cache_hit': cache_hit,
                 'data': data['full_response'],
                 'finished_at': str(timezone.now()),
                })
@@ -162,13 +167,35 @@ def wait_for_match_processing(id, list_item_object_type, timeout=25):
         list_item_object_type.ERROR_MATCHING
     }
 
-    for _ in range(timeout):
+    def get_matched_item():
         facility_list_item = list_item_object_type.objects.get(id=id)
         if facility_list_item.status in end_match_statuses:
             return facility_list_item
-        time.sleep(1)
-
-    return None
+        return None
+
+    facility_list_item = get_matched_item()
+    if facility_list_item:
+        return facility_list_item
+
+    deadline = time.monotonic() + timeout
+    with match_notification_listener.subscribe(id) as matched:
+        while True:
+            # Checked after subscribing as well, so a match that lands
+            # before the listener is ready is not missed.
+            facility_list_item = get_matched_item()
+            if facility_list_item:
+                return facility_list_item
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            matched.wait(
+                min(
+                    remaining,
+                    settings.MATCH_NOTIFICATION_FALLBACK_POLL_SECONDS,
+                )
+            )
+            matched.clear()
 
 
 def process_matches(f_l_item, matches, context, should_create, result):
@@ -0,0 +1,203 @@
+"""Write the API request logs in batches.
+
+`RequestLogMiddleware` queues a log for every token authenticated request
+instead of inserting it in the request. Each process keeps a single writer
+thread, started on first use, that inserts the queued logs with one
+multi-row INSERT once `REQUEST_LOG_BATCH_SIZE` logs are queued or
+`REQUEST_LOG_FLUSH_INTERVAL_SECONDS` have passed since the oldest one was
+queued. The queue is bounded by `REQUEST_LOG_QUEUE_SIZE`; when it is full
+the log is inserted in the request instead. The remaining logs are written
+when the process exits.
+
+When the INSERT of a batch fails, its logs are inserted again one at a time
+on a new connection, so only the logs that still fail on their own are
+dropped, and logged as errors.
+
+A log keeps the time of its request as `created_at`, which is what
+`check_api_limits` counts, however late it is written.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from api.models import RequestLog
+
+log = logging.getLogger(__name__)
+
+# Seconds to wait for the writer thread to write the remaining logs when the
+# process exits.
+STOP_TIMEOUT_SECONDS = 10
+
+COLUMNS = (
+    'user_id',
+    'token',
+    'method',
+    'path',
+    'response_code',
+    'created_at',
+    'updated_at',
+)
+
+Record = Tuple
+
+
+def insert_request_logs(records: List[Record]) -> None:
+    """Insert (user_id, token, method, path, response_code, created_at)
+    records with a single INSERT."""
+    if not records:
+        return
+    table = connection.ops.quote_name(RequestLog._meta.db_table)
+    placeholders = '({})'.format(', '.join(['%s'] * len(COLUMNS)))
+    sql = 'INSERT INTO {} ({}) VALUES {}'.format(
+        table,
+        ', '.join(COLUMNS),
+        ', '.join([placeholders] * len(records)),
+    )
+    params = [
+        value
+        for record in records
+        # updated_at is the same as created_at, as with auto_now.
+        for value in (*record, record[-1])
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+class RequestLogWriter:
+    _stop = object()
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queue: Optional[queue.Queue] = None
+        self.thread = None
+        self.pid = None
+
+    def write(self, user_id, token, method, path, response_code) -> None:
+        record = (
+            user_id,
+            token,
+            method,
+            path,
+            response_code,
+            timezone.now(),
+        )
+        if settings.REQUEST_LOG_BATCH_SIZE <= 1:
+            insert_request_logs([record])
+            return
+
+        self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log.warning('[Request Log] Queue is full, writing in request')
+            insert_request_logs([record])
+
+    def start(self) -> None:
+        """Start the writer thread unless it is running in this process."""
+        with self.lock:
+            if (
+                self.thread is not None
+                and self.thread.is_alive()
+                and self.pid == os.getpid()
+            ):
+                return
+            # A forked process inherits neither the thread nor, usefully,
+            # the logs queued in the parent.
+            self.queue = queue.Queue(maxsize=settings.REQUEST_LOG_QUEUE_SIZE)
+            self.pid = os.getpid()
+            self.thread = threading.Thread(
+                target=self.run,
+                args=(self.queue,),
+                name='request-log-writer',
+                daemon=True,
+            )
+            self.thread.start()
+
+    def stop(self) -> None:
+        """Write the queued logs and stop the writer thread."""
+        with self.lock:
+            thread = self.thread
+            if (
+                thread is None
+                or not thread.is_alive()
+                or self.pid != os.getpid()
+            ):
+                return
+            self.thread = None
+        try:
+            self.queue.put(self._stop, timeout=STOP_TIMEOUT_SECONDS)
+        except queue.Full:
+            log.error('[Request Log] Queue is full, logs were not written')
+            return
+        thread.join(STOP_TIMEOUT_SECONDS)
+
+    def run(self, records: queue.Queue) -> None:
+        batch: List[Record] = []
+        deadline = None
+        while True:
+            timeout = (
+                None if not batch
+                else max(0, deadline - time.monotonic())
+            )
+            try:
+                record = records.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+
+            if record is self._stop:
+                self.flush(batch)
+                return
+            if record is not None:
+                if not batch:
+                    deadline = (
+                        time.monotonic()
+                        + settings.REQUEST_LOG_FLUSH_INTERVAL_SECONDS
+                    )
+                batch.append(record)
+
+            if batch and (
+                len(batch) >= settings.REQUEST_LOG_BATCH_SIZE
+                or time.monotonic() >= deadline
+            ):
+                self.flush(batch)
+                batch = []
+
+    def flush(self, batch: List[Record]) -> None:
+        if not batch:
+            return
+        try:
+            close_old_connections()
+            insert_request_logs(batch)
+            return
+        except Exception as exc:
+            log.warning(
+                f'[Request Log] Failed to write {len(batch)} logs, writing '
+                f'them one at a time: {exc}'
+            )
+            connection.close()
+
+        failed = 0
+        for record in batch:
+            try:
+                insert_request_logs([record])
+            except Exception as exc:
+                failed += 1
+                log.error(f'[Request Log] Failed to write log {record}: {exc}')
+                connection.close()
+        if failed:
+            log.error(
+                f'[Request Log] Dropped {failed} of {len(batch)} logs'
+            )
+
+
+request_log_writer = RequestLogWriter()
+atexit.register(request_log_writer.stop)
@@ -12,12 +12,11 @@ from api.models.partner_field import PartnerField
 from api.serializers.facility.partner_field_helper import (
     get_cached_all_partner_fields,
 )
-from ...models.contributor.contributor import Contributor
 from ...models.facility.facility_index import FacilityIndex
-from ...models.embed_field import EmbedField
 from ...models.facility.facility_claim import FacilityClaim
 from ...helpers.helpers import parse_raw_data, get_csv_values, prefix_a_an
 from ..utils import (
+    get_embed_context,
     is_embed_mode_active,
     get_contributor_id,
     get_contributor_name,
@@ -320,29 +319,26 @@ class FacilityIndexDetailsSerializer(FacilityIndexSerializer):
             except Exception:
                 return []
         else:
-            fields = []
-            contributor = Contributor.objects.get(id=contributor_id)
-            if contributor.embed_config is not None:
-                config = contributor.embed_config
-                # If there are any configured fields, they override the
-                # defaults set above
-                if EmbedField.objects.filter(embed_config=config).count() > 0:
-                    fields = EmbedField.objects.filter(
-                        embed_config=config, visible=True).order_by('order')
-
-                    return [
-                        {
-                            'label': f.display_name,
-                            'value': None,
-                            'column_name': f.column_name
-                        }
-                        for f in fields
-                    ]
-                else:
-                    return []
-            else:
+            embed_context = get_embed_context(self)
+            # If there are any configured fields, they override the
+            # defaults set above
+            if (
+                embed_context is None
+                or not embed_context.has_config
+                or not embed_context.has_fields
+            ):
                 return []
 
+            return [
+                {
+                    'label': display_name,
+                    'value': None,
+                    'column_name': column_name
+                }
+                for (column_name, display_name)
+                in embed_context.visible_fields
+            ]
+
     @with_masked_contributors
     def get_created_from(self, facility, masked):
         created_from_info = facility.created_from_info
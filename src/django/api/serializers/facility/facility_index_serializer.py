@@ -14,13 +14,12 @@ from countries.lib.countries import COUNTRY_NAMES
 from ...constants import MASKED_CONTRIBUTOR_LABEL
 from ...models import Contributor
 from ...models.facility.facility_index import FacilityIndex
-from ...models.embed_config import EmbedConfig
 from ...models.embed_field import EmbedField
 from ...models.extended_field import ExtendedField
 from ...models.nonstandard_field import NonstandardField
 from ...helpers.helpers import parse_raw_data, get_csv_values
 from ...services.contributor_masking_policy import ContributorMaskingPolicy
-from ..utils import is_embed_mode_active
+from ..utils import get_embed_context, is_embed_mode_active
 from .facility_index_extended_field_list_serializer import (
     FacilityIndexExtendedFieldListSerializer
 )
@@ -197,11 +196,8 @@ class FacilityIndexSerializer(GeoFeatureModelSerializer):
             except Exception:
                 return []
         else:
-            try:
-                contributor = Contributor.objects.get(id=contributor_id)
-                if contributor.embed_level is None:
-                    return []
-            except Contributor.DoesNotExist:
+            embed_context = get_embed_context(self)
+            if not embed_context.exists or embed_context.embed_level is None:
                 return []
 
             # If the contributor has not created any overriding embed config
@@ -211,24 +207,21 @@ class FacilityIndexSerializer(GeoFeatureModelSerializer):
                 for (column_name, display_name)
                 in NonstandardField.EXTENDED_FIELDS.items()]
 
-            try:
-                config = EmbedConfig.objects.get(contributor=contributor)
-                # If there are any configured fields, they override the
-                # defaults set above
-                if EmbedField.objects.filter(embed_config=config).count() > 0:
-                    fields = EmbedField.objects.filter(
-                        embed_config=config, visible=True).order_by('order')
-
-                    return [
-                        {
-                            'label': f.display_name, 'value': None,
-                            'column_name': f.column_name
-                        }
-                        for f in fields
-                    ]
-            except EmbedConfig.DoesNotExist:
+            if not embed_context.has_config:
                 return fields
 
+            # If there are any configured fields, they override the
+            # defaults set above
+            if embed_context.has_fields:
+                return [
+                    {
+                        'label': display_name, 'value': None,
+                        'column_name': column_name
+                    }
+                    for (column_name, display_name)
+                    in embed_context.visible_fields
+                ]
+
     @with_masked_contributors
     def get_extended_fields(self, facility, masked):
         request = self._get_request()
@@ -1,6 +1,6 @@
 from ..constants import MASKED_CONTRIBUTOR_LABEL
 from ..helpers.helpers import prefix_a_an
-from ..models import Contributor, EmbedConfig
+from ..services.embed_context import EmbedContext
 
 
 def is_embed_mode_active(serializer):
@@ -39,19 +39,26 @@ def get_embed_contributor_id(serializer):
     return contributor
 
 
+def get_embed_context(serializer):
+    """The embed settings of the contributor of an embedded map request, or
+    None outside embed mode."""
+    contributor_id = get_embed_contributor_id(serializer)
+    if not is_embed_mode_active(serializer) or contributor_id is None:
+        return None
+    return EmbedContext.for_request(
+        serializer.context.get("request"), contributor_id
+    )
+
+
 def prefer_contributor_name(serializer):
-    try:
-        contributor_id = get_embed_contributor_id(serializer)
-        if is_embed_mode_active(serializer) and contributor_id is not None:
-            contributor = Contributor.objects.get(id=contributor_id)
-            if contributor.embed_level is not None:
-                config = EmbedConfig.objects.get(contributor=contributor)
-                return config.prefer_contributor_name
-        return False
-    except EmbedConfig.DoesNotExist:
-        return False
-    except Contributor.DoesNotExist:
+    embed_context = get_embed_context(serializer)
+    if (
+        embed_context is None
+        or embed_context.embed_level is None
+        or not embed_context.has_config
+    ):
         return False
+    return embed_context.prefer_contributor_name
 
 
 def is_contribution_masked(contributor, masked):
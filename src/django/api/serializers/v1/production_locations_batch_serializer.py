@@ -0,0 +1,27 @@
+from typing import List
+
+from rest_framework.serializers import ListField, Serializer
+from rest_framework.exceptions import ValidationError
+
+
+class ProductionLocationsBatchSerializer(Serializer):
+    # Kept low enough for the locations and their partner fields to be
+    # loaded within a request.
+    MAX_OS_IDS = 1000
+
+    os_ids = ListField(allow_empty=False, max_length=MAX_OS_IDS)
+
+    def validate_os_ids(self, value: List) -> List[str]:
+        '''
+        The OS IDs are validated here rather than by a child field so that
+        an invalid one is reported in the same flat list of errors as an
+        invalid number of them.
+        '''
+        if not all(
+            isinstance(os_id, str) and os_id.strip() for os_id in value
+        ):
+            raise ValidationError(
+                'Each OS ID must be a non-empty string.'
+            )
+
+        return [os_id.strip() for os_id in value]
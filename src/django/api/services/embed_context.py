@@ -0,0 +1,129 @@
+from django.core.cache import caches
+from django.db import transaction
+
+from api.constants import (EMBED_CONTEXT_CACHE_KEY,
+                           EMBED_CONTEXT_CACHE_TTL_SECONDS)
+from api.models.contributor.contributor import Contributor
+from api.models.embed_field import EmbedField
+
+
+class EmbedContext:
+    """
+    The embed settings of the contributor whose map is embedded: its embed
+    level, its ``EmbedConfig`` and its visible ``EmbedField`` rows.
+
+    Every facility of an embedded map request is serialized with the same
+    settings, so they are loaded once per request (see ``for_request``) and
+    kept in the shared ``view_cache`` between requests. Saving an
+    ``EmbedConfig``, or the embed level or config of a ``Contributor``,
+    deletes the cached settings once the transaction commits (see
+    ``invalidate``); the TTL bounds how long a missed delete is visible.
+    """
+
+    REQUEST_ATTRIBUTE = '_embed_contexts'
+
+    def __init__(self,
+                 contributor_id,
+                 exists=False,
+                 embed_level=None,
+                 embed_config_id=None,
+                 prefer_contributor_name=None,
+                 has_fields=False,
+                 visible_fields=()):
+        self.contributor_id = contributor_id
+        self.exists = exists
+        self.embed_level = embed_level
+        self.embed_config_id = embed_config_id
+        self.prefer_contributor_name = prefer_contributor_name
+        # Whether the config has any fields, visible or not. Configured
+        # fields override the default transparency pledge fields.
+        self.has_fields = has_fields
+        # (column_name, display_name) pairs in display order.
+        self.visible_fields = list(visible_fields)
+
+    @property
+    def has_config(self):
+        return self.embed_config_id is not None
+
+    @classmethod
+    def for_request(cls, request, contributor_id):
+        """The embed settings of a contributor, loaded at most once per
+        request."""
+        contexts = getattr(request, cls.REQUEST_ATTRIBUTE, None)
+        if contexts is None:
+            contexts = {}
+            setattr(request, cls.REQUEST_ATTRIBUTE, contexts)
+
+        key = str(contributor_id)
+        if key not in contexts:
+            contexts[key] = cls.get(contributor_id)
+        return contexts[key]
+
+    @classmethod
+    def get(cls, contributor_id):
+        """The embed settings of a contributor (cached)."""
+        try:
+            contributor_id = int(contributor_id)
+        except (TypeError, ValueError):
+            return cls(contributor_id)
+
+        # Resolved here (not at import time) so test ``override_settings``
+        # for ``CACHES`` is honoured.
+        cache = caches['view_cache']
+        cache_key = cls.get_cache_key(contributor_id)
+        cached = cache.get(cache_key)
+        if cached is None:
+            cached = cls._load(contributor_id)
+            cache.set(cache_key, cached, EMBED_CONTEXT_CACHE_TTL_SECONDS)
+        return cls(contributor_id, **cached)
+
+    @staticmethod
+    def get_cache_key(contributor_id):
+        return EMBED_CONTEXT_CACHE_KEY.format(contributor_id=contributor_id)
+
+    @classmethod
+    def invalidate(cls, contributor_id):
+        """Delete the cached settings of a contributor once the current
+        transaction commits, so a concurrent request can't cache the
+        settings being replaced."""
+        cache_key = cls.get_cache_key(contributor_id)
+        transaction.on_commit(lambda: caches['view_cache'].delete(cache_key))
+
+    @staticmethod
+    def _load(contributor_id):
+        contributor = (
+            Contributor.objects
+            .filter(id=contributor_id)
+            .values(
+                'embed_level',
+                'embed_config_id',
+                'embed_config__prefer_contributor_name',
+            )
+            .first()
+        )
+        if contributor is None:
+            return {'exists': False}
+
+        fields = []
+        if contributor['embed_config_id'] is not None:
+            fields = list(
+                EmbedField.objects
+                .filter(embed_config_id=contributor['embed_config_id'])
+                .order_by('order')
+                .values_list('column_name', 'display_name', 'visible')
+            )
+
+        return {
+            'exists': True,
+            'embed_level': contributor['embed_level'],
+            'embed_config_id': contributor['embed_config_id'],
+            'prefer_contributor_name': contributor[
+                'embed_config__prefer_contributor_name'
+            ],
+            'has_fields': len(fields) > 0,
+            'visible_fields': [
+                (column_name, display_name)
+                for column_name, display_name, visible in fields
+                if visible
+            ],
+        }
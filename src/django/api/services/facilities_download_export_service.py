@@ -0,0 +1,86 @@
+import csv
+import io
+import tempfile
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from rest_framework.exceptions import ValidationError
+
+from api.constants import FacilitiesDownloadExportConfig
+
+
+class FacilitiesDownloadExportService:
+    """
+    Writes a whole facilities download as a single CSV or XLSX file.
+
+    Rows are read from a server-side cursor and serialized one chunk at a
+    time, so memory use is bounded by `FacilitiesDownloadExportConfig
+    .CHUNK_SIZE` rather than by the size of the download.
+    """
+
+    @staticmethod
+    def get_file_format(request):
+        file_format = request.query_params.get(
+            'file_format', FacilitiesDownloadExportConfig.CSV
+        ).lower()
+        if file_format not in FacilitiesDownloadExportConfig.FILE_FORMATS:
+            raise ValidationError({
+                'file_format': [
+                    'Must be one of: {}.'.format(', '.join(
+                        FacilitiesDownloadExportConfig.FILE_FORMATS
+                    ))
+                ]
+            })
+        return file_format
+
+    @staticmethod
+    def iter_rows(serializer, queryset):
+        """Yield the download row of every facility of the queryset, using
+        the `child` of a many=True download serializer."""
+        chunk_size = FacilitiesDownloadExportConfig.CHUNK_SIZE
+        for facility in queryset.iterator(chunk_size=chunk_size):
+            yield serializer.to_representation(facility)['row']
+
+    @staticmethod
+    def stream_csv(headers, rows):
+        """Yield the CSV file in chunks of rows."""
+        chunk_size = FacilitiesDownloadExportConfig.CHUNK_SIZE
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        row_count = 0
+
+        for row in rows:
+            writer.writerow(row)
+            row_count += 1
+            if row_count % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    @staticmethod
+    def write_xlsx(headers, rows):
+        """
+        Return a temporary file holding the XLSX workbook. The write-only
+        workbook streams rows to disk instead of keeping the cells in
+        memory.
+        """
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(
+            FacilitiesDownloadExportConfig.XLSX_SHEET_NAME
+        )
+        worksheet.append(headers)
+
+        for row in rows:
+            worksheet.append([
+                ILLEGAL_CHARACTERS_RE.sub('', value)
+                if isinstance(value, str) else value
+                for value in row
+            ])
+
+        xlsx_file = tempfile.TemporaryFile()
+        workbook.save(xlsx_file)
+        xlsx_file.seek(0)
+        return xlsx_file
@@ -0,0 +1,325 @@
+'''
+Builds the documents of the production-locations OpenSearch index from the
+rows selected by the statement of the Logstash sync_production_locations
+pipeline (see production_location_indexer.py).
+
+This is a port of the filters of the Logstash sync_production_locations
+pipeline (src/logstash/pipeline/sync_production_locations.conf and
+src/logstash/scripts/production_locations), applied in the same order, so
+that a document is the same whichever of the two indexed it. A change to
+either has to be made to both.
+'''
+
+import json
+import logging
+import os
+from datetime import date, datetime
+from functools import lru_cache
+
+from django.conf import settings
+
+log = logging.getLogger(__name__)
+
+# The country data of the Logstash country filters.
+COUNTRIES_FILE_PATH = os.path.join(
+    settings.LOGSTASH_DIR, 'static_data', 'countries.json'
+)
+
+JSON_FIELDS = (
+    'parent_company_value',
+    'product_type_value',
+    'location_type_value',
+    'processing_type_value',
+    'number_of_workers_value',
+)
+
+STRIPPED_TEXT_FIELDS = (
+    ('local_name_value', 'local_name'),
+    ('description_value', 'description'),
+    ('business_url_value', 'business_url'),
+)
+
+ID_FIELDS = (
+    ('duns_id_value', 'duns_id'),
+    ('lei_id_value', 'lei_id'),
+    ('rba_id_value', 'rba_id'),
+)
+
+ENERGY_SOURCES = (
+    ('Coal', 'energy_coal_value'),
+    ('Natural gas', 'energy_natural_gas_value'),
+    ('Diesel', 'energy_diesel_value'),
+    ('Kerosene', 'energy_kerosene_value'),
+    ('Biomass', 'energy_biomass_value'),
+    ('Charcoal', 'energy_charcoal_value'),
+    ('Animal waste', 'energy_animal_waste_value'),
+    ('Electricity', 'energy_electricity_value'),
+    ('Other', 'energy_other_value'),
+)
+
+CLAIM_STATUSES = (
+    ('APPROVED', 'claimed'),
+    ('PENDING', 'pending'),
+)
+UNCLAIMED = 'unclaimed'
+
+# The fields the pipeline removes before sending a document.
+REMOVED_FIELDS = (
+    'local_name_value',
+    'description_value',
+    'business_url_value',
+    'sector_value',
+    'parent_company_value',
+    'product_type_value',
+    'location_type_value',
+    'processing_type_value',
+    'number_of_workers_value',
+    'longitude',
+    'latitude',
+    'minimum_order_quantity_value',
+    'average_lead_time_value',
+    'percent_female_workers_value',
+    'affiliations_value',
+    'certifications_standards_regulations_value',
+    'country_value',
+    'claim_status_value',
+    'historical_os_id_value',
+    'updated_at',
+    'rba_id_value',
+    'duns_id_value',
+    'lei_id_value',
+    'claimed_at_value',
+    'geocode_value',
+    'opened_at_value',
+    'estimated_annual_throughput_value',
+    'actual_annual_energy_consumption_value',
+)
+
+
+@lru_cache(maxsize=None)
+def get_countries():
+    with open(COUNTRIES_FILE_PATH, encoding='utf-8') as countries_file:
+        return json.load(countries_file)
+
+
+def parse_json(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def is_blank(value):
+    return value is None or not value.strip()
+
+
+def get_matched_values(value, position):
+    if not isinstance(value, dict) or not value.get('matched_values'):
+        return []
+    values = []
+    for matched_value in value['matched_values']:
+        if len(matched_value) <= position:
+            continue
+        if matched_value[position] is not None \
+           and matched_value[position] not in values:
+            values.append(matched_value[position])
+    return values
+
+
+def parse_amount(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        # Ignore common thousands separators and non-breaking spaces.
+        return int(value.strip().replace('\u00a0', '').replace(',', ''))
+    except ValueError:
+        log.warning(
+            '[Production Location Document] Skipping malformed energy '
+            f'consumption amount: {value!r}'
+        )
+        return None
+
+
+def get_energy_consumption(row):
+    consumption = []
+    for source, field in ENERGY_SOURCES:
+        amount = parse_amount(row.get(field))
+        if amount is not None:
+            consumption.append({'source': source, 'amount': amount})
+    if consumption:
+        return consumption
+
+    fallback = parse_json(row.get('actual_annual_energy_consumption_value'))
+    if not isinstance(fallback, list):
+        return None
+    consumption = []
+    for item in fallback:
+        if not isinstance(item, dict):
+            continue
+        amount = parse_amount(item.get('amount'))
+        if amount is None or item.get('source') is None:
+            continue
+        consumption.append({'source': item['source'], 'amount': amount})
+    return consumption
+
+
+def get_opened_at(value):
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y')
+    try:
+        return datetime.fromisoformat(
+            str(value).replace('Z', '+00:00')
+        ).strftime('%Y')
+    except ValueError:
+        log.warning(
+            f'[Production Location Document] Failed to parse opened_at: '
+            f'{value!r}'
+        )
+        return None
+
+
+def set_geocode(document, value):
+    geocode = parse_json(value)
+    if not isinstance(geocode, dict):
+        return
+    results = (geocode.get('data') or {}).get('results')
+    if not results:
+        return
+    result = results[0]
+    location_type = (result.get('geometry') or {}).get('location_type')
+    if location_type:
+        document['geocoded_location_type'] = location_type
+    if result.get('formatted_address'):
+        document['geocoded_address'] = result['formatted_address']
+
+
+def build_production_location_document(row: dict) -> dict:
+    '''
+    Return the production-locations index document of a row selected by
+    the production locations statement, keyed by column name.
+    '''
+    document = dict(row)
+
+    for field in JSON_FIELDS:
+        document[field] = parse_json(document.get(field))
+
+    for source, target in STRIPPED_TEXT_FIELDS:
+        if not is_blank(document.get(source)):
+            document[target] = document[source]
+
+    sector = [
+        value for value in document.get('sector_value') or []
+        if value != 'Unspecified'
+    ]
+    if sector:
+        document['sector'] = sector
+
+    parent_company = document.get('parent_company_value')
+    if isinstance(parent_company, dict) \
+       and parent_company.get('raw_value'):
+        value = parent_company['raw_value'].strip()
+        if value:
+            document['parent_company'] = value
+
+    product_type = document.get('product_type_value')
+    if isinstance(product_type, dict) and product_type.get('raw_values'):
+        document['product_type'] = [
+            value.strip() for value in product_type['raw_values']
+        ]
+
+    location_type = get_matched_values(
+        document.get('location_type_value'), 2
+    )
+    if location_type:
+        document['location_type'] = location_type
+
+    processing_type = get_matched_values(
+        document.get('processing_type_value'), 3
+    )
+    if processing_type:
+        document['processing_type'] = processing_type
+
+    if document.get('number_of_workers_value'):
+        document['number_of_workers'] = document['number_of_workers_value']
+
+    if document.get('latitude') is not None \
+       and document.get('longitude') is not None:
+        document['coordinates'] = {
+            'lat': document['latitude'],
+            'lon': document['longitude'],
+        }
+
+    if not is_blank(document.get('minimum_order_quantity_value')):
+        document['minimum_order_quantity'] = \
+            document['minimum_order_quantity_value']
+    if not is_blank(document.get('average_lead_time_value')):
+        document['average_lead_time'] = document['average_lead_time_value']
+
+    if document.get('percent_female_workers_value') is not None:
+        document['percent_female_workers'] = \
+            document['percent_female_workers_value']
+    if document.get('affiliations_value'):
+        document['affiliations'] = document['affiliations_value']
+    if document.get('certifications_standards_regulations_value'):
+        document['certifications_standards_regulations'] = \
+            document['certifications_standards_regulations_value']
+
+    country_code = document.get('country_value')
+    country = get_countries().get(country_code)
+    if country is None:
+        log.warning(
+            '[Production Location Document] Unknown country code '
+            f'{country_code!r} for {document.get("os_id")}'
+        )
+    else:
+        document['country'] = {
+            'name': country['name'],
+            'alpha_2': country_code,
+            'alpha_3': country['alpha_3'],
+            'numeric': country['numeric'],
+        }
+
+    claim_statuses = document.get('claim_status_value') or []
+    document['claim_status'] = next(
+        (
+            claim_status
+            for status, claim_status in CLAIM_STATUSES
+            if status in claim_statuses
+        ),
+        UNCLAIMED,
+    )
+
+    if document.get('claimed_at_value') is not None:
+        document['claimed_at'] = document['claimed_at_value']
+    if document.get('historical_os_id_value') is not None:
+        document['historical_os_id'] = document['historical_os_id_value']
+
+    for source, target in ID_FIELDS:
+        identifier = parse_json(document.get(source))
+        if isinstance(identifier, dict) \
+           and not is_blank(identifier.get('raw_value')):
+            document[target] = identifier['raw_value'].strip()
+
+    set_geocode(document, document.get('geocode_value'))
+
+    if document.get('opened_at_value') is not None:
+        document['opened_at'] = get_opened_at(document['opened_at_value'])
+
+    if document.get('estimated_annual_throughput_value') is not None:
+        document['estimated_annual_throughput'] = \
+            document['estimated_annual_throughput_value']
+
+    energy_consumption = get_energy_consumption(document)
+    if energy_consumption is not None:
+        document['actual_annual_energy_consumption'] = energy_consumption
+
+    for field in REMOVED_FIELDS:
+        document.pop(field, None)
+
+    return document
@@ -0,0 +1,288 @@
+'''
+Keeps the production-locations OpenSearch index in step with the database.
+
+The `record_production_location_changes` triggers insert the OS ID of every
+production location changed by a statement on the facility, claim, extended
+field, list item and alias tables into `api_productionlocationchange`, in the
+transaction of the change, while the `production_location_indexer` switch is
+on. The indexer takes the oldest changes in batches of
+`PRODUCTION_LOCATION_INDEXER_BATCH_SIZE`, locking them so that several
+indexers can run at once, selects the documents of the changed locations with
+one query, sends them with a single `_bulk` request and removes the changes
+from the outbox. Each location is also locked by its OS ID until its changes
+are removed, and the changes of locations locked by another indexer are left
+for a later batch, so that a document selected before a change can never
+overwrite one selected after it. The documents of locations that no longer
+exist are deleted from the index. Changes whose document could not be
+selected or built, or was rejected by OpenSearch, are kept, with the number
+of attempts and the last error, and retried with a later batch until they
+have failed `PRODUCTION_LOCATION_INDEXER_MAX_ATTEMPTS` times. They are then
+parked in the outbox and no longer claimed, so that they do not hold up the
+other changes.
+'''
+
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from api.services.opensearch.production_location_document import (
+    build_production_location_document,
+)
+from api.views.v1.index_names import OpenSearchIndexNames
+
+log = logging.getLogger(__name__)
+
+# The statement of the Logstash sync_production_locations pipeline, whose
+# filter on the time of the last run is replaced with one on the OS IDs of a
+# batch, so that both select the same document fields.
+DOCUMENTS_SQL_PATH = os.path.join(
+    settings.LOGSTASH_DIR, 'sql', 'sync_production_locations.sql'
+)
+DOCUMENTS_SQL_FILTER_SEPARATOR = '\nWHERE\n'
+DOCUMENTS_SQL_FILTER = 'af.id = ANY(%(os_ids)s)'
+
+# Namespace of the advisory locks taken on the OS IDs of the claimed changes,
+# keyed together with the hash of the OS ID via the two-key form of
+# pg_try_advisory_xact_lock, so that they cannot collide with other advisory
+# locks of the app. The value is arbitrary; this is the number of the
+# migration adding the outbox.
+ADVISORY_LOCK_NAMESPACE = 231
+
+# Row locks only keep two indexers from claiming the same change, not two
+# changes of the same location. The claimed changes of a location are
+# therefore only indexed while this transaction also holds the advisory lock
+# of its OS ID, which is released on commit, after the `_bulk` request. The
+# changes of locations whose lock is held by another indexer stay locked but
+# unindexed until this transaction ends, and are claimed again later. The
+# claim is made in a subquery so that locks are only tried on the OS IDs of
+# the batch.
+CLAIM_CHANGES_SQL = '''
+    SELECT id, os_id
+    FROM (
+        SELECT id, os_id
+        FROM api_productionlocationchange
+        WHERE attempts < %s
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ) AS claimed
+    WHERE pg_try_advisory_xact_lock(%s, hashtext(os_id))
+    ORDER BY id
+'''
+
+DELETE_CHANGES_SQL = '''
+    DELETE FROM api_productionlocationchange
+    WHERE id = ANY(%s)
+'''
+
+RECORD_FAILED_CHANGE_SQL = '''
+    UPDATE api_productionlocationchange
+    SET attempts = attempts + 1, last_error = %s
+    WHERE id = %s
+    RETURNING attempts
+'''
+
+
+def get_documents_sql():
+    """The Logstash statement, selecting the locations with the given
+    `os_ids` instead of those updated since its last run."""
+    with open(DOCUMENTS_SQL_PATH) as documents_sql_file:
+        sync_sql = documents_sql_file.read()
+    body, separator, _ = sync_sql.rpartition(DOCUMENTS_SQL_FILTER_SEPARATOR)
+    if not separator:
+        raise ValueError(f'No WHERE clause found in {DOCUMENTS_SQL_PATH}')
+    return f'{body}{separator}  {DOCUMENTS_SQL_FILTER}'
+
+
+class ProductionLocationIndexer:
+    def __init__(
+        self,
+        client,
+        batch_size: Optional[int] = None,
+        index: str = OpenSearchIndexNames.PRODUCTION_LOCATIONS_INDEX,
+    ):
+        self.client = client
+        self.batch_size = (
+            batch_size or settings.PRODUCTION_LOCATION_INDEXER_BATCH_SIZE
+        )
+        self.index = index
+        self.max_attempts = settings.PRODUCTION_LOCATION_INDEXER_MAX_ATTEMPTS
+        self.documents_sql = get_documents_sql()
+
+    def run(self, once: bool = False) -> None:
+        '''
+        Index the recorded changes until stopped, waiting
+        `PRODUCTION_LOCATION_INDEXER_POLL_INTERVAL_SECONDS` whenever the
+        outbox has no full batch left. With `once`, return when no more
+        changes can be indexed instead.
+        '''
+        while True:
+            close_old_connections()
+            try:
+                indexed = self.index_batch()
+            except Exception as exc:
+                log.error(
+                    '[Production Location Indexer] Failed to index a batch '
+                    f'of changes: {exc}'
+                )
+                connection.close()
+                if once:
+                    raise
+                indexed = 0
+
+            if once and indexed == 0:
+                return
+            if indexed < self.batch_size:
+                time.sleep(
+                    settings.PRODUCTION_LOCATION_INDEXER_POLL_INTERVAL_SECONDS
+                )
+
+    def index_batch(self) -> int:
+        '''
+        Index the locations of the oldest batch of changes and return the
+        number of changes removed from the outbox.
+        '''
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    CLAIM_CHANGES_SQL,
+                    [
+                        self.max_attempts,
+                        self.batch_size,
+                        ADVISORY_LOCK_NAMESPACE,
+                    ],
+                )
+                changes = cursor.fetchall()
+            if not changes:
+                return 0
+
+            os_ids = list(dict.fromkeys(os_id for _, os_id in changes))
+            documents, errors = self.get_documents(os_ids)
+            errors.update(self.send(
+                [os_id for os_id in os_ids if os_id not in errors],
+                documents,
+            ))
+
+            indexed_change_ids = [
+                change_id
+                for change_id, os_id in changes
+                if os_id not in errors
+            ]
+            with connection.cursor() as cursor:
+                cursor.execute(DELETE_CHANGES_SQL, [indexed_change_ids])
+                for change_id, os_id in changes:
+                    if os_id in errors:
+                        self.record_failure(
+                            cursor, change_id, os_id, errors[os_id]
+                        )
+
+        log.info(
+            f'[Production Location Indexer] Indexed {len(os_ids)} '
+            f'locations from {len(changes)} changes, '
+            f'{len(errors)} failed'
+        )
+        return len(indexed_change_ids)
+
+    def record_failure(
+        self,
+        cursor,
+        change_id: int,
+        os_id: str,
+        error: str,
+    ) -> None:
+        '''
+        Count a failed attempt of the change and log it once it is parked.
+        '''
+        cursor.execute(RECORD_FAILED_CHANGE_SQL, [error, change_id])
+        attempts, = cursor.fetchone()
+        if attempts >= self.max_attempts:
+            log.error(
+                f'[Production Location Indexer] Parked change {change_id} '
+                f'of {os_id} after {attempts} failed attempts'
+            )
+
+    def get_documents(
+        self, os_ids: List[str]
+    ) -> Tuple[Dict[str, dict], Dict[str, str]]:
+        '''
+        Select and build the documents of the locations. Return them with the
+        errors of the OS IDs whose document could not be selected or built.
+        When the statement fails, the OS IDs are selected again in halves, so
+        that only the location it fails on is kept from being indexed.
+        '''
+        try:
+            # A savepoint, so that the batch's transaction can continue
+            # after the statement failed.
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(self.documents_sql, {'os_ids': os_ids})
+                    columns = [column[0] for column in cursor.description]
+                    rows = cursor.fetchall()
+        except Exception as exc:
+            if len(os_ids) == 1:
+                log.error(
+                    '[Production Location Indexer] Failed to select '
+                    f'{os_ids[0]}: {exc}'
+                )
+                return {}, {os_ids[0]: str(exc)}
+            middle = len(os_ids) // 2
+            documents, errors = self.get_documents(os_ids[:middle])
+            other_documents, other_errors = self.get_documents(
+                os_ids[middle:]
+            )
+            documents.update(other_documents)
+            errors.update(other_errors)
+            return documents, errors
+
+        documents = {}
+        errors = {}
+        for row in rows:
+            values = dict(zip(columns, row))
+            try:
+                document = build_production_location_document(values)
+            except Exception as exc:
+                log.error(
+                    '[Production Location Indexer] Failed to build the '
+                    f'document of {values["os_id"]}: {exc}'
+                )
+                errors[values['os_id']] = str(exc)
+                continue
+            documents[document['os_id']] = document
+        return documents, errors
+
+    def send(
+        self, os_ids: List[str], documents: Dict[str, dict]
+    ) -> Dict[str, str]:
+        '''
+        Index the documents and delete the locations without one with a
+        single `_bulk` request. Return the errors of the OS IDs that failed.
+        '''
+        body = []
+        for os_id in os_ids:
+            if os_id in documents:
+                body.append({'index': {'_index': self.index, '_id': os_id}})
+                body.append(documents[os_id])
+            else:
+                body.append({'delete': {'_index': self.index, '_id': os_id}})
+
+        response = self.client.bulk(body=body)
+        if not response.get('errors'):
+            return {}
+
+        errors = {}
+        for item in response['items']:
+            action, result = next(iter(item.items()))
+            status = result.get('status', 500)
+            # Deleting a location that was never indexed is not a failure.
+            if status < 300 or (action == 'delete' and status == 404):
+                continue
+            log.error(
+                f'[Production Location Indexer] Failed to {action} '
+                f'{result.get("_id")}: {result.get("error")}'
+            )
+            errors[result.get('_id')] = str(result.get('error'))
+        return errors
@@ -1,7 +1,7 @@
 import logging
 from api.services.opensearch.opensearch import OpenSearchServiceConnection
 from api.services.opensearch.search_interface import SearchInterface
-from opensearchpy.exceptions import OpenSearchException
+from opensearchpy.exceptions import NotFoundError, OpenSearchException
 
 logger = logging.getLogger(__name__)
 
@@ -40,9 +40,7 @@ class OpenSearchService(SearchInterface):
         data = []
         for hit in hits:
             if "_source" in hit:
-                source = self.__rename_lon_field(hit["_source"])
-                clean_source = self.__remove_null_values(source)
-                data.append(clean_source)
+                data.append(self.__prepare_source(hit["_source"]))
             else:
                 logger.warning(f"Missing '_source' in hit: {hit}")
 
@@ -66,6 +64,9 @@ class OpenSearchService(SearchInterface):
 
         return response_data
 
+    def __prepare_source(self, source):
+        return self.__remove_null_values(self.__rename_lon_field(source))
+
     @staticmethod
     def __remove_null_values(obj):
         if isinstance(obj, dict):
@@ -100,3 +101,55 @@ class OpenSearchService(SearchInterface):
         except Exception as e:
             logger.error(f"An unexpected error occurred: {e}")
             raise OpenSearchServiceException()
+
+    def get_document(self, index_name, document_id, source_includes=None):
+        '''
+        Return the source of the document with the ID, read in real time
+        rather than searched for, or None if there is none.
+        '''
+        try:
+            response = self.__client.get(
+                index=index_name,
+                id=document_id,
+                _source_includes=source_includes,
+            )
+        except NotFoundError:
+            return None
+        except OpenSearchException as e:
+            logger.error(f"An error occurred while getting document \
+                          '{document_id}' from index '{index_name}': {e}")
+            raise OpenSearchServiceException()
+        except Exception as e:
+            logger.error(f"An unexpected error occurred: {e}")
+            raise OpenSearchServiceException()
+
+        if not response.get("found") or "_source" not in response:
+            return None
+        return self.__prepare_source(response["_source"])
+
+    def get_documents(self, index_name, document_ids, source_includes=None):
+        '''
+        Return the sources of the documents with the IDs, read with a single
+        multi-get request, by ID. IDs without a document are left out.
+        '''
+        if not document_ids:
+            return {}
+        try:
+            response = self.__client.mget(
+                index=index_name,
+                body={"ids": list(document_ids)},
+                _source_includes=source_includes,
+            )
+        except OpenSearchException as e:
+            logger.error(f"An error occurred while getting documents from \
+                          index '{index_name}': {e}")
+            raise OpenSearchServiceException()
+        except Exception as e:
+            logger.error(f"An unexpected error occurred: {e}")
+            raise OpenSearchServiceException()
+
+        return {
+            document["_id"]: self.__prepare_source(document["_source"])
+            for document in response.get("docs", [])
+            if document.get("found") and "_source" in document
+        }
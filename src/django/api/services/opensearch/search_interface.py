@@ -9,3 +9,11 @@ class SearchInterface:
     @abstractmethod
     def search_index(self, index_name, query_body, params=None):
         pass
+
+    @abstractmethod
+    def get_document(self, index_name, document_id, source_includes=None):
+        pass
+
+    @abstractmethod
+    def get_documents(self, index_name, document_ids, source_includes=None):
+        pass
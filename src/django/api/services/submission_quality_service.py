@@ -1,9 +1,12 @@
+import hashlib
+import json
 import logging
 import os
 from typing import Optional
 
 import boto3
 from botocore.config import Config
+from django.core.cache import caches
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 from pydantic_ai.models.bedrock import BedrockConverseModel
@@ -39,6 +42,16 @@ SUBMISSION_QUALITY_MODEL_ID = os.getenv(
 # the warning (fail open).
 INVOKE_TIMEOUT_SECONDS = 5.0
 
+# Verdicts are cached in the shared view_cache (memcached, so every worker
+# sees them) by a hash of the evaluated fields, the model and the
+# instructions. An identical resubmission - e.g. a retry after a 409, or
+# the same location sent again after fixing an unrelated field - reuses
+# the verdict instead of making another model call. Failed calls are not
+# cached. A day is long enough to cover retries and short enough that a
+# change to the model's judgement reaches old submissions soon.
+VERDICT_CACHE_KEY_PREFIX = 'submission_quality_verdicts'
+VERDICT_CACHE_TTL_SECONDS = 24 * 60 * 60
+
 # The system-level framing of the model call - overall task, strictness,
 # tone. Overridable per environment so the check can be tuned (e.g. made
 # more or less aggressive while watching false-positive rates) with an
@@ -59,6 +72,16 @@ _DEFAULT_INSTRUCTIONS = (
 )
 
 
+def _get_instructions() -> str:
+    # `or` rather than a getenv default: .env.sample ships the var
+    # set-but-empty, which must mean "use the default" too.
+    return os.getenv(_INSTRUCTIONS_ENV_VAR) or _DEFAULT_INSTRUCTIONS
+
+
+def _normalize(value: str) -> str:
+    return ' '.join(str(value or '').split()).casefold()
+
+
 class QualityVerdict(BaseModel):
     flagged: bool = Field(
         description=(
@@ -168,12 +191,7 @@ class SubmissionQualityService:
                     provider=BedrockProvider(bedrock_client=bedrock_client),
                 ),
                 output_type=SubmissionQualityVerdicts,
-                # `or` rather than a getenv default: .env.sample ships
-                # the var set-but-empty, which must mean "use the
-                # default" too.
-                instructions=(
-                    os.getenv(_INSTRUCTIONS_ENV_VAR) or _DEFAULT_INSTRUCTIONS
-                ),
+                instructions=_get_instructions(),
                 # No re-prompting on output that fails schema validation
                 # - a retry is a second synchronous model call in the
                 # request path. An invalid output raises instead, and
@@ -185,6 +203,12 @@ class SubmissionQualityService:
     def evaluate(
         self, name: str, address: str, country_name: str
     ) -> Optional[SubmissionQualityVerdicts]:
+        cache_key = self._verdict_cache_key(name, address, country_name)
+        cached_verdicts = self._get_cached_verdicts(cache_key)
+        if cached_verdicts is not None:
+            logger.info('Submission quality check verdicts read from cache.')
+            return cached_verdicts
+
         try:
             result = self._get_agent().run_sync(
                 'Evaluate this production location submission.\n'
@@ -214,4 +238,53 @@ class SubmissionQualityService:
                 exc_info=True,
             )
 
+        self._cache_verdicts(cache_key, result.output)
         return result.output
+
+    @staticmethod
+    def _verdict_cache_key(
+        name: str, address: str, country_name: str
+    ) -> str:
+        evaluated = json.dumps([
+            SUBMISSION_QUALITY_MODEL_ID,
+            _get_instructions(),
+            _normalize(name),
+            _normalize(address),
+            _normalize(country_name),
+        ])
+        digest = hashlib.sha256(evaluated.encode('utf-8')).hexdigest()
+        return f'{VERDICT_CACHE_KEY_PREFIX}:{digest}'
+
+    @staticmethod
+    def _get_cached_verdicts(
+        cache_key: str
+    ) -> Optional[SubmissionQualityVerdicts]:
+        # Like the model call, the cache is best effort: an unavailable
+        # cache or an entry that no longer matches the schema is a miss.
+        try:
+            cached = caches['view_cache'].get(cache_key)
+            if cached is None:
+                return None
+            return SubmissionQualityVerdicts.model_validate(cached)
+        except Exception:
+            logger.warning(
+                'Submission quality verdicts could not be read from cache.',
+                exc_info=True,
+            )
+            return None
+
+    @staticmethod
+    def _cache_verdicts(
+        cache_key: str, verdicts: SubmissionQualityVerdicts
+    ) -> None:
+        try:
+            caches['view_cache'].set(
+                cache_key,
+                verdicts.model_dump(),
+                VERDICT_CACHE_TTL_SECONDS,
+            )
+        except Exception:
+            logger.warning(
+                'Submission quality verdicts could not be cached.',
+                exc_info=True,
+            )
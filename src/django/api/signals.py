@@ -7,6 +7,10 @@ from django.dispatch import receiver
 from opensearchpy.exceptions import \
     ConnectionError, NotFoundError, AuthorizationException
 
+from rest_framework.authtoken.models import Token
+
+from api.models.api.api_block import ApiBlock
+from api.models.contributor.contributor import Contributor
 from api.models.facility.facility import Facility
 from api.models.facility.facility_list_item import FacilityListItem
 from api.models.extended_field import ExtendedField
@@ -16,6 +20,7 @@ from api.models.facility.facility_location import FacilityLocation
 from api.models.facility.facility_alias import FacilityAlias
 from api.models.moderation_event import ModerationEvent
 from api.services.opensearch.opensearch import OpenSearchServiceConnection
+from api.token_meter import invalidate_token_meter, invalidate_token_meters
 from oar.rollbar import report_error_to_rollbar
 from api.views.v1.index_names import OpenSearchIndexNames
 
@@ -106,6 +111,30 @@ def moderation_event_update_handler_for_opensearch(
         signal_error_notifier(error_log_message, response)
 
 
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_handler_for_token_meter(instance, **kwargs):
+    invalidate_token_meter(instance.key)
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def contributor_handler_for_token_meter(instance, **kwargs):
+    invalidate_token_meters(instance.admin_id)
+
+
+@receiver(post_save, sender=ApiBlock)
+@receiver(post_delete, sender=ApiBlock)
+def api_block_handler_for_token_meter(instance, **kwargs):
+    invalidate_token_meters(
+        Contributor
+        .objects
+        .filter(id=instance.contributor_id)
+        .values_list('admin_id', flat=True)
+        .first()
+    )
+
+
 def set_origin_source_on_create(instance, created, **kwargs):
     if created and instance.origin_source is None:
         instance.origin_source = settings.INSTANCE_SOURCE
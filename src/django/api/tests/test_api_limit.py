@@ -1,10 +1,15 @@
-from api.limits import check_api_limits
+from api.limits import (
+    check_api_limits,
+    get_request_count,
+    rollup_request_log_daily_counts,
+)
 from api.models import (
     ApiBlock,
     ApiLimit,
     Contributor,
     ContributorNotifications,
     RequestLog,
+    RequestLogDailyCount,
     User,
 )
 from api.limitation.date.date_limitation_context import (
@@ -461,3 +466,62 @@ class ApiLimitTest(TestCase):
             result_date_two,
             datetime(day=1, month=1, year=2025)
         )
+
+    def create_log(self, user, created_at, response_code=200):
+        log = RequestLog.objects.create(user=user, response_code=response_code)
+        log.created_at = created_at
+        log.save()
+
+    def test_rollup_counts_successful_requests_of_past_days(self):
+        today = timezone.now()
+        yesterday = today - relativedelta(days=1)
+        two_days_ago = today - relativedelta(days=2)
+        self.create_log(self.user_one, two_days_ago)
+        self.create_log(self.user_one, two_days_ago)
+        self.create_log(self.user_one, two_days_ago, response_code=404)
+        self.create_log(self.user_one, yesterday)
+        self.create_log(self.user_one, today)
+
+        rollup_request_log_daily_counts(today)
+        rollup_request_log_daily_counts(today)
+
+        self.assertEqual(
+            list(RequestLogDailyCount.objects.values_list(
+                'user_id', 'day', 'count'
+            )),
+            [(self.user_one.id, two_days_ago.date(), 2)],
+        )
+
+    def test_request_count_includes_logs_written_late(self):
+        today = timezone.now()
+        yesterday = today - relativedelta(days=1)
+        start_date = today - relativedelta(days=5)
+        self.create_log(self.user_one, yesterday)
+        rollup_request_log_daily_counts(today)
+
+        # Written by the batch writer after the rollup ran.
+        self.create_log(self.user_one, yesterday)
+        rollup_end = rollup_request_log_daily_counts(today)
+        self.assertEqual(
+            get_request_count(self.contrib_one, start_date, rollup_end), 2
+        )
+
+        rollup_end = rollup_request_log_daily_counts(
+            today + relativedelta(days=1)
+        )
+        self.assertEqual(
+            get_request_count(self.contrib_one, start_date, rollup_end), 2
+        )
+
+    def test_request_count_combines_daily_counts_and_logs(self):
+        today = timezone.now()
+        start_date = today - relativedelta(days=3)
+        self.create_log(self.user_one, start_date - relativedelta(minutes=1))
+        self.create_log(self.user_one, start_date)
+        self.create_log(self.user_one, today - relativedelta(days=2))
+        self.create_log(self.user_one, today)
+        rollup_end = rollup_request_log_daily_counts(today)
+
+        self.assertEqual(
+            get_request_count(self.contrib_one, start_date, rollup_end), 3
+        )
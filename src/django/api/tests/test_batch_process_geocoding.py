@@ -0,0 +1,117 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.models import (
+    Contributor,
+    FacilityList,
+    FacilityListItem,
+    FacilityListItemTemp,
+    Source,
+    User,
+)
+
+
+def geocode_address_with_cache_hit(address, country_code):
+    return {
+        'result_count': 1,
+        'geocoded_point': {'lat': 1.0, 'lng': 2.0},
+        'geocoded_address': address.upper(),
+        'full_response': {},
+    }, False
+
+
+@override_settings(GEOCODING_WRITE_BATCH_SIZE=2)
+@patch(
+    'api.processing.geocode_address_with_cache_hit',
+    side_effect=geocode_address_with_cache_hit,
+)
+class BatchProcessGeocodingTest(TestCase):
+    def setUp(self):
+        user = User.objects.create(email='test@example.com')
+        contributor = Contributor.objects.create(
+            admin=user,
+            name='test contributor',
+            contrib_type=Contributor.OTHER_CONTRIB_TYPE,
+        )
+        self.facility_list = FacilityList.objects.create(
+            header='header', file_name='one', name='First List'
+        )
+        self.source = Source.objects.create(
+            facility_list=self.facility_list,
+            source_type=Source.LIST,
+            is_active=True,
+            is_public=True,
+            contributor=contributor,
+        )
+        statuses = [
+            FacilityListItem.PARSED,
+            FacilityListItem.PARSED,
+            FacilityListItem.ITEM_REMOVED,
+            FacilityListItem.PARSED,
+            FacilityListItem.UPLOADED,
+            FacilityListItem.PARSED,
+        ]
+        for row_index, status in enumerate(statuses):
+            FacilityListItem.objects.create(
+                source=self.source,
+                row_index=row_index,
+                raw_data='',
+                status=status,
+                address=f'{row_index} Main St',
+                country_code='US',
+            )
+
+    def geocode(self, concurrency):
+        stdout = StringIO()
+        call_command(
+            'batch_process',
+            '--action', 'geocode',
+            '--list-id', self.facility_list.id,
+            '--concurrency', concurrency,
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        return stdout.getvalue()
+
+    def assert_geocoded(self, output):
+        items = FacilityListItem.objects.filter(
+            source=self.source
+        ).order_by('row_index')
+        self.assertEqual(
+            [(item.status, item.geocoded_address) for item in items],
+            [
+                (FacilityListItem.GEOCODED, '0 MAIN ST'),
+                (FacilityListItem.GEOCODED, '1 MAIN ST'),
+                (FacilityListItem.ITEM_REMOVED, None),
+                (FacilityListItem.GEOCODED, '3 MAIN ST'),
+                (FacilityListItem.UPLOADED, None),
+                (FacilityListItem.GEOCODED, '5 MAIN ST'),
+            ],
+        )
+        self.assertEqual(items[0].geocoded_point.coords, (2.0, 1.0))
+        self.assertEqual(
+            sorted(
+                FacilityListItemTemp.objects.values_list(
+                    'row_index', 'status'
+                )
+            ),
+            [
+                (0, FacilityListItem.GEOCODED),
+                (1, FacilityListItem.GEOCODED),
+                (3, FacilityListItem.GEOCODED),
+                (5, FacilityListItem.GEOCODED),
+            ],
+        )
+        self.assertIn('geocode: 4 successes', output)
+        self.assertIn('geocode: 1 warnings', output)
+        self.assertIn('geocode: 1 failures', output)
+
+    def test_geocodes_items_one_at_a_time(self, mock_geocode_address):
+        self.assert_geocoded(self.geocode(1))
+
+    def test_geocodes_items_concurrently(self, mock_geocode_address):
+        self.assert_geocoded(self.geocode(3))
+        self.assertEqual(mock_geocode_address.call_count, 4)
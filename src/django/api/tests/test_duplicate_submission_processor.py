@@ -21,7 +21,11 @@ from api.moderation_event_actions.creation.dtos.create_moderation_event_dto \
     import CreateModerationEventDTO
 from api.moderation_event_actions.creation.location_contribution \
     .processors.duplicate_submission_processor \
-    import ADVISORY_LOCK_NAMESPACE, DUPLICATE_CHECK_WINDOW_MINUTES
+    import (
+        ADVISORY_LOCK_NAMESPACE,
+        DUPLICATE_CHECK_WINDOW_MINUTES,
+        DuplicateSubmissionProcessor,
+    )
 
 
 class TestDuplicateSubmissionProcessor(APITestCase):
@@ -203,6 +207,53 @@ class TestDuplicateSubmissionProcessor(APITestCase):
         self.assertEqual(second_result.status_code, status.HTTP_409_CONFLICT)
         self.assertIsNone(second_result.moderation_event)
 
+    def test_short_name_with_two_typos_is_flagged(self):
+        # "ahmed knit" and "abhmed knt" have a SequenceMatcher ratio of 0.9,
+        # right at NAME_SIMILARITY_THRESHOLD, but a trigram similarity of
+        # only 0.375, just above CANDIDATE_TRIGRAM_SIMILARITY_THRESHOLD.
+        first_input_data = {
+            **self.base_input_data,
+            'name': 'Ahmed Knit',
+        }
+        first_result = self._submit(self.contributor, first_input_data)
+        self.assertEqual(first_result.status_code, status.HTTP_202_ACCEPTED)
+
+        typo_input_data = {
+            **self.base_input_data,
+            'name': 'Abhmed Knt',
+        }
+        second_result = self._submit(self.contributor, typo_input_data)
+
+        self.assertEqual(second_result.status_code, status.HTTP_409_CONFLICT)
+        self.assertIsNone(second_result.moderation_event)
+
+    def test_blank_name_matching_a_blank_name_is_flagged(self):
+        first_result = self._submit(self.contributor, self.base_input_data)
+        self.assertEqual(first_result.status_code, status.HTTP_202_ACCEPTED)
+
+        event = first_result.moderation_event
+        cleaned_data = {**event.cleaned_data, 'clean_name': ''}
+        # Use a queryset update (not instance.save()) so the OpenSearch
+        # post_save signal, which needs AWS credentials unavailable in
+        # tests, isn't triggered.
+        ModerationEvent.objects.filter(pk=event.pk).update(
+            cleaned_data=cleaned_data
+        )
+
+        event_dto = CreateModerationEventDTO(
+            contributor=self.contributor,
+            raw_data=self.base_input_data,
+            request_type=ModerationEvent.RequestType.CREATE.value,
+            source=ModerationEvent.Source.SLC.value,
+            cleaned_data=cleaned_data,
+        )
+        result = DuplicateSubmissionProcessor().process(event_dto)
+
+        self.assertEqual(result.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            result.errors['duplicate_of']['moderation_id'], str(event.uuid)
+        )
+
     def test_different_unit_number_in_name_is_not_flagged(self):
         first_unit_data = {
             **self.base_input_data,
@@ -327,6 +378,28 @@ class TestDuplicateSubmissionProcessor(APITestCase):
         self.assertEqual(second_result.status_code, status.HTTP_202_ACCEPTED)
         self.assertIsNotNone(second_result.moderation_event)
 
+    def test_most_similar_recent_submission_is_reported(self):
+        self._submit(
+            self.contributor,
+            {**self.base_input_data, 'name': 'Green Valley Warehouse'},
+        )
+        self._submit(
+            self.contributor,
+            {**self.base_input_data, 'name': 'Blue Horizon Facilty'},
+        )
+        exact_result = self._submit(
+            self.contributor, self.base_input_data, duplicate_override=True
+        )
+        self.assertEqual(exact_result.status_code, status.HTTP_202_ACCEPTED)
+
+        second_result = self._submit(self.contributor, self.base_input_data)
+
+        self.assertEqual(second_result.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            second_result.errors['duplicate_of']['moderation_id'],
+            str(exact_result.moderation_event.uuid)
+        )
+
     def test_other_contributors_submission_is_not_flagged(self):
         first_result = self._submit(self.contributor, self.base_input_data)
         self.assertEqual(first_result.status_code, status.HTTP_202_ACCEPTED)
@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from api.models import Contributor, EmbedConfig, EmbedField, User
+from api.services.embed_context import EmbedContext
+
+
+# The embed settings are cached in ``view_cache``, which is a DummyCache in
+# the test settings. Override it with a real local cache so the caching
+# behaviour can be exercised.
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'view_cache': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'embed-context-test',
+    },
+})
+class EmbedContextTest(TestCase):
+    def setUp(self):
+        caches['view_cache'].clear()
+        self.embed_config = EmbedConfig.objects.create(
+            prefer_contributor_name=True
+        )
+        self.contributor = Contributor.objects.create(
+            admin=User.objects.create(email='embed@example.com'),
+            name='Embed contributor',
+            contrib_type=Contributor.OTHER_CONTRIB_TYPE,
+            embed_config=self.embed_config,
+            embed_level=Contributor.EMBED_LEVEL_CHOICES[0][0],
+        )
+        EmbedField.objects.create(
+            embed_config=self.embed_config,
+            order=1,
+            column_name='extra_2',
+            display_name='ExtraTwo',
+            visible=True,
+        )
+        EmbedField.objects.create(
+            embed_config=self.embed_config,
+            order=0,
+            column_name='extra_1',
+            display_name='ExtraOne',
+            visible=True,
+        )
+        EmbedField.objects.create(
+            embed_config=self.embed_config,
+            order=2,
+            column_name='hidden',
+            display_name='Hidden',
+            visible=False,
+        )
+
+    def tearDown(self):
+        caches['view_cache'].clear()
+
+    def test_loads_visible_fields_in_order(self):
+        embed_context = EmbedContext.get(self.contributor.id)
+
+        self.assertTrue(embed_context.exists)
+        self.assertTrue(embed_context.has_config)
+        self.assertTrue(embed_context.has_fields)
+        self.assertTrue(embed_context.prefer_contributor_name)
+        self.assertEqual(
+            embed_context.visible_fields,
+            [('extra_1', 'ExtraOne'), ('extra_2', 'ExtraTwo')],
+        )
+
+    def test_unknown_contributor_does_not_exist(self):
+        self.assertFalse(EmbedContext.get(self.contributor.id + 1).exists)
+        self.assertFalse(EmbedContext.get('not-an-id').exists)
+
+    def test_is_cached_between_requests(self):
+        EmbedContext.get(self.contributor.id)
+
+        with self.assertNumQueries(0):
+            embed_context = EmbedContext.get(str(self.contributor.id))
+
+        self.assertEqual(len(embed_context.visible_fields), 2)
+
+    def test_is_loaded_once_per_request(self):
+        request = SimpleNamespace()
+        embed_context = EmbedContext.for_request(request, self.contributor.id)
+        caches['view_cache'].clear()
+
+        with self.assertNumQueries(0):
+            self.assertIs(
+                EmbedContext.for_request(request, str(self.contributor.id)),
+                embed_context,
+            )
+
+    def test_saving_embed_config_invalidates_cache(self):
+        EmbedContext.get(self.contributor.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EmbedField.objects.filter(column_name='hidden').update(
+                visible=True
+            )
+            self.embed_config.save()
+
+        self.assertEqual(
+            len(EmbedContext.get(self.contributor.id).visible_fields), 3
+        )
+
+    def test_changing_embed_level_invalidates_cache(self):
+        EmbedContext.get(self.contributor.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.contributor.embed_level = None
+            self.contributor.save()
+
+        self.assertIsNone(EmbedContext.get(self.contributor.id).embed_level)
@@ -0,0 +1,277 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.contrib.gis.geos import Point
+from django.core.files.storage import InMemoryStorage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api.management.commands import export_csv
+from api.models.facility.facility_index import FacilityIndex
+from api.models.partner_field import PartnerField
+from api.models.wage_indicator_country_data import WageIndicatorCountryData
+
+
+class FakeSerializer:
+    def get_headers(self):
+        return ["os_id", "name"]
+
+    def get_row(self, facility):
+        return [facility.id, facility.name]
+
+
+class InlinePool:
+    """Runs the jobs of `starmap` in this process, last job first."""
+
+    def __init__(self, processes):
+        self.processes = processes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def starmap(self, function, jobs):
+        results = {}
+        for index, job in reversed(list(enumerate(jobs))):
+            results[index] = function(*job)
+        return [results[index] for index in range(len(jobs))]
+
+
+class ExportCsvTest(TestCase):
+    def setUp(self):
+        patcher = patch.object(export_csv, "serializer", FakeSerializer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_facility_index(self, facility_id, name="Test Facility"):
+        return FacilityIndex.objects.create(
+            id=facility_id,
+            name=name,
+            address="123 Main St",
+            country_code="US",
+            location=Point(0, 0),
+            contributors_count=0,
+            contributors_id=[],
+            contributors=[],
+            contrib_types=[],
+            facility_addresses=[],
+            extended_fields=[],
+            lists=[],
+            approved_claim_ids=[],
+            facility_names=[],
+        )
+
+    def set_updated_at(self, facility_id, updated_at):
+        FacilityIndex.objects.filter(id=facility_id).update(
+            updated_at=updated_at
+        )
+
+    def write_delta(self, previous_rows, since, limit=2):
+        previous_file = io.StringIO()
+        csv.writer(previous_file).writerows(previous_rows)
+        previous_file.seek(0)
+        output = io.StringIO()
+
+        counts = export_csv.write_delta(
+            writer=csv.writer(output),
+            previous_file=previous_file,
+            since=since,
+            limit=limit,
+        )
+
+        output.seek(0)
+        return counts, list(csv.reader(output))
+
+    def test_delta_copies_unchanged_and_serializes_changed_rows(self):
+        since = timezone.now()
+        long_before = since - timedelta(days=1)
+        for facility_id in ["US1", "US2", "US3", "US5"]:
+            self.create_facility_index(facility_id, name=f"{facility_id} new")
+        self.set_updated_at("US1", long_before)
+        self.set_updated_at("US3", long_before)
+
+        counts, rows = self.write_delta(
+            [
+                ["US1", "US1 old"],
+                ["US2", "US2 old"],
+                ["US3", "US3 old"],
+                ["US4", "US4 old"],
+            ],
+            since,
+        )
+
+        self.assertEqual(
+            rows,
+            [
+                ["US1", "US1 old"],
+                ["US2", "US2 new"],
+                ["US3", "US3 old"],
+                ["US5", "US5 new"],
+            ],
+        )
+        self.assertEqual(counts, (4, 2))
+
+    def test_delta_serializes_rows_updated_just_before_the_last_export(self):
+        since = timezone.now()
+        self.create_facility_index("US1", name="US1 new")
+        self.create_facility_index("US2", name="US2 new")
+        self.set_updated_at("US1", since - timedelta(days=1))
+        self.set_updated_at("US2", since - timedelta(minutes=5))
+
+        counts, rows = self.write_delta(
+            [["US1", "US1 old"], ["US2", "US2 old"]],
+            since,
+        )
+
+        self.assertEqual(rows, [["US1", "US1 old"], ["US2", "US2 new"]])
+        self.assertEqual(counts, (2, 1))
+
+    def test_delta_without_previous_rows_serializes_everything(self):
+        self.create_facility_index("US1")
+        self.create_facility_index("US2")
+
+        counts, rows = self.write_delta([], timezone.now())
+
+        self.assertEqual(
+            rows, [["US1", "Test Facility"], ["US2", "Test Facility"]]
+        )
+        self.assertEqual(counts, (2, 2))
+
+    def test_parallel_export_joins_parts_in_id_order(self):
+        facility_ids = [f"US{i}" for i in range(7)] + ["CN1", "BD1"]
+        for facility_id in facility_ids:
+            self.create_facility_index(facility_id)
+
+        sequential = io.StringIO()
+        sequential_count = export_csv.write_facility_range(
+            writer=csv.writer(sequential), limit=2
+        )
+
+        parallel = io.StringIO()
+        multiprocessing = MagicMock()
+        multiprocessing.get_context.return_value.Pool = InlinePool
+        with patch.object(
+            export_csv, "multiprocessing", multiprocessing
+        ), patch.object(export_csv, "connections"):
+            parallel_count = export_csv.export_in_parallel(
+                file=parallel, workers=3, limit=2
+            )
+
+        self.assertEqual(parallel_count, len(facility_ids))
+        self.assertEqual(sequential_count, len(facility_ids))
+        self.assertEqual(parallel.getvalue(), sequential.getvalue())
+        self.assertEqual(
+            [row[0] for row in csv.reader(io.StringIO(parallel.getvalue()))],
+            sorted(facility_ids),
+        )
+
+    def test_shard_bounds_cover_every_facility_once(self):
+        for i in range(7):
+            self.create_facility_index(f"US{i}")
+
+        bounds = export_csv.get_shard_bounds(3)
+
+        self.assertEqual(
+            bounds, [(None, "US2"), ("US2", "US4"), ("US4", "US6")]
+        )
+
+    def test_fingerprint_changes_with_the_reference_data(self):
+        partner_field = PartnerField.objects.create(
+            name="custom_partner_field",
+            type=PartnerField.OBJECT,
+            json_schema={"type": "object", "properties": {}},
+        )
+        fingerprint = export_csv.get_reference_data_fingerprint()
+        self.assertEqual(
+            export_csv.get_reference_data_fingerprint(), fingerprint
+        )
+
+        # A queryset update, which does not bump `updated_at`.
+        PartnerField.objects.get_all_including_inactive().filter(
+            pk=partner_field.pk
+        ).update(json_schema={"type": "object", "default": {}})
+        schema_fingerprint = export_csv.get_reference_data_fingerprint()
+        self.assertNotEqual(schema_fingerprint, fingerprint)
+
+        WageIndicatorCountryData.objects.create(
+            country_code="US",
+            living_wage_link_national="https://example.com/living",
+            minimum_wage_link_english="https://example.com/min-en",
+            minimum_wage_link_national="https://example.com/min-nat",
+        )
+        self.assertNotEqual(
+            export_csv.get_reference_data_fingerprint(), schema_fingerprint
+        )
+
+    def test_baseline_is_only_used_with_the_same_reference_data(self):
+        filename = self.write_temp_file("os_id,name\r\nUS1,US1\r\n")
+        with patch.object(export_csv, "default_storage", InMemoryStorage()):
+            export_csv.save_baseline(
+                filename=filename,
+                headers=["os_id", "name"],
+                reference_data="fingerprint",
+                started_at=timezone.now(),
+                total_facilities=1,
+            )
+
+            manifest, previous_filename = export_csv.load_baseline(
+                ["os_id", "name"], "fingerprint"
+            )
+            self.addCleanup(os.remove, previous_filename)
+            self.assertEqual(manifest["reference_data"], "fingerprint")
+
+            self.assertEqual(
+                export_csv.load_baseline(["os_id", "name"], "changed"),
+                (None, None),
+            )
+
+    def test_delta_export_warns_that_workers_are_ignored(self):
+        self.create_facility_index("US1")
+        baseline = self.write_temp_file("os_id,name\r\nUS1,US1\r\n")
+        # The command writes its export to the working directory.
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory)
+
+        with patch.object(
+            export_csv, "default_storage", InMemoryStorage()
+        ), patch.object(
+            export_csv, "upload_file_to_google_drive"
+        ), patch.object(
+            export_csv, "export_in_parallel"
+        ) as export_in_parallel:
+            export_csv.save_baseline(
+                filename=baseline,
+                headers=["os_id", "name"],
+                reference_data=export_csv.get_reference_data_fingerprint(),
+                started_at=timezone.now(),
+                total_facilities=1,
+            )
+
+            with self.assertLogs(export_csv.logger, "WARNING") as logs:
+                call_command("export_csv", "--delta", "--workers", "4")
+
+        export_in_parallel.assert_not_called()
+        self.assertEqual(
+            logs.output,
+            [
+                f"WARNING:{export_csv.logger.name}:Ignoring --workers 4: a "
+                "delta export serializes facilities in one process"
+            ],
+        )
+
+    def write_temp_file(self, content):
+        fd, filename = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as file:
+            file.write(content)
+        self.addCleanup(os.remove, filename)
+        return filename
@@ -1,3 +1,7 @@
+import csv
+import io
+
+from openpyxl import load_workbook
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
@@ -1570,3 +1574,96 @@ class FacilitiesDownloadViewSetTest(APITestCase):
         result = FacilitiesDownloadService.get_download_limit(request)
         self.assertIsNotNone(result)
         self.assertIsInstance(result, FacilityDownloadLimit)
+
+    def get_facility_export(self, params=None):
+        return self.client.get(
+            reverse("facilities-downloads-export"), params or {}
+        )
+
+    def test_csv_export_contains_every_page_in_one_response(self):
+        user = self.create_user()
+        self.login_user(user)
+
+        paged = self.get_facility_downloads({"pageSize": 250})
+        response = self.get_facility_export()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn(
+            'filename="facilities.csv"', response["Content-Disposition"]
+        )
+        content = b"".join(response.streaming_content).decode("utf-8")
+        exported = list(csv.reader(io.StringIO(content)))
+        expected = [
+            ["" if value is None else str(value) for value in row]
+            for row in [paged.data["results"]["headers"]]
+            + paged.data["results"]["rows"]
+        ]
+        self.assertEqual(exported, expected)
+        self.assertEqual(len(exported), 19)
+
+    def test_xlsx_export_contains_every_row(self):
+        user = self.create_user()
+        self.login_user(user)
+
+        response = self.get_facility_export({"file_format": "xlsx"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        workbook = load_workbook(
+            io.BytesIO(b"".join(response.streaming_content)), read_only=True
+        )
+        rows = list(workbook["facilities"].iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], "os_id")
+        self.assertEqual(len(rows), 19)
+
+    def test_export_rejects_unknown_file_format(self):
+        user = self.create_user()
+        self.login_user(user)
+
+        response = self.get_facility_export({"file_format": "pdf"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch(
+        'api.constants.FacilitiesDownloadSettings.'
+        'FREE_FACILITIES_DOWNLOAD_LIMIT',
+        FREE_FACILITIES_DOWNLOAD_LIMIT,
+    )
+    def test_export_enforces_records_limit(self):
+        user = self.create_user()
+        self.login_user(user)
+        FacilityDownloadLimit.objects.create(
+            user=user,
+            free_download_records=FREE_FACILITIES_DOWNLOAD_LIMIT,
+            paid_download_records=1
+        )
+
+        response = self.get_facility_export()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_registers_download_before_streaming(self):
+        user = self.create_user()
+        self.login_user(user)
+        limit = FacilityDownloadLimit.objects.create(
+            user=user,
+            free_download_records=20,
+            paid_download_records=0,
+        )
+
+        with patch(
+            'api.services.facilities_download_service.'
+            'FacilitiesDownloadService.send_email_if_needed',
+            return_value=None
+        ):
+            response = self.get_facility_export()
+            limit.refresh_from_db()
+            self.assertEqual(limit.free_download_records, 2)
+            self.assertEqual(limit.paid_download_records, 0)
+
+            next(iter(response.streaming_content))
+            response.close()
+
+        limit.refresh_from_db()
+        self.assertEqual(limit.free_download_records, 2)
+        self.assertEqual(limit.paid_download_records, 0)
@@ -95,3 +95,22 @@ class FacilitySearchAccentedCharactersTest(TestCase):
                 self.assertEqual(
                     any(x.name == self.facility_second.name for x in result),
                     True)
+
+    def test_indexed_search_treats_query_literally(self):
+        self.params.update({"q": "%"})
+        result = FacilityIndexNewManager.filter_by_query_params(
+            self, self.params
+        )
+
+        self.assertIn("immutable_unaccent", str(result.query))
+        self.assertEqual(0, len(result))
+
+        self.params.update({"q": "düğme san"})
+        result = FacilityIndexNewManager.filter_by_query_params(
+            self, self.params
+        )
+
+        self.assertEqual(
+            [facility.id for facility in result],
+            [self.facility_second.id],
+        )
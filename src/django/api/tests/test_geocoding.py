@@ -1,16 +1,24 @@
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
 from api.geocoding import (
     GEOCODING_REQUEST_TIMEOUT_SECONDS,
+    TokenBucket,
     geocode_address,
+    geocode_address_with_cache_hit,
+    purge_expired_geocoding_responses,
 )
+from api.models import GeocodingResult
 from api.tests.test_data import (
     geocoding_data,
     geocoding_data_no_country,
     geocoding_data_second_country,
+    geocoding_no_results,
 )
 
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
 
 
 class GeocodingTest(TestCase):
@@ -104,3 +112,189 @@ class GeocodingTest(TestCase):
         mock_get.return_value = Mock(ok=True, status_code=400)
         with self.assertRaisesRegex(ValueError, "400"):
             geocode_address("Noorbagh, Kaliakoir Gazipur Dhaka 1704", "BD")
+
+
+class GeocodingCacheTest(TestCase):
+    def create_result(self, key, days_old):
+        return GeocodingResult.objects.create(
+            key=key,
+            address=key,
+            country_code="US",
+            response=geocoding_data,
+            geocoded_at=timezone.now() - timedelta(days=days_old),
+        )
+
+    @patch("api.geocoding.requests.get")
+    def test_reuses_response_for_normalised_address(self, mock_get):
+        mock_get.return_value = Mock(ok=True, status_code=200)
+        mock_get.return_value.json.return_value = geocoding_data
+
+        first, first_cache_hit = geocode_address_with_cache_hit(
+            "990 Spring Garden St, Philly", "US"
+        )
+        second, second_cache_hit = geocode_address_with_cache_hit(
+            " 990 spring garden st ,  PHILLY ", "us"
+        )
+
+        self.assertEqual(1, mock_get.call_count)
+        self.assertFalse(first_cache_hit)
+        self.assertTrue(second_cache_hit)
+        self.assertEqual(first["geocoded_point"], second["geocoded_point"])
+
+    @patch("api.geocoding.requests.get")
+    def test_result_does_not_report_cache_hits(self, mock_get):
+        mock_get.return_value = Mock(ok=True, status_code=200)
+        mock_get.return_value.json.return_value = geocoding_data
+
+        geocode_address("990 Spring Garden St, Philly", "US")
+        cached = geocode_address("990 Spring Garden St, Philly", "US")
+
+        self.assertEqual(1, mock_get.call_count)
+        # The geocoding endpoints return the result to clients as it is.
+        self.assertNotIn("cache_hit", cached)
+
+    @patch("api.geocoding.requests.get")
+    def test_does_not_share_responses_across_countries(self, mock_get):
+        mock_get.return_value = Mock(ok=True, status_code=200)
+        mock_get.return_value.json.return_value = geocoding_data
+
+        geocode_address("990 Spring Garden St, Philly", "US")
+        with self.assertRaises(ValueError):
+            geocode_address("990 Spring Garden St, Philly", "CA")
+
+        self.assertEqual(2, mock_get.call_count)
+
+    @patch("api.geocoding.requests.get")
+    def test_caches_zero_results_with_shorter_ttl(self, mock_get):
+        mock_get.return_value = Mock(ok=True, status_code=200)
+        mock_get.return_value.json.return_value = geocoding_no_results
+
+        geocode_address("@#$^@#$^", "US")
+        cached, cache_hit = geocode_address_with_cache_hit("@#$^@#$^", "US")
+        self.assertEqual(1, mock_get.call_count)
+        self.assertTrue(cache_hit)
+        self.assertEqual(0, cached["result_count"])
+
+        GeocodingResult.objects.update(
+            geocoded_at=timezone.now() - timedelta(days=8)
+        )
+        geocode_address("@#$^@#$^", "US")
+        self.assertEqual(2, mock_get.call_count)
+
+    @patch("api.geocoding.requests.get")
+    def test_refreshes_expired_responses(self, mock_get):
+        mock_get.return_value = Mock(ok=True, status_code=200)
+        mock_get.return_value.json.return_value = geocoding_data
+
+        geocode_address("990 Spring Garden St, Philly", "US")
+        GeocodingResult.objects.update(
+            geocoded_at=timezone.now() - timedelta(days=31)
+        )
+        _, cache_hit = geocode_address_with_cache_hit(
+            "990 Spring Garden St, Philly", "US"
+        )
+
+        self.assertEqual(2, mock_get.call_count)
+        self.assertFalse(cache_hit)
+        self.assertEqual(1, GeocodingResult.objects.count())
+        self.assertGreater(
+            GeocodingResult.objects.get().geocoded_at,
+            timezone.now() - timedelta(days=1),
+        )
+
+    @patch("api.geocoding.requests.get")
+    def test_does_not_cache_failed_requests(self, mock_get):
+        mock_get.return_value = Mock(ok=True, status_code=200)
+        mock_get.return_value.json.return_value = {
+            "results": [],
+            "status": "OVER_QUERY_LIMIT",
+        }
+
+        geocode_address("990 Spring Garden St, Philly", "US")
+
+        self.assertEqual(0, GeocodingResult.objects.count())
+
+    @override_settings(GEOCODING_CACHE_TTL_DAYS=0)
+    @patch("api.geocoding.requests.get")
+    def test_cache_can_be_disabled(self, mock_get):
+        mock_get.return_value = Mock(ok=True, status_code=200)
+        mock_get.return_value.json.return_value = geocoding_data
+
+        geocode_address("990 Spring Garden St, Philly", "US")
+        geocode_address("990 Spring Garden St, Philly", "US")
+
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(0, GeocodingResult.objects.count())
+
+    def test_purges_responses_older_than_the_ttl(self):
+        self.create_result("expired", days_old=31)
+        self.create_result("fresh", days_old=29)
+
+        self.assertEqual(1, purge_expired_geocoding_responses())
+
+        self.assertEqual(
+            ["fresh"], list(GeocodingResult.objects.values_list(
+                "key", flat=True
+            ))
+        )
+
+    @override_settings(GEOCODING_CACHE_TTL_DAYS=0)
+    def test_purges_every_response_when_the_cache_is_disabled(self):
+        self.create_result("fresh", days_old=1)
+
+        self.assertEqual(1, purge_expired_geocoding_responses())
+
+    @patch("api.geocoding.GEOCODING_CACHE_PURGE_BATCH_SIZE", 1)
+    @patch(
+        "api.management.commands.purge_geocoding_results."
+        "GEOCODING_CACHE_PURGE_BATCH_SIZE",
+        1,
+    )
+    def test_command_purges_every_batch_of_expired_responses(self):
+        self.create_result("expired", days_old=31)
+        self.create_result("expired-too", days_old=40)
+        self.create_result("fresh", days_old=29)
+
+        call_command("purge_geocoding_results")
+
+        self.assertEqual(
+            ["fresh"], list(GeocodingResult.objects.values_list(
+                "key", flat=True
+            ))
+        )
+
+
+@patch("api.geocoding.time.sleep")
+@patch("api.geocoding.time.monotonic")
+class TokenBucketTest(SimpleTestCase):
+    def test_waits_once_the_bucket_is_empty(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket()
+
+        for _ in range(4):
+            bucket.acquire(2)
+
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list], [0.5, 1.0]
+        )
+
+    def test_refills_over_time(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket()
+        bucket.acquire(2)
+        bucket.acquire(2)
+
+        mock_monotonic.return_value = 100.5
+        bucket.acquire(2)
+        mock_sleep.assert_not_called()
+
+        bucket.acquire(2)
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_no_limit(self, mock_monotonic, mock_sleep):
+        bucket = TokenBucket()
+
+        for _ in range(10):
+            bucket.acquire(0)
+
+        mock_sleep.assert_not_called()
@@ -0,0 +1,228 @@
+"""Tests for the arithmetic facilitygrid hexagon binning and the
+precomputed hexagon counts."""
+
+import math
+import random
+from collections import Counter
+from io import StringIO
+
+import mercantile
+from django.contrib.gis.geos import Point
+from django.core.management import call_command
+from django.db import connection
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api.hexgrid import HexGrid
+from api.models.facility.facility_hex_count import (
+    MAX_ZOOM_VERSION_NAME,
+    FacilityHexCount,
+)
+from api.models.facility.facility_index import FacilityIndex
+from api.models.version import Version
+from api.tiler import get_facility_grid_vector_tile
+
+
+class HexGridTest(SimpleTestCase):
+    def setUp(self):
+        self.grid = HexGrid.for_zoom(5)
+        self.random = random.Random(5)
+
+    def get_nearest_cell(self, x, y):
+        col, row = self.grid.get_cell(x, y)
+        candidates = [
+            (c, r)
+            for c in range(col - 2, col + 3)
+            for r in range(row - 2, row + 3)
+        ]
+
+        def distance(cell):
+            center_x, center_y = self.grid.get_center(*cell)
+            return math.hypot(x - center_x, y - center_y)
+
+        return min(candidates, key=distance)
+
+    def test_assigns_points_to_the_nearest_center(self):
+        for _ in range(2000):
+            x = self.random.uniform(-2e7, 2e7)
+            y = self.random.uniform(-2e7, 2e7)
+
+            self.assertEqual(
+                self.get_nearest_cell(x, y), self.grid.get_cell(x, y)
+            )
+
+    def test_points_are_within_a_radius_of_their_center(self):
+        for _ in range(2000):
+            x = self.random.uniform(-2e7, 2e7)
+            y = self.random.uniform(-2e7, 2e7)
+            center_x, center_y = self.grid.get_center(
+                *self.grid.get_cell(x, y)
+            )
+
+            self.assertLessEqual(
+                math.hypot(x - center_x, y - center_y),
+                self.grid.radius * (1 + 1e-9),
+            )
+
+    def test_centers_belong_to_their_own_cell(self):
+        for cell in [(0, 0), (0, 1), (-3, -7), (12, 5), (-1, 2)]:
+            self.assertEqual(
+                cell, self.grid.get_cell(*self.grid.get_center(*cell))
+            )
+
+    def test_cell_range_covers_centers_inside_the_box(self):
+        box = (-1234567.0, 2345678.0, 3456789.0, 4567890.0)
+        col_min, row_min, col_max, row_max = self.grid.get_cell_range(*box)
+
+        for _ in range(500):
+            x = self.random.uniform(box[0], box[2])
+            y = self.random.uniform(box[1], box[3])
+            col, row = self.grid.get_cell(x, y)
+
+            self.assertTrue(col_min <= col <= col_max)
+            self.assertTrue(row_min <= row <= row_max)
+
+
+class FacilityHexCountTest(TestCase):
+    LOCATIONS = [
+        Point(13.4, 52.5),
+        Point(13.41, 52.51),
+        Point(-74.0, 40.7),
+        Point(121.47, 31.23),
+        Point(90.41, 23.81),
+    ]
+
+    def create_facility_index(self, facility_id, location):
+        return FacilityIndex.objects.create(
+            id=facility_id,
+            name='Test Facility',
+            address='123 Main St',
+            country_code='US',
+            location=location,
+            contributors_count=0,
+            contributors_id=[],
+            contributors=[],
+            contrib_types=[],
+            facility_addresses=[],
+            extended_fields=[],
+            lists=[],
+            approved_claim_ids=[],
+            facility_names=[],
+        )
+
+    def get_expected_counts(self, locations, max_zoom):
+        counts = Counter()
+        for location in locations:
+            mercator = location.transform(3857, clone=True)
+            for z in range(max_zoom + 1):
+                cell = HexGrid.for_zoom(z).get_cell(mercator.x, mercator.y)
+                counts[(z, *cell)] += 1
+        return counts
+
+    def get_counts(self):
+        return Counter({
+            (count.zoom, count.hex_col, count.hex_row): count.count
+            for count in FacilityHexCount.objects.all()
+        })
+
+    def build_counts(self, max_zoom):
+        call_command(
+            'build_facility_hex_counts',
+            max_zoom=max_zoom,
+            stdout=StringIO(),
+        )
+
+    def test_hex_cell_function_matches_python(self):
+        grid = HexGrid.for_zoom(7)
+        for location in self.LOCATIONS:
+            mercator = location.transform(3857, clone=True)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT facility_hex_cell(facility_hex_width(%s), %s, %s)',
+                    [7, mercator.x, mercator.y],
+                )
+                cell = tuple(cursor.fetchone()[0])
+
+            self.assertEqual(grid.get_cell(mercator.x, mercator.y), cell)
+
+    def test_builds_counts_for_every_zoom(self):
+        for index, location in enumerate(self.LOCATIONS):
+            self.create_facility_index(f'US2026HEX{index}', location)
+
+        self.build_counts(3)
+
+        self.assertEqual(
+            self.get_expected_counts(self.LOCATIONS, 3), self.get_counts()
+        )
+        self.assertEqual(3, FacilityHexCount.current_max_zoom())
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'tile_store': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test_hexgrid',
+        },
+    })
+    def test_rebuild_drops_cached_max_zoom(self):
+        self.build_counts(2)
+        self.assertEqual(2, FacilityHexCount.cached_max_zoom())
+
+        self.build_counts(3)
+
+        self.assertEqual(3, FacilityHexCount.cached_max_zoom())
+
+    def test_triggers_keep_counts_up_to_date(self):
+        self.create_facility_index('US2026HEX0', self.LOCATIONS[0])
+        moved = self.create_facility_index('US2026HEX1', self.LOCATIONS[1])
+        deleted = self.create_facility_index('US2026HEX2', self.LOCATIONS[2])
+        self.build_counts(3)
+
+        self.create_facility_index('US2026HEX3', self.LOCATIONS[3])
+        moved.location = self.LOCATIONS[4]
+        moved.save()
+        deleted.delete()
+
+        self.assertEqual(
+            self.get_expected_counts(
+                [self.LOCATIONS[0], self.LOCATIONS[3], self.LOCATIONS[4]], 3
+            ),
+            self.get_counts(),
+        )
+
+    def test_triggers_do_nothing_until_counts_are_built(self):
+        self.create_facility_index('US2026HEX0', self.LOCATIONS[0])
+
+        self.assertFalse(FacilityHexCount.objects.exists())
+        self.assertEqual(-1, FacilityHexCount.current_max_zoom())
+
+    def test_precomputed_and_binned_tiles_have_the_same_size(self):
+        for index, location in enumerate(self.LOCATIONS):
+            self.create_facility_index(f'US2026HEX{index}', location)
+        tile = mercantile.tile(13.4, 52.5, 3)
+        params = QueryDict('')
+
+        binned = get_facility_grid_vector_tile(
+            params, 'facilitygrid', tile.z, tile.x, tile.y
+        )
+        self.build_counts(3)
+        precomputed = get_facility_grid_vector_tile(
+            params, 'facilitygrid', tile.z, tile.x, tile.y
+        )
+
+        self.assertGreater(len(binned), 0)
+        self.assertEqual(len(binned), len(precomputed))
+
+    def test_rebuild_drops_zoom_levels_above_max_zoom(self):
+        self.create_facility_index('US2026HEX0', self.LOCATIONS[0])
+        self.build_counts(3)
+        self.build_counts(1)
+
+        self.assertEqual(
+            {0, 1},
+            set(FacilityHexCount.objects.values_list('zoom', flat=True)),
+        )
+        self.assertEqual(
+            1, Version.objects.get(name=MAX_ZOOM_VERSION_NAME).version
+        )
@@ -0,0 +1,110 @@
+import threading
+import time
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from api.match_notifications import MatchNotificationListener
+from api.processing import wait_for_match_processing
+
+
+class FakeListItem:
+    MATCHED = 'MATCHED'
+    POTENTIAL_MATCH = 'POTENTIAL_MATCH'
+    ERROR_MATCHING = 'ERROR_MATCHING'
+
+    def __init__(self, status):
+        self.status = status
+
+
+class FakeListener:
+    """Notifies the waiter as soon as it subscribes."""
+
+    def __init__(self):
+        self.subscribed = []
+
+    @contextmanager
+    def subscribe(self, item_id):
+        self.subscribed.append(item_id)
+        event = threading.Event()
+        event.set()
+        yield event
+
+
+class MatchNotificationListenerTest(SimpleTestCase):
+    def setUp(self):
+        self.listener = MatchNotificationListener('matched')
+        patcher = patch.object(self.listener, 'start')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_wakes_every_waiter_of_the_item(self):
+        with self.listener.subscribe(1) as first, \
+                self.listener.subscribe(1) as second, \
+                self.listener.subscribe(2) as other:
+            self.listener.notify('1')
+
+            self.assertTrue(first.is_set())
+            self.assertTrue(second.is_set())
+            self.assertFalse(other.is_set())
+
+    def test_unsubscribes_on_exit(self):
+        with self.listener.subscribe(1):
+            self.assertIn('1', self.listener.waiters)
+
+        self.assertEqual({}, self.listener.waiters)
+
+    def test_ignores_notifications_without_waiters(self):
+        self.listener.notify('1')
+
+        self.assertEqual({}, self.listener.waiters)
+
+
+@override_settings(MATCH_NOTIFICATION_FALLBACK_POLL_SECONDS=60)
+class WaitForMatchProcessingTest(SimpleTestCase):
+    def setUp(self):
+        self.listener = FakeListener()
+        patcher = patch(
+            'api.processing.match_notification_listener', self.listener
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.list_item_type = MagicMock()
+        self.list_item_type.MATCHED = FakeListItem.MATCHED
+        self.list_item_type.POTENTIAL_MATCH = FakeListItem.POTENTIAL_MATCH
+        self.list_item_type.ERROR_MATCHING = FakeListItem.ERROR_MATCHING
+
+    def test_returns_matched_item_without_subscribing(self):
+        matched = FakeListItem(FakeListItem.MATCHED)
+        self.list_item_type.objects.get.return_value = matched
+
+        result = wait_for_match_processing(1, self.list_item_type)
+
+        self.assertIs(matched, result)
+        self.assertEqual([], self.listener.subscribed)
+
+    def test_wakes_up_on_notification(self):
+        matched = FakeListItem(FakeListItem.POTENTIAL_MATCH)
+        self.list_item_type.objects.get.side_effect = [
+            FakeListItem('GEOCODED'),
+            FakeListItem('GEOCODED'),
+            matched,
+        ]
+
+        started = time.monotonic()
+        result = wait_for_match_processing(1, self.list_item_type)
+
+        self.assertIs(matched, result)
+        self.assertEqual([1], self.listener.subscribed)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_returns_none_on_timeout(self):
+        self.list_item_type.objects.get.return_value = FakeListItem(
+            'GEOCODED'
+        )
+
+        result = wait_for_match_processing(1, self.list_item_type, timeout=0)
+
+        self.assertIsNone(result)
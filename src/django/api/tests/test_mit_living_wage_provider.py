@@ -254,6 +254,34 @@ class MITLivingWageProviderTest(TestCase):
         self.assertIn('raw_values', data['value'])
         self.assertEqual(data['value']['raw_values']['county_id'], '99999')
 
+    def test_fetch_data_for_locations_with_one_spatial_join(self):
+        '''Test fetch_data_for_locations looks all the counties up at once.'''
+        outside_county = Facility(
+            id='US2024000000001',
+            country_code='US',
+            location=Point(-100.0, 30.0, srid=4326),
+        )
+        outside_us = Facility(
+            id='GB2024000000001',
+            country_code='GB',
+            location=self.facility.location,
+        )
+
+        with self.assertNumQueries(3):
+            data = self.provider.fetch_data_for_locations(
+                [self.facility, outside_county, outside_us]
+            )
+
+        self.assertEqual(list(data.keys()), [self.facility.id])
+        self.assertEqual(
+            data[self.facility.id]['value']['raw_values']['county_id'],
+            '99999'
+        )
+        self.assertEqual(
+            data[self.facility.id]['contributor']['id'],
+            self.contributor.id
+        )
+
     def test_fetch_data_no_county_data(self):
         '''Test fetch_data returns None when no county data exists.'''
         self.county_data.delete()
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import patch, MagicMock
+from opensearchpy.exceptions import NotFoundError, OpenSearchException
 from api.services.opensearch.search import \
     OpenSearchService, OpenSearchServiceException
 
@@ -257,6 +258,74 @@ class TestPrepareOpenSearchResponse(unittest.TestCase):
         )
         self.assertEqual(item.get("coordinates", {}).get("lng"), 20.0)
 
+    def test_get_document_prepares_source(self):
+        self.mock_client.get.return_value = {
+            "_id": "CN2021250D1DTN7",
+            "found": True,
+            "_source": {
+                "os_id": "CN2021250D1DTN7",
+                "local_name": None,
+                "coordinates": {"lat": 10.0, "lon": 20.0},
+            },
+        }
+
+        result = self.service.get_document(
+            "production-locations", "CN2021250D1DTN7", ["os_id"]
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "os_id": "CN2021250D1DTN7",
+                "coordinates": {"lat": 10.0, "lng": 20.0},
+            },
+        )
+        self.mock_client.get.assert_called_once_with(
+            index="production-locations",
+            id="CN2021250D1DTN7",
+            _source_includes=["os_id"],
+        )
+
+    def test_get_document_not_found(self):
+        self.mock_client.get.side_effect = NotFoundError(
+            404, "not_found", {}
+        )
+
+        self.assertIsNone(
+            self.service.get_document("production-locations", "missing")
+        )
+
+    def test_get_documents_leaves_out_missing_ids(self):
+        self.mock_client.mget.return_value = {
+            "docs": [
+                {
+                    "_id": "CN2021250D1DTN7",
+                    "found": True,
+                    "_source": {"os_id": "CN2021250D1DTN7"},
+                },
+                {"_id": "missing", "found": False},
+            ]
+        }
+
+        result = self.service.get_documents(
+            "production-locations", ["CN2021250D1DTN7", "missing"]
+        )
+
+        self.assertEqual(
+            result, {"CN2021250D1DTN7": {"os_id": "CN2021250D1DTN7"}}
+        )
+        self.mock_client.mget.assert_called_once_with(
+            index="production-locations",
+            body={"ids": ["CN2021250D1DTN7", "missing"]},
+            _source_includes=None,
+        )
+
+    def test_get_documents_error(self):
+        self.mock_client.mget.side_effect = OpenSearchException()
+
+        with self.assertRaises(OpenSearchServiceException):
+            self.service.get_documents("production-locations", ["id"])
+
 
 if __name__ == '__main__':
     unittest.main()
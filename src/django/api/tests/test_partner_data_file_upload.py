@@ -62,6 +62,41 @@ def capture_on_commit_callbacks(*, execute=False):
             callback()
 
 
+class FakeSheetsService:
+    """Records the batchUpdate requests sent to a spreadsheet."""
+
+    def __init__(self):
+        self.batch_updates = []
+
+    def spreadsheets(self):
+        return self
+
+    def batchUpdate(self, spreadsheetId, body):
+        self.batch_updates.append(body["requests"])
+        return Mock(execute=Mock(return_value={}))
+
+    def marked_rows(self):
+        """
+        Return the (row, error, moderation_id) outcomes of each batchUpdate.
+        """
+        marked_rows = []
+        for requests in self.batch_updates:
+            marked_rows.append([
+                (
+                    requests[index]["repeatCell"]["range"]["endRowIndex"],
+                    self._cell_value(requests[index + 1]),
+                    self._cell_value(requests[index + 2]),
+                )
+                for index in range(0, len(requests), 3)
+            ])
+        return marked_rows
+
+    @staticmethod
+    def _cell_value(request):
+        cell = request["updateCells"]["rows"][0]["values"][0]
+        return cell["userEnteredValue"]["stringValue"]
+
+
 class PartnerDataFileUploadTest(TestCase):
     def setUp(self):
         self.user = User.objects.create(email="partner-upload@test.com")
@@ -579,3 +614,179 @@ class PartnerDataFileUploadTest(TestCase):
         self.assertEqual(stats["rows_failed"], 0)
         processor.event_creator.create.assert_called_once()
         mock_sheets.mark_row.assert_called_once()
+
+    def _build_processing_context(self, rows):
+        workbook = SheetWorkbook(
+            spreadsheet_id="sheet-123",
+            sheet_name="Partner Data",
+            tab_id=1,
+            column_count=5,
+            headers=[
+                "os_id",
+                "custom_partner_field",
+                "error",
+                "moderation_id",
+            ],
+            rows=rows,
+        )
+        mappings, partner_fields = (
+            PartnerFieldSheetParser.build_column_mappings(
+                ["custom_partner_field"],
+                self.contributor,
+            )
+        )
+        return SheetProcessingContext(
+            workbook=workbook,
+            data_columns=["custom_partner_field"],
+            header_map=PartnerFieldSheetParser.build_header_map(
+                workbook.headers,
+            ),
+            column_mappings=mappings,
+            partner_fields_by_name=partner_fields,
+            tracking_columns={"error": 2, "moderation_id": 3},
+            cols_count=4,
+        )
+
+    def test_mark_rows_sends_one_batch_update(self):
+        service = FakeSheetsService()
+        context = self._build_processing_context([])
+
+        GoogleSheetClient(service).mark_rows(
+            context.workbook,
+            [(2, "", "moderation-1"), (4, "Invalid value", "")],
+            context.cols_count,
+            2,
+            3,
+        )
+
+        self.assertEqual(
+            service.marked_rows(),
+            [[(2, "", "moderation-1"), (4, "Invalid value", "")]],
+        )
+        self.assertEqual(
+            service.batch_updates[0][3]["repeatCell"]["cell"],
+            {
+                "userEnteredFormat": {
+                    "backgroundColor": {"red": 1.0, "green": 0.8, "blue": 0.8}
+                }
+            },
+        )
+
+    def test_pipelined_process_rows_writes_outcomes_in_batches(self):
+        service = FakeSheetsService()
+        processor = PartnerDataFileUploadProcessor(
+            GoogleSheetClient(service),
+            write_batch_size=2,
+            concurrency=3,
+        )
+
+        def create(contributor, record, column_mappings):
+            value = record["custom_partner_field"]
+            if value == "bad":
+                raise ValueError("Invalid value")
+            return f"moderation-{value}"
+
+        processor.event_creator = Mock()
+        processor.event_creator.create.side_effect = create
+        context = self._build_processing_context(
+            [
+                [self.facility.id, "1", "", ""],
+                [self.facility.id, "bad", "", ""],
+                ["", "", "", ""],
+                [self.facility.id, "3", "", "existing-moderation-id"],
+                [self.facility.id, "4", "", ""],
+                [self.facility.id, "5", "", ""],
+            ]
+        )
+        upload = PartnerDataFileUpload.objects.create(
+            google_drive_file_link=(
+                "https://docs.google.com/spreadsheets/d/test-sheet"
+            ),
+            contributor=self.contributor,
+            status=PartnerDataFileUpload.Status.PROCESSING,
+        )
+
+        stats = processor._process_rows(upload, context)
+
+        self.assertEqual(
+            stats,
+            {
+                "rows_succeeded": 3,
+                "rows_failed": 1,
+                "rows_skipped_empty": 1,
+                "rows_skipped_existing": 1,
+            },
+        )
+        self.assertEqual(
+            service.marked_rows(),
+            [
+                [(2, "", "moderation-1"), (3, "Invalid value", "")],
+                [(6, "", "moderation-4"), (7, "", "moderation-5")],
+            ],
+        )
+
+    def test_pipelined_process_rows_flushes_the_last_partial_batch(self):
+        service = FakeSheetsService()
+        processor = PartnerDataFileUploadProcessor(
+            GoogleSheetClient(service),
+            write_batch_size=10,
+        )
+        processor.event_creator = Mock()
+        processor.event_creator.create.return_value = "new-moderation-id"
+        context = self._build_processing_context(
+            [
+                [self.facility.id, "1", "", ""],
+                [self.facility.id, "2", "", ""],
+            ]
+        )
+        upload = PartnerDataFileUpload.objects.create(
+            google_drive_file_link=(
+                "https://docs.google.com/spreadsheets/d/test-sheet"
+            ),
+            contributor=self.contributor,
+            status=PartnerDataFileUpload.Status.PROCESSING,
+        )
+
+        processor._process_rows(upload, context)
+
+        self.assertEqual(
+            service.marked_rows(),
+            [[(2, "", "new-moderation-id"), (3, "", "new-moderation-id")]],
+        )
+
+    def test_pipelined_process_rows_writes_outcomes_when_it_fails(self):
+        service = FakeSheetsService()
+        processor = PartnerDataFileUploadProcessor(
+            GoogleSheetClient(service),
+            write_batch_size=10,
+        )
+        processor.event_creator = Mock()
+        processor.event_creator.create.return_value = "new-moderation-id"
+        context = self._build_processing_context([])
+        upload = PartnerDataFileUpload.objects.create(
+            google_drive_file_link=(
+                "https://docs.google.com/spreadsheets/d/test-sheet"
+            ),
+            contributor=self.contributor,
+            status=PartnerDataFileUpload.Status.PROCESSING,
+        )
+        row_stats = {"rows_succeeded": 0, "rows_failed": 0}
+
+        def pending_rows():
+            yield 2, {"os_id": self.facility.id}
+            yield 3, {"os_id": self.facility.id}
+            raise RuntimeError("Sheet read failed")
+
+        with self.assertRaisesMessage(RuntimeError, "Sheet read failed"):
+            processor._process_rows_pipelined(
+                upload,
+                context,
+                pending_rows(),
+                row_stats,
+            )
+
+        self.assertEqual(row_stats["rows_succeeded"], 2)
+        self.assertEqual(
+            service.marked_rows(),
+            [[(2, "", "new-moderation-id"), (3, "", "new-moderation-id")]],
+        )
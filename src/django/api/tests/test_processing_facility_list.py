@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.facility_actions.processing_facility_list import (
+    ProcessingFacilityList
+)
+from api.models import (
+    Contributor,
+    ExtendedField,
+    FacilityList,
+    FacilityListItem,
+    Source,
+    User,
+)
+from contricleaner.lib.dto.list_dto import ListDTO
+from contricleaner.lib.dto.row_dto import RowDTO
+
+
+class ProcessingFacilityListTest(TestCase):
+    def setUp(self):
+        user = User.objects.create(email='test@example.com')
+        contributor = Contributor.objects.create(
+            admin=user,
+            name='test contributor',
+            contrib_type=Contributor.OTHER_CONTRIB_TYPE,
+        )
+        self.facility_list = FacilityList.objects.create(
+            header='header', file_name='one', name='First List'
+        )
+        Source.objects.create(
+            facility_list=self.facility_list,
+            source_type=Source.LIST,
+            is_active=True,
+            is_public=True,
+            contributor=contributor,
+        )
+
+    @staticmethod
+    def make_row(name, errors=None, fields=None):
+        return RowDTO(
+            raw_json={'country': 'US', 'name': name, 'address': 'Address'},
+            name=name,
+            clean_name=name.lower(),
+            address='Address',
+            clean_address='address',
+            country_code='US',
+            sector=['Apparel'],
+            fields=fields or {},
+            errors=errors or [],
+        )
+
+    def process(self, rows):
+        ProcessingFacilityList({
+            'facility_list': self.facility_list,
+            'contri_cleaner_processed_data': ListDTO(rows=rows, errors=[]),
+            'parsing_started': str(timezone.now()),
+        }).process_facility()
+
+    @override_settings(INSTANCE_SOURCE='os_hub')
+    def test_creates_items_in_batches(self):
+        rows = [
+            self.make_row('Factory A', fields={'number_of_workers': '100'}),
+            self.make_row('Factory B'),
+            self.make_row('Factory A'),
+            self.make_row('Factory C', errors=[{'message': 'Bad row'}]),
+            self.make_row('Factory D', fields={'number_of_workers': '5'}),
+        ]
+
+        with patch.object(ProcessingFacilityList, 'BATCH_SIZE', 2):
+            self.process(rows)
+
+        items = FacilityListItem.objects.filter(
+            source__facility_list=self.facility_list
+        ).order_by('row_index')
+        self.assertEqual(
+            [(item.row_index, item.name, item.status) for item in items],
+            [
+                (0, 'Factory A', FacilityListItem.PARSED),
+                (1, 'Factory B', FacilityListItem.PARSED),
+                (2, 'Factory A', FacilityListItem.DUPLICATE),
+                (3, '', FacilityListItem.ERROR_PARSING),
+                (4, 'Factory D', FacilityListItem.PARSED),
+            ],
+        )
+        self.assertEqual(
+            {item.origin_source for item in items}, {'os_hub'}
+        )
+        self.assertTrue(items[3].processing_results[0]['error'])
+
+        extended_fields = ExtendedField.objects.filter(
+            facility_list_item__source__facility_list=self.facility_list
+        ).order_by('facility_list_item__row_index')
+        self.assertEqual(
+            [
+                (field.facility_list_item.row_index, field.value)
+                for field in extended_fields
+            ],
+            [(0, {'min': 100, 'max': 100}), (4, {'min': 5, 'max': 5})],
+        )
+        self.assertEqual(
+            ExtendedField.history.filter(
+                id__in=[field.id for field in extended_fields]
+            ).count(),
+            2,
+        )
@@ -0,0 +1,360 @@
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from waffle.testutils import override_switch
+
+from api.models import (
+    Contributor,
+    Facility,
+    FacilityList,
+    FacilityListItem,
+    ProductionLocationChange,
+    Source,
+    User,
+)
+from api.services.opensearch.production_location_document import (
+    build_production_location_document,
+)
+from api.services.opensearch.production_location_indexer import (
+    ADVISORY_LOCK_NAMESPACE,
+    ProductionLocationIndexer,
+    get_documents_sql,
+)
+
+
+class FakeOpenSearchClient:
+    def __init__(self, failed_ids=()):
+        self.failed_ids = set(failed_ids)
+        self.bulk_bodies = []
+
+    def bulk(self, body):
+        self.bulk_bodies.append(body)
+        items = []
+        for line in body:
+            action, meta = next(iter(line.items()))
+            if action not in ('index', 'delete'):
+                continue
+            result = {'_id': meta['_id'], 'status': 200}
+            if meta['_id'] in self.failed_ids:
+                result['status'] = 400
+                result['error'] = 'mapper_parsing_exception'
+            items.append({action: result})
+        return {
+            'errors': any(
+                next(iter(item.values()))['status'] >= 300 for item in items
+            ),
+            'items': items,
+        }
+
+
+@override_switch('production_location_indexer', active=True)
+class ProductionLocationIndexerTest(TestCase):
+    def setUp(self):
+        user = User.objects.create(email='test@example.com')
+        contributor = Contributor.objects.create(
+            admin=user,
+            name='test contributor',
+            contrib_type=Contributor.OTHER_CONTRIB_TYPE,
+        )
+        facility_list = FacilityList.objects.create(
+            header='header', file_name='one', name='First List'
+        )
+        source = Source.objects.create(
+            facility_list=facility_list,
+            source_type=Source.LIST,
+            is_active=True,
+            is_public=True,
+            contributor=contributor,
+        )
+        list_item = FacilityListItem.objects.create(
+            name='Item Name',
+            address='Item Address',
+            country_code='US',
+            sector=['Apparel'],
+            row_index=1,
+            status=FacilityListItem.CONFIRMED_MATCH,
+            source=source,
+        )
+        self.facility = Facility.objects.create(
+            name='Facility Name',
+            address='Facility Address',
+            country_code='US',
+            location=Point(10, 20),
+            created_from=list_item,
+        )
+        list_item.facility = self.facility
+        list_item.save()
+
+    def index_batch(self, client):
+        return ProductionLocationIndexer(client, batch_size=10).index_batch()
+
+    def test_changes_are_recorded_in_the_transaction(self):
+        self.assertTrue(
+            ProductionLocationChange.objects.filter(
+                os_id=self.facility.id
+            ).exists()
+        )
+
+    def test_changes_are_not_recorded_while_the_switch_is_off(self):
+        ProductionLocationChange.objects.all().delete()
+
+        with override_switch('production_location_indexer', active=False):
+            self.facility.name = 'New Name'
+            self.facility.save()
+
+        self.assertFalse(ProductionLocationChange.objects.exists())
+
+    def test_indexes_changed_locations_with_one_bulk_request(self):
+        changes = ProductionLocationChange.objects.count()
+        client = FakeOpenSearchClient()
+
+        self.assertEqual(self.index_batch(client), changes)
+
+        self.assertEqual(len(client.bulk_bodies), 1)
+        action, document = client.bulk_bodies[0]
+        self.assertEqual(
+            action,
+            {
+                'index': {
+                    '_index': 'production-locations',
+                    '_id': self.facility.id,
+                },
+            },
+        )
+        self.assertEqual(document['os_id'], self.facility.id)
+        self.assertEqual(document['name'], 'Item Name')
+        self.assertEqual(document['sector'], ['Apparel'])
+        self.assertEqual(document['coordinates'], {'lat': 20, 'lon': 10})
+        self.assertEqual(document['country']['alpha_3'], 'USA')
+        self.assertEqual(document['claim_status'], 'unclaimed')
+        self.assertFalse(ProductionLocationChange.objects.exists())
+        self.assertEqual(self.index_batch(client), 0)
+
+    def test_deletes_locations_that_no_longer_exist(self):
+        ProductionLocationChange.objects.all().delete()
+        ProductionLocationChange.objects.create(os_id='US0000000000000')
+        client = FakeOpenSearchClient()
+
+        self.assertEqual(self.index_batch(client), 1)
+
+        self.assertEqual(
+            client.bulk_bodies,
+            [[{
+                'delete': {
+                    '_index': 'production-locations',
+                    '_id': 'US0000000000000',
+                },
+            }]],
+        )
+
+    def test_keeps_changes_of_rejected_documents(self):
+        ProductionLocationChange.objects.create(os_id='US0000000000000')
+        client = FakeOpenSearchClient(failed_ids=[self.facility.id])
+
+        self.index_batch(client)
+
+        self.assertEqual(
+            set(ProductionLocationChange.objects.values_list(
+                'os_id', flat=True
+            )),
+            {self.facility.id},
+        )
+        for change in ProductionLocationChange.objects.all():
+            self.assertEqual(change.attempts, 1)
+            self.assertEqual(change.last_error, 'mapper_parsing_exception')
+
+    @override_settings(PRODUCTION_LOCATION_INDEXER_MAX_ATTEMPTS=2)
+    def test_parks_changes_that_keep_failing(self):
+        client = FakeOpenSearchClient(failed_ids=[self.facility.id])
+
+        self.assertEqual(self.index_batch(client), 0)
+        self.assertEqual(self.index_batch(client), 0)
+        ProductionLocationChange.objects.create(os_id='US0000000000000')
+
+        self.assertEqual(self.index_batch(client), 1)
+
+        self.assertEqual(
+            client.bulk_bodies[-1],
+            [{
+                'delete': {
+                    '_index': 'production-locations',
+                    '_id': 'US0000000000000',
+                },
+            }],
+        )
+        self.assertEqual(
+            set(ProductionLocationChange.objects.values_list(
+                'os_id', 'attempts'
+            )),
+            {(self.facility.id, 2)},
+        )
+
+    def test_keeps_changes_whose_document_cannot_be_built(self):
+        ProductionLocationChange.objects.create(os_id='US0000000000000')
+        client = FakeOpenSearchClient()
+
+        with patch(
+            'api.services.opensearch.production_location_indexer.'
+            'build_production_location_document',
+            side_effect=ValueError('Bad value'),
+        ):
+            self.assertEqual(self.index_batch(client), 1)
+
+        self.assertEqual(
+            client.bulk_bodies,
+            [[{
+                'delete': {
+                    '_index': 'production-locations',
+                    '_id': 'US0000000000000',
+                },
+            }]],
+        )
+        for change in ProductionLocationChange.objects.all():
+            self.assertEqual(change.os_id, self.facility.id)
+            self.assertEqual(change.attempts, 1)
+            self.assertEqual(change.last_error, 'Bad value')
+
+    def test_keeps_changes_whose_document_cannot_be_selected(self):
+        ProductionLocationChange.objects.create(os_id='US0000000000000')
+        indexer = ProductionLocationIndexer(
+            FakeOpenSearchClient(), batch_size=10
+        )
+        # Fails whenever the selected OS IDs include the facility.
+        indexer.documents_sql += (
+            ' AND 1 / (CASE WHEN %(os_ids)s::text[] @> '
+            f"ARRAY['{self.facility.id}'] THEN 0 ELSE 1 END) = 1"
+        )
+
+        self.assertEqual(indexer.index_batch(), 1)
+
+        for change in ProductionLocationChange.objects.all():
+            self.assertEqual(change.os_id, self.facility.id)
+            self.assertEqual(change.attempts, 1)
+            self.assertIn('division by zero', change.last_error)
+
+
+class GetDocumentsSqlTest(SimpleTestCase):
+    def test_leaves_changes_of_locations_locked_by_another_indexer(self):
+        changes = ProductionLocationChange.objects.count()
+        # Another indexer, still sending a document of the location that it
+        # selected before a later change.
+        other_connection = connection.copy()
+        self.addCleanup(other_connection.close)
+        with other_connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_advisory_lock(%s, hashtext(%s))',
+                [ADVISORY_LOCK_NAMESPACE, self.facility.id],
+            )
+        client = FakeOpenSearchClient()
+
+        self.assertEqual(self.index_batch(client), 0)
+
+        self.assertEqual(client.bulk_bodies, [])
+        self.assertEqual(ProductionLocationChange.objects.count(), changes)
+
+        with other_connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_advisory_unlock(%s, hashtext(%s))',
+                [ADVISORY_LOCK_NAMESPACE, self.facility.id],
+            )
+
+        self.assertEqual(self.index_batch(client), changes)
+
+        self.assertEqual(len(client.bulk_bodies), 1)
+        self.assertFalse(ProductionLocationChange.objects.exists())
+
+    def test_filters_the_logstash_statement_by_os_id(self):
+        sql = get_documents_sql()
+
+        self.assertTrue(sql.endswith('WHERE\n  af.id = ANY(%(os_ids)s)'))
+        self.assertIn('AS claimed_at_value', sql)
+        self.assertNotIn(':sql_last_value', sql)
+        self.assertNotIn('ORDER BY\n  af.updated_at', sql)
+
+
+class BuildProductionLocationDocumentTest(SimpleTestCase):
+    def build(self, **values):
+        return build_production_location_document({
+            'os_id': 'US2024000000000',
+            'name': 'Name',
+            'country_value': 'UA',
+            **values,
+        })
+
+    def test_removes_source_fields(self):
+        document = self.build(
+            local_name_value='  ',
+            description_value='Description',
+            latitude=1.5,
+            longitude=2.5,
+            updated_at='2024-01-01',
+        )
+
+        self.assertEqual(
+            document,
+            {
+                'os_id': 'US2024000000000',
+                'name': 'Name',
+                'description': 'Description',
+                'coordinates': {'lat': 1.5, 'lon': 2.5},
+                'country': {
+                    'name': 'Ukraine',
+                    'alpha_2': 'UA',
+                    'alpha_3': 'UKR',
+                    'numeric': '804',
+                },
+                'claim_status': 'unclaimed',
+            },
+        )
+
+    def test_maps_extended_fields(self):
+        document = self.build(
+            parent_company_value='{"raw_value": " Parent "}',
+            product_type_value='{"raw_values": [" Shirts ", "Pants"]}',
+            location_type_value=(
+                '{"matched_values": [["a", "b", "Office", null], '
+                '["c", "d", "Office", null], ["e", "f", null, null]]}'
+            ),
+            processing_type_value=(
+                '{"matched_values": [["a", "b", "Office", "Cutting"]]}'
+            ),
+            number_of_workers_value='{"min": 10, "max": 20}',
+            duns_id_value='{"raw_value": " 123 "}',
+            sector_value=['Unspecified', 'Apparel'],
+        )
+
+        self.assertEqual(document['parent_company'], 'Parent')
+        self.assertEqual(document['product_type'], ['Shirts', 'Pants'])
+        self.assertEqual(document['location_type'], ['Office'])
+        self.assertEqual(document['processing_type'], ['Cutting'])
+        self.assertEqual(
+            document['number_of_workers'], {'min': 10, 'max': 20}
+        )
+        self.assertEqual(document['duns_id'], '123')
+        self.assertEqual(document['sector'], ['Apparel'])
+
+    def test_maps_claim_fields(self):
+        document = self.build(
+            claim_status_value=['PENDING', 'APPROVED'],
+            opened_at_value='2023-12-01',
+            energy_coal_value=100,
+            energy_other_value='1,000',
+            geocode_value=(
+                '{"data": {"results": [{"formatted_address": "Kyiv", '
+                '"geometry": {"location_type": "ROOFTOP"}}]}}'
+            ),
+        )
+
+        self.assertEqual(document['claim_status'], 'claimed')
+        self.assertEqual(document['opened_at'], '2023')
+        self.assertEqual(
+            document['actual_annual_energy_consumption'],
+            [
+                {'source': 'Coal', 'amount': 100},
+                {'source': 'Other', 'amount': 1000},
+            ],
+        )
+        self.assertEqual(document['geocoded_address'], 'Kyiv')
+        self.assertEqual(document['geocoded_location_type'], 'ROOFTOP')
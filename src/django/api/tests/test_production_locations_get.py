@@ -1,6 +1,6 @@
 import unittest.mock
 from django.contrib.gis.geos import Point, MultiPolygon
-from django.core.cache import cache
+from django.core.cache import cache, caches
 from rest_framework.test import APITestCase
 from rest_framework import status
 from api.views.v1.response_mappings.production_locations_response \
@@ -14,6 +14,7 @@ from api.models.source import Source
 from api.models.user import User
 from api.models.us_county_tigerline import USCountyTigerline
 from api.models.wage_indicator_country_data import WageIndicatorCountryData
+from api.throttles import ProductionLocationsBatchThrottle
 
 
 OPEN_SEARCH_SERVICE = "api.views.v1.production_locations.OpenSearchService"
@@ -24,6 +25,12 @@ class TestProductionLocationsViewSet(APITestCase):
     def setUp(self):
         self.search_mock = unittest.mock.patch(OPEN_SEARCH_SERVICE).start()
         self.search_index_mock = self.search_mock.return_value.search_index
+        # The OS ID isn't indexed as a document ID unless a test says so,
+        # so that retrieving a location falls back to searching for it.
+        self.get_document_mock = self.search_mock.return_value.get_document
+        self.get_document_mock.return_value = None
+        self.get_documents_mock = self.search_mock.return_value.get_documents
+        self.get_documents_mock.return_value = {}
         self.os_id = "CN2021250D1DTN7"
         self.ohs_response_mock = {
             "count": 2,
@@ -356,3 +363,158 @@ class TestProductionLocationsViewSet(APITestCase):
         self.assertEqual(api_res.status_code, status.HTTP_200_OK)
         self.assertNotIn("mit_living_wage", api_res.data)
         self.assertIn("wage_indicator", api_res.data)
+
+    def test_get_single_production_location_by_document_id(self):
+        location = {"os_id": self.os_id, "name": "location1"}
+        self.get_document_mock.return_value = location
+
+        url = f"/api/v1/production-locations/{self.os_id}/"
+        api_res = self.client.get(url)
+
+        self.assertEqual(api_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(api_res.data, location)
+        self.get_document_mock.assert_called_once_with(
+            "production-locations",
+            self.os_id,
+            source_includes=(
+                ProductionLocationsResponseMapping.PRODUCTION_LOCATION_BY_OS_ID
+            ),
+        )
+        self.search_index_mock.assert_not_called()
+
+    def test_document_id_lookup_includes_partner_fields(self):
+        facility = self._create_facility_with_partner_data()
+        self.get_document_mock.return_value = {
+            "os_id": facility.id,
+            "name": "location1",
+        }
+
+        url = f"/api/v1/production-locations/{facility.id}/"
+        api_res = self.client.get(url)
+
+        self.assertEqual(api_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            api_res.data["mit_living_wage"], {"county_id": "12345"}
+        )
+        self.assertIn("wage_indicator", api_res.data)
+
+    def test_get_production_locations_batch(self):
+        facility = self._create_facility_with_partner_data()
+        historical_os_id = "CN2019250D1DTN7"
+        self.get_documents_mock.return_value = {
+            facility.id: {"os_id": facility.id, "name": "location1"},
+        }
+        self.search_index_mock.return_value = {
+            "count": 1,
+            "data": [
+                {
+                    "os_id": "CN2022250D1DTN7",
+                    "name": "location2",
+                    "historical_os_id": [historical_os_id],
+                },
+            ],
+        }
+
+        api_res = self.client.post(
+            "/api/v1/production-locations/batch/",
+            {"os_ids": [
+                facility.id,
+                historical_os_id,
+                "CN2023250D1DTN7",
+                facility.id,
+            ]},
+            format="json",
+        )
+
+        self.assertEqual(api_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(api_res.data["count"], 2)
+        self.assertEqual(
+            [location["os_id"] for location in api_res.data["data"]],
+            [facility.id, "CN2022250D1DTN7"],
+        )
+        self.assertEqual(
+            api_res.data["data"][0]["mit_living_wage"],
+            {"county_id": "12345"},
+        )
+        self.assertEqual(api_res.data["not_found"], ["CN2023250D1DTN7"])
+        self.get_documents_mock.assert_called_once_with(
+            "production-locations",
+            [facility.id, historical_os_id, "CN2023250D1DTN7"],
+            source_includes=(
+                ProductionLocationsResponseMapping.PRODUCTION_LOCATION_BY_OS_ID
+            ),
+        )
+        self.assertEqual(self.search_index_mock.call_count, 1)
+
+    def test_get_production_locations_batch_invalid_body(self):
+        for body in ({}, {"os_ids": []}, {"os_ids": [1]}):
+            api_res = self.client.post(
+                "/api/v1/production-locations/batch/",
+                body,
+                format="json",
+            )
+
+            self.assertEqual(
+                api_res.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertEqual(api_res.data["errors"][0]["field"], "os_ids")
+        self.get_documents_mock.assert_not_called()
+
+    @unittest.mock.patch.dict(
+        ProductionLocationsBatchThrottle.THROTTLE_RATES,
+        {"production_locations_batch": "5/day"},
+    )
+    def test_get_production_locations_batch_is_metered_by_os_id(self):
+        caches["api_throttling"].clear()
+
+        def post_batch(os_ids):
+            return self.client.post(
+                "/api/v1/production-locations/batch/",
+                {"os_ids": os_ids},
+                format="json",
+            )
+
+        self.assertEqual(
+            post_batch(["CN1", "CN2", "CN3"]).status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            post_batch(["CN4", "CN5", "CN6"]).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        self.assertEqual(
+            post_batch(["CN4", "CN5"]).status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            post_batch(["CN6"]).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+    @unittest.mock.patch.dict(
+        ProductionLocationsBatchThrottle.THROTTLE_RATES,
+        {"production_locations_batch": "5/day"},
+    )
+    def test_get_production_locations_batch_rejected_body_counts_once(self):
+        caches["api_throttling"].clear()
+
+        def post_batch(os_ids):
+            return self.client.post(
+                "/api/v1/production-locations/batch/",
+                {"os_ids": os_ids},
+                format="json",
+            )
+
+        self.assertEqual(
+            post_batch([f"CN{index}" for index in range(1001)]).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        # Repeated OS IDs are only counted once.
+        self.assertEqual(
+            post_batch(["CN1", "CN1", "CN2", "CN3", "CN4"]).status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            post_batch(["CN5"]).status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
@@ -0,0 +1,101 @@
+import datetime
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from api.models import RequestLog, User
+from api.request_log_writer import RequestLogWriter, insert_request_logs
+
+
+class InsertRequestLogsTest(TestCase):
+    def test_inserts_logs_with_request_time(self):
+        user = User.objects.create(email='test@example.com')
+        requested_at = timezone.now() - datetime.timedelta(minutes=5)
+
+        insert_request_logs([
+            (user.id, 'token', 'GET', '/api/facilities/', 200, requested_at),
+            (user.id, 'token', 'POST', '/api/facilities/', 201, requested_at),
+        ])
+
+        logs = RequestLog.objects.filter(user=user).order_by('method')
+        self.assertEqual(
+            [(log.method, log.response_code) for log in logs],
+            [('GET', 200), ('POST', 201)],
+        )
+        for log in logs:
+            self.assertEqual(log.created_at, requested_at)
+            self.assertEqual(log.updated_at, requested_at)
+
+
+@override_settings(
+    REQUEST_LOG_BATCH_SIZE=2,
+    REQUEST_LOG_FLUSH_INTERVAL_SECONDS=60,
+    REQUEST_LOG_QUEUE_SIZE=10,
+)
+class RequestLogWriterTest(SimpleTestCase):
+    def setUp(self):
+        self.batches = []
+        patcher = patch(
+            'api.request_log_writer.insert_request_logs',
+            side_effect=lambda records: self.batches.append(
+                [record[4] for record in records]
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.writer = RequestLogWriter()
+        self.addCleanup(self.writer.stop)
+
+    def write(self, response_code):
+        self.writer.write(1, 'token', 'GET', '/api/facilities/', response_code)
+
+    def test_writes_full_batches_and_the_rest_on_stop(self):
+        for response_code in (200, 201, 202):
+            self.write(response_code)
+        self.writer.stop()
+
+        self.assertEqual(self.batches, [[200, 201], [202]])
+
+    @patch('api.request_log_writer.close_old_connections')
+    @patch('api.request_log_writer.connection')
+    def test_writes_logs_one_at_a_time_when_batch_fails(self, *mocks):
+        def insert(records):
+            response_codes = [record[4] for record in records]
+            if len(records) > 1 or response_codes == [500]:
+                raise Exception('Insert failed')
+            self.batches.append(response_codes)
+
+        records = [
+            (1, 'token', 'GET', '/api/facilities/', response_code, None)
+            for response_code in (200, 500, 201)
+        ]
+        with patch(
+            'api.request_log_writer.insert_request_logs', side_effect=insert
+        ):
+            self.writer.flush(records)
+
+        self.assertEqual(self.batches, [[200], [201]])
+
+    @override_settings(REQUEST_LOG_BATCH_SIZE=1)
+    def test_writes_in_request_without_batching(self):
+        self.write(200)
+
+        self.assertEqual(self.batches, [[200]])
+        self.assertIsNone(self.writer.thread)
+
+    @override_settings(REQUEST_LOG_QUEUE_SIZE=1)
+    def test_writes_in_request_when_queue_is_full(self):
+        released = threading.Event()
+        # Keep the writer thread busy so the queued log isn't taken.
+        with patch.object(
+            RequestLogWriter, 'run', lambda self, records: released.wait()
+        ):
+            self.write(200)
+            self.write(201)
+            released.set()
+
+        self.assertEqual(self.batches, [[201]])
+        self.assertEqual(self.writer.queue.qsize(), 1)
+        self.writer.thread = None
@@ -1,3 +1,5 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 from botocore.exceptions import ProfileNotFound
@@ -19,6 +21,9 @@ from api.moderation_event_actions.creation.location_contribution \
     .location_contribution import LocationContribution
 from api.moderation_event_actions.creation.dtos.create_moderation_event_dto \
     import CreateModerationEventDTO
+from api.moderation_event_actions.creation.location_contribution \
+    .processors.submission_quality_processor \
+    import SubmissionQualityProcessor
 from api.services.submission_quality_service import (
     QualityVerdict,
     SubmissionQualityVerdicts,
@@ -244,3 +249,96 @@ class TestSubmissionQualityProcessor(APITestCase):
 
         mock_evaluate.assert_not_called()
         self.assertNotEqual(result.status_code, status.HTTP_409_CONFLICT)
+
+    @patch(
+        'api.moderation_event_actions.creation.location_contribution'
+        '.processors.geocoding_processor.geocode_address'
+    )
+    def test_check_runs_concurrently_with_geocoding(
+        self, mock_geocode_address
+    ):
+        # Each external call waits for the other one to start, which only
+        # happens in time if they run at the same time.
+        geocoding_started = threading.Event()
+        check_started = threading.Event()
+        overlapped = {}
+
+        def geocode(address, country_code):
+            geocoding_started.set()
+            overlapped['geocoding'] = check_started.wait(timeout=5)
+            raise ValueError('An error occurred.')
+
+        def evaluate(name, address, country_name):
+            check_started.set()
+            overlapped['check'] = geocoding_started.wait(timeout=5)
+            return _flagged_verdicts(name_quality='Looks like test data.')
+
+        mock_geocode_address.side_effect = geocode
+        input_data = {
+            key: value
+            for key, value in self.base_input_data.items()
+            if key != 'coordinates'
+        }
+        with patch(
+            'api.moderation_event_actions.creation.location_contribution'
+            '.processors.submission_quality_processor'
+            '.SubmissionQualityService.evaluate',
+            side_effect=evaluate,
+        ):
+            result = self._submit(self.contributor, input_data)
+
+        self.assertEqual(overlapped, {'geocoding': True, 'check': True})
+        # The warnings take precedence over the geocoding error, as they
+        # did when the check ran before geocoding.
+        self.assertEqual(result.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            [warning['type'] for warning in result.warnings],
+            ['name_quality'],
+        )
+        self.assertIsNone(result.moderation_event)
+
+    def test_check_fails_open_when_too_many_are_in_flight(self):
+        with patch.object(
+            SubmissionQualityProcessor,
+            'check_slots',
+            threading.BoundedSemaphore(1),
+        ) as check_slots:
+            check_slots.acquire()
+            with self._patch_evaluate(
+                _flagged_verdicts(name_quality='Looks like test data.')
+            ) as mock_evaluate:
+                result = self._submit(
+                    self.contributor, self.base_input_data
+                )
+
+        mock_evaluate.assert_not_called()
+        self.assertEqual(result.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIsNotNone(result.moderation_event)
+
+    def test_queued_check_is_dropped_when_it_times_out(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        # Keeps the only worker busy, so that the check stays queued.
+        worker_released = threading.Event()
+        self.addCleanup(worker_released.set)
+        executor.submit(worker_released.wait)
+        check_slots = threading.BoundedSemaphore(1)
+
+        with patch.object(
+            SubmissionQualityProcessor, 'executor', executor
+        ), patch.object(
+            SubmissionQualityProcessor, 'check_slots', check_slots
+        ), patch(
+            'api.moderation_event_actions.creation.location_contribution'
+            '.processors.submission_quality_processor'
+            '.QUALITY_CHECK_WAIT_SECONDS',
+            0.1,
+        ), self._patch_evaluate(CLEAN_VERDICTS) as mock_evaluate:
+            result = self._submit(self.contributor, self.base_input_data)
+            worker_released.set()
+            executor.shutdown(wait=True)
+
+        mock_evaluate.assert_not_called()
+        self.assertEqual(result.status_code, status.HTTP_202_ACCEPTED)
+        # The slot of the dropped check is free again.
+        self.assertTrue(check_slots.acquire(blocking=False))
@@ -2,7 +2,8 @@ import os
 from unittest.mock import patch
 
 from botocore.exceptions import ProfileNotFound
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
 from pydantic_ai import models
 from pydantic_ai.messages import ModelResponse, TextPart
 from pydantic_ai.models.function import FunctionModel
@@ -18,6 +19,18 @@ from api.services.submission_quality_service import (
 # raises instead of making a network call if one slips through.
 models.ALLOW_MODEL_REQUESTS = False
 
+# The view_cache is a DummyCache in tests, which would never return a
+# cached verdict.
+VERDICT_CACHE_SETTINGS = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'view_cache': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'submission-quality-verdicts',
+    },
+}
+
 
 def _valid_output(flagged=False, reason=''):
     verdict = {'flagged': flagged, 'reason': reason}
@@ -204,3 +217,38 @@ class TestSubmissionQualityService(TestCase):
             'Submission quality check tokens' in line
             for line in logs.output
         ))
+
+    @override_settings(CACHES=VERDICT_CACHE_SETTINGS)
+    def test_identical_resubmission_reuses_cached_verdicts(self):
+        caches['view_cache'].clear()
+        first = self._evaluate_with_model(
+            TestModel(custom_output_args=_valid_output(
+                flagged=True, reason='x'
+            ))
+        )
+
+        # Only differs in case and whitespace, and the model would fail
+        # if it were called again.
+        with self.service._agent.override(
+            model=FunctionModel(_raise_runtime_error)
+        ):
+            second = self.service.evaluate(
+                name='  BLUE HORIZON   Facility',
+                address='990 Spring Garden St.,  Philadelphia PA 19123 ',
+                country_name='united states',
+            )
+
+        self.assertEqual(second, first)
+
+    @override_settings(CACHES=VERDICT_CACHE_SETTINGS)
+    def test_failed_evaluation_is_not_cached(self):
+        caches['view_cache'].clear()
+        self.assertIsNone(
+            self._evaluate_with_model(FunctionModel(_raise_runtime_error))
+        )
+
+        verdicts = self._evaluate_with_model(
+            TestModel(custom_output_args=_valid_output())
+        )
+
+        self.assertIsInstance(verdicts, SubmissionQualityVerdicts)
@@ -0,0 +1,371 @@
+"""Tests for the pre-rendered vector tile store and its use in get_tile."""
+
+from unittest.mock import patch
+
+import mercantile
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from waffle.testutils import override_switch
+
+from api.models import (
+    Contributor,
+    Facility,
+    FacilityList,
+    FacilityListItem,
+    Source,
+    TileStoreChange,
+    User,
+    Version,
+)
+from api.tile_store import VectorTileStore
+
+
+class FakeCache:
+    """Minimal in-memory cache with Django's get/set/delete interface."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+    def add(self, key, value, timeout=None):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class FakeCaches:
+    """Mimics Django's named cache registry for patching."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __getitem__(self, key):
+        return self.cache
+
+
+@override_settings(TILE_STORE_MAX_ZOOM=7)
+class VectorTileStoreTest(TestCase):
+    def setUp(self):
+        self.cache = FakeCache()
+        patcher = patch('api.tile_store.caches', FakeCaches(self.cache))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tile_store = VectorTileStore()
+
+    def test_parses_tile_version_from_cache_key(self):
+        self.assertEqual(
+            3, VectorTileStore.parse_tile_version('1567700347-3-95f951f7')
+        )
+        self.assertEqual(
+            0, VectorTileStore.parse_tile_version('1567700347-0')
+        )
+        self.assertIsNone(VectorTileStore.parse_tile_version('1567700347'))
+        self.assertIsNone(
+            VectorTileStore.parse_tile_version('1567700347-abc-1')
+        )
+
+    def test_only_unfiltered_tiles_at_stored_zooms_are_storable(self):
+        self.assertTrue(self.tile_store.is_storable(QueryDict(''), 0))
+        self.assertTrue(
+            self.tile_store.is_storable(QueryDict('sort_by=name_asc'), 7)
+        )
+        self.assertFalse(self.tile_store.is_storable(QueryDict(''), 8))
+        self.assertFalse(
+            self.tile_store.is_storable(QueryDict('countries=US'), 3)
+        )
+        self.assertFalse(
+            self.tile_store.is_storable(QueryDict('embed=1'), 3)
+        )
+
+    def test_stores_tiles_per_version(self):
+        self.tile_store.set(1, 'facilitygrid', 2, 1, 1, b'tile-bytes')
+
+        self.assertEqual(
+            b'tile-bytes', self.tile_store.get(1, 'facilitygrid', 2, 1, 1)
+        )
+        self.assertIsNone(self.tile_store.get(2, 'facilitygrid', 2, 1, 1))
+        self.assertIsNone(self.tile_store.get(1, 'facilities', 2, 1, 1))
+
+    def test_stores_empty_tiles(self):
+        self.tile_store.set(1, 'facilitygrid', 0, 0, 0, b'')
+
+        self.assertEqual(b'', self.tile_store.get(1, 'facilitygrid', 0, 0, 0))
+
+    @override_settings(VIEW_RESPONSE_CACHE_MAX_BYTES=8)
+    def test_skips_oversized_tiles(self):
+        tile_store = VectorTileStore()
+        tile_store.set(1, 'facilitygrid', 0, 0, 0, bytes(range(256)))
+
+        self.assertIsNone(tile_store.get(1, 'facilitygrid', 0, 0, 0))
+
+    def test_covering_tiles_include_every_stored_zoom(self):
+        tiles = self.tile_store.get_covering_tiles(Point(13.4, 52.5))
+
+        self.assertEqual(set(range(8)), {tile.z for tile in tiles})
+
+    def test_covering_tiles_include_neighbours_within_buffer(self):
+        # Longitude 0 is a tile edge at every zoom above 0.
+        tiles = self.tile_store.get_covering_tiles(Point(0.0001, 10.0))
+        zoom_three_columns = {tile.x for tile in tiles if tile.z == 3}
+
+        self.assertEqual({3, 4}, zoom_three_columns)
+
+    def test_invalidates_only_tiles_covering_locations(self):
+        berlin = Point(13.4, 52.5)
+        for layer in ('facilities', 'facilitygrid'):
+            self.tile_store.set(1, layer, 5, 17, 10, b'berlin')
+            self.tile_store.set(1, layer, 5, 9, 12, b'new-york')
+
+        self.tile_store.invalidate_locations(1, [berlin, None])
+
+        for layer in ('facilities', 'facilitygrid'):
+            self.assertIsNone(self.tile_store.get(1, layer, 5, 17, 10))
+            self.assertEqual(
+                b'new-york', self.tile_store.get(1, layer, 5, 9, 12)
+            )
+
+    def test_invalidates_tiles_covering_recorded_changes(self):
+        tile_version = Facility.current_tile_version()
+        TileStoreChange.objects.all().delete()
+        for layer in ('facilities', 'facilitygrid'):
+            self.tile_store.set(tile_version, layer, 5, 17, 10, b'berlin')
+            self.tile_store.set(tile_version, layer, 5, 9, 12, b'new-york')
+        TileStoreChange.objects.create(location=Point(13.4, 52.5))
+
+        self.assertEqual(1, self.tile_store.invalidate_changes())
+
+        for layer in ('facilities', 'facilitygrid'):
+            self.assertIsNone(
+                self.tile_store.get(tile_version, layer, 5, 17, 10)
+            )
+            self.assertEqual(
+                b'new-york',
+                self.tile_store.get(tile_version, layer, 5, 9, 12),
+            )
+        self.assertFalse(TileStoreChange.objects.exists())
+
+    @patch('api.tile_store.TILE_STORE_CHANGES_BATCH_SIZE', 2)
+    def test_invalidates_one_batch_of_changes_per_request(self):
+        TileStoreChange.objects.all().delete()
+        for x in range(3):
+            TileStoreChange.objects.create(location=Point(x, 0))
+
+        self.tile_store.invalidate_changes_if_due()
+        self.assertEqual(1, TileStoreChange.objects.count())
+
+        # The batch was full, so the next request takes the rest.
+        self.tile_store.invalidate_changes_if_due()
+        self.assertFalse(TileStoreChange.objects.exists())
+
+        TileStoreChange.objects.create(location=Point(0, 0))
+        self.tile_store.invalidate_changes_if_due()
+        self.assertEqual(1, TileStoreChange.objects.count())
+
+    def test_keeps_changes_when_the_cache_fails(self):
+        TileStoreChange.objects.all().delete()
+        TileStoreChange.objects.create(location=Point(13.4, 52.5))
+
+        with patch.object(
+            self.cache, 'delete_many', side_effect=ConnectionError
+        ):
+            self.tile_store.invalidate_changes_if_due()
+
+        self.assertEqual(1, TileStoreChange.objects.count())
+
+    def test_changes_are_recorded_by_the_database(self):
+        TileStoreChange.objects.all().delete()
+        user = User.objects.create(email='test@example.com')
+        contributor = Contributor.objects.create(
+            admin=user,
+            name='test contributor',
+            contrib_type=Contributor.OTHER_CONTRIB_TYPE,
+        )
+        facility_list = FacilityList.objects.create(
+            header='header', file_name='one', name='First List'
+        )
+        source = Source.objects.create(
+            facility_list=facility_list,
+            source_type=Source.LIST,
+            is_active=True,
+            is_public=True,
+            contributor=contributor,
+        )
+        list_item = FacilityListItem.objects.create(
+            name='Item Name',
+            address='Item Address',
+            country_code='US',
+            sector=['Apparel'],
+            row_index=1,
+            status=FacilityListItem.CONFIRMED_MATCH,
+            source=source,
+        )
+        facility = Facility.objects.create(
+            name='Facility Name',
+            address='Facility Address',
+            country_code='US',
+            location=Point(10, 20),
+            created_from=list_item,
+        )
+        TileStoreChange.objects.all().delete()
+
+        # A queryset update, as made by code that sends no signals.
+        Facility.objects.filter(pk=facility.pk).update(location=Point(11, 21))
+
+        self.assertEqual(
+            {(10, 20), (11, 21)},
+            {
+                (change.location.x, change.location.y)
+                for change in TileStoreChange.objects.all()
+            },
+        )
+
+
+@override_settings(ALLOWED_HOSTS=['testserver', '.allowed.org'])
+@override_switch('vector_tile', active=True)
+class GetTileStoreTest(APITestCase):
+    def setUp(self):
+        self.cache = FakeCache()
+        patcher = patch('api.tile_store.caches', FakeCaches(self.cache))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.set_tile_version(1)
+
+    def set_tile_version(self, version):
+        Version.objects.update_or_create(
+            name='tile_version', defaults={'version': version}
+        )
+        VectorTileStore().forget_tile_version()
+
+    def get_tile(self, cachekey, query_params=None, z=3):
+        path = reverse(
+            'tile',
+            kwargs={
+                'layer': 'facilitygrid',
+                'cachekey': cachekey,
+                'z': z,
+                'x': 4,
+                'y': 2,
+                'ext': 'pbf',
+            },
+        )
+        return self.client.get(
+            path, query_params or {}, HTTP_REFERER='http://allowed.org/'
+        )
+
+    @patch('api.views.tile.get_tile.get_facility_grid_vector_tile')
+    def test_serves_unfiltered_tiles_from_store(self, mock_render):
+        mock_render.return_value = memoryview(b'grid-tile')
+
+        first = self.get_tile('1567700347-1-95f951f7')
+        second = self.get_tile('1567700999-1-95f951f7')
+
+        self.assertEqual(200, first.status_code)
+        self.assertEqual(200, second.status_code)
+        self.assertEqual(b'grid-tile', second.content)
+        self.assertEqual(1, mock_render.call_count)
+
+    @patch('api.views.tile.get_tile.get_facility_grid_vector_tile')
+    def test_renders_filtered_tiles_every_time(self, mock_render):
+        mock_render.return_value = memoryview(b'grid-tile')
+
+        self.get_tile('1567700347-1-1a2b3c4d', {'countries': 'US'})
+        self.get_tile('1567700347-1-1a2b3c4d', {'countries': 'US'})
+
+        self.assertEqual(2, mock_render.call_count)
+        self.assertEqual(
+            [],
+            [key for key in self.cache.data if ':facilitygrid:' in key],
+        )
+
+    @patch('api.views.tile.get_tile.get_facility_grid_vector_tile')
+    def test_does_not_share_tiles_across_versions(self, mock_render):
+        mock_render.return_value = memoryview(b'grid-tile')
+
+        self.get_tile('1567700347-1-95f951f7')
+        self.set_tile_version(2)
+        self.get_tile('1567700347-2-95f951f7')
+
+        self.assertEqual(2, mock_render.call_count)
+
+    @patch('api.views.tile.get_tile.get_facility_grid_vector_tile')
+    def test_does_not_store_tiles_of_other_versions(self, mock_render):
+        mock_render.return_value = memoryview(b'grid-tile')
+
+        self.get_tile('1567700347-0-95f951f7')
+        self.get_tile('1567700347-2-95f951f7')
+        self.get_tile('1567700347-2-95f951f7')
+
+        self.assertEqual(3, mock_render.call_count)
+        self.assertEqual(
+            [],
+            [key for key in self.cache.data if ':facilitygrid:' in key],
+        )
+
+    @patch('api.views.tile.get_tile.get_facility_grid_vector_tile')
+    def test_serves_stored_tiles_without_queries(self, mock_render):
+        mock_render.return_value = memoryview(b'grid-tile')
+        self.get_tile('1567700347-1-95f951f7')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_tile('1567700347-1-95f951f7')
+
+        self.assertEqual(b'grid-tile', response.content)
+        tile_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'api_version' in query['sql']
+            or 'api_tilestorechange' in query['sql']
+        ]
+        self.assertEqual([], tile_queries)
+
+    @patch('api.views.tile.get_tile.get_facility_grid_vector_tile')
+    def test_rerenders_tiles_covering_recorded_changes(self, mock_render):
+        mock_render.return_value = memoryview(b'new-grid-tile')
+        TileStoreChange.objects.all().delete()
+        VectorTileStore().set(1, 'facilitygrid', 3, 4, 2, b'grid-tile')
+        bounds = mercantile.bounds(4, 2, 3)
+        TileStoreChange.objects.create(location=Point(
+            (bounds.west + bounds.east) / 2,
+            (bounds.south + bounds.north) / 2,
+        ))
+
+        # A request rendering from PostGIS applies the recorded changes.
+        self.get_tile('1567700347-1-95f951f7', {'countries': 'US'})
+        response = self.get_tile('1567700347-1-95f951f7')
+
+        self.assertEqual(b'new-grid-tile', response.content)
+        self.assertEqual(2, mock_render.call_count)
+
+    @patch('api.views.tile.get_tile.get_facility_grid_vector_tile')
+    def test_does_not_store_tiles_invalidated_while_rendering(
+        self, mock_render
+    ):
+        tile_store = VectorTileStore()
+
+        def render(*args):
+            # A change committed after the tile was read is applied.
+            tile_store.invalidate_locations(1, [Point(0, 0)])
+            return memoryview(b'stale-grid-tile')
+
+        mock_render.side_effect = render
+
+        self.get_tile('1567700347-1-95f951f7')
+
+        self.assertIsNone(tile_store.get(1, 'facilitygrid', 3, 4, 2))
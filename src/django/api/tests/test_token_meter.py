@@ -0,0 +1,106 @@
+import datetime
+
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from api import token_meter
+from api.middleware import has_active_block, token_has_contributor
+from api.models import ApiBlock, Contributor, User
+from api.token_meter import resolve_token_meter
+
+
+# The resolutions are cached in ``view_cache``, which is a DummyCache in the
+# test settings. Override it with a real local cache so the caching
+# behaviour can be exercised.
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'view_cache': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'token-meter-test',
+    },
+})
+class TokenMeterTest(TestCase):
+    def setUp(self):
+        caches['view_cache'].clear()
+        token_meter._local_cache.clear()
+        self.user = User.objects.create(email='test@example.com')
+        self.contributor = Contributor.objects.create(
+            admin=self.user,
+            name='Test contributor',
+            contrib_type=Contributor.OTHER_CONTRIB_TYPE,
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def tearDown(self):
+        caches['view_cache'].clear()
+        token_meter._local_cache.clear()
+
+    def get_request(self, token_key=None):
+        return RequestFactory().get(
+            '/api/facilities/',
+            HTTP_AUTHORIZATION='Token {}'.format(token_key or self.token.key),
+        )
+
+    def block(self, active=True, days=1):
+        return ApiBlock.objects.create(
+            contributor=self.contributor,
+            until=timezone.now() + datetime.timedelta(days=days),
+            active=active,
+            limit=10,
+            actual=11,
+        )
+
+    def test_resolves_user_and_contributor(self):
+        resolved = resolve_token_meter(self.get_request())
+
+        self.assertEqual(resolved.user_id, self.user.id)
+        self.assertEqual(resolved.contributor_id, self.contributor.id)
+        self.assertIsNone(resolved.block_until)
+
+    def test_resolves_once_per_request(self):
+        request = self.get_request()
+
+        with self.assertNumQueries(2):
+            self.assertTrue(token_has_contributor(request))
+            self.assertFalse(has_active_block(request))
+
+    def test_is_cached_between_requests(self):
+        resolve_token_meter(self.get_request())
+        token_meter._local_cache.clear()
+
+        with self.assertNumQueries(0):
+            resolved = resolve_token_meter(self.get_request())
+
+        self.assertEqual(resolved.contributor_id, self.contributor.id)
+
+    def test_unknown_token_is_not_resolved(self):
+        request = self.get_request('0' * 40)
+
+        self.assertIsNone(resolve_token_meter(request))
+        self.assertTrue(token_has_contributor(request))
+        self.assertFalse(has_active_block(request))
+
+    def test_only_latest_active_unexpired_block_applies(self):
+        self.block(active=False, days=2)
+        self.block(active=True, days=1)
+        self.assertFalse(has_active_block(self.get_request()))
+
+    def test_saving_api_block_invalidates_cache(self):
+        self.assertFalse(has_active_block(self.get_request()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.block()
+
+        self.assertTrue(has_active_block(self.get_request()))
+
+    def test_deleting_contributor_invalidates_cache(self):
+        self.assertTrue(token_has_contributor(self.get_request()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.contributor.delete()
+
+        self.assertFalse(token_has_contributor(self.get_request()))
@@ -170,6 +170,37 @@ class WageIndicatorProviderTest(TestCase):
         self.assertEqual(data['contributor']['id'], self.contributor.id)
         self.assertIn('value', data)
 
+    def test_fetch_data_for_locations_with_one_query(self):
+        '''Test fetch_data_for_locations looks all the countries up at once.'''
+        same_country = Facility(
+            id='XX2024000000001',
+            country_code=self.test_country_code,
+            location=Point(0, 0),
+        )
+        unknown_country = Facility(
+            id='ZZ2024000000001',
+            country_code='ZZ',
+            location=Point(0, 0),
+        )
+
+        locations = [self.facility, same_country, unknown_country]
+        with self.assertNumQueries(1):
+            raw_data = self.provider._fetch_raw_data_for_locations(locations)
+        data = self.provider.fetch_data_for_locations(locations)
+
+        self.assertEqual(
+            raw_data,
+            {self.facility.id: self.wage_data, same_country.id: self.wage_data}
+        )
+        self.assertEqual(
+            list(data.keys()), [self.facility.id, same_country.id]
+        )
+        for location_data in data.values():
+            self.assertEqual(location_data['field_name'], 'wage_indicator')
+            self.assertEqual(
+                location_data['contributor']['id'], self.contributor.id
+            )
+
     def test_fetch_data_no_wage_data(self):
         '''Test fetch_data returns None when no wage data exists.'''
         self.facility.country_code = 'ZZ'
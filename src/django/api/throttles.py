@@ -7,6 +7,9 @@ from rest_framework.throttling import (
     BaseThrottle
 )
 from rest_framework.exceptions import Throttled
+from api.serializers.v1.production_locations_batch_serializer import (
+    ProductionLocationsBatchSerializer,
+)
 from oar.settings import DUPLICATE_THROTTLE_TIMEOUT
 
 
@@ -19,14 +22,17 @@ class UserCustomRateThrottle(UserRateThrottle):
     cache = caches['api_throttling']
 
     def allow_request(self, request, view):
+        self.set_user_rate(request)
+
+        return super(UserCustomRateThrottle, self).allow_request(request, view)
+
+    def set_user_rate(self, request):
         if request.user is not None:
             user_rate = getattr(request.user, self.model_rate_field, self.rate)
             if self.rate != user_rate:
                 self.rate = user_rate
                 self.num_requests, self.duration = self.parse_rate(self.rate)
 
-        return super(UserCustomRateThrottle, self).allow_request(request, view)
-
 
 class BurstRateThrottle(UserCustomRateThrottle):
     scope = 'burst'
@@ -43,6 +49,57 @@ class DataUploadThrottle(UserCustomRateThrottle):
     model_rate_field = 'data_upload_rate'
 
 
+class ProductionLocationsBatchThrottle(UserCustomRateThrottle):
+    """Meter the production locations batch lookup by OS ID.
+
+    A batch asks for up to 1000 OS IDs, so rather than counting it as one
+    request this throttle counts the distinct OS IDs it asks for, validated
+    the same way as by the view, in a bucket of its own with the user's
+    sustained rate. The history entries are `[timestamp, number of OS IDs]`
+    pairs, newest first.
+    """
+    scope = 'production_locations_batch'
+    model_rate_field = 'sustained_rate'
+
+    def allow_request(self, request, view):
+        self.set_user_rate(request)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.history = self.cache.get(self.key, [])
+        self.now = self.timer()
+        while self.history and self.history[-1][0] <= self.now - self.duration:
+            self.history.pop()
+
+        os_id_count = self.get_os_id_count(request)
+        used = sum(count for _, count in self.history)
+        if used + os_id_count > self.num_requests:
+            return self.throttle_failure()
+
+        self.history.insert(0, [self.now, os_id_count])
+        self.cache.set(self.key, self.history, self.duration)
+        return True
+
+    @staticmethod
+    def get_os_id_count(request):
+        serializer = ProductionLocationsBatchSerializer(data=request.data)
+        # A malformed body, including one asking for too many OS IDs, is
+        # rejected by the view, but still counts once.
+        if not serializer.is_valid():
+            return 1
+        # The view looks each OS ID up once.
+        return len(set(serializer.validated_data['os_ids']))
+
+    def wait(self):
+        if not self.history:
+            return None
+        return self.duration - (self.now - self.history[-1][0])
+
+
 class DuplicateThrottle(BaseThrottle):
     cache = caches['api_throttling']
     MAX_REQUEST_SIZE = 1024 * 1024  # 1MB limit
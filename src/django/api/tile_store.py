@@ -0,0 +1,345 @@
+"""Versioned store of pre-rendered vector tiles for unfiltered map views.
+
+Unfiltered tiles are identical for every visitor, so they are rendered once,
+ahead of time by the ``prerender_tiles`` command or on the first miss, and
+kept compressed in memcached. Entries are keyed by the tile version part of
+``Facility.current_tile_cache_key()`` plus the layer and z/x/y. The timestamp
+part of that key is left out on purpose: it changes on every facility save,
+so instead only the tiles covering a changed facility are deleted.
+
+The locations of changed facilities are recorded in ``api_tilestorechange``
+by database triggers, so that changes made outside Django, such as facilities
+created by the dedupe-hub list processing, are seen too. ``get_tile`` consumes
+one batch of them at most once every ``TILE_STORE_CHANGES_INTERVAL_SECONDS``,
+or with the next request while a backlog is left, on the requests that render
+a tile from PostGIS. Stored tiles are served without querying the database:
+the current tile version is kept in the store as well. Every invalidation
+replaces a generation token, and a rendered tile is not kept if the token
+changed while it was rendered, since the invalidation may have missed it.
+"""
+
+import logging
+import uuid
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+import mercantile
+from django.conf import settings
+from django.contrib.gis.geos import Point, Polygon
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.http import QueryDict
+
+TILE_STORE_KEY_PREFIX = 'tile_store'
+TILE_STORE_LAYERS = ('facilities', 'facilitygrid')
+# Query params that do not change the features rendered into a tile.
+TILE_STORE_NON_FILTER_PARAMS = frozenset([
+    'detail',
+    'sort_by',
+])
+# `ST_AsMVTGeom` keeps points within a 1024/4096 buffer of the tile and grid
+# hexagons whose centroid is in a tile can spill over its edge, so a facility
+# can be drawn in neighbouring tiles up to a quarter of a tile away.
+TILE_BUFFER_RATIO = 0.25
+# Number of recorded changes invalidated per transaction.
+TILE_STORE_CHANGES_BATCH_SIZE = 1000
+
+CLAIM_CHANGES_SQL = '''
+    DELETE FROM api_tilestorechange
+    WHERE id IN (
+        SELECT id
+        FROM api_tilestorechange
+        ORDER BY id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING ST_X(location), ST_Y(location)
+'''
+
+log = logging.getLogger(__name__)
+
+
+class VectorTileStore:
+    """Stores rendered tile bytes for unfiltered requests, fail-open.
+
+    All cache errors are swallowed: a failing store falls back to rendering
+    the tile from PostGIS and never breaks a request.
+    """
+
+    def __init__(self):
+        self.cache = caches['tile_store']
+        self.key_prefix = TILE_STORE_KEY_PREFIX
+        self.timeout = settings.TILE_STORE_TIMEOUT_SECONDS
+        self.max_zoom = settings.TILE_STORE_MAX_ZOOM
+        self.max_bytes = settings.VIEW_RESPONSE_CACHE_MAX_BYTES
+
+    @staticmethod
+    def parse_tile_version(cachekey: str) -> Optional[int]:
+        """Return the tile version from a `{timestamp}-{version}[-...]` tile
+        URL cache key, or None if the key does not have that shape."""
+        parts = cachekey.split('-')
+        if len(parts) < 2 or not parts[1].isdigit():
+            return None
+        return int(parts[1])
+
+    @staticmethod
+    def get_buffer(tile: mercantile.Tile) -> Tuple[float, float]:
+        """Return the east-west and north-south render buffer of a tile in
+        degrees."""
+        bounds = mercantile.bounds(tile)
+        return (
+            (bounds.east - bounds.west) * TILE_BUFFER_RATIO,
+            (bounds.north - bounds.south) * TILE_BUFFER_RATIO,
+        )
+
+    @staticmethod
+    def get_buffered_bounds(tile: mercantile.Tile) -> mercantile.LngLatBbox:
+        """Return the tile bounds grown by the tile render buffer."""
+        bounds = mercantile.bounds(tile)
+        ew_buffer, ns_buffer = VectorTileStore.get_buffer(tile)
+        return mercantile.LngLatBbox(
+            max(bounds.west - ew_buffer, -180.0),
+            max(bounds.south - ns_buffer, -90.0),
+            min(bounds.east + ew_buffer, 180.0),
+            min(bounds.north + ns_buffer, 90.0),
+        )
+
+    @staticmethod
+    def get_buffered_polygon(tile: mercantile.Tile) -> Polygon:
+        return Polygon.from_bbox(VectorTileStore.get_buffered_bounds(tile))
+
+    @staticmethod
+    def is_unfiltered(query_params: QueryDict) -> bool:
+        """Return True if the params do not change the rendered features."""
+        return all(
+            key in TILE_STORE_NON_FILTER_PARAMS for key in query_params
+        )
+
+    def is_storable(self, query_params: QueryDict, z: int) -> bool:
+        """Only unfiltered tiles at stored zoom levels are kept."""
+        if z < 0 or z > self.max_zoom:
+            return False
+        return self.is_unfiltered(query_params)
+
+    def get_current_tile_version(self) -> int:
+        """Return `Facility.current_tile_version()`, kept in the store for
+        TILE_STORE_TILE_VERSION_TIMEOUT_SECONDS."""
+        from api.models.facility.facility import Facility
+
+        key = f'{self.key_prefix}:tile_version'
+        try:
+            tile_version = self.cache.get(key)
+        except Exception:
+            tile_version = None
+        if tile_version is None:
+            tile_version = Facility.current_tile_version()
+            try:
+                self.cache.set(
+                    key,
+                    tile_version,
+                    settings.TILE_STORE_TILE_VERSION_TIMEOUT_SECONDS,
+                )
+            except Exception:
+                pass
+        return tile_version
+
+    def forget_tile_version(self) -> None:
+        """Drop the kept tile version after it was incremented."""
+        try:
+            self.cache.delete(f'{self.key_prefix}:tile_version')
+        except Exception:
+            pass
+
+    def get_generation(self) -> Optional[str]:
+        """Return the token replaced by every invalidation, to be passed to
+        `set_if_unchanged` for a tile rendered afterwards."""
+        try:
+            return self.cache.get(f'{self.key_prefix}:generation')
+        except Exception:
+            return None
+
+    def replace_generation(self) -> None:
+        # Replaced before the tiles are deleted, so that a tile stored after
+        # the deletion is seen to be stale by `set_if_unchanged`.
+        self.cache.set(
+            f'{self.key_prefix}:generation', uuid.uuid4().hex, self.timeout
+        )
+
+    def build_key(
+        self,
+        tile_version: int,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+    ) -> str:
+        return f'{self.key_prefix}:{tile_version}:{layer}:{z}:{x}:{y}'
+
+    def get(
+        self,
+        tile_version: int,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+    ) -> Optional[bytes]:
+        """Return the stored tile bytes or None on a miss or cache error."""
+        try:
+            compressed = self.cache.get(
+                self.build_key(tile_version, layer, z, x, y)
+            )
+            if compressed is None:
+                return None
+            return zlib.decompress(compressed)
+        except Exception:
+            return None
+
+    def set(
+        self,
+        tile_version: int,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+        tile: bytes,
+    ) -> None:
+        """Compress and store tile bytes, skipping oversized tiles."""
+        try:
+            compressed = zlib.compress(tile)
+            if len(compressed) <= self.max_bytes:
+                self.cache.set(
+                    self.build_key(tile_version, layer, z, x, y),
+                    compressed,
+                    self.timeout,
+                )
+        except Exception:
+            pass
+
+    def set_if_unchanged(
+        self,
+        generation: Optional[str],
+        tile_version: int,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+        tile: bytes,
+    ) -> None:
+        """Store a tile rendered after `generation` was read, unless tiles
+        were invalidated since, which may have left out this tile."""
+        if self.get_generation() != generation:
+            return
+        self.set(tile_version, layer, z, x, y, tile)
+        if self.get_generation() != generation:
+            self.delete(tile_version, layer, z, x, y)
+
+    def delete(
+        self,
+        tile_version: int,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+    ) -> None:
+        try:
+            self.cache.delete(self.build_key(tile_version, layer, z, x, y))
+        except Exception:
+            pass
+
+    def get_covering_tiles(self, location: Point) -> List[mercantile.Tile]:
+        """Return every stored-zoom tile that renders a facility at the
+        given location, including neighbours within the render buffer."""
+        covering_tiles = []
+        for z in range(self.max_zoom + 1):
+            ew_buffer, ns_buffer = self.get_buffer(
+                mercantile.tile(location.x, location.y, z, truncate=True)
+            )
+            covering_tiles.extend(mercantile.tiles(
+                max(location.x - ew_buffer, -180.0),
+                max(location.y - ns_buffer, -90.0),
+                min(location.x + ew_buffer, 180.0),
+                min(location.y + ns_buffer, 90.0),
+                [z],
+                truncate=True,
+            ))
+        return covering_tiles
+
+    def get_covering_keys(
+        self,
+        tile_version: int,
+        locations: Iterable[Optional[Point]],
+    ) -> List[str]:
+        return list({
+            self.build_key(tile_version, layer, tile.z, tile.x, tile.y)
+            for location in locations
+            if location is not None
+            for tile in self.get_covering_tiles(location)
+            for layer in TILE_STORE_LAYERS
+        })
+
+    def invalidate_locations(
+        self,
+        tile_version: int,
+        locations: Iterable[Optional[Point]],
+    ) -> None:
+        """Delete the stored tiles of every layer that cover the locations."""
+        keys = self.get_covering_keys(tile_version, locations)
+        if not keys:
+            return
+        try:
+            self.replace_generation()
+            self.cache.delete_many(keys)
+        except Exception as exc:
+            log.warning(
+                f'[Tile Store] Failed to invalidate {len(keys)} tiles: {exc}'
+            )
+
+    def invalidate_changes_if_due(self) -> None:
+        """Invalidate one batch of the recorded changes unless another
+        request of any process did so in the last
+        TILE_STORE_CHANGES_INTERVAL_SECONDS. While the batch is full, the
+        next request invalidates the next one, so that a backlog is worked
+        off without holding up a single request."""
+        due_key = f'{self.key_prefix}:changes'
+        try:
+            is_due = self.cache.add(
+                due_key,
+                1,
+                settings.TILE_STORE_CHANGES_INTERVAL_SECONDS,
+            )
+            if not is_due:
+                return
+            invalidated = self.invalidate_changes(max_batches=1)
+            if invalidated >= TILE_STORE_CHANGES_BATCH_SIZE:
+                self.cache.delete(due_key)
+        except Exception as exc:
+            log.warning(f'[Tile Store] Failed to invalidate changes: {exc}')
+
+    def invalidate_changes(self, max_batches: Optional[int] = None) -> int:
+        """Delete the stored tiles covering the recorded changes and the
+        changes themselves, at most `max_batches` batches of them, and
+        return the number of changes. A change is only deleted once its
+        tiles are, so a failing cache keeps it for the next call."""
+        tile_version = self.get_current_tile_version()
+        invalidated = 0
+        batches = 0
+        while True:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        CLAIM_CHANGES_SQL, [TILE_STORE_CHANGES_BATCH_SIZE]
+                    )
+                    rows = cursor.fetchall()
+                keys = self.get_covering_keys(
+                    tile_version, [Point(x, y) for x, y in rows]
+                )
+                if keys:
+                    self.replace_generation()
+                    self.cache.delete_many(keys)
+            invalidated += len(rows)
+            batches += 1
+            if (
+                len(rows) < TILE_STORE_CHANGES_BATCH_SIZE
+                or batches == max_batches
+            ):
+                return invalidated
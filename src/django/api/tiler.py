@@ -1,54 +1,43 @@
+from api.hexgrid import HexGrid
 from api.models.facility.facility import Facility
+from api.models.facility.facility_hex_count import FacilityHexCount
 from api.models.facility.facility_index import FacilityIndex
+from api.tile_store import VectorTileStore
 import mercantile
 
 from django.contrib.gis.geos import Polygon
 from django.db import connection
 
-GRID_ZOOM_FACTOR = 3
 HI_LIMIT = 100
+# `ST_AsMVTGeom` keeps geometries within its default 256/4096 buffer of the
+# tile.
+MVT_BUFFER_RATIO = 256 / 4096
 
 
-def get_facility_grid_vector_tile(params, layer, z, x, y):
-    xy_bounds = mercantile.xy_bounds(x, y, z)
-    hex_width = abs(xy_bounds.right - xy_bounds.left) / (2**GRID_ZOOM_FACTOR)
-
+def get_hex_count_query(grid, z, xmin, ymin, xmax, ymax):
+    """
+    Return SQL and params selecting the precomputed unfiltered facility
+    counts of the hexagons whose centres can fall inside the box.
+    """
+    col_min, row_min, col_max, row_max = grid.get_cell_range(
+        xmin, ymin, xmax, ymax
+    )
     query = """
-    SELECT ST_AsMVT(q, 'facilitygrid') FROM (
-        SELECT ST_AsMVTGeom(
-            ST_Centroid(geom),
-            ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax})
-        ) AS mvt_geom,
-        (SELECT COUNT(*) FROM (
-            SELECT * FROM api_facilityindex
-            WHERE
-                ST_Contains(ST_Transform(geom, 4326), location)
-                AND ({where_clause})
-            LIMIT {limit}
-            ) as ss
-        ) as count,
-        ST_XMin(ST_Envelope(ST_Transform(geom, 4326))) AS xmin,
-        ST_YMin(ST_Envelope(ST_Transform(geom, 4326))) AS ymin,
-        ST_XMax(ST_Envelope(ST_Transform(geom, 4326))) AS xmax,
-        ST_YMax(ST_Envelope(ST_Transform(geom, 4326))) AS ymax
-    FROM
-        generate_hexgrid({width}, {xmin}, {ymin}, {xmax}, {ymax})
-    WHERE
-        ST_AsMVTGeom(
-            ST_Centroid(geom),
-            ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax})
-        ) IS NOT NULL
-        AND ABS(ST_XMax(ST_Envelope(ST_Transform(geom, 4326))) -
-            ST_XMin(ST_Envelope(ST_Transform(geom, 4326)))) < 180
-            AND exists (
-            SELECT 1 FROM api_facilityindex
-            WHERE
-                ST_Contains(ST_Transform(geom, 4326), location)
-                AND ({where_clause})
-        )
-    ) AS q;
+        SELECT hex_col, hex_row, count
+        FROM api_facilityhexcount
+        WHERE zoom = %s
+            AND hex_col BETWEEN %s AND %s
+            AND hex_row BETWEEN %s AND %s
     """
+    return query, [z, col_min, col_max, row_min, row_max]
 
+
+def get_hex_binning_query(grid, params, xmin, ymin, xmax, ymax):
+    """
+    Return SQL and params counting the filtered facilities in each hexagon
+    holding at least one of them, in a single pass over the facilities
+    inside the box grown by a hexagon radius.
+    """
     location_query, location_params = (
         FacilityIndex.objects.filter_by_query_params(params)
         .query.sql_with_params()
@@ -60,18 +49,132 @@ def get_facility_grid_vector_tile(params, layer, z, x, y):
             location_query.find("WHERE")+len("WHERE"):
         ]
 
-    query = query.format(
-        width=hex_width,
+    points_query = """
+        SELECT ST_X(mercator) AS px, ST_Y(mercator) AS py
+        FROM (
+            SELECT ST_Transform(location, 3857) AS mercator
+            FROM api_facilityindex
+            WHERE
+                location && ST_Transform(
+                    ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax}, 3857),
+                    4326
+                )
+                AND ({where_clause})
+        ) AS facilities
+    """.format(
+        xmin=xmin - grid.radius,
+        ymin=ymin - grid.radius,
+        xmax=xmax + grid.radius,
+        ymax=ymax + grid.radius,
+        where_clause=where_clause,
+    )
+
+    query = """
+        SELECT hex_col, hex_row, COUNT(*) AS count
+        FROM ({cell_query}) AS cells
+        GROUP BY hex_col, hex_row
+    """.format(cell_query=grid.get_cell_query(points_query))
+    return query, location_params
+
+
+def get_facility_grid_vector_tile(params, layer, z, x, y):
+    """
+    Create a vector tile of hexagons holding facilities, with the number of
+    facilities in each, capped at `HI_LIMIT`, and the hexagon bounds.
+
+    Unfiltered tiles read the counts precomputed in `FacilityHexCount` when
+    they have been built for the zoom level. Other tiles assign each
+    filtered facility to its hexagon arithmetically and aggregate them in a
+    single pass.
+
+    Arguments:
+    params (dict) -- Request query parameters whose potential choices are
+                     enumerated in `api.constants.FacilitiesQueryParams`
+    layer (string) -- The name of the tile layer.
+    z (int) -- Zoom level.
+    x (int) -- X (horizontal) position for requested tile on a grid.
+    y (int) -- Y (vertical) position for requested tile on a grid.
+
+    Returns:
+    A vector tile.
+    """
+    xy_bounds = mercantile.xy_bounds(x, y, z)
+    grid = HexGrid.for_zoom(z)
+
+    buffer = abs(xy_bounds.right - xy_bounds.left) * MVT_BUFFER_RATIO
+    xmin = xy_bounds.left - buffer
+    ymin = xy_bounds.bottom - buffer
+    xmax = xy_bounds.right + buffer
+    ymax = xy_bounds.top + buffer
+
+    if (
+        VectorTileStore.is_unfiltered(params)
+        and z <= FacilityHexCount.cached_max_zoom()
+    ):
+        cells_query, cells_params = get_hex_count_query(
+            grid, z, xmin, ymin, xmax, ymax
+        )
+    else:
+        cells_query, cells_params = get_hex_binning_query(
+            grid, params, xmin, ymin, xmax, ymax
+        )
+
+    center_x, center_y = grid.get_center_sql()
+    query = """
+    SELECT ST_AsMVT(q, 'facilitygrid') FROM (
+        SELECT ST_AsMVTGeom(
+            center,
+            ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax})
+        ) AS mvt_geom,
+        LEAST(count, {limit}) AS count,
+        ST_XMin(envelope) AS xmin,
+        ST_YMin(envelope) AS ymin,
+        ST_XMax(envelope) AS xmax,
+        ST_YMax(envelope) AS ymax
+    FROM (
+        SELECT
+            count,
+            ST_MakePoint(center_x, center_y) AS center,
+            ST_Transform(
+                ST_MakeEnvelope(
+                    center_x - {half_width},
+                    center_y - {radius},
+                    center_x + {half_width},
+                    center_y + {radius},
+                    3857
+                ),
+                4326
+            ) AS envelope
+        FROM (
+            SELECT
+                count,
+                {center_x} AS center_x,
+                {center_y} AS center_y
+            FROM ({cells_query}) AS cells
+        ) AS centers
+    ) AS hexagons
+    WHERE
+        ST_AsMVTGeom(
+            center,
+            ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax})
+        ) IS NOT NULL
+        AND ABS(ST_XMax(envelope) - ST_XMin(envelope)) < 180
+    ) AS q;
+    """.format(
         xmin=xy_bounds.left,
         ymin=xy_bounds.bottom,
         xmax=xy_bounds.right,
         ymax=xy_bounds.top,
-        where_clause=where_clause,
-        limit=HI_LIMIT
+        limit=HI_LIMIT,
+        half_width=grid.half_width,
+        radius=grid.radius,
+        center_x=center_x,
+        center_y=center_y,
+        cells_query=cells_query,
     )
 
     with connection.cursor() as cursor:
-        cursor.execute(query, location_params + location_params)
+        cursor.execute(query, cells_params)
         rows = cursor.fetchall()
         if len(rows) == 0 or len(rows[0]) == 0:
             return None
@@ -0,0 +1,163 @@
+"""Resolve the API token of a request to what `RequestMeterMiddleware`
+checks: its user, the contributor of the user and the API block of the
+contributor.
+
+The resolution is kept on the request, in the shared `view_cache` and, for a
+few seconds, in the process, so that an API call doesn't query the token, the
+contributor and the API block before Django REST Framework authenticates it.
+Saving or deleting a token, a contributor or an API block deletes the shared
+entries of the tokens of the user (see api/signals.py); the other processes
+see the change once their short local TTL expires.
+"""
+
+import hashlib
+import threading
+import time
+from collections import namedtuple
+from typing import Optional
+
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.authentication import get_authorization_header
+from rest_framework.authtoken.models import Token
+
+from api.constants import (TOKEN_METER_CACHE_KEY,
+                           TOKEN_METER_CACHE_TTL_SECONDS,
+                           TOKEN_METER_LOCAL_TTL_SECONDS)
+from api.models import ApiBlock
+
+# `block_until` is when the active API block of the contributor ends, or None
+# if its latest block is inactive.
+TokenMeter = namedtuple(
+    'TokenMeter', ['user_id', 'contributor_id', 'block_until']
+)
+
+# Local entries kept at most, as a bound on memory.
+LOCAL_CACHE_SIZE = 10000
+REQUEST_ATTRIBUTE = '_token_meter'
+
+_local_cache = {}
+_local_cache_lock = threading.Lock()
+
+
+def get_request_token_key(request) -> Optional[str]:
+    auth = get_authorization_header(request).split()
+    if len(auth) != 2 or auth[0].lower() != b'token':
+        return None
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        return None
+
+
+def get_cache_key(token_key: str) -> str:
+    token_hash = hashlib.sha256(token_key.encode()).hexdigest()
+    return TOKEN_METER_CACHE_KEY.format(token_hash=token_hash)
+
+
+def resolve_token_meter(request) -> Optional[TokenMeter]:
+    """The user, contributor and API block of the token of a request, or
+    None if the request has no token or it doesn't exist. Resolved once per
+    request."""
+    if not hasattr(request, REQUEST_ATTRIBUTE):
+        token_key = get_request_token_key(request)
+        setattr(
+            request,
+            REQUEST_ATTRIBUTE,
+            get_token_meter(token_key) if token_key else None,
+        )
+    return getattr(request, REQUEST_ATTRIBUTE)
+
+
+def get_token_meter(token_key: str) -> Optional[TokenMeter]:
+    cache_key = get_cache_key(token_key)
+
+    with _local_cache_lock:
+        local = _local_cache.get(cache_key)
+    if local is not None and local[0] > time.monotonic():
+        return local[1]
+
+    # Resolved here (not at import time) so test ``override_settings`` for
+    # ``CACHES`` is honoured.
+    cache = caches['view_cache']
+    cached = cache.get(cache_key)
+    if cached is None:
+        token_meter = load_token_meter(token_key)
+        if token_meter is None:
+            # Unknown tokens are not cached: DRF rejects them, and a token
+            # created later must be seen at once.
+            return None
+        cache.set(
+            cache_key, tuple(token_meter), TOKEN_METER_CACHE_TTL_SECONDS
+        )
+    else:
+        token_meter = TokenMeter(*cached)
+
+    with _local_cache_lock:
+        if len(_local_cache) >= LOCAL_CACHE_SIZE:
+            _local_cache.clear()
+        _local_cache[cache_key] = (
+            time.monotonic() + TOKEN_METER_LOCAL_TTL_SECONDS,
+            token_meter,
+        )
+    return token_meter
+
+
+def load_token_meter(token_key: str) -> Optional[TokenMeter]:
+    token = (
+        Token.objects
+        .filter(key=token_key)
+        .values('user_id', 'user__contributor__id')
+        .first()
+    )
+    if token is None:
+        return None
+
+    contributor_id = token['user__contributor__id']
+    block_until = None
+    if contributor_id is not None:
+        api_block = (
+            ApiBlock.objects
+            .filter(contributor_id=contributor_id)
+            .order_by('-until')
+            .values('until', 'active')
+            .first()
+        )
+        if api_block is not None and api_block['active']:
+            block_until = api_block['until']
+
+    return TokenMeter(token['user_id'], contributor_id, block_until)
+
+
+def invalidate_token_meters(user_id) -> None:
+    """Delete the cached resolutions of the tokens of a user once the
+    current transaction commits."""
+    if user_id is None:
+        return
+
+    def delete():
+        cache_keys = [
+            get_cache_key(token_key)
+            for token_key in Token.objects.filter(
+                user_id=user_id
+            ).values_list('key', flat=True)
+        ]
+        caches['view_cache'].delete_many(cache_keys)
+        with _local_cache_lock:
+            for cache_key in cache_keys:
+                _local_cache.pop(cache_key, None)
+
+    transaction.on_commit(delete)
+
+
+def invalidate_token_meter(token_key) -> None:
+    """Delete the cached resolution of a token once the current transaction
+    commits."""
+    cache_key = get_cache_key(token_key)
+
+    def delete():
+        caches['view_cache'].delete(cache_key)
+        with _local_cache_lock:
+            _local_cache.pop(cache_key, None)
+
+    transaction.on_commit(delete)
@@ -96,6 +96,7 @@ from api.serializers import (
 from api.serializers.facility.facility_list_page_parameter_serializer \
     import FacilityListPageParameterSerializer
 from api.throttles import DataUploadThrottle
+from api.tile_store import VectorTileStore
 from api.serializers.facility.utils import (
     is_same_contributor_from_url_param,
 )
@@ -2282,6 +2283,7 @@ class FacilitiesViewSet(ListModelMixin,
             tile_version = Version.objects.get(name='tile_version')
             tile_version.version = F('version') + 1
             tile_version.save()
+            transaction.on_commit(VectorTileStore().forget_tile_version)
         except Version.DoesNotExist:
             pass
 
@@ -16,6 +16,7 @@ from ...exceptions import BadRequestException
 from ...permissions import IsAllowedHost
 from ...renderers import MvtRenderer
 from ...serializers import FacilityQueryParamsSerializer
+from ...tile_store import VectorTileStore
 from ...tiler import (
     get_facilities_vector_tile,
     get_facility_grid_vector_tile
@@ -43,13 +44,39 @@ def get_tile(request, layer, cachekey, z, x, y, ext):
     if not params.is_valid():
         raise ValidationError(params.errors)
 
+    tile_store = VectorTileStore()
+    tile_version = VectorTileStore.parse_tile_version(cachekey)
+    # The version comes from the client, and only the tiles of the current
+    # version are invalidated when facilities change.
+    use_tile_store = (
+        tile_version is not None
+        and tile_store.is_storable(request.query_params, z)
+        and tile_version == tile_store.get_current_tile_version()
+    )
+
+    if use_tile_store:
+        stored_tile = tile_store.get(tile_version, layer, z, x, y)
+        if stored_tile is not None:
+            return Response(stored_tile)
+
+    # Stored tiles are served without a query, so the recorded changes are
+    # applied by the requests that render from PostGIS.
+    tile_store.invalidate_changes_if_due()
+    generation = tile_store.get_generation()
+
+    get_vector_tile = {
+        'facilities': get_facilities_vector_tile,
+        'facilitygrid': get_facility_grid_vector_tile,
+    }[layer]
+
     try:
-        tile = {
-            'facilities': get_facilities_vector_tile(
-                request.query_params, layer, z, x, y),
-            'facilitygrid': get_facility_grid_vector_tile(
-                request.query_params, layer, z, x, y)
-        }[layer]
-        return Response(tile.tobytes())
+        tile = get_vector_tile(request.query_params, layer, z, x, y)
     except EmptyResultSet:
         return Response(None, status=HTTP_204_NO_CONTENT)
+
+    tile_bytes = tile.tobytes()
+    if use_tile_store:
+        tile_store.set_if_unchanged(
+            generation, tile_version, layer, z, x, y, tile_bytes
+        )
+    return Response(tile_bytes)
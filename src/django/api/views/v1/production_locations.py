@@ -6,6 +6,7 @@ from django.http import QueryDict
 from django.db import transaction
 
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework.parsers import JSONParser
@@ -34,13 +35,16 @@ from api.serializers.v1.duplicate_override_query_param_serializer \
     import DuplicateOverrideQueryParamSerializer
 from api.serializers.v1.ignore_warnings_query_param_serializer \
     import IgnoreWarningsQueryParamSerializer
+from api.serializers.v1.production_locations_batch_serializer \
+    import ProductionLocationsBatchSerializer
 from api.models.moderation_event import ModerationEvent
 from api.models.facility.facility import Facility
 from api.models.partner_field import PartnerField
 from api.models.extended_field import ExtendedField
 from api.throttles import (
     DataUploadThrottle,
-    DuplicateThrottle
+    DuplicateThrottle,
+    ProductionLocationsBatchThrottle,
 )
 from api.constants import (
     APIV1CommonErrorMessages,
@@ -105,6 +109,13 @@ class ProductionLocations(ViewSet):
                 or self.action == 'partial_update'):
             return [DataUploadThrottle(), DuplicateThrottle()]
 
+        if self.action == 'batch':
+            # A batch is still one request for the default throttles, and
+            # is also metered by the OS IDs it asks for.
+            return super().get_throttles() + [
+                ProductionLocationsBatchThrottle()
+            ]
+
         # Call the parent method to use the default throttling setup in the
         # settings.py file.
         return super().get_throttles()
@@ -163,22 +174,26 @@ class ProductionLocations(ViewSet):
 
     @handle_errors_decorator
     def retrieve(self, _, pk=None):
-        query_params = QueryDict("", mutable=True)
-        query_params.update({"os_id": pk})
-
         opensearch_service, opensearch_query_director = \
             self.__init_opensearch()
-        query_body = opensearch_query_director.build_query(
-            query_params,
-            ProductionLocationsResponseMapping.PRODUCTION_LOCATION_BY_OS_ID
-        )
-        response = opensearch_service.search_index(
+        # The OS ID is the document ID, so a current OS ID is read directly
+        # and in real time. Only a historical OS ID has to be searched for.
+        location = opensearch_service.get_document(
             OpenSearchIndexNames.PRODUCTION_LOCATIONS_INDEX,
-            query_body,
+            pk,
+            source_includes=(
+                ProductionLocationsResponseMapping.PRODUCTION_LOCATION_BY_OS_ID
+            ),
         )
-        locations = response.get("data", [])
+        if location is None:
+            locations = self.__search_by_os_ids(
+                opensearch_service,
+                opensearch_query_director,
+                [pk],
+            )
+            location = locations[0] if locations else None
 
-        if len(locations) == 0:
+        if location is None:
             return Response(
                 data={
                     "detail": "The location with the given id was not found.",
@@ -186,10 +201,99 @@ class ProductionLocations(ViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        partner_extended_fields = self.__get_partner_fields(pk)
-        locations[0].update(partner_extended_fields)
+        os_id = location.get("os_id", pk)
+        partner_extended_fields = self.__get_partner_fields([os_id])
+        location.update(partner_extended_fields.get(os_id, {}))
+
+        return Response(location)
+
+    @action(detail=False, methods=['POST'], url_path='batch')
+    @handle_errors_decorator
+    def batch(self, request):
+        serializer = ProductionLocationsBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {
+                    'detail': APIV1CommonErrorMessages.COMMON_REQ_BODY_ERROR,
+                    'errors': [
+                        {'field': field, 'detail': str(errors[0])}
+                        for field, errors in serializer.errors.items()
+                    ],
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        os_ids = list(dict.fromkeys(serializer.validated_data['os_ids']))
+
+        opensearch_service, opensearch_query_director = \
+            self.__init_opensearch()
+        locations_by_os_id = opensearch_service.get_documents(
+            OpenSearchIndexNames.PRODUCTION_LOCATIONS_INDEX,
+            os_ids,
+            source_includes=(
+                ProductionLocationsResponseMapping.PRODUCTION_LOCATION_BY_OS_ID
+            ),
+        )
+
+        historical_os_ids = [
+            os_id for os_id in os_ids if os_id not in locations_by_os_id
+        ]
+        if historical_os_ids:
+            for location in self.__search_by_os_ids(
+                opensearch_service,
+                opensearch_query_director,
+                historical_os_ids,
+            ):
+                for os_id in location.get("historical_os_id", []):
+                    if os_id in historical_os_ids:
+                        locations_by_os_id[os_id] = location
+
+        locations = {}
+        not_found = []
+        for os_id in os_ids:
+            location = locations_by_os_id.get(os_id)
+            if location is None:
+                not_found.append(os_id)
+            else:
+                # A historical OS ID may resolve to a requested location.
+                locations.setdefault(location["os_id"], location)
+        locations = list(locations.values())
+
+        partner_extended_fields = self.__get_partner_fields(
+            [location["os_id"] for location in locations]
+        )
+        for location in locations:
+            location.update(
+                partner_extended_fields.get(location["os_id"], {})
+            )
+
+        return Response({
+            "count": len(locations),
+            "data": locations,
+            "not_found": not_found,
+        })
 
-        return Response(locations[0])
+    @staticmethod
+    def __search_by_os_ids(
+        opensearch_service,
+        opensearch_query_director,
+        os_ids: List[str],
+    ) -> List[Dict]:
+        '''
+        Search for the locations with the OS IDs, current or historical.
+        '''
+        query_params = QueryDict("", mutable=True)
+        query_params.setlist("os_id", os_ids)
+        query_params.update({"size": len(os_ids)})
+
+        query_body = opensearch_query_director.build_query(
+            query_params,
+            ProductionLocationsResponseMapping.PRODUCTION_LOCATION_BY_OS_ID
+        )
+        response = opensearch_service.search_index(
+            OpenSearchIndexNames.PRODUCTION_LOCATIONS_INDEX,
+            query_body,
+        )
+        return response.get("data", [])
 
     @transaction.atomic
     def create(self, request):
@@ -349,17 +453,20 @@ class ProductionLocations(ViewSet):
             status=result.status_code
         )
 
-    def __get_partner_fields(self, pk):
+    def __get_partner_fields(self, os_ids: List[str]) -> Dict[str, Dict]:
         """
-        Checks and returns partner extended fields for a
-        production location object by its ID or
-        by the provided Facility instance.
+        Checks and returns partner extended fields for the
+        production locations with the given IDs, loading the
+        extended fields of all of them with one query.
 
         Caches the list of partner field names for one hour.
         Returns a dictionary of the form:
             {
-                "field_name_1": value_1,
-                "field_name_2": value_2,
+                "os_id_1": {
+                    "field_name_1": value_1,
+                    "field_name_2": value_2,
+                    ...
+                },
                 ...
             }
         """
@@ -370,14 +477,14 @@ class ProductionLocations(ViewSet):
             if field.active and field.available_in_api
         ]
 
-        if not partner_field_names:
+        if not partner_field_names or not os_ids:
             return {}
 
-        partner_extended_fields = {}
+        partner_extended_fields = {os_id: {} for os_id in os_ids}
         partner_field_values = ExtendedField.objects.filter(
-            facility__id=pk,
+            facility__id__in=os_ids,
             field_name__in=partner_field_names,
-        ).values("field_name", "value")
+        ).values("facility_id", "field_name", "value")
         json_schemas = {
             field.name: field.json_schema
             for field in all_partner_fields
@@ -395,20 +502,26 @@ class ProductionLocations(ViewSet):
             if value is None:
                 continue
 
-            partner_extended_fields[field_name] = value
+            partner_extended_fields[field["facility_id"]][field_name] = value
 
-        facility = (
-            Facility.objects.filter(id=pk)
+        facilities = list(
+            Facility.objects.filter(id__in=os_ids)
             .only(
                 "id",
                 "country_code",
                 "location",
             )
-            .first()
         )
 
-        if not facility:
-            logger.warning(f"PL viewset: Facility not found for ID: {pk}")
+        if len(facilities) < len(os_ids):
+            found_ids = {facility.id for facility in facilities}
+            for os_id in os_ids:
+                if os_id not in found_ids:
+                    logger.warning(
+                        f"PL viewset: Facility not found for ID: {os_id}"
+                    )
+
+        if not facilities:
             return partner_extended_fields
 
         for provider in system_partner_field_registry.providers:
@@ -417,25 +530,25 @@ class ProductionLocations(ViewSet):
             if field_name not in partner_field_names:
                 continue
 
-            provider_data = provider.fetch_data(facility)
+            provider_data_by_os_id = provider.fetch_data_for_locations(
+                facilities
+            )
 
-            if provider_data is None:
-                continue
+            for os_id, provider_data in provider_data_by_os_id.items():
+                provider_value = provider_data.get("value")
 
-            provider_value = provider_data.get("value")
+                if not field_name or not isinstance(provider_value, dict):
+                    continue
 
-            if not field_name or not isinstance(provider_value, dict):
-                continue
+                value = self.__get_partner_field_value(
+                    value=provider_value,
+                    schema=json_schemas.get(field_name),
+                )
 
-            value = self.__get_partner_field_value(
-                value=provider_value,
-                schema=json_schemas.get(field_name),
-            )
-
-            if value is None:
-                continue
+                if value is None:
+                    continue
 
-            partner_extended_fields[field_name] = value
+                partner_extended_fields[os_id][field_name] = value
 
         return partner_extended_fields
 
@@ -1,5 +1,5 @@
 import os
-from typing import Union, List, Dict
+from typing import Union, Iterable, Dict
 
 from django.core.files.base import File
 
@@ -55,8 +55,14 @@ class ContriCleaner:
         self.__os_id_lookup = os_id_lookup
 
     def process_data(self) -> ListDTO:
+        # The file parsers yield the rows as the handlers read them, so a
+        # parsing error can also be raised while the rows are handled.
         try:
             parsed_rows = self.__parse_data()
+
+            entry_handler = self.__setup_handlers()
+
+            processed_list = entry_handler.handle(parsed_rows)
         except ParsingError as err:
             return ListDTO(errors=[{
                 'message': str(err),
@@ -64,13 +70,9 @@ class ContriCleaner:
                 'type': 'ParsingError',
             }])
 
-        entry_handler = self.__setup_handlers()
-
-        processed_list = entry_handler.handle(parsed_rows)
-
         return processed_list
 
-    def __parse_data(self) -> List[Dict]:
+    def __parse_data(self) -> Iterable[Dict]:
         parsing_executor = self.__define_parsing_strategy()
         parsed_rows = parsing_executor.execute_parsing()
 
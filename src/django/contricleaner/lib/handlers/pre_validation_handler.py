@@ -1,4 +1,5 @@
-from typing import List, Dict
+from itertools import tee
+from typing import Iterable, Dict
 
 from contricleaner.lib.dto.list_dto import ListDTO
 from contricleaner.lib.handlers.list_row_handler import ListRowHandler
@@ -10,11 +11,16 @@ from contricleaner.lib.validators.pre_validators \
 
 class PreValidationHandler(ListRowHandler):
 
-    def handle(self, rows: List[Dict]) -> ListDTO:
+    def handle(self, rows: Iterable[Dict]) -> ListDTO:
         composite_pre_validator = CompositePreValidator()
         composite_pre_validator.add_validator(PreHeaderValidator())
 
-        result = composite_pre_validator.validate(rows)
+        # The rows may be read lazily from the file. Validate a copy of them,
+        # so the rows the validators read ahead are kept for the next
+        # handler, and drop the copy afterwards so the rest aren't.
+        rows, rows_to_validate = tee(rows)
+        result = composite_pre_validator.validate(rows_to_validate)
+        del rows_to_validate
 
         if len(result['errors']) > 0:
             return ListDTO(errors=result['errors'])
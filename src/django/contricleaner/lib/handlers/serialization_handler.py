@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Iterable, Dict
 
 from contricleaner.lib.dto.list_dto import ListDTO
 from contricleaner.lib.dto.row_dto import RowDTO
@@ -43,7 +43,7 @@ class SerializationHandler(ListRowHandler):
         self.__sector_cache = sector_cache
         self.__os_id_lookup = os_id_lookup
 
-    def handle(self, rows: List[Dict]) -> ListDTO:
+    def handle(self, rows: Iterable[Dict]) -> ListDTO:
         serialized_rows = []
         composite_row_serializer = self.__construct_serializers()
 
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable
 from abc import ABC, abstractmethod
 
 from django.core.files.base import File
@@ -14,5 +14,5 @@ class FileParser(ABC):
 
     @staticmethod
     @abstractmethod
-    def _parse(file: File) -> List[dict]:
+    def _parse(file: File) -> Iterable[dict]:
         pass
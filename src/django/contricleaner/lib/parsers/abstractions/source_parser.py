@@ -1,8 +1,8 @@
-from typing import List, Dict
+from typing import Iterable, Dict
 from abc import ABC, abstractmethod
 
 
 class SourceParser(ABC):
     @abstractmethod
-    def get_parsed_rows(self) -> List[Dict]:
+    def get_parsed_rows(self) -> Iterable[Dict]:
         pass
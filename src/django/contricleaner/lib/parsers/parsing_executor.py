@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Iterable, Dict
 
 from contricleaner.lib.parsers.abstractions.source_parser import SourceParser
 
@@ -10,5 +10,5 @@ class ParsingExecutor:
     ):
         self.__source_parser = source_parser
 
-    def execute_parsing(self) -> List[Dict]:
+    def execute_parsing(self) -> Iterable[Dict]:
         return self.__source_parser.get_parsed_rows()
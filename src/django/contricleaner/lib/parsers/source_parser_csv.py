@@ -1,5 +1,6 @@
+import codecs
 import csv
-from typing import List
+from typing import Iterator, List
 
 from django.core.files.base import File
 
@@ -9,28 +10,41 @@ from contricleaner.lib.exceptions.parsing_error import ParsingError
 
 
 class SourceParserCSV(SourceParser, FileParser):
-    def get_parsed_rows(self) -> List[dict]:
+    def get_parsed_rows(self) -> Iterator[dict]:
         return self._parse(self._file)
 
     @staticmethod
-    def _parse(file: File) -> List[dict]:
+    def _parse(file: File) -> Iterator[dict]:
+        # The file is read in chunks and decoded line by line, so it is never
+        # held in memory as a whole. Passing the lines to a single reader
+        # keeps quoted values that span several lines in one cell.
+        reader = csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+        header = SourceParserCSV.__read_row(reader)
+        if header is None:
+            return iter([])
+
+        return SourceParserCSV.__iter_rows(reader, header)
+
+    @staticmethod
+    def __iter_rows(reader: Iterator[List[str]],
+                    header: List[str]) -> Iterator[dict]:
+        while True:
+            bare_row = SourceParserCSV.__read_row(reader)
+            if bare_row is None:
+                return
+            yield dict(zip(header, bare_row))
+
+    @staticmethod
+    def __read_row(reader: Iterator[List[str]]) -> List[str]:
         try:
-            decoded_content = file.read().decode(encoding='utf-8-sig') \
-                .splitlines()
+            row = next(reader, None)
         except UnicodeDecodeError:
             raise ParsingError('Our system does not support the type of CSV '
                                'file you submitted. Please save and export '
                                'your file as a UTF-8 CSV or an Excel file and '
                                'reupload.')
 
-        rows = []
-        header = SourceParserCSV.__parse_csv_line(decoded_content[0].rstrip())
-        for line in decoded_content[1:]:
-            bare_row = SourceParserCSV.__parse_csv_line(line.rstrip())
-            rows.append(dict(zip(header, bare_row)))
-
-        return rows
+        if row:
+            row[-1] = row[-1].rstrip()
 
-    @staticmethod
-    def __parse_csv_line(line: str) -> list:
-        return next(csv.reader([line]))
+        return row
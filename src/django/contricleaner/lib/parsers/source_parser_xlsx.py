@@ -1,7 +1,8 @@
-from typing import List, Union
+from itertools import chain, repeat
+from typing import Iterator, List, Union
 
 from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.workbook.workbook import Workbook
 from django.core.files.base import File
 
 from contricleaner.lib.parsers.abstractions.source_parser import SourceParser
@@ -10,13 +11,24 @@ from contricleaner.lib.exceptions.parsing_error import ParsingError
 
 
 class SourceParserXLSX(SourceParser, FileParser):
-    def get_parsed_rows(self) -> List[dict]:
+    __parsing_error_message = (
+        'There was an error within your file and our team needs to take a '
+        'look. Please send your file to support@opensupplyhub.org for '
+        'diagnosis.'
+    )
+
+    def get_parsed_rows(self) -> Iterator[dict]:
         return self._parse(self._file)
 
     @staticmethod
-    def _parse(file: File) -> List[dict]:
+    def _parse(file: File) -> Iterator[dict]:
         try:
-            worksheet = SourceParserXLSX.__get_xlsx_sheet(file)
+            workbook = SourceParserXLSX.__load_workbook(file)
+            worksheet = workbook[workbook.sheetnames[0]]
+            # A read-only sheet only reads the cells within the dimension
+            # stored in the file, which some tools write wrong, so the rows
+            # are read up to their last cell instead.
+            worksheet.reset_dimensions()
 
             worksheet_rows = worksheet.rows
             # Using `next` extracts the header row, causing the iteration of
@@ -26,24 +38,38 @@ class SourceParserXLSX(SourceParser, FileParser):
                 SourceParserXLSX.__format_cell_value(cell.value)
                 for cell in first_row
             ]
+        except Exception:
+            raise ParsingError(SourceParserXLSX.__parsing_error_message)
 
-            rows = [dict(zip(header, SourceParserXLSX.__tidy_row(row)))
-                    for row in worksheet_rows
-                    if any(cell.value is not None for cell in row)]
+        return SourceParserXLSX.__iter_rows(workbook, worksheet_rows, header)
 
-            return rows
+    @staticmethod
+    def __iter_rows(workbook: Workbook,
+                    worksheet_rows: Iterator[tuple],
+                    header: List[str]) -> Iterator[dict]:
+        # The workbook is opened read-only, so the rows are read from the
+        # sheet as they are iterated instead of being loaded up front. Rows
+        # read this way stop at their last stored cell, so they are padded
+        # to the width of the header. Cells beyond the header are dropped.
+        try:
+            for row in worksheet_rows:
+                if any(cell.value is not None for cell in row):
+                    yield dict(zip(
+                        header,
+                        chain(SourceParserXLSX.__tidy_row(row), repeat(''))
+                    ))
         except Exception:
-            raise ParsingError(
-                'There was an error within your file and our team needs to '
-                'take a look. Please send your file to '
-                'support@opensupplyhub.org for diagnosis.')
+            raise ParsingError(SourceParserXLSX.__parsing_error_message)
+        finally:
+            workbook.close()
 
     @staticmethod
     def __tidy_row(row: tuple) -> list:
         formatted_row = []
 
         for cell in row:
-            if '%' in cell.number_format:
+            # Empty cells of a read-only sheet have no number format.
+            if '%' in (cell.number_format or ''):
                 formatted_cell_value = SourceParserXLSX.__format_percent(
                     cell.value
                 )
@@ -56,17 +82,17 @@ class SourceParserXLSX(SourceParser, FileParser):
         return formatted_row
 
     @staticmethod
-    def __get_xlsx_sheet(file: File) -> Worksheet:
+    def __load_workbook(file: File) -> Workbook:
         import defusedxml
         from defusedxml.common import EntitiesForbidden
 
         defusedxml.defuse_stdlib()
 
         try:
-            workbook = load_workbook(filename=file)
-            worksheet = workbook[workbook.sheetnames[0]]
-
-            return worksheet
+            # Cells keep their number format in read-only mode, which is
+            # needed to tell percentages apart, so the values are not read
+            # on their own.
+            return load_workbook(filename=file, read_only=True)
 
         except EntitiesForbidden:
             raise ParsingError('This file may be damaged and '
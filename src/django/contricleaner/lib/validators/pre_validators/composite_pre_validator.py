@@ -1,4 +1,5 @@
-from typing import List
+from itertools import tee
+from typing import Iterable, List
 
 from contricleaner.lib.validators.pre_validators \
     .pre_validator import PreValidator
@@ -11,12 +12,15 @@ class CompositePreValidator(PreValidator):
     def add_validator(self, validator: PreValidator):
         self.__validators.append(validator)
 
-    def validate(self, rows: List[dict]) -> dict:
+    def validate(self, rows: Iterable[dict]) -> dict:
         validation = {
             "errors": [],
         }
-        for validator in self.__validators:
-            result = validator.validate(rows)
+        # Each validator reads its own copy of the rows, and only as far as
+        # it needs to.
+        copies = tee(rows, len(self.__validators))
+        for validator, validator_rows in zip(self.__validators, copies):
+            result = validator.validate(validator_rows)
             if len(result.keys()) > 0:
                 validation["errors"].append(result)
         return validation
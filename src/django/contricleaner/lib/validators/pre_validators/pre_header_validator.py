@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable
 
 from contricleaner.lib.validators.pre_validators \
     .pre_validator import PreValidator
@@ -10,7 +10,7 @@ class PreHeaderValidator(PreValidator):
                          'address',
                          'country'}
 
-    def validate(self, rows: List[dict]) -> dict:
+    def validate(self, rows: Iterable[dict]) -> dict:
         for row in rows:
             raw_row = row
             diff = self.__required_fields.difference(raw_row.keys())
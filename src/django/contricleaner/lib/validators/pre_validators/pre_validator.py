@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable
 
 
 class PreValidator(ABC):
 
     @abstractmethod
-    def validate(self, rows: List[dict]) -> dict:
+    def validate(self, rows: Iterable[dict]) -> dict:
         pass
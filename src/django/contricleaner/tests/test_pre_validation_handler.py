@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 from django.test import TestCase
 
 from contricleaner.lib.handlers.pre_validation_handler \
@@ -43,3 +45,15 @@ class PreValidationHandlerTest(TestCase):
             self.handler_two.handle([facility_source_one, facility_source_two])
         except HandlerNotSetError as exc:
             self.assertEqual("Next Handler wasn't set.", exc.args[0])
+
+    def test_passes_all_rows_of_an_iterator_on(self):
+        rows = [
+            {"sector": "Apparel"},
+            {"country": "US", "name": "Pants Hut", "address": "123 Main St"},
+            {"country": "US", "name": "Shirts Hut", "address": "1 Elm St"},
+        ]
+        next_handler = MagicMock()
+        next_handler.handle.side_effect = list
+        self.handler_one.set_next(next_handler)
+
+        self.assertEqual(self.handler_one.handle(iter(rows)), rows)
@@ -189,3 +189,39 @@ class SourceParserCSVTest(TestCase):
         self.assertEqual(error_field, expected_error_field)
 
         os.remove('test.csv')
+
+    def test_quoted_values_spanning_lines_are_kept_whole(self):
+        uploaded_file = SimpleUploadedFile(
+            'test.csv',
+            ('country,name,address\r\n'
+             'United States,"Fashion Plus\r\nNorth","123 Avenue Street,\n'
+             'Cityville"\r\n'
+             'Canada,Style Haven,456 Fashion Road\r\n').encode('utf-8-sig'),
+        )
+
+        rows = SourceParserCSV(uploaded_file).get_parsed_rows()
+
+        self.assertEqual(next(rows), {
+            'country': 'United States',
+            'name': 'Fashion Plus\r\nNorth',
+            'address': '123 Avenue Street,\nCityville',
+        })
+        self.assertEqual(list(rows), [{
+            'country': 'Canada',
+            'name': 'Style Haven',
+            'address': '456 Fashion Road',
+        }])
+
+    def test_invalid_utf8_after_header_is_parsing_error(self):
+        uploaded_file = SimpleUploadedFile(
+            'test.csv', b'country,name,address\n\xff\xfe,Name,Address\n'
+        )
+
+        processed_data = ContriCleaner(
+            uploaded_file,
+            SectorCacheMock(),
+            OSIDLookupMock()
+        ).process_data()
+
+        self.assertEqual(processed_data.rows, [])
+        self.assertEqual(processed_data.errors[0]['type'], 'ParsingError')
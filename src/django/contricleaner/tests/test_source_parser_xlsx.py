@@ -1,4 +1,6 @@
+import io
 import os
+import zipfile
 from unittest.mock import MagicMock, patch
 
 from defusedxml.common import EntitiesForbidden
@@ -7,7 +9,7 @@ from django.core.files.uploadedfile import (
     SimpleUploadedFile
 )
 from django.core.files.base import File
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import NamedStyle
 
 from contricleaner.lib.parsers.source_parser_xlsx import SourceParserXLSX
@@ -308,3 +310,100 @@ class SourceParserXLSXTest(TestCase):
                  'support@opensupplyhub.org for diagnosis.'),
                 ):
             parser.get_parsed_rows()
+
+    def test_rows_are_read_from_a_read_only_workbook(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in (
+            ('country', 'name', 'address'),
+            ('United States', 'Fashion Plus', '123 Avenue Street'),
+            (None, None, None),
+            ('Canada', 'Style Haven'),
+        ):
+            sheet.append(row)
+        workbook.save('test_read_only.xlsx')
+
+        with open('test_read_only.xlsx', 'rb') as xlsx_file:
+            uploaded_file = SimpleUploadedFile(
+                'test_read_only.xlsx', xlsx_file.read()
+            )
+        os.remove('test_read_only.xlsx')
+
+        with patch(
+            'contricleaner.lib.parsers.source_parser_xlsx.load_workbook',
+            wraps=load_workbook,
+        ) as mock_load_workbook:
+            rows = SourceParserXLSX(uploaded_file).get_parsed_rows()
+
+        self.assertTrue(mock_load_workbook.call_args.kwargs['read_only'])
+        self.assertEqual(list(rows), [
+            {
+                'country': 'United States',
+                'name': 'Fashion Plus',
+                'address': '123 Avenue Street',
+            },
+            {'country': 'Canada', 'name': 'Style Haven', 'address': ''},
+        ])
+
+    def test_rows_wider_than_the_header_have_no_none_key(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in (
+            ('country', 'name', 'address'),
+            ('Canada', 'Style Haven', '1 Main St', 'extra', 'cells'),
+        ):
+            sheet.append(row)
+        xlsx_file = io.BytesIO()
+        workbook.save(xlsx_file)
+        uploaded_file = SimpleUploadedFile(
+            'test_wide_rows.xlsx', xlsx_file.getvalue()
+        )
+
+        rows = list(SourceParserXLSX(uploaded_file).get_parsed_rows())
+
+        self.assertEqual(len(rows), 1)
+        self.assertNotIn(None, rows[0])
+        self.assertEqual(rows[0]['country'], 'Canada')
+        self.assertEqual(rows[0]['name'], 'Style Haven')
+        self.assertEqual(rows[0]['address'], '1 Main St')
+
+    def test_reads_cells_beyond_the_stored_dimension(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in (
+            ('country', 'name', 'address'),
+            ('United States', 'Fashion Plus', '123 Avenue Street'),
+            ('Canada', 'Style Haven', '1 Main St'),
+        ):
+            sheet.append(row)
+        saved_file = io.BytesIO()
+        workbook.save(saved_file)
+        # Declare a smaller sheet than the one stored, as some tools do.
+        xlsx_file = io.BytesIO()
+        with zipfile.ZipFile(saved_file) as source, \
+                zipfile.ZipFile(xlsx_file, 'w') as target:
+            for item in source.infolist():
+                data = source.read(item.filename)
+                if item.filename == 'xl/worksheets/sheet1.xml':
+                    data = data.replace(
+                        b'<dimension ref="A1:C3"', b'<dimension ref="A1:B2"'
+                    )
+                target.writestr(item, data)
+        uploaded_file = SimpleUploadedFile(
+            'test_wrong_dimension.xlsx', xlsx_file.getvalue()
+        )
+
+        rows = list(SourceParserXLSX(uploaded_file).get_parsed_rows())
+
+        self.assertEqual(rows, [
+            {
+                'country': 'United States',
+                'name': 'Fashion Plus',
+                'address': '123 Avenue Street',
+            },
+            {
+                'country': 'Canada',
+                'name': 'Style Haven',
+                'address': '1 Main St',
+            },
+        ])
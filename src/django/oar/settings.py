@@ -243,6 +243,10 @@ REST_FRAMEWORK = {
         'sustained': '10000/day',
         'data_upload': '30/minute',
         'tiles': '300/minute',
+        # Counted in OS IDs rather than requests. Users get their own
+        # sustained rate instead, see
+        # api.throttles.ProductionLocationsBatchThrottle.
+        'production_locations_batch': '10000/day',
     },
     # By default, the value of NON_FIELD_ERRORS_KEY is 'non_field_errors'.
     # It is being redefined to ensure 100% consistency between custom error
@@ -357,6 +361,21 @@ MEMCACHED_VIEW_CACHE_TIMEOUT_SECONDS = int(
 VIEW_RESPONSE_CACHE_MAX_BYTES = int(
     os.getenv('VIEW_RESPONSE_CACHE_MAX_BYTES', 4 * 1024 * 1024)
 )
+# Unfiltered vector tiles up to this zoom are kept in the tile store and
+# served without querying PostGIS. See api/tile_store.py.
+TILE_STORE_MAX_ZOOM = int(os.getenv('TILE_STORE_MAX_ZOOM', 7))
+TILE_STORE_TIMEOUT_SECONDS = int(
+    os.getenv('TILE_STORE_TIMEOUT_SECONDS', 60 * 60 * 24 * 7)
+)
+# How long the current tile version is kept in the tile store, so that stored
+# tiles are served without querying the database.
+TILE_STORE_TILE_VERSION_TIMEOUT_SECONDS = int(
+    os.getenv('TILE_STORE_TILE_VERSION_TIMEOUT_SECONDS', 60)
+)
+# How often the stored tiles covering changed facilities are invalidated.
+TILE_STORE_CHANGES_INTERVAL_SECONDS = int(
+    os.getenv('TILE_STORE_CHANGES_INTERVAL_SECONDS', 10)
+)
 CACHE_BACKEND = 'django.core.cache.backends.memcached.PyLibMCCache'
 
 CACHES = {
@@ -373,6 +392,11 @@ CACHES = {
         'BACKEND': CACHE_BACKEND,
         'LOCATION': MEMCACHED_LOCATION,
         'KEY_PREFIX': 'view',
+    },
+    'tile_store': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': MEMCACHED_LOCATION,
+        'KEY_PREFIX': 'tile',
     }
 }
 
@@ -576,6 +600,69 @@ GOOGLE_SERVER_SIDE_API_KEY = os.getenv('GOOGLE_SERVER_SIDE_API_KEY')
 if GOOGLE_SERVER_SIDE_API_KEY is None:
     raise ImproperlyConfigured(
         'Invalid GOOGLE_SERVER_SIDE_API_KEY provided, must be set')
+# Days a Google geocoding response is reused for the same normalised address
+# and country before the address is geocoded again. 0 disables the cache.
+# The Google Maps Platform terms allow caching geocoding results for at most
+# 30 consecutive calendar days, so do not set this higher. Older responses
+# are deleted by the hourly purge_geocoding_results command. See
+# api/geocoding.py.
+GEOCODING_CACHE_TTL_DAYS = int(os.getenv('GEOCODING_CACHE_TTL_DAYS', 30))
+# Days a ZERO_RESULTS response is reused, kept short as Google may learn the
+# address in the meantime.
+GEOCODING_CACHE_NEGATIVE_TTL_DAYS = int(
+    os.getenv('GEOCODING_CACHE_NEGATIVE_TTL_DAYS', 7)
+)
+# Google geocoding requests a process sends per second at most, shared by all
+# of its threads. 0 disables the limit.
+GEOCODING_REQUESTS_PER_SECOND = float(
+    os.getenv('GEOCODING_REQUESTS_PER_SECOND', 25)
+)
+# List items the batch_process geocode action geocodes at once in threads,
+# writing their results GEOCODING_WRITE_BATCH_SIZE items at a time. 1 geocodes
+# and saves the items one at a time. See
+# api/management/commands/batch_process.py.
+GEOCODING_CONCURRENCY = int(os.getenv('GEOCODING_CONCURRENCY', 1))
+GEOCODING_WRITE_BATCH_SIZE = int(os.getenv('GEOCODING_WRITE_BATCH_SIZE', 100))
+
+# API request logs are inserted in batches of this size from a background
+# thread, or after REQUEST_LOG_FLUSH_INTERVAL_SECONDS. 1 inserts every log in
+# its request. See api/request_log_writer.py.
+REQUEST_LOG_BATCH_SIZE = int(os.getenv('REQUEST_LOG_BATCH_SIZE', 200))
+REQUEST_LOG_FLUSH_INTERVAL_SECONDS = int(
+    os.getenv('REQUEST_LOG_FLUSH_INTERVAL_SECONDS', 2)
+)
+# Logs queued per process before they are inserted in the request instead.
+REQUEST_LOG_QUEUE_SIZE = int(os.getenv('REQUEST_LOG_QUEUE_SIZE', 10000))
+# Whole days before the current one that check_api_limits keeps counting
+# from the request log instead of rolling up, so that logs written late by
+# the batch writer are still counted. See api/limits.py.
+REQUEST_LOG_ROLLUP_GRACE_DAYS = int(
+    os.getenv('REQUEST_LOG_ROLLUP_GRACE_DAYS', 1)
+)
+
+# The Logstash sources (src/logstash), which the production location indexer
+# shares its SQL and country data with. They sit next to the Django project
+# in a checkout and in the image, which copies them from the logstash build
+# context.
+LOGSTASH_DIR = os.getenv(
+    'LOGSTASH_DIR', os.path.join(os.path.dirname(BASE_DIR), 'logstash')
+)
+
+# Changed production locations the index_production_locations command
+# reindexes in OpenSearch per batch, and the seconds it waits for new changes
+# when there are none. See
+# api/services/opensearch/production_location_indexer.py.
+PRODUCTION_LOCATION_INDEXER_BATCH_SIZE = int(
+    os.getenv('PRODUCTION_LOCATION_INDEXER_BATCH_SIZE', 500)
+)
+PRODUCTION_LOCATION_INDEXER_POLL_INTERVAL_SECONDS = float(
+    os.getenv('PRODUCTION_LOCATION_INDEXER_POLL_INTERVAL_SECONDS', 2)
+)
+# Failed attempts after which a change is parked in the outbox instead of
+# being retried.
+PRODUCTION_LOCATION_INDEXER_MAX_ATTEMPTS = int(
+    os.getenv('PRODUCTION_LOCATION_INDEXER_MAX_ATTEMPTS', 5)
+)
 
 if not DEBUG:
     ROLLBAR = {
@@ -640,9 +727,14 @@ AWS_S3_FILE_OVERWRITE = False
 TESTING = "test" in sys.argv
 
 if TESTING:
+    # Tests run in a transaction the writer thread can't see.
+    REQUEST_LOG_BATCH_SIZE = 1
     CACHES["view_cache"] = {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
     }
+    CACHES["tile_store"] = {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    }
 
 # Use filesystem for "default" when running tests (so tests never use S3/MinIO) or
 # when DEBUG and no S3 endpoint (local without MinIO). Use S3 when not DEBUG or
@@ -687,6 +779,16 @@ ALWAYS_GENERATE_SLOW_REPORT = True  # Generate report only when requested using
 
 KAFKA_BOOTSTRAP_SERVERS = os.getenv('KAFKA_BOOTSTRAP_SERVERS', '') # Kafka servers to connect
 KAFKA_TOPIC_DEDUPE_BASIC_NAME = os.getenv('KAFKA_TOPIC_DEDUPE_BASIC_NAME', '') # Kafka Dedupe Hub Topic
+# Postgres channel dedupe-hub notifies with a list item id once its matches
+# are written. See api/match_notifications.py.
+MATCH_NOTIFICATION_CHANNEL = os.getenv(
+    'MATCH_NOTIFICATION_CHANNEL', 'facility_list_item_matched'
+)
+# Waiters for a match still recheck the list item at this interval in case a
+# notification is missed.
+MATCH_NOTIFICATION_FALLBACK_POLL_SECONDS = int(
+    os.getenv('MATCH_NOTIFICATION_FALLBACK_POLL_SECONDS', 5)
+)
 
 # Django Bleach settings
 # https://django-bleach.readthedocs.io/en/latest/
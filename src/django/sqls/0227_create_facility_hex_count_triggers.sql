@@ -0,0 +1,101 @@
+/*
+Keeps api_facilityhexcount in step with the locations in api_facilityindex
+for every zoom level up to the facility_hex_count_max_zoom version row. Does
+nothing until build_facility_hex_counts has created that row.
+*/
+CREATE OR REPLACE FUNCTION update_facility_hex_counts()
+RETURNS TRIGGER AS $$
+DECLARE
+    max_zoom integer;
+    locations geometry[];
+    deltas integer[];
+    empty_ids integer[];
+BEGIN
+    SELECT version INTO max_zoom
+    FROM api_version
+    WHERE name = 'facility_hex_count_max_zoom';
+
+    IF max_zoom IS NULL OR max_zoom < 0 THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(location), array_agg(1)
+        INTO locations, deltas
+        FROM new_rows
+        WHERE location IS NOT NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(location), array_agg(-1)
+        INTO locations, deltas
+        FROM old_rows
+        WHERE location IS NOT NULL;
+    ELSE
+        SELECT array_agg(changes.location), array_agg(changes.delta)
+        INTO locations, deltas
+        FROM (
+            SELECT old_rows.location, -1 AS delta
+            FROM old_rows
+            JOIN new_rows ON new_rows.id = old_rows.id
+            WHERE old_rows.location IS DISTINCT FROM new_rows.location
+            UNION ALL
+            SELECT new_rows.location, 1 AS delta
+            FROM old_rows
+            JOIN new_rows ON new_rows.id = old_rows.id
+            WHERE old_rows.location IS DISTINCT FROM new_rows.location
+        ) AS changes
+        WHERE changes.location IS NOT NULL;
+    END IF;
+
+    IF locations IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    WITH upserted AS (
+        INSERT INTO api_facilityhexcount (zoom, hex_col, hex_row, count)
+        SELECT zoom, cell[1], cell[2], SUM(delta)
+        FROM (
+            SELECT
+                zoom,
+                facility_hex_cell(
+                    facility_hex_width(zoom), ST_X(mercator), ST_Y(mercator)
+                ) AS cell,
+                delta
+            FROM
+                unnest(locations, deltas) AS changes(location, delta),
+                LATERAL ST_Transform(changes.location, 3857) AS mercator,
+                generate_series(0, max_zoom) AS zoom
+        ) AS cells
+        GROUP BY zoom, cell[1], cell[2]
+        ON CONFLICT (zoom, hex_col, hex_row) DO UPDATE
+        SET count = api_facilityhexcount.count + EXCLUDED.count
+        RETURNING id, count
+    )
+    SELECT array_agg(id) INTO empty_ids
+    FROM upserted
+    WHERE count <= 0;
+
+    IF empty_ids IS NOT NULL THEN
+        DELETE FROM api_facilityhexcount WHERE id = ANY(empty_ids);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER facility_index_hex_count_insert_trigger
+    AFTER INSERT ON api_facilityindex
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_facility_hex_counts();
+
+CREATE TRIGGER facility_index_hex_count_update_trigger
+    AFTER UPDATE ON api_facilityindex
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_facility_hex_counts();
+
+CREATE TRIGGER facility_index_hex_count_delete_trigger
+    AFTER DELETE ON api_facilityindex
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION update_facility_hex_counts();
@@ -0,0 +1,9 @@
+DROP TRIGGER IF EXISTS facility_index_hex_count_insert_trigger
+    ON api_facilityindex;
+DROP TRIGGER IF EXISTS facility_index_hex_count_update_trigger
+    ON api_facilityindex;
+DROP TRIGGER IF EXISTS facility_index_hex_count_delete_trigger
+    ON api_facilityindex;
+DROP FUNCTION IF EXISTS update_facility_hex_counts();
+DROP FUNCTION IF EXISTS facility_hex_width(integer);
+DROP FUNCTION IF EXISTS facility_hex_cell(float, float, float);
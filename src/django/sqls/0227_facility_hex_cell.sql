@@ -0,0 +1,36 @@
+/*
+Returns the {column, row} of the facilitygrid hexagon of the given width that
+holds the EPSG 3857 point (x, y). Mirrors `HexGrid.get_cell` in
+api/hexgrid.py, which also documents the cell addressing.
+*/
+CREATE OR REPLACE FUNCTION facility_hex_cell(width float, x float, y float)
+RETURNS bigint[] AS $$
+DECLARE
+    b float := width / 2;
+    a float := tan(radians(30)) * b;
+    row_height float := 3 * a;
+    pair_height float := 2 * row_height;
+    even_col bigint := floor(x / width + 0.5);
+    even_row bigint := 2 * floor((y - 2 * a) / pair_height + 0.5)::bigint;
+    odd_col bigint := floor((x - b) / width + 0.5);
+    odd_row bigint := 2 * floor((y - 5 * a) / pair_height + 0.5)::bigint + 1;
+    even_distance float := (x - even_col * width) ^ 2
+        + (y - (2 * a + even_row * row_height)) ^ 2;
+    odd_distance float := (x - (odd_col * width + b)) ^ 2
+        + (y - (2 * a + odd_row * row_height)) ^ 2;
+BEGIN
+    IF even_distance <= odd_distance THEN
+        RETURN ARRAY[even_col, even_row];
+    END IF;
+    RETURN ARRAY[odd_col, odd_row];
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+/*
+Returns the width in EPSG 3857 metres of the facilitygrid hexagons at a tile
+zoom level. Mirrors `HexGrid.for_zoom`.
+*/
+CREATE OR REPLACE FUNCTION facility_hex_width(zoom integer)
+RETURNS float AS $$
+    SELECT 40075016.68557849::float / 2 ^ (zoom + 3);
+$$ LANGUAGE SQL IMMUTABLE;
@@ -0,0 +1,148 @@
+/*
+Records the OS IDs of the production locations touched by a statement in
+api_productionlocationchange, in the same transaction, so that the
+index_production_locations command rebuilds only their documents in the
+production-locations OpenSearch index. The first trigger argument is the
+column holding the OS ID in the table the trigger is defined on. Changes are
+only recorded while the production_location_indexer switch is on, so that
+api_productionlocationchange does not grow in environments where no
+index_production_locations command consumes it.
+*/
+CREATE OR REPLACE FUNCTION record_production_location_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    os_id_column text := TG_ARGV[0];
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM waffle_switch
+        WHERE name = 'production_location_indexer' AND active
+    ) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format(
+            'INSERT INTO api_productionlocationchange (os_id, created_at)
+             SELECT DISTINCT %1$I, now()
+             FROM new_rows
+             WHERE %1$I IS NOT NULL',
+            os_id_column
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format(
+            'INSERT INTO api_productionlocationchange (os_id, created_at)
+             SELECT DISTINCT %1$I, now()
+             FROM old_rows
+             WHERE %1$I IS NOT NULL',
+            os_id_column
+        );
+    ELSE
+        -- Both sides of the update, so that a row moved from one location
+        -- to another, e.g. by a merge, changes both of them.
+        EXECUTE format(
+            'INSERT INTO api_productionlocationchange (os_id, created_at)
+             SELECT changes.os_id, now()
+             FROM (
+                 SELECT %1$I AS os_id FROM new_rows
+                 UNION
+                 SELECT %1$I AS os_id FROM old_rows
+             ) AS changes
+             WHERE changes.os_id IS NOT NULL',
+            os_id_column
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER production_location_change_facility_insert_trigger
+    AFTER INSERT ON api_facility
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('id');
+
+CREATE TRIGGER production_location_change_facility_update_trigger
+    AFTER UPDATE ON api_facility
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('id');
+
+CREATE TRIGGER production_location_change_facility_delete_trigger
+    AFTER DELETE ON api_facility
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('id');
+
+CREATE TRIGGER production_location_change_facilityclaim_insert_trigger
+    AFTER INSERT ON api_facilityclaim
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilityclaim_update_trigger
+    AFTER UPDATE ON api_facilityclaim
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilityclaim_delete_trigger
+    AFTER DELETE ON api_facilityclaim
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_extendedfield_insert_trigger
+    AFTER INSERT ON api_extendedfield
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_extendedfield_update_trigger
+    AFTER UPDATE ON api_extendedfield
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_extendedfield_delete_trigger
+    AFTER DELETE ON api_extendedfield
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilitylistitem_insert_trigger
+    AFTER INSERT ON api_facilitylistitem
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilitylistitem_update_trigger
+    AFTER UPDATE ON api_facilitylistitem
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilitylistitem_delete_trigger
+    AFTER DELETE ON api_facilitylistitem
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilityalias_insert_trigger
+    AFTER INSERT ON api_facilityalias
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilityalias_update_trigger
+    AFTER UPDATE ON api_facilityalias
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
+
+CREATE TRIGGER production_location_change_facilityalias_delete_trigger
+    AFTER DELETE ON api_facilityalias
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_production_location_changes('facility_id');
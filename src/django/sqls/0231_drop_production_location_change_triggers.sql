@@ -0,0 +1,31 @@
+DROP TRIGGER IF EXISTS production_location_change_facility_insert_trigger
+    ON api_facility;
+DROP TRIGGER IF EXISTS production_location_change_facility_update_trigger
+    ON api_facility;
+DROP TRIGGER IF EXISTS production_location_change_facility_delete_trigger
+    ON api_facility;
+DROP TRIGGER IF EXISTS production_location_change_facilityclaim_insert_trigger
+    ON api_facilityclaim;
+DROP TRIGGER IF EXISTS production_location_change_facilityclaim_update_trigger
+    ON api_facilityclaim;
+DROP TRIGGER IF EXISTS production_location_change_facilityclaim_delete_trigger
+    ON api_facilityclaim;
+DROP TRIGGER IF EXISTS production_location_change_extendedfield_insert_trigger
+    ON api_extendedfield;
+DROP TRIGGER IF EXISTS production_location_change_extendedfield_update_trigger
+    ON api_extendedfield;
+DROP TRIGGER IF EXISTS production_location_change_extendedfield_delete_trigger
+    ON api_extendedfield;
+DROP TRIGGER IF EXISTS production_location_change_facilitylistitem_insert_trigger
+    ON api_facilitylistitem;
+DROP TRIGGER IF EXISTS production_location_change_facilitylistitem_update_trigger
+    ON api_facilitylistitem;
+DROP TRIGGER IF EXISTS production_location_change_facilitylistitem_delete_trigger
+    ON api_facilitylistitem;
+DROP TRIGGER IF EXISTS production_location_change_facilityalias_insert_trigger
+    ON api_facilityalias;
+DROP TRIGGER IF EXISTS production_location_change_facilityalias_update_trigger
+    ON api_facilityalias;
+DROP TRIGGER IF EXISTS production_location_change_facilityalias_delete_trigger
+    ON api_facilityalias;
+DROP FUNCTION IF EXISTS record_production_location_changes();
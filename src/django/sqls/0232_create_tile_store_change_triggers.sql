@@ -0,0 +1,84 @@
+/*
+Records the old and new locations of the facilities whose location, name or
+address is changed by a statement in api_tilestorechange, in the same
+transaction, so that the stored vector tiles covering them are invalidated.
+The triggers are defined on api_facility, which the facilities layer is
+rendered from, and on api_facilityindex, which the facilitygrid layer is
+rendered from, so that changes made outside Django, e.g. by the dedupe-hub
+list processing or the indexing functions, are recorded too.
+*/
+CREATE OR REPLACE FUNCTION record_tile_store_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO api_tilestorechange (location, created_at)
+        SELECT location, now()
+        FROM new_rows
+        WHERE location IS NOT NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO api_tilestorechange (location, created_at)
+        SELECT location, now()
+        FROM old_rows
+        WHERE location IS NOT NULL;
+    ELSE
+        -- Both sides of the update, so that the tiles a facility moved out
+        -- of are invalidated as well.
+        WITH changed AS (
+            SELECT
+                old_rows.location AS old_location,
+                new_rows.location AS new_location
+            FROM old_rows
+            JOIN new_rows ON new_rows.id = old_rows.id
+            WHERE old_rows.location IS DISTINCT FROM new_rows.location
+               OR old_rows.name IS DISTINCT FROM new_rows.name
+               OR old_rows.address IS DISTINCT FROM new_rows.address
+        )
+        INSERT INTO api_tilestorechange (location, created_at)
+        SELECT locations.location, now()
+        FROM (
+            SELECT old_location AS location FROM changed
+            UNION ALL
+            SELECT new_location AS location FROM changed
+        ) AS locations
+        WHERE locations.location IS NOT NULL;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tile_store_change_facility_insert_trigger
+    AFTER INSERT ON api_facility
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_tile_store_changes();
+
+CREATE TRIGGER tile_store_change_facility_update_trigger
+    AFTER UPDATE ON api_facility
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_tile_store_changes();
+
+CREATE TRIGGER tile_store_change_facility_delete_trigger
+    AFTER DELETE ON api_facility
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_tile_store_changes();
+
+CREATE TRIGGER tile_store_change_facilityindex_insert_trigger
+    AFTER INSERT ON api_facilityindex
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_tile_store_changes();
+
+CREATE TRIGGER tile_store_change_facilityindex_update_trigger
+    AFTER UPDATE ON api_facilityindex
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_tile_store_changes();
+
+CREATE TRIGGER tile_store_change_facilityindex_delete_trigger
+    AFTER DELETE ON api_facilityindex
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_tile_store_changes();
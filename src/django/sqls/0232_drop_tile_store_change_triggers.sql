@@ -0,0 +1,14 @@
+DROP TRIGGER IF EXISTS tile_store_change_facility_insert_trigger
+    ON api_facility;
+DROP TRIGGER IF EXISTS tile_store_change_facility_update_trigger
+    ON api_facility;
+DROP TRIGGER IF EXISTS tile_store_change_facility_delete_trigger
+    ON api_facility;
+DROP TRIGGER IF EXISTS tile_store_change_facilityindex_insert_trigger
+    ON api_facilityindex;
+DROP TRIGGER IF EXISTS tile_store_change_facilityindex_update_trigger
+    ON api_facilityindex;
+DROP TRIGGER IF EXISTS tile_store_change_facilityindex_delete_trigger
+    ON api_facilityindex;
+
+DROP FUNCTION IF EXISTS record_tile_store_changes();
@@ -1,3 +1,7 @@
+-- Also run by the Django production location indexer
+-- (src/django/api/services/opensearch/production_location_indexer.py), which
+-- replaces everything after the last top-level WHERE with a filter on the OS
+-- IDs in the change outbox. Keep that WHERE on a line of its own.
 SELECT
   af.id AS os_id,
   (